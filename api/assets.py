@@ -0,0 +1,446 @@
+"""Build and serve the Mini App's static assets.
+
+`python -m api.assets` turns miniapp/ into miniapp/dist/:
+
+- the local <script> files of index.html are concatenated, in page order,
+  into one minified bundle and style.css is minified
+- both are named after their content hash (app.<hash>.js), so they can be
+  cached forever: a change produces a new name in the new index.html
+- every text file gets a precompressed .gz sibling (and .br when the brotli
+  package is installed)
+- manifest.json records the build version; the bot puts it in the Mini App
+  URL instead of a per-click timestamp
+
+MiniAppStaticFiles serves dist/ when it exists: fingerprinted files as
+immutable with a one-year max-age, index.html as no-cache (revalidated with
+its ETag, so a repeat open of an unchanged app is a 304). Without a build it
+serves the sources with no-store, as before. Assets of the previous build are
+kept so clients holding the old index.html can still load them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+MINIAPP_DIR = Path(__file__).resolve().parents[1] / "miniapp"
+DIST_DIRNAME = "dist"
+MANIFEST = "manifest.json"
+BUNDLE_NAME = "app.js"
+STYLESHEET = "style.css"
+
+HASH_LENGTH = 10
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+NO_STORE = "no-store, no-cache, must-revalidate, max-age=0"
+COMPRESSIBLE = (".html", ".js", ".css", ".json", ".svg")
+
+_FINGERPRINT_RE = re.compile(r"\.[0-9a-f]{%d}\.[a-z0-9]+$" % HASH_LENGTH)
+_SCRIPT_RE = re.compile(r'[ \t]*<script src="\./(js/[\w.-]+\.js)(?:\?[^"]*)?"></script>\n?')
+_STYLESHEET_RE = re.compile(r'href="\./style\.css(?:\?[^"]*)?"')
+
+# A '/' after one of these (or at the start) begins a regex literal, not a division
+_REGEX_PRECEDERS = set("(,=:[!&|?{};+-*%<>~^")
+_REGEX_KEYWORDS = {"return", "typeof", "case", "do", "else", "in", "of", "void",
+                   "delete", "throw", "new", "instanceof", "yield", "await"}
+
+
+def _is_word(c: str) -> bool:
+    return c.isalnum() or c in "_$" or ord(c) > 127
+
+
+def _skip_string(s: str, i: int) -> int:
+    quote = s[i]
+    i += 1
+    while i < len(s):
+        if s[i] == "\\":
+            i += 2
+            continue
+        if s[i] == quote:
+            return i + 1
+        if s[i] == "\n":
+            break
+        i += 1
+    raise ValueError(f"Unterminated string at offset {i}")
+
+
+def _skip_template(s: str, i: int) -> int:
+    i += 1
+    while i < len(s):
+        c = s[i]
+        if c == "\\":
+            i += 2
+        elif c == "`":
+            return i + 1
+        elif s.startswith("${", i):
+            i = _skip_expression(s, i + 2)
+        else:
+            i += 1
+    raise ValueError("Unterminated template literal")
+
+
+def _skip_expression(s: str, i: int) -> int:
+    depth = 0
+    while i < len(s):
+        c = s[i]
+        if c in "'\"":
+            i = _skip_string(s, i)
+            continue
+        if c == "`":
+            i = _skip_template(s, i)
+            continue
+        if c == "{":
+            depth += 1
+        elif c == "}":
+            if depth == 0:
+                return i + 1
+            depth -= 1
+        i += 1
+    raise ValueError("Unterminated template expression")
+
+
+def _skip_regex(s: str, i: int) -> int:
+    i += 1
+    in_class = False
+    while i < len(s):
+        c = s[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == "\n":
+            raise ValueError(f"Unterminated regex literal at offset {i}")
+        if in_class:
+            in_class = c != "]"
+        elif c == "[":
+            in_class = True
+        elif c == "/":
+            i += 1
+            break
+        i += 1
+    while i < len(s) and s[i].isalpha():
+        i += 1
+    return i
+
+
+def minify_js(source: str) -> str:
+    """Strip comments and redundant whitespace from classic-script JavaScript.
+
+    Conservative on purpose: strings, template literals and regex literals
+    are copied verbatim, names are not mangled and line breaks that could end
+    a statement (automatic semicolon insertion) are kept.
+    """
+    out: List[str] = []
+    prev = ""  # last emitted token
+    space = newline = False
+    i, n = 0, len(source)
+    while i < n:
+        c = source[i]
+        if c in " \t\r\n":
+            newline = newline or c == "\n"
+            space = True
+            i += 1
+            continue
+        if source.startswith("//", i):
+            end = source.find("\n", i)
+            i = n if end < 0 else end
+            continue
+        if source.startswith("/*", i):
+            end = source.find("*/", i + 2)
+            if end < 0:
+                raise ValueError("Unterminated comment")
+            i = end + 2
+            space = True
+            continue
+
+        if c in "'\"":
+            j = _skip_string(source, i)
+        elif c == "`":
+            j = _skip_template(source, i)
+        elif c == "/" and (not prev or prev in _REGEX_PRECEDERS or prev in _REGEX_KEYWORDS):
+            j = _skip_regex(source, i)
+        elif _is_word(c):
+            j = i + 1
+            while j < n and _is_word(source[j]):
+                j += 1
+        else:
+            j = i + 1
+        token = source[i:j]
+
+        if out and space:
+            last, first = prev[-1], token[0]
+            if newline and last not in "{;,([" and first not in "})]":
+                out.append("\n")
+            elif (_is_word(last) and _is_word(first)) or (last == first and last in "+-/"):
+                out.append(" ")
+        out.append(token)
+        prev = token
+        space = newline = False
+        i = j
+    return "".join(out) + "\n"
+
+
+def minify_css(source: str) -> str:
+    """Strip comments and whitespace around CSS punctuation."""
+    out: List[str] = []
+    space = False
+    i, n = 0, len(source)
+    while i < n:
+        c = source[i]
+        if c.isspace():
+            space = True
+            i += 1
+            continue
+        if source.startswith("/*", i):
+            end = source.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            space = True
+            continue
+        j = _skip_string(source, i) if c in "'\"" else i + 1
+        token = source[i:j]
+        if token == "}" and out and out[-1] == ";":
+            out.pop()
+        if space and out and out[-1][-1] not in "{};,:>" and token[0] not in "{};,>":
+            out.append(" ")
+        out.append(token)
+        space = False
+        i = j
+    return "".join(out) + "\n"
+
+
+def content_hash(data: bytes) -> str:
+    """Short content hash used in fingerprinted file names."""
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def fingerprint(name: str, data: bytes) -> str:
+    """app.js -> app.<hash>.js"""
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{content_hash(data)}{ext}"
+
+
+def compress(path: Path) -> List[Path]:
+    """Write precompressed siblings (.gz, and .br if available) of path."""
+    data = path.read_bytes()
+    written = [path.with_name(path.name + ".gz")]
+    written[0].write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        br = path.with_name(path.name + ".br")
+        br.write_bytes(brotli.compress(data, quality=11))
+        written.append(br)
+    return written
+
+
+def _write(path: Path, data: bytes) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def read_manifest(dist_dir: Path) -> Optional[Dict[str, Any]]:
+    """The manifest of the build in dist_dir, or None if there is none."""
+    try:
+        return json.loads((dist_dir / MANIFEST).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def needs_build(source_dir: Path = MINIAPP_DIR) -> bool:
+    """Whether dist/ is missing or older than any source file."""
+    manifest_path = source_dir / DIST_DIRNAME / MANIFEST
+    if not manifest_path.exists():
+        return True
+    built = manifest_path.stat().st_mtime
+    sources = [source_dir / "index.html", source_dir / STYLESHEET, *(source_dir / "js").glob("*.js")]
+    return any(p.exists() and p.stat().st_mtime > built for p in sources)
+
+
+def build(source_dir: Path = MINIAPP_DIR, dist_dir: Optional[Path] = None) -> Dict[str, Any]:
+    """Bundle, minify, fingerprint and precompress the Mini App.
+
+    Args:
+        source_dir: Folder with index.html, style.css and js/
+        dist_dir: Output folder (default: source_dir/dist)
+
+    Returns:
+        The manifest written to dist_dir: version (content hash of
+        index.html), files (logical name -> fingerprinted name), assets
+        (files of this build) and sizes (bytes before/after minify and gzip)
+
+    Raises:
+        ValueError: If a source file cannot be tokenized
+    """
+    dist_dir = dist_dir or source_dir / DIST_DIRNAME
+    dist_dir.mkdir(parents=True, exist_ok=True)
+    previous = read_manifest(dist_dir) or {}
+    html = (source_dir / "index.html").read_text(encoding="utf-8")
+
+    scripts = _SCRIPT_RE.findall(html)
+    source_js = "".join((source_dir / s).read_text(encoding="utf-8") for s in scripts)
+    bundle = ";\n".join(minify_js((source_dir / s).read_text(encoding="utf-8")) for s in scripts)
+    source_css = (source_dir / STYLESHEET).read_text(encoding="utf-8")
+    css = minify_css(source_css)
+
+    files: Dict[str, str] = {}
+    sizes: Dict[str, Dict[str, int]] = {}
+    for name, text, original in ((BUNDLE_NAME, bundle, source_js), (STYLESHEET, css, source_css)):
+        data = text.encode("utf-8")
+        files[name] = fingerprint(name, data)
+        path = dist_dir / files[name]
+        if not path.exists():
+            _write(path, data)
+        compress(path)
+        sizes[name] = {
+            "source": len(original.encode("utf-8")),
+            "minified": len(data),
+            "gzip": (dist_dir / (files[name] + ".gz")).stat().st_size,
+        }
+
+    if scripts:
+        # One tag for the bundle where the first local script was
+        first = _SCRIPT_RE.search(html)
+        indent = first.group(0)[: len(first.group(0)) - len(first.group(0).lstrip())]
+        html = (html[: first.start()] + f'{indent}<script src="./{files[BUNDLE_NAME]}"></script>\n'
+                + _SCRIPT_RE.sub("", html[first.start():]))
+    html = _STYLESHEET_RE.sub(f'href="./{files[STYLESHEET]}"', html)
+    index = dist_dir / "index.html"
+    _write(index, html.encode("utf-8"))
+    compress(index)
+
+    manifest = {
+        "version": content_hash(html.encode("utf-8")),
+        "files": files,
+        "assets": sorted(files.values()),
+        "sizes": sizes,
+    }
+    keep = set(manifest["assets"]) | set(previous.get("assets", []))
+    for path in dist_dir.iterdir():
+        base = path.name[:-3] if path.name.endswith((".gz", ".br")) else path.name
+        if _FINGERPRINT_RE.search(base) and base not in keep:
+            path.unlink()
+    _write(dist_dir / MANIFEST, json.dumps(manifest, indent=2).encode("utf-8"))
+    logger.info(f"Built Mini App {manifest['version']}: {', '.join(files.values())}")
+    return manifest
+
+
+def build_if_stale(source_dir: Path = MINIAPP_DIR) -> Optional[Dict[str, Any]]:
+    """Rebuild when sources changed; a failed build is logged and the old one kept.
+
+    Returns:
+        The new manifest, or None if nothing was built
+    """
+    if not (source_dir / "index.html").exists() or not needs_build(source_dir):
+        return None
+    try:
+        return build(source_dir)
+    except (OSError, ValueError) as e:
+        logger.error(f"Mini App build failed: {e}")
+        return None
+
+
+_version_cache: Dict[str, Any] = {"mtime": None, "version": None}
+
+
+def build_version(source_dir: Path = MINIAPP_DIR) -> Optional[str]:
+    """Version of the current Mini App build (None when it was never built)."""
+    path = source_dir / DIST_DIRNAME / MANIFEST
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return None
+    if _version_cache["mtime"] != mtime:
+        manifest = read_manifest(path.parent) or {}
+        _version_cache.update(mtime=mtime, version=manifest.get("version"))
+    return _version_cache["version"]
+
+
+class MiniAppStaticFiles(StaticFiles):
+    """Serve the Mini App build with long-lived caching and precompressed bodies."""
+
+    def __init__(self, source_dir: Path = MINIAPP_DIR):
+        dist_dir = source_dir / DIST_DIRNAME
+        self.built = (dist_dir / "index.html").exists()
+        super().__init__(directory=str(dist_dir if self.built else source_dir), html=True)
+
+    async def get_response(self, path: str, scope):
+        response = None
+        if self.built and scope["method"] in ("GET", "HEAD"):
+            response = await self._precompressed_response(path, scope)
+        if response is None:
+            response = await super().get_response(path, scope)
+        if not self.built:
+            response.headers["Cache-Control"] = NO_STORE
+            response.headers["Pragma"] = "no-cache"
+            response.headers["Expires"] = "0"
+        elif _FINGERPRINT_RE.search(path) and response.status_code in (200, 304):
+            response.headers["Cache-Control"] = IMMUTABLE
+        else:
+            response.headers["Cache-Control"] = REVALIDATE
+        return response
+
+    async def _precompressed_response(self, path: str, scope):
+        """The .br/.gz sibling of path the client accepts, or None."""
+        name = "index.html" if path in ("", ".") else path
+        if not name.endswith(COMPRESSIBLE):
+            return None
+        accepted = ""
+        for key, value in scope.get("headers", []):
+            if key == b"accept-encoding":
+                accepted = value.decode("latin-1").lower()
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if encoding not in accepted:
+                continue
+            full_path, stat_result = await anyio.to_thread.run_sync(self.lookup_path, name + suffix)
+            if stat_result is None:
+                continue
+            media_type = mimetypes.guess_type(name)[0] or "text/plain"
+            response = FileResponse(full_path, stat_result=stat_result, media_type=media_type)
+            response.headers["Content-Encoding"] = encoding
+            response.headers["Vary"] = "Accept-Encoding"
+            if self.is_not_modified(response.headers, Headers(scope=scope)):
+                return NotModifiedResponse(response.headers)
+            return response
+        return None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build the Mini App into miniapp/dist")
+    parser.add_argument("--source", default=str(MINIAPP_DIR), help="Mini App source folder")
+    parser.add_argument("--if-stale", action="store_true", help="Only build when sources changed")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    source = Path(args.source)
+    if args.if_stale and not needs_build(source):
+        print("Mini App build is up to date")
+        return 0
+    manifest = build(source)
+    for name, size in manifest["sizes"].items():
+        print(f"{name:10} {size['source']:>8} B -> {size['minified']:>8} B minified, "
+              f"{size['gzip']:>7} B gzip  ({manifest['files'][name]})")
+    print(f"version {manifest['version']}{'' if brotli else '  (brotli not installed: gzip only)'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,6 +12,8 @@ from urllib.parse import parse_qsl
 
 from fastapi import Header, HTTPException
 
+from config.db_executor import DBExecutor
+from config.read_routing import ReadRouter
 from config.settings import Settings
 from services.user_service import UserService
 
@@ -100,12 +102,26 @@ def _extract_init_data(
     return ""
 
 
-def get_current_user(
+def _register_user(u: Dict[str, Any]):
+    return UserService.get_or_register(
+        telegram_id=int(u["id"]),
+        username=u.get("username"),
+        first_name=u.get("first_name"),
+        last_name=u.get("last_name"),
+        language_code=u.get("language_code") or "id",
+    )
+
+
+async def get_current_user(
     authorization: Optional[str] = Header(default=None),
     x_telegram_init_data: Optional[str] = Header(default=None, alias="X-Telegram-Init-Data"),
     init_data: Optional[str] = Header(default=None, alias="X-Init-Data"),
 ):
-    """FastAPI dependency to authenticate user using Telegram init_data."""
+    """FastAPI dependency to authenticate user using Telegram init_data.
+
+    The signature check runs on the event loop; the user lookup runs on the
+    DB executor.
+    """
     raw = _extract_init_data(authorization, x_telegram_init_data, init_data)
     init = validate_init_data(
         raw=raw,
@@ -118,14 +134,20 @@ def get_current_user(
     if not telegram_id:
         raise HTTPException(status_code=401, detail="Missing user id in init_data")
 
-    user = UserService.get_or_register(
-        telegram_id=int(telegram_id),
-        username=u.get("username"),
-        first_name=u.get("first_name"),
-        last_name=u.get("last_name"),
-        language_code=u.get("language_code") or "id",
-    )
+    ReadRouter.bind_user(int(telegram_id))
+    user = await DBExecutor.run(_register_user, u)
     if not user:
         raise HTTPException(status_code=500, detail="Failed to initialize user")
     return user
 
+
+async def get_admin_user(
+    authorization: Optional[str] = Header(default=None),
+    x_telegram_init_data: Optional[str] = Header(default=None, alias="X-Telegram-Init-Data"),
+    init_data: Optional[str] = Header(default=None, alias="X-Init-Data"),
+):
+    """FastAPI dependency that only admits Telegram users listed in ADMIN_USER_IDS."""
+    user = await get_current_user(authorization, x_telegram_init_data, init_data)
+    if user.telegram_id not in Settings.ADMIN_USER_IDS:
+        raise HTTPException(status_code=403, detail="Admin only")
+    return user
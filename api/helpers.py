@@ -2,10 +2,17 @@
 
 from __future__ import annotations
 
-from datetime import date, timedelta
-from typing import Optional, Tuple
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Optional, Tuple, TypeVar
 
+from fastapi import Request
+
+from config.database import DatabaseConnection
+from config.db_executor import DBExecutor
 from utils.datetime_utils import today_jakarta
+from utils.tracing import Tracer
+
+T = TypeVar("T")
 
 
 def parse_date(d: Optional[str]) -> Optional[date]:
@@ -23,3 +30,50 @@ def default_date_range() -> Tuple[date, date]:
     end = today_jakarta()
     start = end - timedelta(days=30)
     return start, end
+
+
+def encode_cursor(transaction: Any) -> str:
+    """Opaque keyset cursor of a transaction row: "date~created_at~id".
+
+    created_at is left empty for rows without one (the column allows NULL).
+    """
+    created = transaction.created_at.isoformat(sep=" ") if transaction.created_at else ""
+    return f"{transaction.transaction_date.isoformat()}~{created}~{transaction.id}"
+
+
+def parse_cursor(value: Optional[str]) -> Optional[Tuple[date, Optional[datetime], int]]:
+    """Decode encode_cursor() output; None if missing or malformed."""
+    if not value:
+        return None
+    try:
+        day, created, row_id = value.split("~")
+        return date.fromisoformat(day), datetime.fromisoformat(created) if created else None, int(row_id)
+    except ValueError:
+        return None
+
+
+async def run_db(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Await a blocking DB call without blocking the event loop.
+
+    Runs on the bounded DB executor inside the request's unit of work; see
+    config.db_executor. Group the queries of one step into one call.
+    """
+    return await DBExecutor.run(func, *args, **kwargs)
+
+
+async def trace_request(request: Request):
+    """Router dependency that wraps the request (auth included) in a trace span."""
+    route = request.scope.get("route")
+    name = f"{request.method} {getattr(route, 'path', request.url.path)}"
+    with Tracer.span(name, "api"):
+        yield
+
+
+async def db_session():
+    """Router dependency running the request (auth included) as one unit of work.
+
+    All queries share one pooled connection and writes commit together when
+    the request finishes (rolled back if it raises).
+    """
+    async with DatabaseConnection.session():
+        yield
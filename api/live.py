@@ -0,0 +1,200 @@
+"""Live change notifications for open Mini App sessions (Server-Sent Events).
+
+Every transaction write, from any process (bot handlers, recurring jobs, API
+workers), bumps the user's version in sync_versions (models/sync.py). Each
+API worker runs one poller task while it has open streams: every
+LIVE_POLL_INTERVAL_SECONDS it reads the versions of all subscribed users in
+one query, and for each user whose version moved it builds one delta (the
+/api/sync payload) plus the new balance and fans it out to all of that
+user's streams. The database cost is one query per interval per worker, plus
+two per user that changed, however many sessions are open.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from api.responses import dumps, records
+from config.db_executor import DBExecutor
+from config.settings import Settings
+from models.sync import SyncLog
+from models.transaction import Transaction
+from services.sync_service import SyncService
+
+logger = logging.getLogger(__name__)
+
+# Events buffered per stream; a stream that falls further behind gets one resync event
+QUEUE_SIZE = 16
+# Changes carried inline in one event; larger deltas make the client call /api/sync
+EVENT_CHANGES_LIMIT = 100
+# Milliseconds a disconnected EventSource-style client waits before reconnecting
+RETRY_MS = 3000
+
+
+def format_event(event: str, data: Any) -> bytes:
+    """Encode one SSE message (orjson output never contains newlines)."""
+    return b"event: " + event.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+
+
+def build_event(user_id: int, since: int, version: int) -> Dict[str, Any]:
+    """Payload of a change event: the delta from since plus the new balance.
+
+    complete is False when the delta is not inline (client had no version,
+    a snapshot is needed or it exceeds EVENT_CHANGES_LIMIT); the client then
+    syncs through /api/sync instead of patching.
+    """
+    event: Dict[str, Any] = {
+        'version': version,
+        'since': since,
+        'transactions': [],
+        'deleted': [],
+        'complete': False,
+        'balance': Transaction.get_balance(user_id),
+    }
+    if since > 0:
+        delta = SyncService.get_changes(user_id, since=since, limit=EVENT_CHANGES_LIMIT)
+        if not delta['reset'] and not delta['has_more']:
+            event.update(
+                version=delta['version'],
+                transactions=records(delta['transactions'], Transaction.FIELDS),
+                deleted=delta['deleted'],
+                complete=True,
+            )
+    return event
+
+
+class ChangeHub:
+    """Per-worker registry of open streams and the shared change poller."""
+
+    _subscribers: Dict[int, Set[asyncio.Queue]] = {}
+    _versions: Dict[int, int] = {}
+    _poller: Optional[asyncio.Task] = None
+
+    @classmethod
+    async def subscribe(cls, user_id: int) -> asyncio.Queue:
+        """Register a stream of user_id and return the queue its events arrive on."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        if user_id not in cls._versions:
+            cls._versions[user_id] = await DBExecutor.run(SyncLog.current_version, user_id)
+        cls._subscribers.setdefault(user_id, set()).add(queue)
+        if cls._poller is None or cls._poller.done():
+            cls._poller = asyncio.create_task(cls._run())
+        return queue
+
+    @classmethod
+    def unsubscribe(cls, user_id: int, queue: asyncio.Queue) -> None:
+        """Drop a stream; the user is forgotten with their last stream."""
+        queues = cls._subscribers.get(user_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del cls._subscribers[user_id]
+            cls._versions.pop(user_id, None)
+
+    @classmethod
+    def version(cls, user_id: int) -> int:
+        """Version of user_id as last seen by the poller."""
+        return cls._versions.get(user_id, 0)
+
+    @classmethod
+    def stream_count(cls) -> int:
+        """Open streams in this worker."""
+        return sum(len(queues) for queues in cls._subscribers.values())
+
+    @staticmethod
+    def collect(known: Dict[int, int]) -> List[Tuple[int, Dict[str, Any]]]:
+        """Blocking poll: events for every user whose version moved past known.
+
+        Args:
+            known: User ID to the version last delivered
+
+        Returns:
+            (user ID, event payload) pairs
+        """
+        if not known:
+            return []
+        events = []
+        for user_id, version in SyncLog.versions(list(known)).items():
+            since = known.get(user_id, 0)
+            if version != since:
+                events.append((user_id, build_event(user_id, since, version)))
+        return events
+
+    @classmethod
+    def publish(cls, user_id: int, event: Dict[str, Any]) -> None:
+        """Fan an event out to the user's streams without waiting on slow ones."""
+        if user_id not in cls._versions:
+            return
+        cls._versions[user_id] = event['version']
+        for queue in list(cls._subscribers.get(user_id, ())):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Too far behind to patch: replace the backlog with one resync
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait({**event, 'transactions': [], 'deleted': [], 'complete': False})
+
+    @classmethod
+    async def poll_once(cls) -> int:
+        """Poll for changes and publish them; returns the number of users notified."""
+        events = await DBExecutor.run(cls.collect, dict(cls._versions))
+        for user_id, event in events:
+            cls.publish(user_id, event)
+        return len(events)
+
+    @classmethod
+    async def _run(cls) -> None:
+        while cls._subscribers:
+            await asyncio.sleep(Settings.LIVE_POLL_INTERVAL_SECONDS)
+            try:
+                await cls.poll_once()
+            except Exception as e:
+                logger.warning(f"Live update poll failed: {e}")
+
+    @classmethod
+    async def close(cls) -> None:
+        """Stop the poller and end every open stream (worker shutdown)."""
+        poller, cls._poller = cls._poller, None
+        if poller is not None and not poller.done():
+            poller.cancel()
+        for queues in cls._subscribers.values():
+            for queue in queues:
+                try:
+                    queue.put_nowait(None)
+                except asyncio.QueueFull:
+                    pass
+        cls._subscribers = {}
+        cls._versions = {}
+
+
+async def event_stream(user_id: int) -> AsyncIterator[bytes]:
+    """SSE body for one client: hello with the current version, then changes.
+
+    Ends after LIVE_STREAM_MAX_SECONDS so idle connections do not pin a
+    worker through reloads; the client reconnects.
+    """
+    queue = await ChangeHub.subscribe(user_id)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + Settings.LIVE_STREAM_MAX_SECONDS
+    try:
+        yield f"retry: {RETRY_MS}\n".encode() + format_event('hello', {'version': ChangeHub.version(user_id)})
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            try:
+                event = await asyncio.wait_for(
+                    queue.get(), timeout=min(Settings.LIVE_HEARTBEAT_SECONDS, remaining)
+                )
+            except asyncio.TimeoutError:
+                yield b": ping\n\n"
+                continue
+            if event is None:
+                return
+            yield format_event('change', event)
+    finally:
+        ChangeHub.unsubscribe(user_id, queue)
@@ -2,15 +2,57 @@
 
 from __future__ import annotations
 
-from pathlib import Path
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
-from api.routers import analytics, balance, categories, health, transactions
+from api.assets import MINIAPP_DIR, MiniAppStaticFiles
+from api.middleware import MetricsMiddleware, ReadRoutingMiddleware
+from api.responses import ORJSONResponse
+from api.live import ChangeHub
+from api.routers import admin, analytics, balance, categories, health, live, metrics, sync, transactions
+from config.database import DatabaseConnection
+from config.db_executor import DBExecutor
+from config.settings import Settings
+from utils.metrics import monitor_event_loop_lag
 
-app = FastAPI(title="Montrixa Mini App API", version="0.1.0")
+logger = logging.getLogger(__name__)
+
+
+async def warmup_worker() -> None:
+    """Fill this worker's DB pool before it starts taking requests."""
+    if Settings.API_WARMUP_CONNECTIONS <= 0:
+        return
+    try:
+        idle = await DBExecutor.run(DatabaseConnection.warmup, Settings.API_WARMUP_CONNECTIONS)
+        logger.info(f"API worker {os.getpid()} warmed up {idle} DB connections")
+    except Exception as e:
+        # Serve anyway; /api/health/ready reports the database as down
+        logger.warning(f"API worker {os.getpid()} DB warmup failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await warmup_worker()
+    lag_probe = asyncio.create_task(monitor_event_loop_lag())
+    try:
+        yield
+    finally:
+        lag_probe.cancel()
+        await ChangeHub.close()
+        DBExecutor.shutdown(wait=False)
+
+
+app = FastAPI(
+    title="Montrixa Mini App API",
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -19,17 +61,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-
-
-class NoCacheStaticFiles(StaticFiles):
-    """Static files with no-store headers to avoid stale Telegram WebView cache."""
-
-    async def get_response(self, path: str, scope):
-        response = await super().get_response(path, scope)
-        response.headers["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
-        response.headers["Pragma"] = "no-cache"
-        response.headers["Expires"] = "0"
-        return response
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(ReadRoutingMiddleware)
 
 
 app.include_router(health.router)
@@ -37,8 +70,11 @@ app.include_router(categories.router)
 app.include_router(balance.router)
 app.include_router(analytics.router)
 app.include_router(transactions.router)
+app.include_router(sync.router)
+app.include_router(live.router)
+app.include_router(admin.router)
+app.include_router(metrics.router)
 
-# Serve Mini App static files (optional, for same-origin hosting)
-_miniapp_dir = Path(__file__).resolve().parents[1] / "miniapp"
-if _miniapp_dir.exists():
-    app.mount("/", NoCacheStaticFiles(directory=str(_miniapp_dir), html=True), name="miniapp")
+# Serve Mini App static files (optional, for same-origin hosting); see api.assets
+if MINIAPP_DIR.exists():
+    app.mount("/", MiniAppStaticFiles(MINIAPP_DIR), name="miniapp")
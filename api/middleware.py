@@ -0,0 +1,62 @@
+"""ASGI middleware for the Mini App API."""
+
+from __future__ import annotations
+
+import time
+
+from config.read_routing import ReadRouter
+from utils.metrics import Metrics
+
+
+class MetricsMiddleware:
+    """Record request latency per route template into Metrics.http_request_duration."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            if route is not None and hasattr(route, "path"):
+                label = route.path
+            elif scope.get("path", "").startswith("/api"):
+                label = "unmatched"
+            else:
+                label = "static"
+            Metrics.http_request_duration.observe(
+                time.perf_counter() - started,
+                method=scope.get("method", ""),
+                route=label,
+                status=str(status["code"]),
+            )
+
+
+class ReadRoutingMiddleware:
+    """Open a read-routing scope per request so reads after a write use the primary.
+
+    get_current_user binds the Telegram user to the scope; see config.read_routing.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with ReadRouter.request_scope():
+            await self.app(scope, receive, send)
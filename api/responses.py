@@ -0,0 +1,63 @@
+"""Fast JSON responses for the Mini App API.
+
+Routes return ORJSONResponse objects themselves, so FastAPI skips
+jsonable_encoder (a recursive walk over every value in Python) and the body is
+encoded by orjson in one C call. orjson writes date and datetime values as ISO
+8601 strings, the same text jsonable_encoder produced.
+
+List payloads are built with records(): one attrgetter/itemgetter call per
+row picks the fields in C, with no to_dict() or per-field Python code.
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from operator import attrgetter, itemgetter
+from typing import Any, Dict, Iterable, List, Sequence
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _default(value: Any) -> Any:
+    """Encode types orjson does not know, the way jsonable_encoder did."""
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content to JSON bytes."""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson (Decimal supported)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def records(items: Iterable[Any], fields: Sequence[str], keys: Sequence[str] = ()) -> List[Dict[str, Any]]:
+    """Pick fields from models (attributes) or dict rows (keys) for encoding.
+
+    Args:
+        items: Slot models, or dict rows as returned by DatabaseConnection
+        fields: Attribute or column names, in output order
+        keys: Output names when they differ from fields (same order)
+
+    Returns:
+        One dict per item, ready for ORJSONResponse
+    """
+    items = list(items)
+    if not items:
+        return []
+    if len(fields) == 1:
+        # attrgetter/itemgetter with one name return the value, not a 1-tuple
+        (field,) = fields
+        key = keys[0] if keys else field
+        get = itemgetter(field) if isinstance(items[0], dict) else attrgetter(field)
+        return [{key: get(item)} for item in items]
+    get = itemgetter(*fields) if isinstance(items[0], dict) else attrgetter(*fields)
+    names = tuple(keys or fields)
+    return [dict(zip(names, get(item))) for item in items]
@@ -0,0 +1,37 @@
+"""Admin diagnostics router."""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from api.auth import get_admin_user
+from api.helpers import db_session, trace_request
+from config.query_stats import QueryStats
+from utils.tracing import Tracer
+
+router = APIRouter(prefix="/api/admin", tags=["admin"], dependencies=[Depends(trace_request), Depends(db_session)])
+
+
+@router.get("/db-stats")
+async def get_db_stats(
+    limit: Optional[int] = Query(default=50, ge=1, le=500),
+    user=Depends(get_admin_user),
+):
+    return QueryStats.snapshot(limit=limit)
+
+
+@router.post("/db-stats/reset")
+async def reset_db_stats(user=Depends(get_admin_user)):
+    QueryStats.reset()
+    return {"reset": True}
+
+
+@router.get("/traces")
+async def get_traces(user=Depends(get_admin_user)):
+    return Tracer.summary()
+
+
+@router.post("/traces/reset")
+async def reset_traces(user=Depends(get_admin_user)):
+    Tracer.reset()
+    return {"reset": True}
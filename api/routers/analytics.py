@@ -5,33 +5,50 @@ from typing import Optional
 from fastapi import APIRouter, Depends, Query
 
 from api.auth import get_current_user
-from api.helpers import default_date_range, parse_date
-from services.report_service import ReportService
+from api.helpers import db_session, run_db, default_date_range, parse_date, trace_request
+from api.responses import ORJSONResponse, records
+from models.transaction_frame import TransactionFrame
+from services.report_service import DEFAULT_TREND_POINTS, ReportService
 
-router = APIRouter(prefix="/api", tags=["analytics"])
+router = APIRouter(prefix="/api", tags=["analytics"], dependencies=[Depends(trace_request), Depends(db_session)])
+
+
+def _analytics(user_id: int, start_date, end_date, trans_type: str, granularity: str, points: int,
+               compare: bool = False):
+    """Summary, one category breakdown, the trend and optionally the comparison
+    with the previous period, all from a single frame load."""
+    comparison = None
+    if compare:
+        frame, previous = ReportService.load_comparison(user_id, start_date, end_date)
+        comparison = ReportService.compare_frames(frame, previous)
+    else:
+        frame = TransactionFrame.load(user_id, start_date, end_date)
+    category_report = f"{trans_type}_by_category"
+    reports = ReportService.reports_from_frame(frame, ("summary", category_report))
+    trend = ReportService.trend(frame, granularity, points, metric=trans_type)
+    return reports["summary"], reports[category_report], trend, comparison
 
 
 @router.get("/analytics")
-def get_analytics(
+async def get_analytics(
     start: Optional[str] = Query(default=None, description="Start date YYYY-MM-DD"),
     end: Optional[str] = Query(default=None, description="End date YYYY-MM-DD"),
     type: str = Query(default="expense", pattern="^(income|expense)$"),
+    granularity: str = Query(default="auto", pattern="^(auto|day|week|month)$"),
+    points: int = Query(default=DEFAULT_TREND_POINTS, ge=10, le=1000, description="Maximum trend points"),
+    compare: Optional[str] = Query(default=None, pattern="^previous$", description="Compare with the previous period"),
     user=Depends(get_current_user),
 ):
     start_date = parse_date(start)
     end_date = parse_date(end)
     if start_date is None or end_date is None:
         start_date, end_date = default_date_range()
-    summary = ReportService.get_summary(user.id, start_date, end_date)
-    by_category = (
-        ReportService.get_income_by_category(user.id, start_date, end_date)
-        if type == "income"
-        else ReportService.get_expense_by_category(user.id, start_date, end_date)
+    summary, by_category, trend, comparison = await run_db(
+        _analytics, user.id, start_date, end_date, type, granularity, points, compare is not None
     )
-    by_day = ReportService.get_daily_trend(user.id, start_date, end_date)
-    return {
-        "start_date": start_date.isoformat(),
-        "end_date": end_date.isoformat(),
+    body = {
+        "start_date": start_date,
+        "end_date": end_date,
         "type": type,
         "summary": {
             "total_income": summary["total_income"],
@@ -48,12 +65,29 @@ def get_analytics(
             }
             for r in by_category
         ],
-        "by_day": [
-            {
-                "date": (d["date"].isoformat() if hasattr(d["date"], "isoformat") else str(d["date"])),
-                "income": d["income"],
-                "expense": d["expense"],
-            }
-            for d in by_day
-        ],
+        # One point per granularity bucket (zero-filled), at most `points` of them
+        "granularity": trend["granularity"],
+        "downsampled": trend["downsampled"],
+        "by_day": records(trend["points"], ("date", "income", "expense")),
     }
+    if comparison is not None:
+        previous = comparison["previous"]
+        body["comparison"] = {
+            "previous_start_date": previous["start_date"],
+            "previous_end_date": previous["end_date"],
+            "totals": comparison["totals"],
+            "by_category": [
+                {
+                    "category_name": r["category_name"],
+                    "category_icon": r["category_icon"],
+                    "current": r["current"],
+                    "previous": r["previous"],
+                    "delta": r["delta"],
+                    "change_pct": r["change_pct"],
+                }
+                for r in comparison[f"{type}_by_category"]
+            ],
+            # Day N of this period next to day N of the previous one
+            "daily": comparison["daily"],
+        }
+    return ORJSONResponse(body)
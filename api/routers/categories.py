@@ -3,24 +3,25 @@
 from fastapi import APIRouter, Depends, Query
 
 from api.auth import get_current_user
+from api.helpers import db_session, run_db, trace_request
+from api.responses import ORJSONResponse, records
 from services.category_service import CategoryService
 
-router = APIRouter(prefix="/api", tags=["categories"])
+router = APIRouter(prefix="/api", tags=["categories"], dependencies=[Depends(trace_request), Depends(db_session)])
 
 
 @router.get("/categories")
-def get_categories(
+async def get_categories(
     type: str = Query(default="expense", pattern="^(income|expense)$"),
     user=Depends(get_current_user),
 ):
-    categories = (
-        CategoryService.get_income_categories(user.id)
+    categories = await run_db(
+        CategoryService.get_income_categories
         if type == "income"
-        else CategoryService.get_expense_categories(user.id)
+        else CategoryService.get_expense_categories,
+        user.id,
     )
-    return {
+    return ORJSONResponse({
         "type": type,
-        "categories": [
-            {"id": c.id, "name": c.name, "icon": c.icon, "type": c.type} for c in categories
-        ],
-    }
+        "categories": records(categories, ("id", "name", "icon", "type")),
+    })
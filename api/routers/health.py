@@ -1,10 +1,104 @@
 """Health check router."""
 
+import time
+
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from config.database import DatabaseConnection
+from config.db_executor import DBExecutor
+from config.read_routing import ReadRouter
+from config.settings import Settings
+from models.job_heartbeat import JobHeartbeat, SCHEDULER_JOB_ID
 
 router = APIRouter(prefix="/api", tags=["health"])
 
+MONITORED_JOBS = ('recurring_transactions', 'budget_alerts')
+
 
 @router.get("/health")
-def health():
+async def health():
     return {"ok": True}
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+def _job_status(heartbeat):
+    if heartbeat is None:
+        return {"last_success_at": None, "last_failure_at": None,
+                "last_error": None, "success_age_seconds": None}
+    return {
+        "last_success_at": _iso(heartbeat.last_success_at),
+        "last_failure_at": _iso(heartbeat.last_failure_at),
+        "last_error": heartbeat.last_error,
+        "success_age_seconds": heartbeat.success_age_seconds,
+    }
+
+
+def _probe_database():
+    """Time a primary round trip and read job heartbeats (runs on the DB executor)."""
+    database = {"ok": False, "latency_ms": None, "threshold_ms": Settings.HEALTH_DB_LATENCY_MS}
+    heartbeats = {}
+    try:
+        started = time.perf_counter()
+        with ReadRouter.use_primary():
+            DatabaseConnection.execute_query("SELECT 1", fetch_one=True, commit=False)
+        latency_ms = (time.perf_counter() - started) * 1000
+        database["latency_ms"] = round(latency_ms, 2)
+        database["ok"] = latency_ms <= Settings.HEALTH_DB_LATENCY_MS
+    except Exception as e:
+        database["error"] = type(e).__name__
+
+    if database["latency_ms"] is not None:
+        try:
+            heartbeats = JobHeartbeat.get_all()
+        except Exception:
+            # Heartbeat table missing (old schema) must not fail readiness
+            heartbeats = {}
+    return database, heartbeats
+
+
+@router.get("/health/ready")
+async def ready():
+    """Readiness probe for load balancers.
+
+    Returns 503 when the DB round trip exceeds HEALTH_DB_LATENCY_MS, the DB is
+    unreachable, or more than HEALTH_POOL_MAX_IN_USE connections are checked
+    out. Scheduler and job status come from heartbeats written by the bot
+    process and are informational only, so a stopped bot does not take the
+    API out of rotation.
+    """
+    # Snapshot before the probe query checks out a connection of its own
+    pool = DatabaseConnection.pool_stats()
+    pool_ok = pool['in_use'] < Settings.HEALTH_POOL_MAX_IN_USE
+
+    database, heartbeats = await DBExecutor.run(_probe_database)
+
+    scheduler = heartbeats.get(SCHEDULER_JOB_ID)
+    scheduler_age = scheduler.success_age_seconds if scheduler else None
+    ok = database["ok"] and pool_ok
+
+    body = {
+        "ok": ok,
+        "database": database,
+        "pool": {
+            "ok": pool_ok,
+            "in_use": pool['in_use'],
+            "idle": pool['idle'],
+            "max_in_use": Settings.HEALTH_POOL_MAX_IN_USE,
+        },
+        "scheduler": {
+            "alive": scheduler_age is not None
+                     and scheduler_age <= Settings.HEALTH_SCHEDULER_STALE_SECONDS,
+            "last_heartbeat_at": _iso(scheduler.last_success_at) if scheduler else None,
+            "heartbeat_age_seconds": scheduler_age,
+        },
+        "jobs": {job_id: _job_status(heartbeats.get(job_id)) for job_id in MONITORED_JOBS},
+    }
+    if DatabaseConnection.replica_backend() is not None:
+        # Informational: reads fall back to the primary while the replica lags
+        body["replica"] = {**ReadRouter.status(), "idle": pool['replica_idle'],
+                           "reads": pool['replica_reads']}
+    return JSONResponse(body, status_code=200 if ok else 503)
@@ -0,0 +1,20 @@
+"""Live updates router: per-user change events over Server-Sent Events."""
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from api.auth import get_current_user
+from api.live import event_stream
+
+# No db_session/trace_request: a stream must not hold a pooled connection or
+# a trace span open for its whole lifetime
+router = APIRouter(prefix="/api", tags=["live"])
+
+
+@router.get("/live")
+async def live_updates(user=Depends(get_current_user)):
+    return StreamingResponse(
+        event_stream(user.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,36 @@
+"""Prometheus metrics router."""
+
+import hmac
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+
+from config.settings import Settings
+from utils.metrics import CONTENT_TYPE, Metrics
+
+router = APIRouter(tags=["metrics"])
+
+LOOPBACK_HOSTS = {"127.0.0.1", "::1", "localhost"}
+
+
+def metrics_allowed(request: Request) -> bool:
+    """Whether a request may read /metrics.
+
+    With METRICS_TOKEN set, a matching "Authorization: Bearer" header is
+    required. Without it only direct loopback clients are answered; requests
+    relayed by a reverse proxy on the same host carry forwarding headers and
+    are refused.
+    """
+    if Settings.METRICS_TOKEN:
+        expected = f"Bearer {Settings.METRICS_TOKEN}"
+        return hmac.compare_digest(request.headers.get("authorization", ""), expected)
+    if "x-forwarded-for" in request.headers or "x-real-ip" in request.headers:
+        return False
+    return request.client is not None and request.client.host in LOOPBACK_HOSTS
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(request: Request):
+    if not metrics_allowed(request):
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return PlainTextResponse(Metrics.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,23 @@
+"""Delta sync router for the Mini App's local transaction cache."""
+
+from fastapi import APIRouter, Depends, Query
+
+from api.auth import get_current_user
+from api.helpers import db_session, run_db, trace_request
+from api.responses import ORJSONResponse, records
+from models.transaction import Transaction
+from services.sync_service import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, SyncService
+
+router = APIRouter(prefix="/api", tags=["sync"], dependencies=[Depends(trace_request), Depends(db_session)])
+
+
+@router.get("/sync")
+async def get_sync(
+    since: int = Query(default=0, ge=0, description="Version of the client's cache (0 = empty)"),
+    after: int = Query(default=0, ge=0, description="Snapshot paging cursor"),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    user=Depends(get_current_user),
+):
+    result = await run_db(SyncService.get_changes, user.id, since, after, limit)
+    result["transactions"] = records(result["transactions"], Transaction.FIELDS)
+    return ORJSONResponse(result)
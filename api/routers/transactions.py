@@ -5,13 +5,14 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 
 from api.auth import get_current_user
-from api.helpers import default_date_range, parse_date
+from api.helpers import db_session, run_db, default_date_range, encode_cursor, parse_cursor, parse_date, trace_request
+from api.responses import ORJSONResponse, records
 from api.schemas import TransactionCreateRequest, TransactionUpdateRequest
 from models.transaction import Transaction
 from services.transaction_service import TransactionService
 from utils.validators import Validator
 
-router = APIRouter(prefix="/api", tags=["transactions"])
+router = APIRouter(prefix="/api", tags=["transactions"], dependencies=[Depends(trace_request), Depends(db_session)])
 
 
 def _get_owned_transaction(transaction_id: int, user_id: int):
@@ -24,43 +25,61 @@ def _get_owned_transaction(transaction_id: int, user_id: int):
     return transaction
 
 
+def _list_transactions(user_id: int, limit: int, offset: int, start_date, end_date):
+    transactions = TransactionService.get_user_transactions(
+        user_id, limit=limit, offset=offset, start_date=start_date, end_date=end_date
+    )
+    total = Transaction.get_count(user_id, start_date=start_date, end_date=end_date)
+    return transactions, total
+
+
 @router.get("/transactions")
-def get_transactions(
+async def get_transactions(
     start: Optional[str] = Query(default=None, description="Start date YYYY-MM-DD"),
     end: Optional[str] = Query(default=None, description="End date YYYY-MM-DD"),
     limit: int = Query(default=10, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor: Optional[str] = Query(default=None, description="next_cursor of the previous page"),
     user=Depends(get_current_user),
 ):
     start_date = parse_date(start)
     end_date = parse_date(end)
     if start_date is None or end_date is None:
         start_date, end_date = default_date_range()
-    transactions = TransactionService.get_user_transactions(
-        user.id, limit=limit, offset=offset, start_date=start_date, end_date=end_date
-    )
-    total = Transaction.get_count(user.id, start_date=start_date, end_date=end_date)
-    return {
-        "transactions": [t.to_dict() for t in transactions],
+    if cursor:
+        # Keyset continuation: no OFFSET scan and no repeated COUNT
+        after = parse_cursor(cursor)
+        if after is None:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        transactions = await run_db(
+            TransactionService.get_user_transactions_before, user.id, after,
+            limit=limit, start_date=start_date, end_date=end_date,
+        )
+        total = None
+    else:
+        transactions, total = await run_db(_list_transactions, user.id, limit, offset, start_date, end_date)
+    return ORJSONResponse({
+        "transactions": records(transactions, Transaction.FIELDS),
         "total": total,
-        "start_date": start_date.isoformat(),
-        "end_date": end_date.isoformat(),
-    }
+        "start_date": start_date,
+        "end_date": end_date,
+        "next_cursor": encode_cursor(transactions[-1]) if len(transactions) == limit else None,
+    })
 
 
 @router.get("/transactions/meta")
-def get_transactions_meta(user=Depends(get_current_user)):
-    bounds = Transaction.get_date_bounds(user.id)
+async def get_transactions_meta(user=Depends(get_current_user)):
+    bounds = await run_db(Transaction.get_date_bounds, user.id)
     oldest = bounds.get("oldest_date")
     newest = bounds.get("newest_date")
-    return {
+    return ORJSONResponse({
         "oldest_date": oldest.isoformat() if hasattr(oldest, "isoformat") and oldest else None,
         "newest_date": newest.isoformat() if hasattr(newest, "isoformat") and newest else None,
-    }
+    })
 
 
 @router.post("/transaction")
-def create_transaction(payload: TransactionCreateRequest, user=Depends(get_current_user)):
+async def create_transaction(payload: TransactionCreateRequest, user=Depends(get_current_user)):
     is_valid, amount, err = Validator.validate_amount(payload.amount)
     if not is_valid or amount is None:
         raise HTTPException(status_code=400, detail=err or "Invalid amount")
@@ -72,7 +91,8 @@ def create_transaction(payload: TransactionCreateRequest, user=Depends(get_curre
             raise HTTPException(status_code=400, detail=err_desc or "Invalid description")
         desc = desc2
 
-    transaction = TransactionService.create_transaction(
+    transaction = await run_db(
+        TransactionService.create_transaction,
         user_id=user.id,
         category_id=payload.category_id,
         amount=amount,
@@ -82,20 +102,32 @@ def create_transaction(payload: TransactionCreateRequest, user=Depends(get_curre
     if not transaction:
         raise HTTPException(status_code=400, detail="Failed to create transaction")
 
-    return {"transaction": transaction.to_dict()}
+    return ORJSONResponse({"transaction": transaction.to_dict()})
+
+
+def _update_owned_transaction(transaction_id: int, user_id: int, updates: dict):
+    """Apply validated updates; return the updated transaction (unchanged if no updates)."""
+    transaction = _get_owned_transaction(transaction_id, user_id)
+    if not updates:
+        return transaction
+    ok = TransactionService.update_transaction(transaction_id, **updates)
+    if not ok:
+        raise HTTPException(status_code=400, detail="Gagal memperbarui transaksi")
+    return Transaction.get_by_id(transaction_id)
+
+
+def _delete_owned_transaction(transaction_id: int, user_id: int) -> bool:
+    _get_owned_transaction(transaction_id, user_id)
+    return TransactionService.delete_transaction(transaction_id)
 
 
 @router.patch("/transaction/{transaction_id}")
-def update_transaction(
+async def update_transaction(
     transaction_id: int,
     payload: TransactionUpdateRequest,
     user=Depends(get_current_user),
 ):
-    transaction = _get_owned_transaction(transaction_id, user.id)
     updates = payload.model_dump(exclude_unset=True)
-    if not updates:
-        return {"transaction": transaction.to_dict()}
-
     if "amount" in updates and updates["amount"] is not None:
         is_valid, amount_val, err = Validator.validate_amount(updates["amount"])
         if not is_valid or amount_val is None:
@@ -110,17 +142,13 @@ def update_transaction(
             desc = desc2
         updates["description"] = desc
 
-    ok = TransactionService.update_transaction(transaction_id, **updates)
-    if not ok:
-        raise HTTPException(status_code=400, detail="Gagal memperbarui transaksi")
-    updated = Transaction.get_by_id(transaction_id)
-    return {"transaction": updated.to_dict()}
+    updated = await run_db(_update_owned_transaction, transaction_id, user.id, updates)
+    return ORJSONResponse({"transaction": updated.to_dict()})
 
 
 @router.delete("/transaction/{transaction_id}")
-def delete_transaction(transaction_id: int, user=Depends(get_current_user)):
-    _get_owned_transaction(transaction_id, user.id)
-    ok = TransactionService.delete_transaction(transaction_id)
+async def delete_transaction(transaction_id: int, user=Depends(get_current_user)):
+    ok = await run_db(_delete_owned_transaction, transaction_id, user.id)
     if not ok:
         raise HTTPException(status_code=400, detail="Gagal menghapus transaksi")
-    return {"deleted": True}
+    return ORJSONResponse({"deleted": True})
@@ -0,0 +1,187 @@
+"""Multi-process production server for the Mini App API.
+
+The supervisor binds the listening socket once (with the configured backlog)
+and runs N uvicorn workers on it, each a freshly spawned process with its own
+DatabaseConnection pool. Workers that exit are replaced.
+
+Signals:
+    SIGTERM / SIGINT: graceful shutdown; workers stop accepting, finish
+        in-flight requests for up to API_GRACEFUL_TIMEOUT_SECONDS, then exit
+    SIGHUP: graceful reload; workers are replaced one at a time, each new
+        worker serving before its predecessor is stopped, so new code and
+        .env changes go live without refusing connections
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import uvicorn
+
+logger = logging.getLogger(__name__)
+
+# Workers are spawned, not forked: nothing (pools, locks, event loops) is inherited
+_spawn = multiprocessing.get_context('spawn')
+
+READY_TIMEOUT_SECONDS = 30
+_TICK_SECONDS = 0.5
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+def configure_logging(level: str) -> None:
+    """Log app messages to stdout (uvicorn configures its own loggers)."""
+    logging.basicConfig(format=LOG_FORMAT, level=getattr(logging, level.upper(), logging.INFO))
+
+
+def _serve(config_kwargs: Dict[str, Any], sockets: list, ready) -> None:
+    """Worker process entry point: run uvicorn on the inherited socket."""
+    configure_logging(config_kwargs['log_level'])
+    config = uvicorn.Config(**config_kwargs)
+    server = uvicorn.Server(config)
+
+    def report_ready():
+        while not server.started and not server.should_exit:
+            time.sleep(0.05)
+        if server.started:
+            ready.set()
+
+    threading.Thread(target=report_ready, daemon=True).start()
+    server.run(sockets=sockets)
+
+
+class _Worker:
+    """One worker process and its readiness flag."""
+
+    def __init__(self, process, ready):
+        self.process = process
+        self.ready = ready
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid
+
+
+class WorkerSupervisor:
+    """Run and supervise uvicorn worker processes sharing one socket."""
+
+    def __init__(self, app: str, host: str, port: int, workers: int = 1,
+                 backlog: int = 2048, keep_alive: int = 5, graceful_timeout: int = 30,
+                 max_requests: int = 0, log_level: str = 'info',
+                 on_reload: Optional[Callable[[], Any]] = None):
+        """Initialize the supervisor.
+
+        Args:
+            app: Import string of the ASGI app ("api.main:app")
+            host: Interface to bind
+            port: Port to bind
+            workers: Number of worker processes
+            backlog: Listen backlog of the shared socket
+            keep_alive: Seconds an idle keep-alive connection is held open
+            graceful_timeout: Seconds a stopping worker may spend on in-flight requests
+            max_requests: Recycle a worker after this many requests (0 = never)
+            log_level: uvicorn log level
+            on_reload: Called before workers are replaced on SIGHUP
+        """
+        self.workers = max(1, workers)
+        self.graceful_timeout = graceful_timeout
+        self.config_kwargs: Dict[str, Any] = {
+            'app': app,
+            'host': host,
+            'port': port,
+            'backlog': backlog,
+            'timeout_keep_alive': keep_alive,
+            'timeout_graceful_shutdown': graceful_timeout,
+            'limit_max_requests': max_requests or None,
+            'log_level': log_level,
+        }
+        self.on_reload = on_reload
+        self._workers: List[_Worker] = []
+        self._sockets: list = []
+        self._stopping = threading.Event()
+        self._reload_requested = threading.Event()
+
+    def _spawn_worker(self) -> _Worker:
+        ready = _spawn.Event()
+        process = _spawn.Process(
+            target=_serve, args=(self.config_kwargs, self._sockets, ready), name='montrixa-api-worker'
+        )
+        process.start()
+        logger.info(f"Started API worker {process.pid}")
+        return _Worker(process, ready)
+
+    def _stop_worker(self, worker: _Worker) -> None:
+        if worker.process.is_alive():
+            worker.process.terminate()
+        worker.process.join(self.graceful_timeout + 5)
+        if worker.process.is_alive():
+            logger.warning(f"API worker {worker.pid} did not stop in time; killing it")
+            worker.process.kill()
+            worker.process.join()
+
+    def _replace_dead_workers(self) -> None:
+        for index, worker in enumerate(self._workers):
+            if not worker.process.is_alive() and not self._stopping.is_set():
+                logger.warning(f"API worker {worker.pid} exited ({worker.process.exitcode}); replacing it")
+                self._workers[index] = self._spawn_worker()
+
+    def reload(self) -> None:
+        """Replace every worker, one at a time, waiting for each replacement to serve."""
+        logger.info("Reloading API workers")
+        if self.on_reload is not None:
+            self.on_reload()
+        for index, old in enumerate(list(self._workers)):
+            if self._stopping.is_set():
+                return
+            new = self._spawn_worker()
+            if not new.ready.wait(READY_TIMEOUT_SECONDS):
+                logger.error(f"API worker {new.pid} did not become ready; keeping {old.pid}")
+                self._stop_worker(new)
+                continue
+            self._workers[index] = new
+            self._stop_worker(old)
+        logger.info("API workers reloaded")
+
+    def shutdown(self) -> None:
+        """Stop all workers gracefully (they finish in-flight requests)."""
+        self._stopping.set()
+        for worker in self._workers:
+            if worker.process.is_alive():
+                worker.process.terminate()
+        for worker in self._workers:
+            self._stop_worker(worker)
+        self._workers = []
+
+    def _install_signal_handlers(self) -> None:
+        signal.signal(signal.SIGTERM, lambda *_: self._stopping.set())
+        signal.signal(signal.SIGINT, lambda *_: self._stopping.set())
+        if hasattr(signal, 'SIGHUP'):
+            signal.signal(signal.SIGHUP, lambda *_: self._reload_requested.set())
+
+    def run(self) -> None:
+        """Bind, start the workers and supervise them until SIGTERM/SIGINT."""
+        config = uvicorn.Config(**self.config_kwargs)
+        self._sockets = [config.bind_socket()]
+        self._install_signal_handlers()
+        logger.info(
+            f"Montrixa API supervisor {os.getpid()} listening on "
+            f"{self.config_kwargs['host']}:{self.config_kwargs['port']} with {self.workers} workers"
+        )
+        try:
+            self._workers = [self._spawn_worker() for _ in range(self.workers)]
+            while not self._stopping.wait(_TICK_SECONDS):
+                if self._reload_requested.is_set():
+                    self._reload_requested.clear()
+                    self.reload()
+                self._replace_dead_workers()
+        finally:
+            self.shutdown()
+            for sock in self._sockets:
+                sock.close()
+            logger.info("Montrixa API supervisor stopped")
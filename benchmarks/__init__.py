@@ -0,0 +1 @@
+"""Benchmark harness: synthetic data generator and timing runner."""
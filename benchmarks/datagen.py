@@ -0,0 +1,230 @@
+"""Synthetic data generator for benchmarks.
+
+Benchmark users get Telegram IDs starting at BENCHMARK_TELEGRAM_ID_BASE so they
+can be told apart from (and cleaned up without touching) real users. Always
+seed a scratch database, never production.
+"""
+
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Tuple
+
+from config.database import DatabaseConnection
+from config.settings import Settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_TELEGRAM_ID_BASE = 900_000_000_000
+
+# Typical IDR amount ranges per default category name
+EXPENSE_AMOUNTS = {
+    'Makanan': (15_000, 150_000),
+    'Transport': (10_000, 100_000),
+    'Belanja': (50_000, 1_500_000),
+    'Tagihan': (100_000, 2_000_000),
+    'Hiburan': (25_000, 500_000),
+    'Kesehatan': (30_000, 1_000_000),
+    'Langganan': (50_000, 300_000),
+    'Lainnya': (5_000, 250_000),
+}
+INCOME_AMOUNTS = {
+    'Gaji': (5_000_000, 25_000_000),
+    'Bonus': (500_000, 10_000_000),
+    'Investasi': (100_000, 5_000_000),
+    'Lainnya': (50_000, 2_000_000),
+}
+DESCRIPTIONS = ['makan siang', 'kopi', 'grab', 'bensin', 'listrik', 'pulsa', 'netflix',
+                'belanja bulanan', 'obat', 'parkir', 'nonton', 'servis motor']
+
+BATCH_SIZE = 5000
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Size and shape of a synthetic dataset."""
+
+    users: int = 10
+    years: int = 2
+    seed: int = 42
+    expenses_per_day: float = 3.0
+    budgets_per_user: int = 3
+    recurring_per_user: int = 2
+
+
+def _amount(rng: random.Random, bounds: Tuple[int, int]) -> float:
+    low, high = bounds
+    # Skewed towards the low end like real spending; rounded to Rp 500
+    value = low + (high - low) * rng.random() ** 2
+    return float(int(value / 500) * 500 or 500)
+
+
+def iter_transactions(rng: random.Random, user_id: int, categories: Dict[str, Dict[str, int]],
+                      start: date, end: date, expenses_per_day: float) -> Iterator[tuple]:
+    """Yield transaction rows for one user between two dates.
+
+    Args:
+        rng: Seeded random generator
+        user_id: User ID
+        categories: {'income': {name: id}, 'expense': {name: id}}
+        start: First date (inclusive)
+        end: Last date (inclusive)
+        expenses_per_day: Mean number of expenses per day
+
+    Yields:
+        (user_id, category_id, amount, description, transaction_date, type)
+    """
+    expense_names = list(categories['expense'])
+    income = categories['income']
+    day = start
+    while day <= end:
+        if day.day == 25 and 'Gaji' in income:
+            yield (user_id, income['Gaji'], _amount(rng, INCOME_AMOUNTS['Gaji']),
+                   'gaji bulanan', day, 'income')
+        if rng.random() < 0.03:
+            name = rng.choice([n for n in income if n != 'Gaji'] or list(income))
+            yield (user_id, income[name], _amount(rng, INCOME_AMOUNTS.get(name, (50_000, 1_000_000))),
+                   '-', day, 'income')
+
+        # Poisson-like count around the configured mean
+        count = sum(1 for _ in range(int(expenses_per_day * 2)) if rng.random() < 0.5)
+        for _ in range(count):
+            name = rng.choice(expense_names)
+            yield (user_id, categories['expense'][name],
+                   _amount(rng, EXPENSE_AMOUNTS.get(name, (5_000, 250_000))),
+                   rng.choice(DESCRIPTIONS), day, 'expense')
+        day += timedelta(days=1)
+
+
+def _insert_batches(query: str, rows: Iterator[tuple]) -> int:
+    total = 0
+    batch: List[tuple] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            DatabaseConnection.execute_many(query, batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        DatabaseConnection.execute_many(query, batch)
+        total += len(batch)
+    return total
+
+
+def clear_benchmark_data() -> int:
+    """Delete all benchmark users (rows in other tables cascade).
+
+    Returns:
+        Number of deleted users
+    """
+    query = "SELECT id FROM users WHERE telegram_id >= %s"
+    user_ids = [r['id'] for r in DatabaseConnection.execute_query(
+        query, (BENCHMARK_TELEGRAM_ID_BASE,), commit=False)]
+    if not user_ids:
+        return 0
+
+    placeholders = ', '.join(['%s'] * len(user_ids))
+    # transactions/recurring reference categories with ON DELETE RESTRICT, so
+    # remove them before the user cascade reaches categories
+    for table in ('transactions', 'recurring_transactions'):
+        DatabaseConnection.execute_query(
+            f"DELETE FROM {table} WHERE user_id IN ({placeholders})", tuple(user_ids))
+    DatabaseConnection.execute_query(
+        f"DELETE FROM users WHERE id IN ({placeholders})", tuple(user_ids))
+    logger.info(f"Removed {len(user_ids)} benchmark users")
+    return len(user_ids)
+
+
+def get_benchmark_user_ids() -> List[int]:
+    """Return IDs of seeded benchmark users in creation order."""
+    rows = DatabaseConnection.execute_query(
+        "SELECT id FROM users WHERE telegram_id >= %s ORDER BY telegram_id",
+        (BENCHMARK_TELEGRAM_ID_BASE,), commit=False,
+    )
+    return [r['id'] for r in rows]
+
+
+def seed_database(spec: DatasetSpec, today: date = None) -> Dict[str, int]:
+    """Replace benchmark data with a freshly generated dataset.
+
+    Args:
+        spec: Dataset size and shape
+        today: Last transaction date (defaults to today)
+
+    Returns:
+        Row counts per table
+    """
+    today = today or date.today()
+    start = today - timedelta(days=365 * spec.years)
+    rng = random.Random(spec.seed)
+
+    clear_benchmark_data()
+
+    DatabaseConnection.execute_many(
+        "INSERT INTO users (telegram_id, username, first_name, language_code) VALUES (%s, %s, %s, 'id')",
+        [(BENCHMARK_TELEGRAM_ID_BASE + i, f'bench{i}', f'Bench {i}') for i in range(spec.users)],
+    )
+    user_ids = get_benchmark_user_ids()
+
+    default_categories = Settings.DEFAULT_INCOME_CATEGORIES + Settings.DEFAULT_EXPENSE_CATEGORIES
+    DatabaseConnection.execute_many(
+        "INSERT INTO categories (user_id, name, type, icon, is_default) VALUES (%s, %s, %s, %s, TRUE)",
+        [(uid, name, cat_type, '📦') for uid in user_ids for name, cat_type in default_categories],
+    )
+
+    placeholders = ', '.join(['%s'] * len(user_ids))
+    category_rows = DatabaseConnection.execute_query(
+        f"SELECT id, user_id, name, type FROM categories WHERE user_id IN ({placeholders})",
+        tuple(user_ids), commit=False,
+    )
+    categories: Dict[int, Dict[str, Dict[str, int]]] = {
+        uid: {'income': {}, 'expense': {}} for uid in user_ids
+    }
+    for row in category_rows:
+        categories[row['user_id']][row['type']][row['name']] = row['id']
+
+    transaction_count = _insert_batches(
+        """
+        INSERT INTO transactions (user_id, category_id, amount, description, transaction_date, type)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        """,
+        (row for uid in user_ids
+         for row in iter_transactions(rng, uid, categories[uid], start, today, spec.expenses_per_day)),
+    )
+
+    month_start = today.replace(day=1)
+    budgets = []
+    recurring = []
+    for uid in user_ids:
+        expense = categories[uid]['expense']
+        for name in rng.sample(sorted(expense), min(spec.budgets_per_user, len(expense))):
+            low, high = EXPENSE_AMOUNTS.get(name, (5_000, 250_000))
+            budgets.append((uid, expense[name], float(high * 20), 'monthly', month_start))
+        for i in range(spec.recurring_per_user):
+            name = 'Langganan' if i % 2 == 0 else 'Tagihan'
+            recurring.append((uid, expense[name], _amount(rng, EXPENSE_AMOUNTS[name]),
+                              f'{name.lower()} rutin', 'expense', 'monthly', start, today))
+
+    DatabaseConnection.execute_many(
+        "INSERT INTO budgets (user_id, category_id, amount, period, start_date) VALUES (%s, %s, %s, %s, %s)",
+        budgets,
+    )
+    DatabaseConnection.execute_many(
+        """
+        INSERT INTO recurring_transactions
+            (user_id, category_id, amount, description, type, frequency, start_date, next_run_date)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        """,
+        recurring,
+    )
+
+    counts = {
+        'users': len(user_ids),
+        'categories': len(category_rows),
+        'transactions': transaction_count,
+        'budgets': len(budgets),
+        'recurring_transactions': len(recurring),
+    }
+    logger.info(f"Seeded benchmark dataset: {counts}")
+    return counts
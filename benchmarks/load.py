@@ -0,0 +1,361 @@
+"""Simulated-load harness driving the bot Application end to end.
+
+Virtual users send Updates through the real Application from
+bot.build_application(): every handler, decorator and DB query runs as in
+production. Bot API calls go to RecordingRequest, which answers locally after
+a configurable latency and records every call.
+
+Each user repeats a script per round: /expense -> tap a category button from
+the bot's reply -> /report -> tap the 30-day period -> /balance.
+
+Usage:
+    python -m benchmarks.load --sqlite /tmp/load.db --users 200 --rounds 3
+    python -m benchmarks.load --users 500 --latency-ms 80 --concurrent-updates 64 --output load.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from telegram import Update
+from telegram.ext import Application, TypeHandler
+from telegram.request import BaseRequest, RequestData
+
+from config.backends import SQLiteBackend
+from config.database import DatabaseConnection
+from config.query_stats import summarize
+from benchmarks.datagen import BENCHMARK_TELEGRAM_ID_BASE, DatasetSpec, seed_database
+from utils.tracing import label_for_update
+
+logger = logging.getLogger(__name__)
+
+BOT_USER = {'id': 1, 'is_bot': True, 'first_name': 'Montrixa', 'username': 'MontrixaLoadBot'}
+LOAD_TOKEN = '1:LOADTEST'
+
+# Handler groups that bracket the real handlers (group 0)
+_FIRST_GROUP = -(2 ** 31)
+_LAST_GROUP = 2 ** 31
+
+
+class RecordingRequest(BaseRequest):
+    """Stand-in for the Bot API: records calls and answers after a delay.
+
+    Args:
+        latency_ms: Simulated round-trip time per call
+        jitter_ms: Uniform random jitter added to the latency
+    """
+
+    def __init__(self, latency_ms: float = 50.0, jitter_ms: float = 0.0, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self._rng = random.Random(seed)
+        self._message_id = 0
+        self.calls: List[Tuple[str, Optional[int], float]] = []
+        self.last_markup: Dict[int, Dict[str, Any]] = {}
+        self.last_message_id: Dict[int, int] = {}
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    def _message(self, chat_id: int, params: Dict[str, Any]) -> Dict[str, Any]:
+        message_id = params.get('message_id')
+        if message_id is None:
+            self._message_id += 1
+            message_id = self._message_id
+        self.last_message_id[chat_id] = message_id
+        if isinstance(params.get('reply_markup'), dict):
+            self.last_markup[chat_id] = params['reply_markup']
+        return {
+            'message_id': message_id,
+            'date': int(time.time()),
+            'chat': {'id': chat_id, 'type': 'private'},
+            'from': BOT_USER,
+            'text': params.get('text') or params.get('caption') or '',
+        }
+
+    def _result(self, method: str, params: Dict[str, Any]) -> Any:
+        if method == 'getMe':
+            return {**BOT_USER, 'can_join_groups': False, 'can_read_all_group_messages': False,
+                    'supports_inline_queries': False}
+        chat_id = params.get('chat_id')
+        if method.startswith(('send', 'edit')) and chat_id is not None:
+            return self._message(int(chat_id), params)
+        return True
+
+    async def do_request(self, url, method, request_data: Optional[RequestData] = None,
+                         read_timeout=None, write_timeout=None, connect_timeout=None,
+                         pool_timeout=None):
+        api_method = url.rsplit('/', 1)[-1]
+        params = dict(request_data.parameters) if request_data else {}
+        delay = self.latency_ms + self._rng.uniform(0, self.jitter_ms)
+        started = time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        chat_id = params.get('chat_id')
+        self.calls.append((api_method, chat_id, (time.perf_counter() - started) * 1000))
+        body = {'ok': True, 'result': self._result(api_method, params)}
+        return 200, json.dumps(body).encode('utf-8')
+
+    def callback_buttons(self, chat_id: int) -> List[str]:
+        """Return callback_data of the inline buttons last sent to a chat."""
+        markup = self.last_markup.get(chat_id) or {}
+        return [button['callback_data']
+                for row in markup.get('inline_keyboard', [])
+                for button in row if 'callback_data' in button]
+
+
+class _EventLoopProbe:
+    """Measures how long the event loop is blocked by synchronous work."""
+
+    def __init__(self, interval_ms: float = 5.0):
+        self.interval = interval_ms / 1000
+        self.lags_ms: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lags_ms.append(max(0.0, loop.time() - expected) * 1000)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+class LoadHarness:
+    """Feeds synthetic Updates into an Application and measures them."""
+
+    def __init__(self, application: Application, request: RecordingRequest):
+        self.application = application
+        self.request = request
+        self._update_id = 0
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._enqueued: Dict[int, float] = {}
+        self._started: Dict[int, float] = {}
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.service_times: Dict[str, List[float]] = defaultdict(list)
+
+        application.add_handler(TypeHandler(Update, self._on_start), group=_FIRST_GROUP)
+        application.add_handler(TypeHandler(Update, self._on_done), group=_LAST_GROUP)
+
+    async def _on_start(self, update: Update, context) -> None:
+        self._started[update.update_id] = time.perf_counter()
+
+    async def _on_done(self, update: Update, context) -> None:
+        now = time.perf_counter()
+        label = label_for_update(update, 'message')
+        self.latencies[label].append((now - self._enqueued.pop(update.update_id)) * 1000)
+        self.service_times[label].append((now - self._started.pop(update.update_id, now)) * 1000)
+        future = self._pending.pop(update.update_id, None)
+        if future and not future.done():
+            future.set_result(None)
+
+    async def send(self, data: Dict[str, Any]) -> None:
+        """Enqueue one update and wait until every handler group processed it."""
+        self._update_id += 1
+        update_id = self._update_id
+        update = Update.de_json({'update_id': update_id, **data}, self.application.bot)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[update_id] = future
+        self._enqueued[update_id] = time.perf_counter()
+        await self.application.update_queue.put(update)
+        await future
+
+    @staticmethod
+    def _user(index: int) -> Dict[str, Any]:
+        return {'id': BENCHMARK_TELEGRAM_ID_BASE + index, 'is_bot': False,
+                'first_name': f'Bench {index}', 'username': f'bench{index}', 'language_code': 'id'}
+
+    async def command(self, index: int, text: str) -> None:
+        user = self._user(index)
+        command = text.split()[0]
+        await self.send({'message': {
+            'message_id': self._update_id + 1,
+            'date': int(time.time()),
+            'chat': {'id': user['id'], 'type': 'private'},
+            'from': user,
+            'text': text,
+            'entities': [{'type': 'bot_command', 'offset': 0, 'length': len(command)}],
+        }})
+
+    async def tap(self, index: int, data: str) -> None:
+        user = self._user(index)
+        chat_id = user['id']
+        await self.send({'callback_query': {
+            'id': str(self._update_id + 1),
+            'from': user,
+            'chat_instance': str(chat_id),
+            'data': data,
+            'message': {
+                'message_id': self.request.last_message_id.get(chat_id, 1),
+                'date': int(time.time()),
+                'chat': {'id': chat_id, 'type': 'private'},
+                'from': BOT_USER,
+                'text': '-',
+            },
+        }})
+
+    async def user_session(self, index: int, rounds: int, think_ms: float, rng: random.Random) -> None:
+        """Run the scripted session of one virtual user."""
+        for _ in range(rounds):
+            await self.command(index, f"/expense {rng.randrange(5, 200) * 1000} makan siang")
+            categories = [d for d in self.request.callback_buttons(BENCHMARK_TELEGRAM_ID_BASE + index)
+                          if d.startswith('expense_cat_')]
+            if categories:
+                await self.tap(index, rng.choice(categories))
+            await self.command(index, "/report")
+            await self.tap(index, "report_30d")
+            await self.command(index, "/balance")
+            if think_ms:
+                await asyncio.sleep(rng.uniform(0, think_ms) / 1000)
+
+
+async def run_load(users: int, rounds: int, latency_ms: float, jitter_ms: float = 0.0,
+                   think_ms: float = 0.0, concurrent_updates: int = 0,
+                   seed: int = 42) -> Dict[str, Any]:
+    """Run all virtual users concurrently and summarize the results.
+
+    Args:
+        users: Number of concurrent virtual users
+        rounds: Script repetitions per user
+        latency_ms: Simulated Bot API latency
+        jitter_ms: Random extra Bot API latency
+        think_ms: Maximum random pause between rounds
+        concurrent_updates: Application.concurrent_updates (0 = sequential, as in production)
+        seed: Random seed for amounts, categories and jitter
+
+    Returns:
+        JSON-serializable results document
+    """
+    from bot import build_application
+
+    request = RecordingRequest(latency_ms, jitter_ms, seed)
+    application = build_application(
+        token=LOAD_TOKEN, request=request,
+        get_updates_request=RecordingRequest(0),
+        concurrent_updates=concurrent_updates or False,
+    )
+    harness = LoadHarness(application, request)
+    probe = _EventLoopProbe()
+
+    await application.initialize()
+    await application.start()
+    probe.start()
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(
+            harness.user_session(i, rounds, think_ms, random.Random(seed + i))
+            for i in range(users)
+        ))
+    finally:
+        duration = time.perf_counter() - started
+        await probe.stop()
+        await application.stop()
+        await application.shutdown()
+
+    total = sum(len(v) for v in harness.latencies.values())
+    telegram: Dict[str, int] = defaultdict(int)
+    for method, _, _ in request.calls:
+        telegram[method] += 1
+    blocked = [lag for lag in probe.lags_ms if lag > 1.0]
+
+    return {
+        'config': {
+            'users': users, 'rounds': rounds, 'latency_ms': latency_ms, 'jitter_ms': jitter_ms,
+            'think_ms': think_ms, 'concurrent_updates': concurrent_updates, 'seed': seed,
+        },
+        'throughput': {
+            'updates': total,
+            'duration_s': round(duration, 3),
+            'updates_per_s': round(total / duration, 2) if duration else 0.0,
+        },
+        'commands': {
+            label: {
+                'latency': summarize(harness.latencies[label]),
+                'service': summarize(harness.service_times[label]),
+            }
+            for label in sorted(harness.latencies)
+        },
+        'telegram_calls': dict(sorted(telegram.items())),
+        'event_loop': {
+            'lag': summarize(probe.lags_ms),
+            'blocked_ms_total': round(sum(blocked), 3),
+            'blocked_fraction': round(sum(blocked) / (duration * 1000), 4) if duration else 0.0,
+        },
+    }
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    t = report['throughput']
+    print(f"{t['updates']} updates in {t['duration_s']} s ({t['updates_per_s']} updates/s)")
+    loop = report['event_loop']
+    print(f"event loop blocked {loop['blocked_ms_total']:.0f} ms "
+          f"({loop['blocked_fraction']:.1%}), max lag {loop['lag']['max_ms']:.1f} ms\n")
+    width = max(len(name) for name in report['commands'])
+    print(f"{'command':<{width}}  {'count':>6}  {'p50':>9}  {'p95':>9}  {'p99':>9}  {'svc p50':>9}")
+    for name, r in report['commands'].items():
+        lat = r['latency']
+        print(f"{name:<{width}}  {lat['count']:>6}  {lat['p50_ms']:>9.1f}  {lat['p95_ms']:>9.1f}  "
+              f"{lat['p99_ms']:>9.1f}  {r['service']['p50_ms']:>9.1f}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='simulated Bot API latency')
+    parser.add_argument('--jitter-ms', type=float, default=20.0)
+    parser.add_argument('--think-ms', type=float, default=0.0)
+    parser.add_argument('--concurrent-updates', type=int, default=0,
+                        help='Application.concurrent_updates (0 = sequential like bot.py)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--seed-years', type=int, default=0,
+                        help='seed this many years of history for the virtual users first')
+    parser.add_argument('--sqlite', metavar='PATH',
+                        help='run against an embedded SQLite file instead of DB_BACKEND')
+    parser.add_argument('--output', help='write results JSON to this file')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.ERROR)
+    if args.sqlite:
+        backend = SQLiteBackend(args.sqlite)
+        backend.apply_schema()
+        DatabaseConnection.configure(backend)
+    if args.seed_years:
+        seed_database(DatasetSpec(users=args.users, years=args.seed_years, seed=args.seed))
+
+    from benchmarks.run import _git_commit
+
+    report = asyncio.run(run_load(
+        args.users, args.rounds, args.latency_ms, args.jitter_ms, args.think_ms,
+        args.concurrent_updates, args.seed,
+    ))
+    report['config']['git_commit'] = _git_commit()
+    DatabaseConnection.close_all_connections()
+
+    _print_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,453 @@
+"""Index advisor: EXPLAIN every statement the models and report/budget services run.
+
+Usage:
+    python -m benchmarks.plans --sqlite /tmp/plans.db --users 3 --years 1
+    DB_NAME=montrixa_bench python -m benchmarks.plans --no-seed --fail-on-regression
+
+Each workload case calls one model or service read path for a seeded user
+and captures the statements it issues (QueryStats.capture_statements). Every
+SELECT/UPDATE/DELETE is then run under EXPLAIN (MySQL) or EXPLAIN QUERY PLAN
+(SQLite) and flagged for full table scans, filesorts and temporary tables.
+Flagged statements get a suggested covering index built from their
+equality, range, grouping and selected columns.
+
+HOT_CASES lists the plan issues each hot read path may have; any other issue
+on a statement reading a large table is a regression that
+--fail-on-regression (and tests/test_query_plans.py) fail on.
+"""
+
+import argparse
+import logging
+import re
+import sys
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from config.backends import SQLiteBackend
+from config.database import DatabaseConnection
+from config.query_stats import QueryStats, fingerprint
+from benchmarks.datagen import DatasetSpec, get_benchmark_user_ids, seed_database
+from models.budget import Budget
+from models.category import Category
+from models.job_heartbeat import JobHeartbeat
+from models.recurring import RecurringTransaction
+from models.transaction import Transaction
+from models.transaction_frame import TransactionFrame
+from models.user import User
+from services.budget_service import BudgetService
+from services.report_service import ReportService
+
+logger = logging.getLogger(__name__)
+
+FULL_SCAN = 'full scan'
+FILESORT = 'filesort'
+TEMPORARY = 'temporary'
+
+# Hot read paths and the plan issues each one is allowed to have. Anything
+# else (e.g. a full scan of transactions) is a regression.
+HOT_CASES: Dict[str, Tuple[str, ...]] = {
+    'ReportService.get_reports': (),
+    'ReportService.get_expense_by_category': (TEMPORARY, FILESORT),
+    'ReportService.get_income_by_category': (TEMPORARY, FILESORT),
+    'ReportService.get_daily_trend': (),
+    'ReportService.get_summary': (),
+    'Transaction.get_by_user': (FILESORT,),
+    'Transaction.get_balance_minor': (),
+    'Budget.get_spent_minor': (),
+    'Budget.get_spent_minor_amounts': (),
+    'BudgetService.get_budget_status': (),
+}
+
+# Tables small enough per user that scanning them is expected
+_SMALL_TABLES = {'categories', 'job_heartbeats'}
+# Tables that grow with history: regressions and index advice focus on these
+_LARGE_TABLES = {'transactions', 'budget_alerts', 'transaction_history'}
+
+_WRITE_OR_READ_RE = re.compile(r'^\s*(SELECT|UPDATE|DELETE|WITH)\b', re.IGNORECASE)
+
+
+def _transaction_round_trip(user_id: int) -> None:
+    category = Category.get_by_user(user_id, 'expense')[0]
+    transaction = Transaction.create(user_id, category.id, 1000, 'plan check', 'expense')
+    transaction.update(amount=2000)
+    transaction.delete()
+
+
+def workload(today: Optional[date] = None) -> Dict[str, Callable[[int], Any]]:
+    """Named read (and a few write) paths of models and the report/budget services.
+
+    Args:
+        today: Reference date for date ranges (defaults to today)
+
+    Returns:
+        Case name -> callable taking a user ID
+    """
+    today = today or date.today()
+    month = today.replace(day=1)
+    last_30 = today - timedelta(days=29)
+
+    return OrderedDict([
+        ('User.get_by_telegram_id', lambda uid: User.get_by_telegram_id(User.get_by_id(uid).telegram_id)),
+        ('User.get_all_active', lambda uid: User.get_all_active()),
+        ('Category.get_by_user', lambda uid: Category.get_by_user(uid, 'expense')),
+        ('Category.get_by_name', lambda uid: Category.get_by_name(uid, 'Makan', 'expense')),
+        ('Transaction.get_by_user', lambda uid: Transaction.get_by_user(uid, start_date=month, end_date=today)),
+        ('Transaction.get_by_user[all]', lambda uid: Transaction.get_by_user(uid, limit=20)),
+        ('Transaction.get_count', lambda uid: Transaction.get_count(uid, month, today)),
+        ('Transaction.get_today', lambda uid: Transaction.get_today(uid)),
+        ('Transaction.get_by_category', lambda uid: Transaction.get_by_category(
+            uid, Category.get_by_user(uid, 'expense')[0].id, month, today)),
+        ('Transaction.get_balance_minor', lambda uid: Transaction.get_balance_minor(uid, month, today)),
+        ('Transaction.get_date_bounds', lambda uid: Transaction.get_date_bounds(uid)),
+        ('Transaction.write', _transaction_round_trip),
+        ('TransactionFrame.load', lambda uid: TransactionFrame.load(uid, month, today)),
+        ('Budget.get_by_user', lambda uid: Budget.get_by_user(uid)),
+        ('Budget.get_spent_minor', lambda uid: [b.get_spent_minor(today) for b in Budget.get_by_user(uid)[:1]]),
+        ('Budget.get_spent_minor_amounts', lambda uid: Budget.get_spent_minor_amounts(Budget.get_by_user(uid), today)),
+        ('Budget.get_all_active', lambda uid: Budget.get_all_active()),
+        ('RecurringTransaction.get_by_user', lambda uid: RecurringTransaction.get_by_user(uid)),
+        ('RecurringTransaction.get_due_transactions', lambda uid: RecurringTransaction.get_due_transactions(today)),
+        ('JobHeartbeat.get_all', lambda uid: JobHeartbeat.get_all()),
+        ('ReportService.get_reports', lambda uid: ReportService.get_reports(uid, month, today)),
+        ('ReportService.get_summary', lambda uid: ReportService.get_summary(uid, month, today)),
+        ('ReportService.get_expense_by_category', lambda uid: ReportService.get_expense_by_category(uid, month, today)),
+        ('ReportService.get_income_by_category', lambda uid: ReportService.get_income_by_category(uid, month, today)),
+        ('ReportService.get_daily_trend', lambda uid: ReportService.get_daily_trend(uid, last_30, today)),
+        ('BudgetService.get_budget_status', lambda uid: BudgetService.get_budget_status(uid)),
+        ('BudgetService.get_alerts_sent_today', lambda uid: BudgetService.get_alerts_sent_today(
+            [b.id for b in Budget.get_by_user(uid)] or [0])),
+    ])
+
+
+class PlanStep:
+    """One row of a query plan, reduced to what the advisor checks."""
+
+    __slots__ = ('table', 'index', 'full_scan', 'filesort', 'temporary', 'covering', 'detail')
+
+    def __init__(self, table: Optional[str], index: Optional[str] = None, full_scan: bool = False,
+                 filesort: bool = False, temporary: bool = False, covering: bool = False,
+                 detail: str = ''):
+        self.table = table
+        self.index = index
+        self.full_scan = full_scan
+        self.filesort = filesort
+        self.temporary = temporary
+        self.covering = covering
+        self.detail = detail
+
+
+def _explain_mysql(query: str, args: Any) -> List[PlanStep]:
+    steps = []
+    for row in DatabaseConnection.execute_query(f"EXPLAIN {query}", args, commit=False):
+        extra = [e.strip() for e in (row.get('Extra') or '').split(';')]
+        steps.append(PlanStep(
+            table=row.get('table'),
+            index=row.get('key'),
+            full_scan=row.get('type') in ('ALL', 'index'),
+            filesort='Using filesort' in extra,
+            temporary='Using temporary' in extra,
+            covering='Using index' in extra,
+            detail=f"type={row.get('type')} key={row.get('key')} rows={row.get('rows')} {row.get('Extra') or ''}".strip(),
+        ))
+    return steps
+
+
+_SQLITE_ACCESS_RE = re.compile(r'^(SCAN|SEARCH) (\w+)(?: USING (COVERING )?INDEX (\w+))?')
+
+
+def _explain_sqlite(query: str, args: Any) -> List[PlanStep]:
+    steps = []
+    for row in DatabaseConnection.execute_query(f"EXPLAIN QUERY PLAN {query}", args, commit=False):
+        detail = row['detail']
+        if detail.startswith('USE TEMP B-TREE'):
+            steps.append(PlanStep(None, filesort='ORDER BY' in detail,
+                                  temporary='ORDER BY' not in detail, detail=detail))
+            continue
+        match = _SQLITE_ACCESS_RE.match(detail)
+        if not match or match.group(2) == 'CONSTANT':
+            continue
+        access, table, covering, index = match.groups()
+        steps.append(PlanStep(
+            table=table,
+            index=index or ('PRIMARY' if 'PRIMARY KEY' in detail else None),
+            full_scan=access == 'SCAN',
+            covering=bool(covering) or 'PRIMARY KEY' in detail,
+            detail=detail,
+        ))
+    return steps
+
+
+def explain(query: str, args: Any = None) -> List[PlanStep]:
+    """Plan of one statement on the configured backend."""
+    if DatabaseConnection.backend().name == 'sqlite':
+        return _explain_sqlite(query, args)
+    return _explain_mysql(query, args)
+
+
+class StatementPlan:
+    """A captured statement, its plan and the issues found in it."""
+
+    def __init__(self, case: str, query: str, args: Any, steps: List[PlanStep],
+                 aliases: Dict[str, str]):
+        self.case = case
+        self.query = query
+        self.args = args
+        self.steps = steps
+        self.aliases = aliases
+
+    def table_of(self, step: PlanStep) -> Optional[str]:
+        """Real table name of a plan step (plans name aliases)."""
+        return self.aliases.get(step.table, step.table)
+
+    @property
+    def issues(self) -> List[str]:
+        """Distinct issues, e.g. ['full scan: transactions', 'temporary']."""
+        found = []
+        for step in self.steps:
+            table = self.table_of(step)
+            if step.full_scan and table not in _SMALL_TABLES:
+                found.append(f"{FULL_SCAN}: {table}")
+            if step.filesort:
+                found.append(FILESORT)
+            if step.temporary:
+                found.append(TEMPORARY)
+        return list(OrderedDict.fromkeys(found))
+
+    @property
+    def tables(self) -> List[str]:
+        """Tables the plan reads, in plan order."""
+        return list(OrderedDict.fromkeys(self.table_of(s) for s in self.steps if s.table))
+
+    def reads_large_table(self) -> bool:
+        return any(t in _LARGE_TABLES for t in self.tables)
+
+
+_TABLE_RE = re.compile(r'\b(?:FROM|JOIN|UPDATE)\s+(\w+)(?:\s+(?:AS\s+)?(?!WHERE|LEFT|JOIN|ON|SET|GROUP|ORDER|INNER|LIMIT)(\w+))?',
+                       re.IGNORECASE)
+
+
+def table_aliases(query: str) -> Dict[str, str]:
+    """Map each alias (and table name) used in a statement to its table."""
+    aliases = {}
+    for table, alias in _TABLE_RE.findall(query):
+        aliases[table] = table
+        if alias:
+            aliases[alias] = table
+    return aliases
+
+
+def capture_cases(user_id: int, cases: Optional[Sequence[str]] = None,
+                  today: Optional[date] = None) -> List[Tuple[str, str, Any]]:
+    """Run workload cases and collect their plannable statements.
+
+    Returns:
+        (case, query, args), one per distinct statement fingerprint per case
+    """
+    captured = []
+    for name, fn in workload(today).items():
+        if cases is not None and name not in cases:
+            continue
+        with QueryStats.capture_statements() as statements:
+            fn(user_id)
+        seen = set()
+        for query, args in statements:
+            fp = fingerprint(query)
+            if fp in seen or not _WRITE_OR_READ_RE.match(query) or 'EXPLAIN' in query.upper():
+                continue
+            seen.add(fp)
+            captured.append((name, query, args))
+    return captured
+
+
+def analyze(user_id: int, cases: Optional[Sequence[str]] = None,
+            today: Optional[date] = None) -> List[StatementPlan]:
+    """EXPLAIN every statement the workload cases issue for one user."""
+    return [
+        StatementPlan(case, query, args, explain(query, args), table_aliases(query))
+        for case, query, args in capture_cases(user_id, cases, today)
+    ]
+
+
+def regressions(plans: Sequence[StatementPlan]) -> List[str]:
+    """Issues on HOT_CASES statements that the case is not allowed to have."""
+    found = []
+    for plan in plans:
+        allowed = HOT_CASES.get(plan.case)
+        # Sorting a user's handful of budgets or categories is not a regression
+        if allowed is None or not plan.reads_large_table():
+            continue
+        for issue in plan.issues:
+            if issue.split(':')[0] not in allowed:
+                found.append(f"{plan.case}: {issue}\n    {' '.join(plan.query.split())[:160]}")
+    return found
+
+
+_WHERE_RE = re.compile(r'\bWHERE\b(.*?)(?:\bGROUP\s+BY\b|\bORDER\s+BY\b|\bLIMIT\b|$)', re.IGNORECASE | re.DOTALL)
+_GROUP_ORDER_RE = re.compile(r'\b(?:GROUP|ORDER)\s+BY\b(.*?)(?:\bLIMIT\b|\bHAVING\b|\bORDER\s+BY\b|$)',
+                             re.IGNORECASE | re.DOTALL)
+_EQUALITY_RE = r'(?:\b{alias}\.)?\b(\w+)\s*(?:=\s*(?:%s|\'[^\']*\'|\d+)|IN\s*\()'
+_RANGE_RE = r'(?:\b{alias}\.)?\b(\w+)\s*(?:>=|<=|>|<|BETWEEN\b)'
+
+# Columns that cannot be part of an index
+_UNINDEXABLE = {'description', 'notes'}
+# Wider suggestions are left non-covering
+MAX_INDEX_COLUMNS = 5
+
+
+def table_columns(table: str) -> List[str]:
+    """Column names of a table, in definition order."""
+    with DatabaseConnection.get_cursor(commit=False) as cursor:
+        cursor.execute(f"SELECT * FROM {table} WHERE 1 = 0")
+        return [d[0] for d in cursor.description]
+
+
+def suggest_index(query: str, table: str, columns: Sequence[str]) -> Optional[List[str]]:
+    """Suggest an index for the rows a statement reads from table.
+
+    Columns are ordered equality filters, then the first range filter, then
+    GROUP BY/ORDER BY columns, then the remaining columns the statement reads
+    from the table so the index covers it. Columns that cannot be indexed
+    (TEXT) make the suggestion non-covering.
+
+    Args:
+        query: Statement text
+        table: Table to index
+        columns: All columns of table
+
+    Returns:
+        Column list, or None if nothing in the statement filters table
+    """
+    aliases = [a for a, t in table_aliases(query).items() if t == table]
+    alias = '(?:' + '|'.join(map(re.escape, aliases)) + ')'
+    single_table = len(set(table_aliases(query).values())) == 1
+    known = set(columns)
+
+    def own(names):
+        return [n for n in names if n in known]
+
+    def referenced(text):
+        if single_table:
+            return own(re.findall(r'\b(\w+)\b', text))
+        return own(re.findall(rf'\b{alias}\.(\w+)\b', text))
+
+    where = _WHERE_RE.search(query)
+    where_text = where.group(1) if where else ''
+    equality = own(re.findall(_EQUALITY_RE.format(alias=alias), where_text, re.IGNORECASE))
+    ranges = own(re.findall(_RANGE_RE.format(alias=alias), where_text, re.IGNORECASE))
+    if not equality and not ranges:
+        return None
+
+    ordered = list(OrderedDict.fromkeys(equality))
+    for column in ranges[:1]:
+        if column not in ordered:
+            ordered.append(column)
+    for match in _GROUP_ORDER_RE.findall(query):
+        ordered.extend(c for c in referenced(match) if c not in ordered)
+    # The primary key is already part of every secondary index
+    rest = list(OrderedDict.fromkeys(c for c in referenced(query) if c not in ordered and c != 'id'))
+    if any(c in _UNINDEXABLE for c in rest) or len(ordered) + len(rest) > MAX_INDEX_COLUMNS:
+        return ordered
+    return ordered + rest
+
+
+def existing_indexes(table: str) -> Dict[str, List[str]]:
+    """Index name -> columns for a table."""
+    if DatabaseConnection.backend().name == 'sqlite':
+        indexes = {}
+        for row in DatabaseConnection.execute_query(f"PRAGMA index_list({table})", commit=False):
+            info = DatabaseConnection.execute_query(f"PRAGMA index_info({row['name']})", commit=False)
+            indexes[row['name']] = [r['name'] for r in sorted(info, key=lambda r: r['seqno'])]
+        return indexes
+    rows = DatabaseConnection.execute_query(
+        "SELECT INDEX_NAME AS name, COLUMN_NAME AS col FROM information_schema.STATISTICS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s ORDER BY INDEX_NAME, SEQ_IN_INDEX",
+        (table,), commit=False
+    )
+    indexes: Dict[str, List[str]] = OrderedDict()
+    for row in rows:
+        indexes.setdefault(row['name'], []).append(row['col'])
+    return indexes
+
+
+def advise(plans: Sequence[StatementPlan]) -> List[Dict[str, Any]]:
+    """Suggested indexes for statements with issues, skipping ones an index already has.
+
+    Returns:
+        Dicts with table, columns (suggested index) and cases that need it
+    """
+    suggestions: Dict[Tuple[str, Tuple[str, ...]], List[str]] = OrderedDict()
+    columns_cache: Dict[str, List[str]] = {}
+    indexes_cache: Dict[str, List[List[str]]] = {}
+    for plan in plans:
+        if not plan.issues:
+            continue
+        scanned = {plan.table_of(s) for s in plan.steps if s.full_scan}
+        for table in plan.tables:
+            if table in _SMALL_TABLES or (table not in _LARGE_TABLES and table not in scanned):
+                continue
+            if table not in columns_cache:
+                columns_cache[table] = table_columns(table)
+                indexes_cache[table] = list(existing_indexes(table).values())
+            columns = suggest_index(plan.query, table, columns_cache[table])
+            if not columns or any(index[:len(columns)] == columns for index in indexes_cache[table]):
+                continue
+            cases = suggestions.setdefault((table, tuple(columns)), [])
+            if plan.case not in cases:
+                cases.append(plan.case)
+    return [{'table': t, 'columns': list(c), 'cases': cases} for (t, c), cases in suggestions.items()]
+
+
+def render(plans: Sequence[StatementPlan], verbose: bool = False) -> str:
+    """Text report of issues per case, then index suggestions."""
+    lines = []
+    for plan in plans:
+        if not plan.issues and not verbose:
+            continue
+        mark = 'HOT ' if plan.case in HOT_CASES else ''
+        lines.append(f"{mark}{plan.case}: {', '.join(plan.issues) or 'ok'}")
+        lines.append(f"    {' '.join(plan.query.split())[:160]}")
+        for step in plan.steps:
+            lines.append(f"      - {step.table or '':<14} {step.detail}")
+    suggestions = advise(plans)
+    if suggestions:
+        lines.append('\nSuggested indexes:')
+        for s in suggestions:
+            lines.append(f"  {s['table']} ({', '.join(s['columns'])})  <- {', '.join(s['cases'])}")
+    return '\n'.join(lines) or 'No plan issues found'
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='EXPLAIN model/service queries and suggest indexes')
+    parser.add_argument('--sqlite', help='run against this SQLite file instead of the configured DB')
+    parser.add_argument('--users', type=int, default=3)
+    parser.add_argument('--years', type=int, default=1)
+    parser.add_argument('--no-seed', action='store_true', help='reuse existing benchmark users')
+    parser.add_argument('--verbose', action='store_true', help='also print plans without issues')
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help='exit 1 when a HOT_CASES statement has a disallowed issue')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    if args.sqlite:
+        backend = SQLiteBackend(args.sqlite)
+        backend.apply_schema()
+        DatabaseConnection.configure(backend)
+    if not args.no_seed:
+        seed_database(DatasetSpec(users=args.users, years=args.years))
+    user_ids = get_benchmark_user_ids()
+    if not user_ids:
+        print('No benchmark users found; run without --no-seed first', file=sys.stderr)
+        return 1
+
+    plans = analyze(user_ids[0])
+    print(render(plans, args.verbose))
+    found = regressions(plans)
+    if found:
+        print('\nPlan regressions on hot queries:\n  ' + '\n  '.join(found))
+        return 1 if args.fail_on_regression else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
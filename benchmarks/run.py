@@ -0,0 +1,354 @@
+"""Benchmark services, jobs and API routes against a seeded database.
+
+Usage:
+    python -m benchmarks.run --users 20 --years 2 --output bench.json
+    python -m benchmarks.run --no-seed --baseline bench.json --fail-on-regression
+    python -m benchmarks.run --sqlite /tmp/bench.db --users 5 --years 1
+
+Point DB_NAME (or --sqlite) at a scratch database: seeding replaces benchmark users and the
+job benchmarks process every due recurring rule and active budget in it.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from config.backends import SQLiteBackend
+from config.database import DatabaseConnection
+from config.query_stats import QueryStats, summarize
+from benchmarks.datagen import DatasetSpec, get_benchmark_user_ids, seed_database
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REGRESSION_THRESHOLD = 0.2
+
+
+class _FakeBot:
+    """Stands in for telegram.Bot so alert jobs run without network calls."""
+
+    async def send_message(self, chat_id, text, **kwargs):
+        return None
+
+
+class _QueryCounter:
+    """Counts statements executed while a benchmark case runs."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, fingerprint, query, duration_ms, rows):
+        self.count += 1
+
+
+def measure(fn: Callable[[int], Any], repeat: int, warmup: int = 1,
+            setup: Optional[Callable[[int], Any]] = None) -> Dict[str, Any]:
+    """Time repeated calls of a benchmark case.
+
+    Args:
+        fn: Case body, called with the iteration number
+        repeat: Number of timed iterations
+        warmup: Untimed iterations run first
+        setup: Optional untimed per-iteration preparation, called with the
+            iteration number; its return value is passed to fn instead
+
+    Returns:
+        Latency summary plus average query count per call
+    """
+    counter = _QueryCounter()
+    QueryStats.add_listener(counter)
+    try:
+        timings = []
+        queries = []
+        for i in range(warmup + repeat):
+            arg = setup(i) if setup else i
+            counter.count = 0
+            started = time.perf_counter()
+            fn(arg)
+            elapsed = (time.perf_counter() - started) * 1000
+            if i >= warmup:
+                timings.append(elapsed)
+                queries.append(counter.count)
+    finally:
+        QueryStats.remove_listener(counter)
+
+    result = summarize(timings)
+    result['mean_ms'] = round(sum(timings) / len(timings), 3) if timings else 0.0
+    result['queries_avg'] = round(sum(queries) / len(queries), 2) if queries else 0.0
+    return result
+
+
+def _service_cases(user_ids: List[int]) -> Dict[str, Callable[[int], Any]]:
+    from api.responses import dumps, records
+    from models.transaction import Transaction
+    from models.transaction_frame import TransactionFrame
+    from services.budget_service import BudgetService
+    from services.report_service import ReportService
+
+    today = date.today()
+    last_year = today - timedelta(days=365)
+
+    def user(i):
+        return user_ids[i % len(user_ids)]
+
+    return {
+        'ReportService.get_current_month_summary':
+            lambda i: ReportService.get_current_month_summary(user(i)),
+        'ReportService.get_summary[365d]':
+            lambda i: ReportService.get_summary(user(i), last_year, today),
+        'ReportService.get_expense_by_category[365d]':
+            lambda i: ReportService.get_expense_by_category(user(i), last_year, today),
+        'ReportService.get_daily_trend[90d]':
+            lambda i: ReportService.get_daily_trend(user(i), today - timedelta(days=90), today),
+        'ReportService.get_reports[365d]':
+            lambda i: ReportService.get_reports(user(i), last_year, today),
+        'ReportService.trend[365d,auto]':
+            lambda i: ReportService.trend(TransactionFrame.load(user(i), last_year, today)),
+        'Transaction.get_by_user[500]':
+            lambda i: Transaction.get_by_user(user(i), limit=500),
+        'Transaction.get_by_user[500]+json':
+            lambda i: dumps(records(Transaction.get_by_user(user(i), limit=500), Transaction.FIELDS)),
+        'ReportService.export_to_csv[365d]':
+            lambda i: ReportService.export_to_csv(user(i), last_year, today),
+        'BudgetService.get_budget_status':
+            lambda i: BudgetService.get_budget_status(user(i)),
+    }
+
+
+def _run_job_cases(user_ids: List[int], repeat: int) -> Dict[str, Dict[str, Any]]:
+    from jobs.budget_alert_job import check_budget_alerts
+    from services.recurring_service import RecurringService
+
+    placeholders = ', '.join(['%s'] * len(user_ids))
+    bot = _FakeBot()
+
+    def reset_alerts(i):
+        # Alerts are sent once per day; clear the log so every run does full work
+        DatabaseConnection.execute_query(
+            f"DELETE FROM budget_alerts WHERE user_id IN ({placeholders})", tuple(user_ids))
+        return i
+
+    def reset_recurring(i):
+        DatabaseConnection.execute_query(
+            f"UPDATE recurring_transactions "
+            f"SET next_run_date = {DatabaseConnection.dialect().current_date()}, last_run_date = NULL "
+            f"WHERE user_id IN ({placeholders})", tuple(user_ids))
+        return i
+
+    return {
+        'jobs.check_budget_alerts': measure(
+            lambda i: asyncio.run(check_budget_alerts(bot)), repeat, setup=reset_alerts),
+        'RecurringService.process_due_recurring': measure(
+            lambda i: RecurringService.process_due_recurring(), repeat, setup=reset_recurring),
+    }
+
+
+def _run_api_cases(user_id: int, repeat: int) -> Dict[str, Dict[str, Any]]:
+    from fastapi.testclient import TestClient
+
+    from api.auth import get_current_user
+    from api.main import app
+    from models.category import Category
+    from models.user import User
+
+    user = User.get_by_id(user_id)
+    category = Category.get_by_user(user_id, 'expense')[0]
+    last_year = (date.today() - timedelta(days=365)).isoformat()
+    today = date.today().isoformat()
+
+    app.dependency_overrides[get_current_user] = lambda: user
+    results: Dict[str, Dict[str, Any]] = {}
+    try:
+        client = TestClient(app)
+
+        def get(path):
+            def case(i):
+                response = client.get(path)
+                assert response.status_code == 200, f"{path}: {response.status_code}"
+            return case
+
+        for name, path in (
+            ('GET /api/health', '/api/health'),
+            ('GET /api/health/ready', '/api/health/ready'),
+            ('GET /api/balance', '/api/balance'),
+            ('GET /api/categories', '/api/categories?type=expense'),
+            ('GET /api/transactions', '/api/transactions?limit=50'),
+            ('GET /api/transactions[365d]', f'/api/transactions?start={last_year}&end={today}&limit=100'),
+            ('GET /api/transactions/meta', '/api/transactions/meta'),
+            ('GET /api/analytics', '/api/analytics'),
+            ('GET /api/analytics[365d]', f'/api/analytics?start={last_year}&end={today}'),
+        ):
+            results[name] = measure(get(path), repeat)
+
+        created: List[int] = []
+
+        def create(i):
+            response = client.post('/api/transaction', json={
+                'amount': '25000', 'category_id': category.id,
+                'description': 'benchmark', 'type': 'expense',
+            })
+            assert response.status_code == 200, response.text
+            created.append(response.json()['transaction']['id'])
+
+        results['POST /api/transaction'] = measure(create, repeat)
+        results['PATCH /api/transaction/{id}'] = measure(
+            lambda i: client.patch(f'/api/transaction/{created[i % len(created)]}',
+                                   json={'amount': '30000'}),
+            repeat,
+        )
+        results['DELETE /api/transaction/{id}'] = measure(
+            lambda i: client.delete(f'/api/transaction/{created.pop()}'),
+            min(repeat, len(created) - 1), warmup=1,
+        )
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def run_benchmarks(spec: DatasetSpec, repeat: int, seed: bool = True,
+                   sample_users: int = 5) -> Dict[str, Any]:
+    """Seed (optionally) and run every benchmark case.
+
+    Args:
+        spec: Dataset size and shape
+        repeat: Timed iterations per case
+        seed: Regenerate the dataset before running
+        sample_users: Number of benchmark users per-user cases rotate through
+
+    Returns:
+        JSON-serializable results document
+    """
+    dataset = seed_database(spec) if seed else None
+    user_ids = get_benchmark_user_ids()
+    if not user_ids:
+        raise RuntimeError("No benchmark users found; run without --no-seed first")
+    sample = user_ids[:sample_users]
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, case in _service_cases(sample).items():
+        results[name] = measure(case, repeat)
+    results.update(_run_job_cases(user_ids, repeat))
+    results.update(_run_api_cases(sample[0], repeat))
+
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'spec': spec.__dict__,
+            'dataset': dataset,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> List[Dict[str, Any]]:
+    """Compare two results documents case by case.
+
+    Args:
+        current: Results of this run
+        baseline: Results of an earlier run
+        threshold: Relative p50 increase that counts as a regression (0.2 = +20%)
+
+    Returns:
+        One row per case present in both runs, with a 'regression' flag
+    """
+    rows = []
+    for name, result in current['results'].items():
+        before = baseline.get('results', {}).get(name)
+        if not before:
+            continue
+        old, new = before['p50_ms'], result['p50_ms']
+        change = (new - old) / old if old else 0.0
+        rows.append({
+            'case': name,
+            'baseline_p50_ms': old,
+            'p50_ms': new,
+            'change': round(change, 4),
+            'queries_avg': result.get('queries_avg'),
+            'baseline_queries_avg': before.get('queries_avg'),
+            'regression': change > threshold
+                          or result.get('queries_avg', 0) > before.get('queries_avg', 0),
+        })
+    return rows
+
+
+def _print_table(results: Dict[str, Dict[str, Any]]) -> None:
+    width = max(len(name) for name in results)
+    print(f"{'case':<{width}}  {'p50':>9}  {'p95':>9}  {'p99':>9}  {'queries':>7}")
+    for name, r in results.items():
+        print(f"{name:<{width}}  {r['p50_ms']:>9.2f}  {r['p95_ms']:>9.2f}  "
+              f"{r['p99_ms']:>9.2f}  {r['queries_avg']:>7}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--users', type=int, default=DatasetSpec.users)
+    parser.add_argument('--years', type=int, default=DatasetSpec.years)
+    parser.add_argument('--seed', type=int, default=DatasetSpec.seed)
+    parser.add_argument('--expenses-per-day', type=float, default=DatasetSpec.expenses_per_day)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--sample-users', type=int, default=5)
+    parser.add_argument('--no-seed', action='store_true', help='reuse existing benchmark data')
+    parser.add_argument('--sqlite', metavar='PATH',
+                        help='run against an embedded SQLite file instead of DB_BACKEND')
+    parser.add_argument('--output', help='write results JSON to this file')
+    parser.add_argument('--baseline', help='results JSON of an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_REGRESSION_THRESHOLD)
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    if args.sqlite:
+        backend = SQLiteBackend(args.sqlite)
+        backend.apply_schema()
+        DatabaseConnection.configure(backend)
+
+    spec = DatasetSpec(users=args.users, years=args.years, seed=args.seed,
+                       expenses_per_day=args.expenses_per_day)
+    report = run_benchmarks(spec, args.repeat, seed=not args.no_seed,
+                            sample_users=args.sample_users)
+    DatabaseConnection.close_all_connections()
+
+    _print_table(report['results'])
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        rows = compare(report, baseline, args.threshold)
+        report['comparison'] = rows
+        print()
+        for row in rows:
+            flag = 'REGRESSION' if row['regression'] else ''
+            print(f"{row['case']}: {row['baseline_p50_ms']:.2f} -> {row['p50_ms']:.2f} ms "
+                  f"({row['change']:+.1%}) {flag}")
+        if args.fail_on_regression and any(r['regression'] for r in rows):
+            exit_code = 1
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, default=str)
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,9 @@
 """Main bot application entry point."""
 
+import asyncio
 import logging
 import sys
+from typing import Optional, Union
 from telegram import Update, MenuButtonWebApp, WebAppInfo
 from telegram.ext import (
     Application,
@@ -11,11 +13,14 @@ from telegram.ext import (
     ConversationHandler,
     filters,
 )
+from telegram.request import BaseRequest
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 # Import config
 from config.settings import Settings
 from config.database import DatabaseConnection
+from utils.metrics import monitor_event_loop_lag, start_metrics_server
+from utils.telegram_request import TracedHTTPXRequest
 
 # Import handlers
 from handlers.start_handler import start_command, help_command, menu_command
@@ -36,6 +41,7 @@ from handlers.budget_handler import (
 )
 from handlers.recurring_handler import recurring_command, add_recurring_command
 from handlers.report_handler import summary_command, report_command, export_command
+from handlers.admin_handler import dbstats_command, tracestats_command
 from handlers.callbacks import (
     handle_category_selection,
     handle_cancel,
@@ -53,24 +59,43 @@ from handlers.callbacks import (
 # Import jobs
 from jobs.recurring_job import schedule_recurring_job
 from jobs.budget_alert_job import schedule_budget_alert_job
+from jobs.heartbeat_job import schedule_heartbeat_job
+from jobs.partition_job import schedule_partition_job
+from jobs.sync_prune_job import schedule_sync_prune_job
 
-# Configure logging
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=getattr(logging, Settings.LOG_LEVEL),
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('montrixa.log', encoding='utf-8')
-    ]
-)
 logger = logging.getLogger(__name__)
 
 
+def configure_logging():
+    """Log to stdout and montrixa.log (only when running the bot)."""
+    logging.basicConfig(
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        level=getattr(logging, Settings.LOG_LEVEL),
+        handlers=[
+            logging.StreamHandler(sys.stdout),
+            logging.FileHandler('montrixa.log', encoding='utf-8')
+        ]
+    )
+
+
 async def error_callback(update: Update, context) -> None:
     """Handle errors in the bot."""
     logger.error(f"Update {update} caused error {context.error}", exc_info=context.error)
 
 
+async def post_init(application: Application) -> None:
+    """Run startup tasks once the bot's event loop is running."""
+    application.bot_data['lag_probe'] = asyncio.create_task(monitor_event_loop_lag())
+    await post_init_set_menu_button(application)
+
+
+async def post_shutdown(application: Application) -> None:
+    """Stop background tasks started in post_init."""
+    lag_probe = application.bot_data.pop('lag_probe', None)
+    if lag_probe:
+        lag_probe.cancel()
+
+
 async def post_init_set_menu_button(application: Application) -> None:
     """Set chat menu button to open Mini App (tombol 'Open' di samping lampiran)."""
     if not Settings.MINIAPP_URL:
@@ -89,25 +114,59 @@ async def post_init_set_menu_button(application: Application) -> None:
         logger.error("Gagal set Menu Button: %s", e, exc_info=True)
 
 
-def main():
-    """Start the bot."""
-    # Validate settings
-    try:
-        Settings.validate()
-    except ValueError as e:
-        logger.error(f"Configuration error: {e}")
-        logger.error("Please check your .env file")
-        sys.exit(1)
+def telegram_pool_size(concurrent_updates: Union[bool, int]) -> int:
+    """Bot API connection pool size for an update concurrency.
     
-    logger.info("Starting Montrixa Bot...")
+    Handlers send at most one request at a time each, so the pool only needs
+    a connection per update handled at once (True means PTB's 256), plus one
+    so scheduler jobs do not queue behind a handler. TELEGRAM_CONNECTION_POOL_SIZE
+    overrides it.
+    
+    Args:
+        concurrent_updates: Value passed to ApplicationBuilder.concurrent_updates
+        
+    Returns:
+        Number of pooled connections
+    """
+    if Settings.TELEGRAM_CONNECTION_POOL_SIZE > 0:
+        return Settings.TELEGRAM_CONNECTION_POOL_SIZE
+    if concurrent_updates is True:
+        updates = 256
+    else:
+        updates = max(int(concurrent_updates), 1)
+    return updates + 1
+
+
+def build_application(token: Optional[str] = None,
+                      request: Optional[BaseRequest] = None,
+                      get_updates_request: Optional[BaseRequest] = None,
+                      concurrent_updates: Union[bool, int] = False) -> Application:
+    """Create the Application with every handler registered.
+    
+    Jobs and the metrics listener are started by main(), so this can also be
+    used to drive the bot in-process (e.g. the load harness in benchmarks/).
     
+    Args:
+        token: Bot token (defaults to TELEGRAM_BOT_TOKEN)
+        request: Request object for Bot API calls
+        get_updates_request: Request object for getUpdates polling
+        concurrent_updates: Passed to ApplicationBuilder.concurrent_updates
+        
+    Returns:
+        Configured, not yet initialized Application
+    """
     # Create application (post_init = set Menu Button "Open" seperti BotFather)
-    application = (
+    builder = (
         Application.builder()
-        .token(Settings.TELEGRAM_BOT_TOKEN)
-        .post_init(post_init_set_menu_button)
-        .build()
+        .token(token or Settings.TELEGRAM_BOT_TOKEN)
+        .request(request or TracedHTTPXRequest(connection_pool_size=telegram_pool_size(concurrent_updates)))
+        .concurrent_updates(concurrent_updates)
+        .post_init(post_init)
+        .post_shutdown(post_shutdown)
     )
+    if get_updates_request is not None:
+        builder = builder.get_updates_request(get_updates_request)
+    application = builder.build()
     
     # Register command handlers
     application.add_handler(CommandHandler("start", start_command))
@@ -141,6 +200,10 @@ def main():
     application.add_handler(CommandHandler("report", report_command))
     application.add_handler(CommandHandler("export", export_command))
     
+    # Admin commands
+    application.add_handler(CommandHandler("dbstats", dbstats_command))
+    application.add_handler(CommandHandler("tracestats", tracestats_command))
+    
     # Conversation: klik Pemasukan/Pengeluaran -> ketik nominal -> klik kategori
     conv_transaction = ConversationHandler(
         entry_points=[
@@ -170,6 +233,30 @@ def main():
     # Error handler
     application.add_error_handler(error_callback)
     
+    return application
+
+
+def main():
+    """Start the bot."""
+    configure_logging()
+    
+    # Validate settings
+    try:
+        Settings.validate()
+    except ValueError as e:
+        logger.error(f"Configuration error: {e}")
+        logger.error("Please check your .env file")
+        sys.exit(1)
+    
+    logger.info("Starting Montrixa Bot...")
+    
+    # Optional Prometheus listener (no external service needed)
+    metrics_server = None
+    if Settings.BOT_METRICS_PORT:
+        metrics_server = start_metrics_server(Settings.BOT_METRICS_HOST, Settings.BOT_METRICS_PORT)
+    
+    application = build_application()
+    
     # Setup scheduler for background jobs
     scheduler = AsyncIOScheduler()
     
@@ -179,6 +266,9 @@ def main():
     # Schedule jobs
     schedule_recurring_job(scheduler, bot)
     schedule_budget_alert_job(scheduler, bot)
+    schedule_heartbeat_job(scheduler)
+    schedule_partition_job(scheduler)
+    schedule_sync_prune_job(scheduler)
     
     # Start scheduler
     scheduler.start()
@@ -190,6 +280,8 @@ def main():
     
     # Cleanup on shutdown
     scheduler.shutdown()
+    if metrics_server:
+        metrics_server.shutdown()
     DatabaseConnection.close_all_connections()
     logger.info("Bot stopped")
 
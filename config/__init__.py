@@ -2,5 +2,6 @@
 
 from .settings import Settings
 from .database import DatabaseConnection
+from .query_stats import QueryStats
 
-__all__ = ['Settings', 'DatabaseConnection']
+__all__ = ['Settings', 'DatabaseConnection', 'QueryStats']
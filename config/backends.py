@@ -0,0 +1,367 @@
+"""Storage backends and SQL dialects behind DatabaseConnection.
+
+Models write MySQL-flavoured SQL with %s placeholders. Backends adapt the
+driver (connection, cursor, placeholders, row format); dialect helpers cover
+the few statements whose syntax differs (upserts, current time, intervals).
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Iterable, Optional, Sequence
+
+import pymysql
+from pymysql.cursors import Cursor, DictCursor
+
+from utils.money import MINOR_UNITS
+from .settings import Settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+
+class Dialect:
+    """SQL fragments that differ between databases (MySQL flavour)."""
+
+    name = 'mysql'
+
+    def now(self) -> str:
+        return 'NOW()'
+
+    def current_date(self) -> str:
+        return 'CURDATE()'
+
+    def seconds_between(self, start: str, end: str) -> str:
+        return f'TIMESTAMPDIFF(SECOND, {start}, {end})'
+
+    def minor_units(self, expr: str) -> str:
+        """Integer minor units of a DECIMAL(15, 2) amount expression (see utils.money)."""
+        return f'CAST({expr} * {MINOR_UNITS} AS SIGNED)'
+
+    def sum_minor_units(self, expr: str) -> str:
+        """Exact SUM of an amount expression as integer minor units (0 when no rows)."""
+        # DECIMAL sums are exact; scale once after summing
+        return f'CAST(COALESCE(SUM({expr}), 0) * {MINOR_UNITS} AS SIGNED)'
+
+    def excluded(self, column: str) -> str:
+        """Reference the value an upsert tried to insert into column."""
+        return f'VALUES({column})'
+
+    def table_exists(self) -> str:
+        """Query counting tables named %s (column n)."""
+        return ("SELECT COUNT(*) AS n FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s")
+
+    def index_exists(self) -> str:
+        """Query counting indexes of table %s named %s (column n)."""
+        return ("SELECT COUNT(*) AS n FROM information_schema.STATISTICS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s")
+
+    def online_ddl(self, statement: str) -> str:
+        """Ask MySQL to run ALTER TABLE / CREATE INDEX without blocking writes.
+
+        Statements that already name an ALGORITHM, or change partitioning
+        (which always copies), are returned unchanged. MySQL rejects the
+        statement instead of silently taking a table lock when it cannot
+        honour ALGORITHM=INPLACE, LOCK=NONE.
+        """
+        if _ALGORITHM_RE.search(statement) or 'PARTITION' in statement.upper():
+            return statement
+        body = statement.strip().rstrip(';')
+        if _ALTER_TABLE_RE.match(body):
+            return f'{body}, ALGORITHM=INPLACE, LOCK=NONE'
+        if _CREATE_INDEX_RE.match(body):
+            return f'{body} ALGORITHM=INPLACE LOCK=NONE'
+        return statement
+
+    def on_conflict_update(self, conflict_columns: Sequence[str], assignments: Iterable[str]) -> str:
+        """Build the upsert tail of an INSERT statement.
+
+        Args:
+            conflict_columns: Columns of the unique key that may collide
+                (implicit in MySQL, required by SQLite)
+            assignments: 'column = expression' strings applied on conflict
+
+        Returns:
+            SQL clause to append after VALUES (...)
+        """
+        return 'ON DUPLICATE KEY UPDATE ' + ', '.join(assignments)
+
+
+class SQLiteDialect(Dialect):
+    """SQL fragments for SQLite (local time to match MySQL NOW())."""
+
+    name = 'sqlite'
+
+    def now(self) -> str:
+        return "datetime('now', 'localtime')"
+
+    def current_date(self) -> str:
+        return "date('now', 'localtime')"
+
+    def seconds_between(self, start: str, end: str) -> str:
+        return f'CAST(ROUND((julianday({end}) - julianday({start})) * 86400) AS INTEGER)'
+
+    def minor_units(self, expr: str) -> str:
+        return f'CAST(ROUND({expr} * {MINOR_UNITS}) AS INTEGER)'
+
+    def sum_minor_units(self, expr: str) -> str:
+        # NUMERIC values may be stored as REAL: round each row, then sum integers
+        return f'COALESCE(SUM({self.minor_units(expr)}), 0)'
+
+    def excluded(self, column: str) -> str:
+        return f'excluded.{column}'
+
+    def table_exists(self) -> str:
+        return "SELECT COUNT(*) AS n FROM sqlite_master WHERE type = 'table' AND name = %s"
+
+    def index_exists(self) -> str:
+        return "SELECT COUNT(*) AS n FROM sqlite_master WHERE type = 'index' AND tbl_name = %s AND name = %s"
+
+    def online_ddl(self, statement: str) -> str:
+        # SQLite has no online DDL options; its ALTERs are metadata-only or rebuild anyway
+        return statement
+
+    def on_conflict_update(self, conflict_columns, assignments):
+        return (f"ON CONFLICT({', '.join(conflict_columns)}) DO UPDATE SET "
+                + ', '.join(assignments))
+
+
+class MySQLBackend:
+    """PyMySQL backend (default)."""
+
+    name = 'mysql'
+    dialect = Dialect()
+
+    def __init__(self, host: Optional[str] = None, port: Optional[int] = None,
+                 user: Optional[str] = None, password: Optional[str] = None):
+        self.host = host or Settings.DB_HOST
+        self.port = port or Settings.DB_PORT
+        self.user = user or Settings.DB_USER
+        self.password = Settings.DB_PASSWORD if password is None else password
+
+    def connect(self):
+        connection = pymysql.connect(
+            host=self.host,
+            port=self.port,
+            user=self.user,
+            password=self.password,
+            database=Settings.DB_NAME,
+            charset='utf8mb4',
+            cursorclass=DictCursor,
+            autocommit=False
+        )
+        logger.info(f"Database connection established ({self.host}:{self.port})")
+        return connection
+
+    def ping(self, conn) -> None:
+        conn.ping(reconnect=True)
+
+    def cursor(self, conn, tuples: bool = False):
+        # Plain Cursor rows are tuples in SELECT order (no per-row dict)
+        return conn.cursor(Cursor if tuples else None)
+
+    def replication_lag(self, conn) -> Optional[float]:
+        """Seconds this server is behind its source, None if it is not replicating."""
+        with conn.cursor() as cursor:
+            try:
+                cursor.execute('SHOW REPLICA STATUS')
+            except pymysql.err.ProgrammingError:
+                # MySQL < 8.0.22 and MariaDB < 10.5.1
+                cursor.execute('SHOW SLAVE STATUS')
+            row = cursor.fetchone()
+        if not row:
+            return None
+        lag = row.get('Seconds_Behind_Source', row.get('Seconds_Behind_Master'))
+        return None if lag is None else float(lag)
+
+
+# %s placeholders that are not escaped as %%s, and pyformat %(name)s
+_POSITIONAL_RE = re.compile(r'(?<!%)%s')
+_NAMED_RE = re.compile(r'(?<!%)%\((\w+)\)s')
+
+# Online DDL detection (see Dialect.online_ddl)
+_ALGORITHM_RE = re.compile(r'\bALGORITHM\s*=', re.IGNORECASE)
+_ALTER_TABLE_RE = re.compile(r'^\s*ALTER\s+TABLE\b', re.IGNORECASE)
+_CREATE_INDEX_RE = re.compile(r'^\s*CREATE\s+(UNIQUE\s+)?INDEX\b', re.IGNORECASE)
+
+# Aggregates (MIN/MAX/...) lose the declared column type, so date-like columns
+# are also converted by name
+_DATE_COLUMN_SUFFIXES = ('_date',)
+_DATETIME_COLUMN_SUFFIXES = ('_at',)
+
+
+def _to_date(value: Any) -> Any:
+    if isinstance(value, bytes):
+        value = value.decode()
+    try:
+        return date.fromisoformat(value[:10])
+    except (TypeError, ValueError):
+        return value
+
+
+def _to_datetime(value: Any) -> Any:
+    if isinstance(value, bytes):
+        value = value.decode()
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return value
+
+
+sqlite3.register_adapter(date, lambda d: d.isoformat())
+sqlite3.register_adapter(datetime, lambda d: d.isoformat(' '))
+# Decimal binds as text; NUMERIC column affinity stores it as a number
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_converter('DATE', _to_date)
+sqlite3.register_converter('TIMESTAMP', _to_datetime)
+sqlite3.register_converter('DATETIME', _to_datetime)
+
+
+def _convert(name: str, value: Any) -> Any:
+    if isinstance(value, str):
+        if name.endswith(_DATE_COLUMN_SUFFIXES):
+            return _to_date(value)
+        if name.endswith(_DATETIME_COLUMN_SUFFIXES):
+            return _to_datetime(value)
+    return value
+
+
+def _dict_row(cursor, row):
+    return {name: _convert(name, value) for (name, *_), value in zip(cursor.description, row)}
+
+
+def _tuple_row(cursor, row):
+    return tuple(_convert(name, value) for (name, *_), value in zip(cursor.description, row))
+
+
+def translate_query(query: str) -> str:
+    """Convert pyformat placeholders (%s, %(name)s) to sqlite3 qmark/named style."""
+    query = _NAMED_RE.sub(r':\1', query)
+    return _POSITIONAL_RE.sub('?', query).replace('%%', '%')
+
+
+class _SQLiteCursor:
+    """DB-API cursor adapter giving sqlite3 the PyMySQL calling convention."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, query, args=None):
+        self._cursor.execute(translate_query(query), args if args is not None else ())
+        return self._cursor.rowcount
+
+    def executemany(self, query, args):
+        self._cursor.executemany(translate_query(query), args)
+        return self._cursor.rowcount
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetchmany(self, size=None):
+        return self._cursor.fetchmany(size or self._cursor.arraysize)
+
+    def close(self):
+        self._cursor.close()
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+
+class SQLiteBackend:
+    """Embedded SQLite backend in WAL mode for single-node deployments and tests.
+
+    WAL lets readers proceed while one writer commits; writers are serialized
+    by SQLite itself and wait up to SQLITE_BUSY_TIMEOUT_MS for the lock.
+    """
+
+    name = 'sqlite'
+    dialect = SQLiteDialect()
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or Settings.SQLITE_PATH
+        self._schema_lock = threading.Lock()
+
+    def connect(self):
+        connection = sqlite3.connect(
+            self.path,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            timeout=Settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+            # Pooled connections move between threads but are never shared concurrently
+            check_same_thread=False,
+        )
+        connection.row_factory = _dict_row
+        if self.path != ':memory:':
+            connection.execute('PRAGMA journal_mode = WAL')
+        connection.execute('PRAGMA synchronous = NORMAL')
+        connection.execute('PRAGMA foreign_keys = ON')
+        logger.info(f"SQLite connection established ({self.path})")
+        return connection
+
+    def ping(self, conn) -> None:
+        # Raises sqlite3.ProgrammingError if the connection was closed
+        conn.execute('SELECT 1')
+
+    def cursor(self, conn, tuples: bool = False):
+        cursor = conn.cursor()
+        if tuples:
+            cursor.row_factory = _tuple_row
+        return _SQLiteCursor(cursor)
+
+    def replication_lag(self, conn) -> Optional[float]:
+        # A second SQLite file configured as "replica" never lags (used by tests)
+        return 0.0
+
+    def apply_schema(self, conn=None) -> None:
+        """Create all tables, triggers and views (idempotent).
+
+        Args:
+            conn: Connection to use (a new one is opened and closed if omitted)
+        """
+        with open(os.path.join(MIGRATIONS_DIR, 'init_db_sqlite.sql'), encoding='utf-8') as f:
+            script = f.read()
+        own = conn is None
+        conn = conn or self.connect()
+        try:
+            with self._schema_lock:
+                conn.executescript(script)
+                conn.commit()
+        finally:
+            if own:
+                conn.close()
+
+
+def create_backend(name: Optional[str] = None):
+    """Instantiate the backend named by DB_BACKEND ('mysql' or 'sqlite')."""
+    name = (name or Settings.DB_BACKEND).lower()
+    if name == 'mysql':
+        return MySQLBackend()
+    if name == 'sqlite':
+        return SQLiteBackend()
+    raise ValueError(f"Unknown DB_BACKEND: {name}")
+
+
+def create_replica_backend():
+    """Instantiate the read replica backend, or None when DB_REPLICA_HOST is unset."""
+    if not Settings.DB_REPLICA_HOST:
+        return None
+    if Settings.DB_BACKEND != 'mysql':
+        logger.warning("DB_REPLICA_HOST is only supported with DB_BACKEND=mysql; ignoring it")
+        return None
+    return MySQLBackend(
+        host=Settings.DB_REPLICA_HOST,
+        port=Settings.DB_REPLICA_PORT,
+        user=Settings.DB_REPLICA_USER,
+        password=Settings.DB_REPLICA_PASSWORD,
+    )
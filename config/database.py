@@ -1,60 +1,420 @@
 """Database connection pool and management."""
 
-import pymysql
-from pymysql.cursors import DictCursor
 from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
 import logging
-from .settings import Settings
+import os
+import threading
+import time
+from .query_stats import QueryStats
+from .backends import create_backend, create_replica_backend
+from .db_executor import DBExecutor
+from .read_routing import ReadRouter
 
 logger = logging.getLogger(__name__)
 
 
+class _InstrumentedCursor:
+    """Cursor proxy that reports every statement to QueryStats."""
+    
+    def __init__(self, cursor):
+        self._cursor = cursor
+    
+    def execute(self, query, args=None):
+        if QueryStats._captures:
+            QueryStats.record_statement(query, args)
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(query, args)
+        finally:
+            QueryStats.record_query(
+                query, (time.perf_counter() - started) * 1000, self._cursor.rowcount
+            )
+    
+    def executemany(self, query, args):
+        started = time.perf_counter()
+        try:
+            return self._cursor.executemany(query, args)
+        finally:
+            QueryStats.record_query(
+                query, (time.perf_counter() - started) * 1000, self._cursor.rowcount
+            )
+    
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+    
+    def __iter__(self):
+        return iter(self._cursor)
+
+
+class _Session:
+    """Connections and transaction state shared by nested UnitOfWork blocks."""
+    
+    def __init__(self):
+        self.primary = None
+        self.replica = None
+        self.atomic_depth = 0
+        self.dirty = False
+        self.failed = False
+    
+    @contextmanager
+    def cursor(self, commit, tuples=False):
+        # Once the primary is in use (or a write is pending) reads stay on it
+        # so they see the session's own uncommitted writes.
+        if self.primary is None and (commit or self.replica is None):
+            conn, replica = DatabaseConnection._checkout(commit)
+            if replica:
+                self.replica = conn
+            else:
+                self.primary = conn
+        replica = self.primary is None and not commit
+        conn = self.replica if replica else self.primary
+        cursor = DatabaseConnection._wrap_cursor(conn, replica, tuples)
+        try:
+            yield cursor
+            if commit:
+                ReadRouter.note_write()
+                if self.atomic_depth:
+                    self.dirty = True
+                else:
+                    conn.commit()
+            elif not self.atomic_depth and not self.dirty:
+                # As in get_cursor: end the read's transaction so a long
+                # non-atomic session holds no snapshot or metadata locks.
+                conn.rollback()
+        except Exception as e:
+            logger.error(f"Database error: {e}")
+            if self.atomic_depth:
+                self.failed = True
+            else:
+                conn.rollback()
+            raise
+        finally:
+            cursor.close()
+    
+    def end_transaction(self, commit):
+        """Commit or roll back writes deferred by an atomic block."""
+        if self.primary is None:
+            return
+        if commit and self.dirty and not self.failed:
+            self.primary.commit()
+        else:
+            if self.dirty:
+                logger.warning("Unit of work rolled back")
+            self.primary.rollback()
+        self.dirty = False
+        self.failed = False
+    
+    def close(self):
+        """Return the session's connections to their pools."""
+        if self.replica is not None:
+            try:
+                self.replica.rollback()
+            finally:
+                DatabaseConnection.release_connection(self.replica, replica=True)
+                self.replica = None
+        if self.primary is not None:
+            try:
+                self.primary.rollback()
+            finally:
+                DatabaseConnection.release_connection(self.primary)
+                self.primary = None
+
+
+_current_session: ContextVar[Optional[_Session]] = ContextVar('db_session', default=None)
+
+
+class UnitOfWork:
+    """Bind one pooled connection to a block; see DatabaseConnection.session().
+    
+    Nested blocks join the outer session. Bot handlers use atomic=False since
+    they await Telegram between statements: a transaction held open across
+    an await would block other updates on the same event loop (with SQLite,
+    for the whole busy timeout). Wrap the DB-only part in an atomic block
+    where several writes must succeed together.
+    """
+    
+    def __init__(self, atomic=True):
+        self.atomic = atomic
+        self._session = None
+        self._token = None
+    
+    def __enter__(self):
+        session = _current_session.get()
+        if session is None:
+            session = _Session()
+            self._token = _current_session.set(session)
+        if self.atomic:
+            session.atomic_depth += 1
+        self._session = session
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        token, self._token = self._token, None
+        try:
+            self._finish(exc_type, owner=token is not None)
+        finally:
+            if token is not None:
+                _current_session.reset(token)
+        return False
+    
+    def _finish(self, exc_type, owner):
+        """Commit/roll back the outermost atomic block and release the session if owned."""
+        session = self._session
+        try:
+            if self.atomic:
+                session.atomic_depth -= 1
+                if exc_type is not None:
+                    session.failed = True
+                if session.atomic_depth == 0:
+                    session.end_transaction(commit=True)
+        finally:
+            if owner:
+                session.close()
+    
+    async def __aenter__(self):
+        return self.__enter__()
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        # The commit and connection release run on the DB executor so the
+        # event loop never waits on the database
+        token, self._token = self._token, None
+        try:
+            await DBExecutor.run(self._finish, exc_type, token is not None)
+        finally:
+            if token is not None:
+                _current_session.reset(token)
+        return False
+
+
 class DatabaseConnection:
     """Database connection manager with connection pooling."""
     
     _connection_pool = []
     _pool_size = 5
+    _backend = None
+    
+    # Optional read replica (see config.read_routing)
+    _replica_pool = []
+    _replica_backend = None
+    _replica_configured = False
+    _replica_lock = threading.Lock()
+    
+    # Pool utilization counters (read by metrics and health checks)
+    _stats_lock = threading.Lock()
+    _in_use = 0
+    _created = 0
+    _reused = 0
+    _replica_reads = 0
+    
+    @classmethod
+    def backend(cls):
+        """Return the active storage backend (created from DB_BACKEND on first use)."""
+        if cls._backend is None:
+            cls._backend = create_backend()
+        return cls._backend
+    
+    @classmethod
+    def dialect(cls):
+        """Return SQL dialect helpers of the active backend."""
+        return cls.backend().dialect
+    
+    @classmethod
+    def configure(cls, backend):
+        """Switch to another backend, closing pooled connections of the old one.
+        
+        Args:
+            backend: Backend instance (see config.backends)
+        """
+        cls._close_pool(cls._connection_pool)
+        cls._backend = backend
+    
+    @classmethod
+    def replica_backend(cls):
+        """Return the read replica backend, or None when no replica is configured."""
+        if not cls._replica_configured:
+            cls._replica_backend = create_replica_backend()
+            cls._replica_configured = True
+        return cls._replica_backend
+    
+    @classmethod
+    def configure_replica(cls, backend):
+        """Switch the read replica (None disables replica routing).
+        
+        Args:
+            backend: Backend instance (see config.backends) or None
+        """
+        cls._close_pool(cls._replica_pool)
+        cls._replica_backend = backend
+        cls._replica_configured = True
+        ReadRouter.reset()
+    
+    @classmethod
+    def _use_replica(cls):
+        """Decide whether a read-only cursor may be served by the replica."""
+        backend = cls.replica_backend()
+        if backend is None or ReadRouter.pinned_to_primary():
+            return False
+        if ReadRouter.lag_check_due():
+            cls._check_replica_lag(backend)
+        return ReadRouter.replica_ok()
     
     @classmethod
-    def get_connection(cls):
-        """Get a database connection from the pool or create a new one."""
-        if cls._connection_pool:
-            conn = cls._connection_pool.pop()
+    def _check_replica_lag(cls, backend):
+        """Measure replication lag; one thread checks while others use the last result."""
+        if not cls._replica_lock.acquire(blocking=False):
+            return
+        try:
+            if not ReadRouter.lag_check_due():
+                return
+            lag = None
+            conn = None
+            try:
+                conn = cls.get_connection(replica=True)
+                lag = backend.replication_lag(conn)
+            except Exception as e:
+                logger.warning(f"Read replica lag check failed: {e}")
+            finally:
+                if conn is not None:
+                    cls.release_connection(conn, replica=True)
+            ReadRouter.record_lag(lag)
+        finally:
+            cls._replica_lock.release()
+    
+    @classmethod
+    def get_connection(cls, replica=False):
+        """Get a database connection from the pool or create a new one.
+        
+        Args:
+            replica: Take the connection from the read replica pool
+        """
+        if not QueryStats.enabled:
+            return cls._acquire_connection(replica)
+        
+        started = time.perf_counter()
+        try:
+            return cls._acquire_connection(replica)
+        finally:
+            QueryStats.record_pool_wait((time.perf_counter() - started) * 1000)
+    
+    @classmethod
+    def _acquire_connection(cls, replica=False):
+        """Pop a live pooled connection, falling back to a new one."""
+        pool = cls._replica_pool if replica else cls._connection_pool
+        backend = cls.replica_backend() if replica else cls.backend()
+        if pool:
+            conn = pool.pop()
             try:
-                conn.ping(reconnect=True)
+                backend.ping(conn)
+                cls._count_checkout(reused=True)
                 return conn
             except:
                 pass
         
-        return cls._create_connection()
+        conn = cls._create_connection(backend)
+        cls._count_checkout(reused=False)
+        return conn
+    
+    @classmethod
+    def _count_checkout(cls, reused):
+        with cls._stats_lock:
+            cls._in_use += 1
+            if reused:
+                cls._reused += 1
+            else:
+                cls._created += 1
+    
+    @classmethod
+    def pool_stats(cls):
+        """Return pool utilization counters.
+        
+        Returns:
+            Dictionary with size (max idle connections kept), idle, in_use,
+            created and reused counts (primary and replica together), plus
+            replica_idle and replica_reads
+        """
+        with cls._stats_lock:
+            return {
+                'size': cls._pool_size,
+                'idle': len(cls._connection_pool),
+                'in_use': cls._in_use,
+                'created': cls._created,
+                'reused': cls._reused,
+                'replica_idle': len(cls._replica_pool),
+                'replica_reads': cls._replica_reads,
+            }
+    
+    @classmethod
+    def warmup(cls, connections=None):
+        """Open pooled connections ahead of the first requests.
+        
+        Args:
+            connections: Idle connections to have ready (capped at the pool
+                size; default: the pool size)
+            
+        Returns:
+            Number of idle primary connections afterwards
+            
+        With a read replica configured, its lag is measured as well so the
+        first reads are routed on a fresh measurement.
+        """
+        wanted = cls._pool_size if connections is None else min(connections, cls._pool_size)
+        opened = []
+        try:
+            for _ in range(wanted):
+                opened.append(cls.get_connection())
+        finally:
+            for conn in opened:
+                cls.release_connection(conn)
+        replica = cls.replica_backend()
+        if replica is not None:
+            cls._check_replica_lag(replica)
+        return len(cls._connection_pool)
+    
+    @classmethod
+    def reset_after_fork(cls):
+        """Forget connections and locks inherited from a parent process.
+        
+        Registered with os.register_at_fork, so every forked worker opens its
+        own connections instead of sharing the parent's sockets. Inherited
+        connections are dropped, not close()d: closing would send QUIT over a
+        socket the parent still uses.
+        """
+        cls._connection_pool = []
+        cls._replica_pool = []
+        cls._replica_lock = threading.Lock()
+        cls._stats_lock = threading.Lock()
+        cls._in_use = 0
+        cls._created = 0
+        cls._reused = 0
+        cls._replica_reads = 0
     
     @classmethod
-    def _create_connection(cls):
+    def _create_connection(cls, backend=None):
         """Create a new database connection."""
         try:
-            connection = pymysql.connect(
-                host=Settings.DB_HOST,
-                port=Settings.DB_PORT,
-                user=Settings.DB_USER,
-                password=Settings.DB_PASSWORD,
-                database=Settings.DB_NAME,
-                charset='utf8mb4',
-                cursorclass=DictCursor,
-                autocommit=False
-            )
-            logger.info("Database connection established")
-            return connection
+            return (backend or cls.backend()).connect()
         except Exception as e:
             logger.error(f"Failed to connect to database: {e}")
             raise
     
     @classmethod
-    def release_connection(cls, conn):
-        """Return a connection to the pool."""
-        if conn and len(cls._connection_pool) < cls._pool_size:
+    def release_connection(cls, conn, replica=False):
+        """Return a connection to the pool.
+        
+        Args:
+            conn: Connection from get_connection()
+            replica: Whether it came from the read replica pool
+        """
+        pool = cls._replica_pool if replica else cls._connection_pool
+        backend = cls.replica_backend() if replica else cls.backend()
+        with cls._stats_lock:
+            cls._in_use = max(cls._in_use - 1, 0)
+        if conn and len(pool) < cls._pool_size:
             try:
-                conn.ping(reconnect=True)
-                cls._connection_pool.append(conn)
+                backend.ping(conn)
+                pool.append(conn)
             except:
                 try:
                     conn.close()
@@ -66,25 +426,80 @@ class DatabaseConnection:
             except:
                 pass
     
+    @classmethod
+    def _checkout(cls, commit):
+        """Pick the pool for a cursor: (connection, from_replica)."""
+        replica = not commit and cls._use_replica()
+        if replica:
+            try:
+                conn = cls.get_connection(replica=True)
+            except Exception:
+                ReadRouter.record_lag(None)
+                replica = False
+        if not replica:
+            return cls.get_connection(), False
+        with cls._stats_lock:
+            cls._replica_reads += 1
+        return conn, True
+    
+    @classmethod
+    def _wrap_cursor(cls, conn, replica, tuples=False):
+        cursor = (cls.replica_backend() if replica else cls.backend()).cursor(conn, tuples)
+        if QueryStats.is_active():
+            cursor = _InstrumentedCursor(cursor)
+        return cursor
+    
+    @classmethod
+    def session(cls, atomic=True):
+        """Unit of work binding one connection to the current request.
+        
+        Args:
+            atomic: Commit once when the outermost atomic block exits (rolled
+                back on error); False commits each write immediately but still
+                reuses the connection
+            
+        Returns:
+            UnitOfWork usable with both 'with' and 'async with'
+            
+        Usage:
+            with DatabaseConnection.session():
+                user = User.create(...)
+                Category.create_default_categories(user.id, categories)
+        """
+        return UnitOfWork(atomic)
+    
     @classmethod
     @contextmanager
-    def get_cursor(cls, commit=True):
+    def get_cursor(cls, commit=True, tuples=False):
         """Context manager for database operations.
         
         Args:
             commit: Whether to commit the transaction (default: True)
+            tuples: Return rows as tuples in SELECT order instead of dicts
+            
+        Read-only cursors (commit=False) are served by the read replica when
+        one is configured and ReadRouter allows it; committing cursors always
+        use the primary and pin the current request to it. Inside a session()
+        the session's connection is reused instead of the pool.
             
         Usage:
             with DatabaseConnection.get_cursor() as cursor:
                 cursor.execute("SELECT * FROM users")
                 results = cursor.fetchall()
         """
-        conn = cls.get_connection()
-        cursor = conn.cursor()
+        session = _current_session.get()
+        if session is not None:
+            with session.cursor(commit, tuples) as cursor:
+                yield cursor
+            return
+        
+        conn, replica = cls._checkout(commit)
+        cursor = cls._wrap_cursor(conn, replica, tuples)
         try:
             yield cursor
             if commit:
                 conn.commit()
+                ReadRouter.note_write()
             else:
                 # End read-only transaction so pooled connections do not keep stale snapshots.
                 conn.rollback()
@@ -94,10 +509,10 @@ class DatabaseConnection:
             raise
         finally:
             cursor.close()
-            cls.release_connection(conn)
+            cls.release_connection(conn, replica=replica)
     
     @classmethod
-    def execute_query(cls, query, params=None, fetch_one=False, commit=True):
+    def execute_query(cls, query, params=None, fetch_one=False, commit=True, tuples=False):
         """Execute a query and return results.
         
         Args:
@@ -105,16 +520,41 @@ class DatabaseConnection:
             params: Query parameters (tuple or dict)
             fetch_one: Return single row instead of all rows
             commit: Whether to commit the transaction
+            tuples: Return rows as tuples in SELECT order instead of dicts
             
         Returns:
             Query results or None
         """
-        with cls.get_cursor(commit=commit) as cursor:
+        with cls.get_cursor(commit=commit, tuples=tuples) as cursor:
             cursor.execute(query, params or ())
             if fetch_one:
                 return cursor.fetchone()
             return cursor.fetchall()
     
+    @classmethod
+    def iter_query(cls, query, params=None, batch_size=500):
+        """Yield rows of a read-only query as tuples, batch_size at a time.
+        
+        Args:
+            query: SQL query string (columns in the order callers unpack)
+            params: Query parameters (tuple or dict)
+            batch_size: Rows fetched from the cursor per round
+            
+        Yields:
+            Row tuples in SELECT order
+            
+        The cursor (and, outside a session, its pooled connection) is held
+        until the generator is exhausted or closed, so consume it promptly or
+        wrap it in contextlib.closing().
+        """
+        with cls.get_cursor(commit=False, tuples=True) as cursor:
+            cursor.execute(query, params or ())
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                yield from rows
+    
     @classmethod
     def execute_many(cls, query, params_list):
         """Execute a query multiple times with different parameters.
@@ -130,13 +570,22 @@ class DatabaseConnection:
             cursor.executemany(query, params_list)
             return cursor.rowcount
     
-    @classmethod
-    def close_all_connections(cls):
-        """Close all connections in the pool."""
-        while cls._connection_pool:
-            conn = cls._connection_pool.pop()
+    @staticmethod
+    def _close_pool(pool):
+        while pool:
+            conn = pool.pop()
             try:
                 conn.close()
             except:
                 pass
+    
+    @classmethod
+    def close_all_connections(cls):
+        """Close all connections in the primary and replica pools."""
+        cls._close_pool(cls._connection_pool)
+        cls._close_pool(cls._replica_pool)
         logger.info("All database connections closed")
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=DatabaseConnection.reset_after_fork)
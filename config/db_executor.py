@@ -0,0 +1,76 @@
+"""Bounded thread pool for blocking database work called from async code.
+
+The DB layer (PyMySQL / sqlite3) is synchronous. Async API routes hand their
+DB work to DBExecutor.run() instead of blocking the event loop, so the number
+of open requests is limited only by the event loop; at most
+API_DB_THREADS of them touch the database at a time, the rest wait on the
+loop without holding a thread. Since the connection pool grows on demand,
+API_DB_THREADS is also the ceiling on connections a worker opens.
+
+Each call runs in a copy of the caller's contextvars, so the request's unit
+of work (DatabaseConnection.session()), read-routing scope and trace span
+are visible inside the thread.
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+from config.settings import Settings
+
+T = TypeVar('T')
+
+
+class DBExecutor:
+    """Process-wide executor for blocking DB calls (created on first use)."""
+
+    _executor: Optional[ThreadPoolExecutor] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def executor(cls) -> ThreadPoolExecutor:
+        """Return the executor, sized by API_DB_THREADS."""
+        if cls._executor is None:
+            with cls._lock:
+                if cls._executor is None:
+                    cls._executor = ThreadPoolExecutor(
+                        max_workers=max(1, Settings.API_DB_THREADS), thread_name_prefix='montrixa-db'
+                    )
+        return cls._executor
+
+    @classmethod
+    async def run(cls, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run func(*args, **kwargs) on the DB executor and await its result.
+
+        Args:
+            func: Blocking callable
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            func's return value (its exception is re-raised here)
+        """
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, func, *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(cls.executor(), call)
+
+    @classmethod
+    def shutdown(cls, wait: bool = True) -> None:
+        """Stop the executor; the next run() creates a new one."""
+        with cls._lock:
+            executor, cls._executor = cls._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    @classmethod
+    def reset_after_fork(cls) -> None:
+        """Forget the parent's executor; its threads do not exist in a forked child."""
+        cls._executor = None
+        cls._lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=DBExecutor.reset_after_fork)
@@ -0,0 +1,309 @@
+"""Versioned schema migrations.
+
+Migration files live in migrations/versions/ and are applied in version
+order, once each; applied versions are recorded in schema_migrations.
+
+File names are NNNN_name.sql or NNNN_name.py, optionally restricted to one
+backend with a .mysql/.sqlite tag (NNNN_name.mysql.sql). SQL files are split
+on ';'. Python files define upgrade(migrator) and must go through
+migrator.execute() and migrator.backfill() so dry runs stay read-only.
+
+On MySQL, ALTER TABLE and CREATE INDEX statements are sent with
+ALGORITHM=INPLACE, LOCK=NONE (see Dialect.online_ddl) unless
+MIGRATION_ONLINE_DDL is off; MySQL then fails the statement rather than
+locking the table. Large data changes belong in backfill(), which updates
+in primary-key chunks, commits each chunk and throttles between them.
+"""
+
+import hashlib
+import importlib.util
+import os
+import re
+import time
+from typing import Any, Dict, List, Optional, Sequence
+from config.database import DatabaseConnection
+from config.backends import MIGRATIONS_DIR
+from config.settings import Settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+VERSIONS_DIR = os.path.join(MIGRATIONS_DIR, 'versions')
+
+_FILE_RE = re.compile(r'^(\d{4})_([a-z0-9_]+)(?:\.(mysql|sqlite))?\.(sql|py)$')
+
+SCHEMA_MIGRATIONS_DDL = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version VARCHAR(32) NOT NULL PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        checksum CHAR(64) NOT NULL,
+        execution_ms INT NOT NULL DEFAULT 0,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+class MigrationError(Exception):
+    """A migration could not be discovered or applied."""
+
+
+def split_statements(script: str) -> List[str]:
+    """Split a SQL script into statements, dropping '--' comment lines.
+
+    Args:
+        script: SQL text with each statement ending in ';' at the end of a
+            line; BEGIN ... END; bodies (SQLite triggers) stay in one statement
+
+    Returns:
+        Non-empty statements without the trailing ';'
+    """
+    statements, current, depth = [], [], 0
+    for line in script.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith('--'):
+            continue
+        current.append(line)
+        upper = stripped.upper()
+        if upper == 'BEGIN' or upper.endswith(' BEGIN'):
+            depth += 1
+        elif upper in ('END', 'END;') and depth:
+            depth -= 1
+        if stripped.endswith(';') and not depth:
+            statements.append('\n'.join(current).strip().rstrip(';').strip())
+            current = []
+    if current:
+        statements.append('\n'.join(current).strip().rstrip(';').strip())
+    return [s for s in statements if s]
+
+
+class Migration:
+    """One migration file."""
+
+    def __init__(self, version: str, name: str, path: str):
+        self.version = version
+        self.name = name
+        self.path = path
+
+    @property
+    def kind(self) -> str:
+        return os.path.splitext(self.path)[1][1:]
+
+    @property
+    def checksum(self) -> str:
+        with open(self.path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    def __repr__(self):
+        return f"<Migration {self.version}_{self.name}>"
+
+
+class Migrator:
+    """Discover, plan and apply migrations against DatabaseConnection."""
+
+    def __init__(self, directory: str = VERSIONS_DIR, dry_run: bool = False,
+                 online: Optional[bool] = None):
+        """Initialize the migrator.
+
+        Args:
+            directory: Folder holding migration files
+            dry_run: Log statements and backfill plans instead of running them
+            online: Add online DDL options (defaults to MIGRATION_ONLINE_DDL)
+        """
+        self.directory = directory
+        self.dry_run = dry_run
+        self.online = Settings.MIGRATION_ONLINE_DDL if online is None else online
+        self.statements: List[str] = []
+
+    def discover(self) -> List[Migration]:
+        """Migration files for the configured backend, in version order.
+
+        Raises:
+            MigrationError: If two files for this backend share a version
+        """
+        backend = DatabaseConnection.backend().name
+        migrations: Dict[str, Migration] = {}
+        for filename in sorted(os.listdir(self.directory)):
+            match = _FILE_RE.match(filename)
+            if not match:
+                continue
+            version, name, only, _ = match.groups()
+            if only and only != backend:
+                continue
+            if version in migrations:
+                raise MigrationError(
+                    f"Duplicate migration version {version}: {migrations[version].path} and {filename}"
+                )
+            migrations[version] = Migration(version, name, os.path.join(self.directory, filename))
+        return [migrations[v] for v in sorted(migrations)]
+
+    def applied(self) -> Dict[str, Dict[str, Any]]:
+        """Rows of schema_migrations keyed by version (empty before the first run)."""
+        exists = DatabaseConnection.execute_query(
+            DatabaseConnection.dialect().table_exists(), ('schema_migrations',),
+            fetch_one=True, commit=False
+        )
+        if not exists['n']:
+            return {}
+        rows = DatabaseConnection.execute_query(
+            "SELECT version, name, checksum, execution_ms, applied_at FROM schema_migrations",
+            commit=False
+        )
+        return {row['version']: row for row in rows}
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Every known migration with whether it is applied and whether its file changed."""
+        applied = self.applied()
+        result = []
+        for migration in self.discover():
+            row = applied.get(migration.version)
+            result.append({
+                'version': migration.version,
+                'name': migration.name,
+                'applied_at': row['applied_at'] if row else None,
+                'changed': bool(row) and row['checksum'] != migration.checksum,
+            })
+        return result
+
+    def pending(self, target: Optional[str] = None) -> List[Migration]:
+        """Migrations not applied yet, up to and including target."""
+        applied = self.applied()
+        return [m for m in self.discover()
+                if m.version not in applied and (target is None or m.version <= target)]
+
+    def migrate(self, target: Optional[str] = None) -> List[Migration]:
+        """Apply pending migrations in order.
+
+        Args:
+            target: Stop after this version (default: apply all)
+
+        Returns:
+            Migrations applied (or, in a dry run, that would be applied)
+
+        Raises:
+            MigrationError: If a migration fails; earlier ones stay recorded.
+                MySQL commits DDL implicitly, so a failed multi-statement
+                migration may be partially applied and should be written to
+                be safe to re-run.
+        """
+        pending = self.pending(target)
+        if not self.dry_run and pending:
+            DatabaseConnection.execute_query(SCHEMA_MIGRATIONS_DDL)
+        for migration in pending:
+            logger.info(f"{'[dry-run] ' if self.dry_run else ''}Applying {migration.version}_{migration.name}")
+            started = time.perf_counter()
+            try:
+                self._apply(migration)
+            except Exception as e:
+                raise MigrationError(f"Migration {migration.version}_{migration.name} failed: {e}") from e
+            if not self.dry_run:
+                elapsed_ms = int((time.perf_counter() - started) * 1000)
+                DatabaseConnection.execute_query(
+                    "INSERT INTO schema_migrations (version, name, checksum, execution_ms) "
+                    "VALUES (%s, %s, %s, %s)",
+                    (migration.version, migration.name, migration.checksum, elapsed_ms)
+                )
+                logger.info(f"Applied {migration.version}_{migration.name} in {elapsed_ms} ms")
+        return pending
+
+    def _apply(self, migration: Migration) -> None:
+        if migration.kind == 'sql':
+            with open(migration.path, encoding='utf-8') as f:
+                for statement in split_statements(f.read()):
+                    self.execute(statement)
+            return
+        spec = importlib.util.spec_from_file_location(
+            f"migration_{migration.version}_{migration.name}", migration.path
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        module.upgrade(self)
+
+    def execute(self, statement: str, params: Optional[Sequence[Any]] = None) -> None:
+        """Run one statement (logged only in a dry run), with online DDL options on MySQL.
+
+        Args:
+            statement: SQL statement
+            params: Query parameters
+        """
+        if self.online:
+            statement = DatabaseConnection.dialect().online_ddl(statement)
+        self.statements.append(statement)
+        if self.dry_run:
+            logger.info(f"[dry-run] {' '.join(statement.split())}")
+            return
+        with DatabaseConnection.get_cursor() as cursor:
+            # No params: pass None so literal '%' (DATE_FORMAT) is not treated as a placeholder
+            cursor.execute(statement, tuple(params) if params else None)
+
+    def index_exists(self, table: str, name: str) -> bool:
+        """Whether table already has an index called name (for idempotent migrations)."""
+        row = DatabaseConnection.execute_query(
+            DatabaseConnection.dialect().index_exists(), (table, name), fetch_one=True, commit=False
+        )
+        return bool(row['n'])
+
+    def backfill(self, table: str, assignments: str, where: str = '1 = 1',
+                 params: Sequence[Any] = (), key: str = 'id',
+                 batch_size: Optional[int] = None, pause_ms: Optional[float] = None) -> int:
+        """UPDATE a large table in key-range chunks, one commit per chunk.
+
+        Args:
+            table: Table to update
+            assignments: SET clause, e.g. "amount_cents = amount * 100"
+            where: Extra filter; make it exclude already backfilled rows so
+                an interrupted backfill can simply be re-run
+            params: Parameters for assignments and where, in that order
+            key: Integer primary key column to chunk on
+            batch_size: Key range per chunk (default MIGRATION_BACKFILL_BATCH)
+            pause_ms: Sleep between chunks (default MIGRATION_BACKFILL_PAUSE_MS)
+
+        Returns:
+            Rows updated (0 in a dry run)
+
+        Between chunks the backfill also waits while a configured read
+        replica lags more than DB_REPLICA_MAX_LAG_SECONDS.
+        """
+        batch_size = batch_size or Settings.MIGRATION_BACKFILL_BATCH
+        pause_ms = Settings.MIGRATION_BACKFILL_PAUSE_MS if pause_ms is None else pause_ms
+        bounds = DatabaseConnection.execute_query(
+            f"SELECT MIN({key}) AS low, MAX({key}) AS high FROM {table}", fetch_one=True, commit=False
+        )
+        if bounds['low'] is None:
+            return 0
+        low, high = int(bounds['low']), int(bounds['high'])
+        chunks = (high - low) // batch_size + 1
+        query = (f"UPDATE {table} SET {assignments} "
+                 f"WHERE {key} >= %s AND {key} < %s AND ({where})")
+        if self.dry_run:
+            logger.info(f"[dry-run] {query} -- {chunks} chunks of {batch_size} over {key} {low}..{high}")
+            self.statements.append(query)
+            return 0
+
+        updated = 0
+        for index, start in enumerate(range(low, high + 1, batch_size), start=1):
+            with DatabaseConnection.get_cursor() as cursor:
+                cursor.execute(query, (*params, start, start + batch_size))
+                updated += max(cursor.rowcount, 0)
+            if index % 100 == 0 or index == chunks:
+                logger.info(f"Backfill {table}: chunk {index}/{chunks}, {updated} rows updated")
+            if index < chunks:
+                self._throttle(pause_ms)
+        return updated
+
+    @staticmethod
+    def _throttle(pause_ms: float) -> None:
+        if pause_ms > 0:
+            time.sleep(pause_ms / 1000)
+        backend = DatabaseConnection.replica_backend()
+        if backend is None:
+            return
+        while True:
+            conn = DatabaseConnection.get_connection(replica=True)
+            try:
+                lag = backend.replication_lag(conn)
+            finally:
+                DatabaseConnection.release_connection(conn, replica=True)
+            if lag is None or lag <= Settings.DB_REPLICA_MAX_LAG_SECONDS:
+                return
+            logger.info(f"Replica {lag:.0f}s behind; pausing backfill")
+            time.sleep(1)
@@ -0,0 +1,296 @@
+"""Monthly RANGE partitioning of the transactions table (MySQL only).
+
+Partitions are named pYYYYMM and hold one calendar month of
+transaction_date; a trailing pmax partition (VALUES LESS THAN MAXVALUE)
+catches anything beyond the last planned month. Report, budget and trend
+queries all filter on a transaction_date range, so MySQL prunes them to the
+months they touch.
+
+MySQL does not allow foreign keys on partitioned tables and every unique key
+must contain the partition column, so partitioning drops the two foreign keys
+(users and categories are soft-deleted, so no cascade is lost) and widens the
+primary key to (id, transaction_date).
+"""
+
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from config.database import DatabaseConnection
+from config.query_stats import QueryStats
+import logging
+
+logger = logging.getLogger(__name__)
+
+TABLE = 'transactions'
+MAX_PARTITION = 'pmax'
+ARCHIVE_PREFIX = 'transactions_archive_'
+
+
+def month_start(value: date) -> date:
+    """First day of value's month."""
+    return value.replace(day=1)
+
+
+def add_months(value: date, months: int) -> date:
+    """First day of the month `months` after value's month."""
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Partition name (pYYYYMM) holding month."""
+    return f"p{month.year:04d}{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """Month a pYYYYMM partition holds, None for pmax or foreign names."""
+    if len(name) != 7 or not name.startswith('p') or not name[1:].isdigit():
+        return None
+    return date(int(name[1:5]), int(name[5:7]), 1)
+
+
+def partition_clause(month: date) -> str:
+    """PARTITION definition for one month."""
+    return f"PARTITION {partition_name(month)} VALUES LESS THAN ('{add_months(month, 1).isoformat()}')"
+
+
+def plan_future(existing: Iterable[str], today: date, months_ahead: int) -> List[date]:
+    """Months that still need a partition to cover up to today + months_ahead.
+
+    Args:
+        existing: Current partition names
+        today: Reference date
+        months_ahead: Number of months after today's month to cover
+
+    Returns:
+        Missing months in ascending order, starting after the last existing one
+    """
+    months = [m for m in (partition_month(n) for n in existing) if m]
+    first = add_months(max(months), 1) if months else month_start(today)
+    last = add_months(today, months_ahead)
+    planned = []
+    while first <= last:
+        planned.append(first)
+        first = add_months(first, 1)
+    return planned
+
+
+def plan_archive(existing: Iterable[str], before: date) -> List[str]:
+    """Partitions holding only months before `before`'s month, oldest first."""
+    cutoff = month_start(before)
+    return sorted(n for n in existing if (partition_month(n) or cutoff) < cutoff)
+
+
+class TransactionPartitions:
+    """Create, extend, archive and inspect transactions partitions."""
+
+    @staticmethod
+    def supported() -> bool:
+        """Whether the configured backend supports table partitioning."""
+        return DatabaseConnection.backend().name == 'mysql'
+
+    @staticmethod
+    def list_partitions() -> List[Dict[str, Any]]:
+        """Partitions of transactions in ordinal order (empty if unpartitioned).
+
+        Returns:
+            Dicts with name, description (upper bound) and rows (estimate)
+        """
+        query = """
+            SELECT PARTITION_NAME AS name, PARTITION_DESCRIPTION AS description,
+                   TABLE_ROWS AS `rows`
+            FROM information_schema.PARTITIONS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+            AND PARTITION_NAME IS NOT NULL
+            ORDER BY PARTITION_ORDINAL_POSITION
+        """
+        return DatabaseConnection.execute_query(query, (TABLE,), commit=False)
+
+    @staticmethod
+    def foreign_keys() -> List[str]:
+        """Names of the foreign keys defined on transactions."""
+        query = """
+            SELECT CONSTRAINT_NAME AS name
+            FROM information_schema.TABLE_CONSTRAINTS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+            AND CONSTRAINT_TYPE = 'FOREIGN KEY'
+        """
+        return [row['name'] for row in DatabaseConnection.execute_query(query, (TABLE,), commit=False)]
+
+    @staticmethod
+    def partition_ddl(first_month: date, last_month: date,
+                      foreign_keys: Sequence[str] = ()) -> List[str]:
+        """Statements that turn transactions into a monthly partitioned table.
+
+        Args:
+            first_month: Oldest month to get its own partition
+            last_month: Newest month to get its own partition
+            foreign_keys: Foreign key names to drop first
+
+        Returns:
+            ALTER TABLE statements, in order
+        """
+        statements = [f"ALTER TABLE {TABLE} DROP FOREIGN KEY `{fk}`" for fk in foreign_keys]
+        statements.append(
+            f"ALTER TABLE {TABLE} DROP PRIMARY KEY, ADD PRIMARY KEY (id, transaction_date)"
+        )
+        clauses = []
+        month = month_start(first_month)
+        while month <= last_month:
+            clauses.append(partition_clause(month))
+            month = add_months(month, 1)
+        clauses.append(f"PARTITION {MAX_PARTITION} VALUES LESS THAN (MAXVALUE)")
+        statements.append(
+            f"ALTER TABLE {TABLE} PARTITION BY RANGE COLUMNS(transaction_date) (\n    "
+            + ",\n    ".join(clauses) + "\n)"
+        )
+        return statements
+
+    @staticmethod
+    def future_ddl(months: Sequence[date]) -> Optional[str]:
+        """REORGANIZE statement splitting new monthly partitions off pmax."""
+        if not months:
+            return None
+        clauses = [partition_clause(m) for m in months]
+        clauses.append(f"PARTITION {MAX_PARTITION} VALUES LESS THAN (MAXVALUE)")
+        return (f"ALTER TABLE {TABLE} REORGANIZE PARTITION {MAX_PARTITION} INTO (\n    "
+                + ",\n    ".join(clauses) + "\n)")
+
+    @staticmethod
+    def archive_ddl(name: str, drop: bool = False) -> List[str]:
+        """Statements that move one partition out of transactions.
+
+        Args:
+            name: Partition to archive
+            drop: Discard its rows instead of keeping them in an archive table
+
+        Returns:
+            Statements, in order. Without drop the rows are swapped into
+            transactions_archive_<name> with EXCHANGE PARTITION (a metadata
+            operation), then the emptied partition is dropped.
+        """
+        drop_partition = f"ALTER TABLE {TABLE} DROP PARTITION {name}"
+        if drop:
+            return [drop_partition]
+        archive = ARCHIVE_PREFIX + name
+        return [
+            f"CREATE TABLE {archive} LIKE {TABLE}",
+            f"ALTER TABLE {archive} REMOVE PARTITIONING",
+            f"ALTER TABLE {TABLE} EXCHANGE PARTITION {name} WITH TABLE {archive}",
+            drop_partition,
+        ]
+
+    @staticmethod
+    def _run(statements: Iterable[str]) -> None:
+        for statement in statements:
+            logger.info(f"Executing: {' '.join(statement.split())[:120]}")
+            DatabaseConnection.execute_query(statement)
+
+    @staticmethod
+    def apply(months_ahead: int = 3, today: Optional[date] = None) -> bool:
+        """Partition transactions by month, from its oldest row to today + months_ahead.
+
+        The ALTER rebuilds the whole table; run it in a maintenance window.
+
+        Returns:
+            True if the table was partitioned, False if it already was
+        """
+        if TransactionPartitions.list_partitions():
+            logger.info("transactions is already partitioned")
+            return False
+        today = today or date.today()
+        row = DatabaseConnection.execute_query(
+            f"SELECT MIN(transaction_date) AS oldest FROM {TABLE}", fetch_one=True, commit=False
+        )
+        oldest = row['oldest'] if row and row['oldest'] else today
+        TransactionPartitions._run(TransactionPartitions.partition_ddl(
+            month_start(min(oldest, today)), add_months(today, months_ahead),
+            TransactionPartitions.foreign_keys(),
+        ))
+        return True
+
+    @staticmethod
+    def ensure_future(months_ahead: int = 3, today: Optional[date] = None) -> List[str]:
+        """Pre-create monthly partitions up to today + months_ahead.
+
+        Returns:
+            Names of the partitions created (empty if unpartitioned or up to date)
+        """
+        existing = [p['name'] for p in TransactionPartitions.list_partitions()]
+        if not existing:
+            return []
+        months = plan_future(existing, today or date.today(), months_ahead)
+        statement = TransactionPartitions.future_ddl(months)
+        if statement:
+            TransactionPartitions._run([statement])
+        return [partition_name(m) for m in months]
+
+    @staticmethod
+    def archive(before: date, drop: bool = False) -> List[str]:
+        """Archive (or drop) every monthly partition older than before's month.
+
+        Returns:
+            Names of the partitions removed from transactions
+        """
+        existing = [p['name'] for p in TransactionPartitions.list_partitions()]
+        names = plan_archive(existing, before)
+        for name in names:
+            TransactionPartitions._run(TransactionPartitions.archive_ddl(name, drop))
+        return names
+
+    @staticmethod
+    def explain_partitions(query: str, params: Any = None) -> List[Dict[str, Any]]:
+        """Partitions each table of a statement's plan reads.
+
+        Returns:
+            One dict per plan row on a partitioned table: table and partitions
+            (list of names)
+        """
+        plan = DatabaseConnection.execute_query(f"EXPLAIN {query}", params, commit=False)
+        return [
+            {'table': row['table'], 'partitions': row['partitions'].split(',')}
+            for row in plan if row.get('partitions')
+        ]
+
+    @staticmethod
+    def capture_report_statements(user_id: int, today: Optional[date] = None) -> List[Tuple[str, Any]]:
+        """Run the report, trend and budget reads for one user and collect their statements."""
+        from models.budget import Budget
+        from models.transaction import Transaction
+        from services.report_service import ReportService
+
+        today = today or date.today()
+        first = month_start(today)
+        with QueryStats.capture_statements() as statements:
+            ReportService.get_reports(user_id, first, today)
+            ReportService.get_expense_by_category(user_id, first, today)
+            ReportService.get_daily_trend(user_id, today - timedelta(days=29), today)
+            Transaction.get_by_user(user_id, start_date=first, end_date=today)
+            budgets = Budget.get_by_user(user_id)
+            if budgets:
+                Budget.get_spent_minor_amounts(budgets, today)
+        return [(q, a) for q, a in statements if f' {TABLE}' in q]
+
+    @staticmethod
+    def verify_pruning(user_id: int, today: Optional[date] = None) -> List[Dict[str, Any]]:
+        """EXPLAIN the report reads and report how many partitions each one touches.
+
+        Args:
+            user_id: User whose reports to run
+            today: Reference date (defaults to today)
+
+        Returns:
+            One dict per statement: query (one line), partitions read,
+            total partitions and pruned (True if fewer than all were read)
+        """
+        total = len(TransactionPartitions.list_partitions())
+        results = []
+        for query, params in TransactionPartitions.capture_report_statements(user_id, today):
+            plan = TransactionPartitions.explain_partitions(query, params)
+            read = sorted({p for row in plan for p in row['partitions']})
+            results.append({
+                'query': ' '.join(query.split()),
+                'partitions': read,
+                'total': total,
+                'pruned': bool(read) and len(read) < total,
+            })
+        return results
@@ -0,0 +1,247 @@
+"""Opt-in query instrumentation for DatabaseConnection."""
+
+import logging
+import os
+import re
+import sys
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .settings import Settings
+
+logger = logging.getLogger(__name__)
+
+_COMMENT_RE = re.compile(r'(--[^\n]*|/\*.*?\*/)', re.DOTALL)
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_RE = re.compile(r'%s|%\(\w+\)s|\?')
+_IN_LIST_RE = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Frames from the config package and the standard library are skipped when
+# resolving the call site of a query.
+_INTERNAL_DIRS = (
+    os.path.dirname(os.path.abspath(__file__)),
+    os.path.dirname(os.path.abspath(threading.__file__)),
+)
+
+
+def fingerprint(query: str) -> str:
+    """Normalize a SQL statement so calls differing only in literals group together.
+
+    Args:
+        query: SQL query string
+
+    Returns:
+        Normalized SQL fingerprint
+    """
+    text = _COMMENT_RE.sub(' ', query)
+    text = _STRING_RE.sub('?', text)
+    text = _NUMBER_RE.sub('?', text)
+    text = _PLACEHOLDER_RE.sub('?', text)
+    text = _IN_LIST_RE.sub('(?+)', text)
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Return the pct-th percentile (0-100) of values using linear interpolation."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return float(ordered[0])
+    rank = (len(ordered) - 1) * (pct / 100.0)
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return float(ordered[low] + (ordered[high] - ordered[low]) * (rank - low))
+
+
+def summarize(values: Sequence[float]) -> Dict[str, float]:
+    """Return count/p50/p95/p99/max for a window of timings (milliseconds)."""
+    return {
+        'count': len(values),
+        'p50_ms': round(percentile(values, 50), 3),
+        'p95_ms': round(percentile(values, 95), 3),
+        'p99_ms': round(percentile(values, 99), 3),
+        'max_ms': round(max(values), 3) if values else 0.0,
+    }
+
+
+def _call_site() -> str:
+    """Return 'file:line in function' of the first frame outside the database layer."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if not filename.startswith(_INTERNAL_DIRS):
+            return f"{os.path.relpath(filename)}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return 'unknown'
+
+
+class _StatementStats:
+    """Aggregated timings for one SQL fingerprint."""
+
+    __slots__ = ('calls', 'total_ms', 'max_ms', 'rows', 'durations')
+
+    def __init__(self, window: int):
+        self.calls = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.durations = deque(maxlen=window)
+
+
+class QueryStats:
+    """Per-statement timing, rows and pool wait statistics.
+
+    Disabled by default; enable with DB_INSTRUMENTATION=true. Listeners registered
+    through add_listener() receive every statement even when the aggregated
+    statistics are disabled.
+    """
+
+    enabled = Settings.DB_INSTRUMENTATION
+    slow_query_ms = Settings.DB_SLOW_QUERY_MS
+    window = Settings.DB_STATS_WINDOW
+
+    _lock = threading.Lock()
+    _statements: Dict[str, _StatementStats] = {}
+    _pool_waits = deque(maxlen=Settings.DB_STATS_WINDOW)
+    _listeners: List[Callable[[str, str, float, int], None]] = []
+    _captures: List[List[Tuple[str, Any]]] = []
+
+    @classmethod
+    def is_active(cls) -> bool:
+        """Whether statements should be timed at all."""
+        return cls.enabled or bool(cls._listeners) or bool(cls._captures)
+
+    @classmethod
+    @contextmanager
+    def capture_statements(cls) -> Iterator[List[Tuple[str, Any]]]:
+        """Collect (query, args) of every statement executed inside the block.
+
+        Meant for tooling that re-runs real statements, e.g. under EXPLAIN.
+        Like listeners, captures are process-wide, not scoped to a thread.
+        """
+        captured: List[Tuple[str, Any]] = []
+        with cls._lock:
+            cls._captures = cls._captures + [captured]
+        try:
+            yield captured
+        finally:
+            with cls._lock:
+                cls._captures = [c for c in cls._captures if c is not captured]
+
+    @classmethod
+    def record_statement(cls, query: str, args: Any) -> None:
+        """Hand a statement and its parameters to active capture_statements() blocks."""
+        for captured in cls._captures:
+            captured.append((query, args))
+
+    @classmethod
+    def add_listener(cls, listener: Callable[[str, str, float, int], None]) -> None:
+        """Register a callback(fingerprint, query, duration_ms, rows) for every statement."""
+        with cls._lock:
+            cls._listeners = cls._listeners + [listener]
+
+    @classmethod
+    def remove_listener(cls, listener: Callable[[str, str, float, int], None]) -> None:
+        """Unregister a callback previously passed to add_listener()."""
+        with cls._lock:
+            cls._listeners = [fn for fn in cls._listeners if fn is not listener]
+
+    @classmethod
+    def record_query(cls, query: str, duration_ms: float, rows: int) -> None:
+        """Record one executed statement.
+
+        Args:
+            query: SQL query string as executed
+            duration_ms: Wall time spent in cursor.execute
+            rows: Rows returned or affected
+        """
+        fp = fingerprint(query)
+        rows = max(rows or 0, 0)
+
+        for listener in cls._listeners:
+            try:
+                listener(fp, query, duration_ms, rows)
+            except Exception as e:
+                logger.error(f"Query listener failed: {e}")
+
+        if not cls.enabled:
+            return
+
+        with cls._lock:
+            stats = cls._statements.get(fp)
+            if stats is None:
+                stats = cls._statements[fp] = _StatementStats(cls.window)
+            stats.calls += 1
+            stats.total_ms += duration_ms
+            stats.max_ms = max(stats.max_ms, duration_ms)
+            stats.rows += rows
+            stats.durations.append(duration_ms)
+
+        if duration_ms >= cls.slow_query_ms:
+            logger.warning(
+                f"Slow query ({duration_ms:.1f} ms, {rows} rows) at {_call_site()}: {fp}"
+            )
+
+    @classmethod
+    def record_pool_wait(cls, duration_ms: float) -> None:
+        """Record time spent obtaining a connection from the pool."""
+        if not cls.enabled:
+            return
+        with cls._lock:
+            cls._pool_waits.append(duration_ms)
+
+    @classmethod
+    def snapshot(cls, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Return statement statistics ordered by total time spent.
+
+        Args:
+            limit: Maximum number of statements to include
+
+        Returns:
+            Dictionary with 'statements' and 'pool_wait' summaries
+        """
+        with cls._lock:
+            items = [
+                (fp, s.calls, s.total_ms, s.max_ms, s.rows, list(s.durations))
+                for fp, s in cls._statements.items()
+            ]
+            pool_waits = list(cls._pool_waits)
+
+        items.sort(key=lambda item: item[2], reverse=True)
+        if limit is not None:
+            items = items[:limit]
+
+        statements = []
+        for fp, calls, total_ms, max_ms, rows, durations in items:
+            window = summarize(durations)
+            statements.append({
+                'fingerprint': fp,
+                'calls': calls,
+                'total_ms': round(total_ms, 3),
+                'avg_ms': round(total_ms / calls, 3) if calls else 0.0,
+                'max_ms': round(max_ms, 3),
+                'p50_ms': window['p50_ms'],
+                'p95_ms': window['p95_ms'],
+                'p99_ms': window['p99_ms'],
+                'rows_total': rows,
+                'rows_avg': round(rows / calls, 2) if calls else 0.0,
+            })
+
+        return {
+            'enabled': cls.enabled,
+            'slow_query_ms': cls.slow_query_ms,
+            'statements': statements,
+            'pool_wait': summarize(pool_waits),
+        }
+
+    @classmethod
+    def reset(cls) -> None:
+        """Clear all collected statistics."""
+        with cls._lock:
+            cls._statements = {}
+            cls._pool_waits = deque(maxlen=cls.window)
@@ -0,0 +1,162 @@
+"""Read-replica routing state for DatabaseConnection.
+
+Reads (commit=False) go to the replica only when it is configured, its
+replication lag is within DB_REPLICA_MAX_LAG_SECONDS, and the current request
+is not pinned to the primary. A request is pinned once it writes, and a user
+stays pinned for DB_READ_YOUR_WRITES_SECONDS after their last write, so a
+Mini App refresh right after /expense still shows the new transaction.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from .settings import Settings
+
+logger = logging.getLogger(__name__)
+
+
+class _Scope:
+    """Routing state of one handler call or API request."""
+
+    __slots__ = ('user_key', 'wrote')
+
+    def __init__(self, user_key: Any = None, wrote: bool = False):
+        self.user_key = user_key
+        self.wrote = wrote
+
+
+# Holds a mutable _Scope so a user bound inside a FastAPI dependency (which
+# runs in a copied context) is visible to the endpoint of the same request.
+_scope: ContextVar[Optional[_Scope]] = ContextVar('db_read_scope', default=None)
+
+
+class ReadRouter:
+    """Replica health and read-your-writes pins.
+
+    Pins live in process memory: with several API workers the per-request pin
+    always holds, while the per-user pin only covers requests served by the
+    process that saw the write.
+    """
+
+    max_lag_seconds = Settings.DB_REPLICA_MAX_LAG_SECONDS
+    lag_check_seconds = Settings.DB_REPLICA_LAG_CHECK_SECONDS
+    pin_seconds = Settings.DB_READ_YOUR_WRITES_SECONDS
+
+    _lock = threading.Lock()
+    _recent_writers: Dict[Any, float] = {}
+    _replica_ok = False
+    _replica_lag: Optional[float] = None
+    _next_lag_check = 0.0
+
+    @classmethod
+    @contextmanager
+    def request_scope(cls, user_key: Any = None):
+        """Track writes of one handler call or API request.
+
+        Args:
+            user_key: Identifier of the acting user (e.g. Telegram ID); can
+                also be set later with bind_user()
+        """
+        token = _scope.set(_Scope(user_key))
+        try:
+            yield
+        finally:
+            _scope.reset(token)
+
+    @classmethod
+    @contextmanager
+    def use_primary(cls):
+        """Send every read inside the block to the primary."""
+        token = _scope.set(_Scope(wrote=True))
+        try:
+            yield
+        finally:
+            _scope.reset(token)
+
+    @classmethod
+    def bind_user(cls, user_key: Any) -> None:
+        """Attach the acting user to the current request scope (no-op outside one)."""
+        scope = _scope.get()
+        if scope is not None:
+            scope.user_key = user_key
+
+    @classmethod
+    def note_write(cls) -> None:
+        """Pin the current request, and its user for pin_seconds, to the primary."""
+        scope = _scope.get()
+        if scope is None:
+            return
+        scope.wrote = True
+        if scope.user_key is None:
+            return
+        now = time.monotonic()
+        with cls._lock:
+            cls._recent_writers[scope.user_key] = now + cls.pin_seconds
+            if len(cls._recent_writers) > 1024:
+                cls._recent_writers = {
+                    key: until for key, until in cls._recent_writers.items() if until > now
+                }
+
+    @classmethod
+    def pinned_to_primary(cls) -> bool:
+        """Whether reads of the current request must see the primary."""
+        scope = _scope.get()
+        if scope is None:
+            return False
+        if scope.wrote:
+            return True
+        if scope.user_key is None:
+            return False
+        until = cls._recent_writers.get(scope.user_key)
+        return until is not None and until > time.monotonic()
+
+    @classmethod
+    def lag_check_due(cls) -> bool:
+        """Whether the cached replica lag is older than lag_check_seconds."""
+        return time.monotonic() >= cls._next_lag_check
+
+    @classmethod
+    def record_lag(cls, lag: Optional[float]) -> None:
+        """Store a replica lag measurement.
+
+        Args:
+            lag: Seconds behind the primary, or None when replication is not
+                running or the replica is unreachable
+        """
+        ok = lag is not None and lag <= cls.max_lag_seconds
+        with cls._lock:
+            changed = ok != cls._replica_ok
+            cls._replica_ok = ok
+            cls._replica_lag = lag
+            cls._next_lag_check = time.monotonic() + cls.lag_check_seconds
+        if changed and ok:
+            logger.info(f"Read replica in use (lag {lag}s)")
+        elif changed:
+            logger.warning(f"Read replica bypassed (lag {lag}s, max {cls.max_lag_seconds}s)")
+
+    @classmethod
+    def replica_ok(cls) -> bool:
+        """Result of the last lag check."""
+        return cls._replica_ok
+
+    @classmethod
+    def status(cls) -> Dict[str, Any]:
+        """Return replica health for the readiness probe."""
+        return {
+            'ok': cls._replica_ok,
+            'lag_seconds': cls._replica_lag,
+            'max_lag_seconds': cls.max_lag_seconds,
+        }
+
+    @classmethod
+    def reset(cls) -> None:
+        """Forget pins and lag measurements (the next read re-checks the replica)."""
+        with cls._lock:
+            cls._recent_writers = {}
+            cls._replica_ok = False
+            cls._replica_lag = None
+            cls._next_lag_check = 0.0
@@ -13,6 +13,8 @@ class Settings:
     
     # Telegram Bot Configuration
     TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
+    # Bot API connections (0 = one per update handled at once, plus one for scheduler jobs)
+    TELEGRAM_CONNECTION_POOL_SIZE = int(os.getenv('TELEGRAM_CONNECTION_POOL_SIZE', 0))
 
     # Telegram Mini App (Web App)
     MINIAPP_URL = os.getenv('MINIAPP_URL', '').strip()
@@ -21,19 +23,89 @@ class Settings:
     # Mini App API server (optional, for local run commands)
     API_HOST = os.getenv('API_HOST', '127.0.0.1')
     API_PORT = int(os.getenv('API_PORT', 8000))
+    # Production server (run_miniapp_api.py without --reload)
+    API_WORKERS = int(os.getenv('API_WORKERS', 1))
+    API_BACKLOG = int(os.getenv('API_BACKLOG', 2048))
+    API_KEEPALIVE_SECONDS = int(os.getenv('API_KEEPALIVE_SECONDS', 5))
+    API_GRACEFUL_TIMEOUT_SECONDS = int(os.getenv('API_GRACEFUL_TIMEOUT_SECONDS', 30))
+    # Restart a worker after this many requests (0 = never)
+    API_MAX_REQUESTS = int(os.getenv('API_MAX_REQUESTS', 0))
+    # Pooled DB connections each worker opens before serving (0 = lazy)
+    API_WARMUP_CONNECTIONS = int(os.getenv('API_WARMUP_CONNECTIONS', 2))
+    # Threads per worker running blocking DB calls of async routes (see config.db_executor)
+    API_DB_THREADS = int(os.getenv('API_DB_THREADS', 16))
+    # Live updates (GET /api/live, see api.live): change poll interval per worker,
+    # keep-alive comment interval and maximum stream age before the client reconnects
+    LIVE_POLL_INTERVAL_SECONDS = float(os.getenv('LIVE_POLL_INTERVAL_SECONDS', 1.0))
+    LIVE_HEARTBEAT_SECONDS = int(os.getenv('LIVE_HEARTBEAT_SECONDS', 15))
+    LIVE_STREAM_MAX_SECONDS = int(os.getenv('LIVE_STREAM_MAX_SECONDS', 300))
     
     # Database Configuration
+    # 'mysql' (default) or 'sqlite' (embedded, WAL mode; no server needed)
+    DB_BACKEND = os.getenv('DB_BACKEND', 'mysql').strip().lower()
+    SQLITE_PATH = os.getenv('SQLITE_PATH', 'montrixa.db')
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))
     DB_HOST = os.getenv('DB_HOST', 'localhost')
     DB_PORT = int(os.getenv('DB_PORT', 3306))
     DB_NAME = os.getenv('DB_NAME', 'montrixa')
     DB_USER = os.getenv('DB_USER', 'root')
     DB_PASSWORD = os.getenv('DB_PASSWORD', '')
     
+    # MySQL read replica for commit=False reads (empty host = disabled)
+    DB_REPLICA_HOST = os.getenv('DB_REPLICA_HOST', '').strip()
+    DB_REPLICA_PORT = int(os.getenv('DB_REPLICA_PORT', DB_PORT))
+    DB_REPLICA_USER = os.getenv('DB_REPLICA_USER', DB_USER)
+    DB_REPLICA_PASSWORD = os.getenv('DB_REPLICA_PASSWORD', DB_PASSWORD)
+    DB_REPLICA_MAX_LAG_SECONDS = float(os.getenv('DB_REPLICA_MAX_LAG_SECONDS', 5))
+    DB_REPLICA_LAG_CHECK_SECONDS = float(os.getenv('DB_REPLICA_LAG_CHECK_SECONDS', 10))
+    # Reads of a user who just wrote stay on the primary this long
+    DB_READ_YOUR_WRITES_SECONDS = float(os.getenv('DB_READ_YOUR_WRITES_SECONDS', 15))
+    
+    # Monthly partitions of transactions (MySQL, after migrations/partition_transactions.py apply)
+    PARTITION_MONTHS_AHEAD = int(os.getenv('PARTITION_MONTHS_AHEAD', 3))
+    # Archive partitions older than this many months (0 = never archive)
+    PARTITION_ARCHIVE_AFTER_MONTHS = int(os.getenv('PARTITION_ARCHIVE_AFTER_MONTHS', 0))
+    
+    # Days the Mini App sync change log is kept (0 = keep forever); older clients resnapshot
+    SYNC_CHANGES_RETENTION_DAYS = int(os.getenv('SYNC_CHANGES_RETENTION_DAYS', 30))
+    
+    # Versioned migrations (migrations/migrate.py)
+    MIGRATION_ONLINE_DDL = os.getenv('MIGRATION_ONLINE_DDL', 'true').lower() in ('1', 'true', 'yes')
+    MIGRATION_BACKFILL_BATCH = int(os.getenv('MIGRATION_BACKFILL_BATCH', 1000))
+    MIGRATION_BACKFILL_PAUSE_MS = float(os.getenv('MIGRATION_BACKFILL_PAUSE_MS', 50))
+    
+    # Database instrumentation (opt-in)
+    DB_INSTRUMENTATION = os.getenv('DB_INSTRUMENTATION', 'false').lower() in ('1', 'true', 'yes')
+    DB_SLOW_QUERY_MS = float(os.getenv('DB_SLOW_QUERY_MS', 200))
+    DB_STATS_WINDOW = int(os.getenv('DB_STATS_WINDOW', 1000))
+    
+    # Handler/request tracing (opt-in)
+    TRACING_ENABLED = os.getenv('TRACING_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+    TRACE_LOG_FILE = os.getenv('TRACE_LOG_FILE', '').strip()
+    TRACE_WINDOW = int(os.getenv('TRACE_WINDOW', 1000))
+    
+    # Bearer token for the API's GET /metrics (empty = direct loopback clients only)
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN', '').strip()
+    
+    # Standalone /metrics listener for the bot process (0 = disabled)
+    BOT_METRICS_HOST = os.getenv('BOT_METRICS_HOST', '127.0.0.1')
+    BOT_METRICS_PORT = int(os.getenv('BOT_METRICS_PORT', 0))
+
+    # Readiness probe thresholds (/api/health/ready returns 503 beyond these)
+    HEALTH_DB_LATENCY_MS = float(os.getenv('HEALTH_DB_LATENCY_MS', 250))
+    HEALTH_POOL_MAX_IN_USE = int(os.getenv('HEALTH_POOL_MAX_IN_USE', 32))
+    HEALTH_SCHEDULER_STALE_SECONDS = int(os.getenv('HEALTH_SCHEDULER_STALE_SECONDS', 180))
+    
     # Application Settings
     TIMEZONE = os.getenv('TIMEZONE', 'Asia/Jakarta')
     DEFAULT_CURRENCY = os.getenv('DEFAULT_CURRENCY', 'IDR')
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     
+    # Telegram user IDs allowed to run admin commands (comma separated)
+    ADMIN_USER_IDS = [
+        int(uid) for uid in os.getenv('ADMIN_USER_IDS', '').split(',') if uid.strip()
+    ]
+    
     # Bot Settings
     MAX_TRANSACTIONS_PER_PAGE = int(os.getenv('MAX_TRANSACTIONS_PER_PAGE', 10))
     CHART_DPI = int(os.getenv('CHART_DPI', 100))
@@ -0,0 +1,102 @@
+"""Admin-only diagnostic command handlers."""
+
+from telegram import Update
+from telegram.ext import ContextTypes
+from config.query_stats import QueryStats
+from utils.decorators import admin_only, error_handler
+from utils.tracing import Tracer
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@error_handler
+@admin_only
+async def dbstats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /dbstats command - show slowest query fingerprints.
+
+    Usage: /dbstats [jumlah] [reset]
+
+    Args:
+        update: Telegram update object
+        context: Telegram context
+    """
+    args = context.args or []
+    if 'reset' in args:
+        QueryStats.reset()
+        await update.message.reply_text("Statistik query direset.")
+        return
+
+    limit = next((int(a) for a in args if a.isdigit()), 10)
+    stats = QueryStats.snapshot(limit=limit)
+
+    if not stats['enabled']:
+        await update.message.reply_text(
+            "Instrumentasi database nonaktif. Set DB_INSTRUMENTATION=true lalu restart."
+        )
+        return
+
+    pool = stats['pool_wait']
+    message = "STATISTIK QUERY DATABASE\n\n"
+    message += (
+        f"Tunggu pool: p50 {pool['p50_ms']} ms • p95 {pool['p95_ms']} ms • "
+        f"max {pool['max_ms']} ms ({pool['count']}x)\n"
+    )
+
+    if not stats['statements']:
+        message += "\nBelum ada query tercatat."
+
+    for i, row in enumerate(stats['statements'], 1):
+        message += (
+            f"\n{i}. {row['calls']}x • total {row['total_ms']:.0f} ms • "
+            f"p50 {row['p50_ms']} / p95 {row['p95_ms']} / p99 {row['p99_ms']} ms • "
+            f"{row['rows_avg']} baris\n"
+            f"{row['fingerprint'][:200]}\n"
+        )
+
+    # Telegram messages are capped at 4096 characters
+    await update.message.reply_text(message[:4000])
+
+
+@error_handler
+@admin_only
+async def tracestats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle /tracestats command - latency percentiles per command and callback.
+
+    Usage: /tracestats [jumlah] [reset]
+
+    Args:
+        update: Telegram update object
+        context: Telegram context
+    """
+    args = context.args or []
+    if 'reset' in args:
+        Tracer.reset()
+        await update.message.reply_text("Statistik tracing direset.")
+        return
+
+    limit = next((int(a) for a in args if a.isdigit()), 15)
+    summary = Tracer.summary()
+
+    if not summary['enabled']:
+        await update.message.reply_text(
+            "Tracing nonaktif. Set TRACING_ENABLED=true lalu restart."
+        )
+        return
+
+    message = "LATENSI PER PERINTAH (p50 / p95 / p99)\n"
+    if not summary['spans']:
+        message += "\nBelum ada data."
+
+    for row in summary['spans'][:limit]:
+        wall = row['wall']
+        message += (
+            f"\n{row['name']} • {row['calls']}x"
+            f"{' • ' + str(row['errors']) + ' error' if row['errors'] else ''}\n"
+            f"  total {wall['p50_ms']:.0f} / {wall['p95_ms']:.0f} / {wall['p99_ms']:.0f} ms\n"
+            f"  DB {row['db']['p50_ms']:.0f} / {row['db']['p95_ms']:.0f} ms "
+            f"({row['db_queries_avg']} query)\n"
+            f"  Telegram {row['telegram']['p50_ms']:.0f} / {row['telegram']['p95_ms']:.0f} ms\n"
+        )
+
+    await update.message.reply_text(message[:4000])
@@ -35,7 +35,7 @@ async def budget_command(update: Update, context: ContextTypes.DEFAULT_TYPE, use
     
     for budget in budgets:
         message += f"{budget.category_name}\n"
-        message += f"  {Formatter.format_currency(budget.amount)}\n"
+        message += f"  {Formatter.format_money(budget.amount_minor)}\n"
         message += f"  {Formatter.format_period(budget.period)}\n"
         message += "─" * 30 + "\n"
     
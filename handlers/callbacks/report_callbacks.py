@@ -33,16 +33,19 @@ async def handle_report_period(update: Update, context: ContextTypes.DEFAULT_TYP
         await query.message.edit_text("❌ Periode tidak valid.")
         return
 
-    transactions = TransactionService.get_transactions_by_period(user.id, period)
-    if not transactions:
+    # One frame load covers the period and the one it is compared with
+    frame, previous = ReportService.load_comparison(user.id, *TransactionService.get_period_range(period))
+    if not len(frame):
         await query.message.edit_text("Tidak ada transaksi untuk periode ini.")
         return
 
-    start_date = min(t.transaction_date for t in transactions)
-    end_date = max(t.transaction_date for t in transactions)
-    summary = ReportService.get_summary(user.id, start_date, end_date)
-    expense_by_cat = ReportService.get_expense_by_category(user.id, start_date, end_date)
-    income_by_cat = ReportService.get_income_by_category(user.id, start_date, end_date)
+    start_date, end_date = frame.date_span()
+    reports = ReportService.reports_from_frame(
+        frame, ("summary", "expense_by_category", "income_by_category")
+    )
+    summary = reports["summary"]
+    expense_by_cat = reports["expense_by_category"]
+    income_by_cat = reports["income_by_category"]
 
     message = "LAPORAN KEUANGAN\n"
     message += f"{Formatter.format_date(start_date)} - {Formatter.format_date(end_date)}\n\n"
@@ -65,4 +68,34 @@ async def handle_report_period(update: Update, context: ContextTypes.DEFAULT_TYP
             message += f"{Formatter.format_currency(cat['total_amount'])} "
             message += f"({Formatter.format_percentage(cat['percentage'])})\n"
 
+    message += _comparison_section(ReportService.compare_frames(frame, previous))
+
     await query.message.edit_text(message)
+
+
+def _comparison_section(comparison) -> str:
+    """Report lines comparing the period with the previous one."""
+    previous = comparison["previous"]
+    totals = comparison["totals"]
+    if not previous["transaction_count"]:
+        return "\nBelum ada transaksi pada periode sebelumnya untuk dibandingkan.\n"
+
+    section = "\nDIBANDINGKAN PERIODE SEBELUMNYA\n"
+    section += f"{Formatter.format_date(previous['start_date'])} - {Formatter.format_date(previous['end_date'])}\n"
+    for label, key in (("Pemasukan", "income"), ("Pengeluaran", "expense"), ("Saldo", "balance")):
+        change = totals[key]
+        section += f"{label}: {Formatter.format_currency(change['previous'])} → "
+        section += f"{Formatter.format_currency(change['current'])} ({Formatter.format_change(change['change_pct'])})\n"
+
+    # Categories whose spending moved the most, either way
+    movers = sorted(
+        (cat for cat in comparison["expense_by_category"] if cat["delta"]),
+        key=lambda cat: abs(cat["delta"]), reverse=True,
+    )
+    if movers:
+        section += "\nPERUBAHAN PENGELUARAN TERBESAR:\n"
+        for cat in movers[:5]:
+            sign = "+" if cat["delta"] > 0 else "-"
+            section += f"  {cat['category_name']}: {sign}{Formatter.format_currency(abs(cat['delta']))} "
+            section += f"({Formatter.format_change(cat['change_pct'])})\n"
+    return section
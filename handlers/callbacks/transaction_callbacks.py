@@ -125,7 +125,7 @@ async def handle_delete_transaction(update: Update, context: ContextTypes.DEFAUL
         if success:
             sign = "+" if transaction.type == "income" else "-"
             message = "✅ Transaksi berhasil dihapus\n\n"
-            message += f"{sign}{Formatter.format_currency(transaction.amount)}\n"
+            message += f"{sign}{Formatter.format_money(transaction.amount_minor)}\n"
             message += f"{transaction.category_name}\n"
             message += f"{transaction.description}\n"
             message += f"{Formatter.format_date_relative(transaction.transaction_date)}"
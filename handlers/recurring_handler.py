@@ -37,7 +37,7 @@ async def recurring_command(update: Update, context: ContextTypes.DEFAULT_TYPE,
         status_icon = "✅" if recurring.is_active else "⏸"
         sign = "+" if recurring.type == "income" else "-"
         
-        message += f"{status_icon} {sign}{Formatter.format_currency(recurring.amount)}\n"
+        message += f"{status_icon} {sign}{Formatter.format_money(recurring.amount_minor)}\n"
         message += f"{recurring.category_name}\n"
         message += f"{recurring.description}\n"
         message += f"Frekuensi: {Formatter.format_period(recurring.frequency)}\n"
@@ -4,6 +4,7 @@ from telegram import Update
 from telegram.ext import ContextTypes
 from utils.decorators import authenticated, error_handler
 from utils.formatters import Formatter
+from models.transaction_frame import TransactionFrame
 from services.report_service import ReportService
 from services.transaction_service import TransactionService
 from datetime import date
@@ -15,30 +16,39 @@ logger = logging.getLogger(__name__)
 @error_handler
 @authenticated
 async def summary_command(update: Update, context: ContextTypes.DEFAULT_TYPE, user):
-    """Handle /summary command - show current month summary.
+    """Handle /summary command - show current month summary vs last month.
     
     Args:
         update: Telegram update object
         context: Telegram context
         user: Authenticated user object
     """
-    summary = ReportService.get_current_month_summary(user.id)
+    # Month to date next to the same days of last month, from one frame load
+    comparison = ReportService.compare(user.id, *TransactionService.get_period_range('this_month'))
+    summary = comparison['current']
+    totals = comparison['totals']
     
-    message = f"RINGKASAN {summary['month']}/{summary['year']}\n\n"
-    message += f"Pemasukan: {Formatter.format_currency(summary['total_income'])}\n"
-    message += f"Pengeluaran: {Formatter.format_currency(summary['total_expense'])}\n"
+    def versus(change):
+        if not change['previous'] and not change['current']:
+            return ""
+        return f" ({Formatter.format_change(change['change_pct'])} vs bulan lalu)"
+    
+    message = f"RINGKASAN {summary['start_date'].month}/{summary['start_date'].year}\n\n"
+    message += f"Pemasukan: {Formatter.format_currency(summary['total_income'])}{versus(totals['income'])}\n"
+    message += f"Pengeluaran: {Formatter.format_currency(summary['total_expense'])}{versus(totals['expense'])}\n"
     
     balance_icon = '✅' if summary['balance'] >= 0 else '⚠️'
     message += f"{balance_icon} Saldo: {Formatter.format_currency(summary['balance'])}\n"
     message += f"\nTransaksi: {summary['transaction_count']}\n"
     
     # Top spending categories
-    if summary['expense_by_category']:
+    expense_by_category = [cat for cat in comparison['expense_by_category'] if cat['current']]
+    if expense_by_category:
         message += "\nTOP PENGELUARAN:\n"
-        for i, cat in enumerate(summary['expense_by_category'][:5], 1):
+        for i, cat in enumerate(expense_by_category[:5], 1):
             message += f"{i}. {cat['category_name']} - "
-            message += f"{Formatter.format_currency(cat['total_amount'])} "
-            message += f"({Formatter.format_percentage(cat['percentage'])})\n"
+            message += f"{Formatter.format_currency(cat['current'])} "
+            message += f"({Formatter.format_percentage(cat['percentage'])}){versus(cat)}\n"
     
     message += "\nGunakan /report untuk laporan lengkap."
     
@@ -92,25 +102,25 @@ async def handle_report_period(update: Update, context: ContextTypes.DEFAULT_TYP
         user: Authenticated user object
         period: Period string ('today', '7d', '30d', 'this_month', 'last_month')
     """
-    # Calculate date range
-    transactions = TransactionService.get_transactions_by_period(user.id, period)
+    # Load the period once; every report below is computed from it
+    frame = TransactionFrame.load(user.id, *TransactionService.get_period_range(period))
     
-    if not transactions:
+    if not len(frame):
         await update.callback_query.message.edit_text(
             f"Tidak ada transaksi untuk periode ini."
         )
         return
     
     # Get first and last transaction dates
-    start_date = min(t.transaction_date for t in transactions)
-    end_date = max(t.transaction_date for t in transactions)
-    
-    # Get summary
-    summary = ReportService.get_summary(user.id, start_date, end_date)
+    start_date, end_date = frame.date_span()
     
-    # Get category breakdown
-    expense_by_cat = ReportService.get_expense_by_category(user.id, start_date, end_date)
-    income_by_cat = ReportService.get_income_by_category(user.id, start_date, end_date)
+    # Get summary and category breakdown
+    reports = ReportService.reports_from_frame(
+        frame, ('summary', 'expense_by_category', 'income_by_category')
+    )
+    summary = reports['summary']
+    expense_by_cat = reports['expense_by_category']
+    income_by_cat = reports['income_by_category']
     
     # Format message
     message = f"LAPORAN KEUANGAN\n"
@@ -246,7 +246,7 @@ async def delete_command(update: Update, context: ContextTypes.DEFAULT_TYPE, use
     for trans in transactions:
         # Format transaction info
         sign = '+' if trans.type == 'income' else '-'
-        amount = Formatter.format_currency(trans.amount)
+        amount = Formatter.format_money(trans.amount_minor)
         date_str = Formatter.format_date_relative(trans.transaction_date)
         category = trans.category_name
         
@@ -4,6 +4,8 @@ from models.budget import Budget
 from services.budget_service import BudgetService
 from telegram import Bot
 from utils.formatters import Formatter
+from utils.money import to_major
+from jobs.heartbeat_job import tracked_run
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,78 +20,81 @@ async def check_budget_alerts(bot: Bot):
     logger.info("Checking budget alerts...")
     
     try:
-        # Get all active budgets
-        budgets = Budget.get_all_active()
+        with tracked_run('budget_alerts'):
+            await _send_budget_alerts(bot)
+    except Exception as e:
+        logger.error(f"Error checking budget alerts: {e}", exc_info=True)
+
+
+async def _send_budget_alerts(bot: Bot):
+    """Send alerts for every active budget over a threshold (raises on failure)."""
+    # Get all active budgets (with the owner's telegram_id joined in), their
+    # spending and today's alerts up front: three queries regardless of count
+    budgets = Budget.get_all_active()
+    spent_by_budget = Budget.get_spent_minor_amounts(budgets)
+    sent_today = BudgetService.get_alerts_sent_today([budget.id for budget in budgets])
+    
+    alert_count = 0
+    
+    for budget in budgets:
+        # Check if alert needed
+        spent = spent_by_budget[budget.id]
+        percentage = budget.percentage_of(spent)
         
-        alert_count = 0
+        # Determine alert type
+        alert_type = None
+        should_send = False
         
-        for budget in budgets:
-            # Check if alert needed
-            percentage = budget.get_percentage_used()
-            
-            # Determine alert type
-            alert_type = None
-            should_send = False
-            
-            if percentage >= 100 and budget.alert_at_100:
-                alert_type = 'critical'
-                should_send = True
-            elif percentage >= 90 and budget.alert_at_90:
-                alert_type = 'danger'
-                should_send = True
-            elif percentage >= 75 and budget.alert_at_75:
-                alert_type = 'warning'
-                should_send = True
-            
-            if should_send:
-                # Check if alert already sent today
-                if not BudgetService._alert_sent_today(budget.id, alert_type):
-                    # Send alert to user
-                    from models.user import User
-                    user = User.get_by_id(budget.user_id)
-                    
-                    if user:
-                        spent = budget.get_spent_amount()
-                        
-                        message = "⚠️ PERINGATAN BUDGET\n\n"
-                        message += f"{budget.category_name}\n"
-                        message += f"{Formatter.format_currency(spent)} / "
-                        message += f"{Formatter.format_currency(budget.amount)} "
-                        message += f"({Formatter.format_percentage(percentage)})\n"
-                        message += f"{Formatter.format_period(budget.period)}\n\n"
-                        
-                        if alert_type == 'critical':
-                            message += "Budget sudah melampaui batas!"
-                        elif alert_type == 'danger':
-                            message += "Budget hampir habis! (90%+)"
-                        else:
-                            message += "Perhatian: Budget sudah terpakai 75%"
-                        
-                        try:
-                            await bot.send_message(
-                                chat_id=user.telegram_id,
-                                text=message
-                            )
-                            
-                            # Log alert
-                            BudgetService.log_alert(
-                                user.id, budget.id, alert_type,
-                                percentage, spent, budget.amount
-                            )
-                            
-                            alert_count += 1
-                            logger.info(f"Sent {alert_type} alert for budget {budget.id} to user {user.telegram_id}")
-                            
-                        except Exception as e:
-                            logger.error(f"Failed to send alert to user {user.telegram_id}: {e}")
+        if percentage >= 100 and budget.alert_at_100:
+            alert_type = 'critical'
+            should_send = True
+        elif percentage >= 90 and budget.alert_at_90:
+            alert_type = 'danger'
+            should_send = True
+        elif percentage >= 75 and budget.alert_at_75:
+            alert_type = 'warning'
+            should_send = True
         
-        if alert_count > 0:
-            logger.info(f"Sent {alert_count} budget alerts")
-        else:
-            logger.info("No budget alerts needed")
-            
-    except Exception as e:
-        logger.error(f"Error checking budget alerts: {e}", exc_info=True)
+        if should_send:
+            # Check if alert already sent today
+            if (budget.id, alert_type) not in sent_today:
+                # Send alert to user
+                message = "⚠️ PERINGATAN BUDGET\n\n"
+                message += f"{budget.category_name}\n"
+                message += f"{Formatter.format_money(spent)} / "
+                message += f"{Formatter.format_money(budget.amount_minor)} "
+                message += f"({Formatter.format_percentage(percentage)})\n"
+                message += f"{Formatter.format_period(budget.period)}\n\n"
+                
+                if alert_type == 'critical':
+                    message += "Budget sudah melampaui batas!"
+                elif alert_type == 'danger':
+                    message += "Budget hampir habis! (90%+)"
+                else:
+                    message += "Perhatian: Budget sudah terpakai 75%"
+                
+                try:
+                    await bot.send_message(
+                        chat_id=budget.telegram_id,
+                        text=message
+                    )
+                    
+                    # Log alert
+                    BudgetService.log_alert(
+                        budget.user_id, budget.id, alert_type,
+                        percentage, to_major(spent), budget.amount
+                    )
+                    
+                    alert_count += 1
+                    logger.info(f"Sent {alert_type} alert for budget {budget.id} to user {budget.telegram_id}")
+                    
+                except Exception as e:
+                    logger.error(f"Failed to send alert to user {budget.telegram_id}: {e}")
+    
+    if alert_count > 0:
+        logger.info(f"Sent {alert_count} budget alerts")
+    else:
+        logger.info("No budget alerts needed")
 
 
 def schedule_budget_alert_job(scheduler, bot: Bot):
@@ -0,0 +1,53 @@
+"""Scheduler liveness heartbeat job and job run tracking."""
+
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator
+from models.job_heartbeat import JobHeartbeat, SCHEDULER_JOB_ID
+from utils.metrics import Metrics
+import logging
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_INTERVAL_SECONDS = 60
+
+
+@contextmanager
+def tracked_run(job_id: str) -> Iterator[None]:
+    """Record metrics and a persisted heartbeat around a job run.
+
+    Args:
+        job_id: Scheduler job ID
+    """
+    JobHeartbeat.record_start(job_id)
+    try:
+        with Metrics.track_job(job_id):
+            yield
+    except Exception as e:
+        JobHeartbeat.record_failure(job_id, f"{type(e).__name__}: {e}")
+        raise
+    JobHeartbeat.record_success(job_id)
+
+
+async def scheduler_heartbeat():
+    """Record that the scheduler is alive and running jobs."""
+    JobHeartbeat.record_success(SCHEDULER_JOB_ID)
+
+
+def schedule_heartbeat_job(scheduler):
+    """Schedule scheduler liveness heartbeat job.
+    
+    Args:
+        scheduler: APScheduler instance
+    """
+    scheduler.add_job(
+        scheduler_heartbeat,
+        'interval',
+        seconds=HEARTBEAT_INTERVAL_SECONDS,
+        id=SCHEDULER_JOB_ID,
+        name='Scheduler Heartbeat',
+        replace_existing=True,
+        next_run_time=datetime.now(),
+    )
+    
+    logger.info(f"Scheduled scheduler heartbeat (every {HEARTBEAT_INTERVAL_SECONDS} seconds)")
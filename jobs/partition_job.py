@@ -0,0 +1,58 @@
+"""Transactions partition maintenance job."""
+
+from datetime import date
+from config.partitions import TransactionPartitions, add_months
+from config.settings import Settings
+from jobs.heartbeat_job import tracked_run
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def maintain_transaction_partitions():
+    """Pre-create upcoming monthly partitions and archive expired ones.
+
+    Does nothing on backends without partitioning or while transactions has
+    not been partitioned yet (see migrations/partition_transactions.py).
+    """
+    if not TransactionPartitions.supported():
+        return
+    
+    try:
+        with tracked_run('transaction_partitions'):
+            if not TransactionPartitions.list_partitions():
+                logger.info("transactions is not partitioned; skipping maintenance")
+                return
+            created = TransactionPartitions.ensure_future(Settings.PARTITION_MONTHS_AHEAD)
+            archived = []
+            if Settings.PARTITION_ARCHIVE_AFTER_MONTHS > 0:
+                before = add_months(date.today(), -Settings.PARTITION_ARCHIVE_AFTER_MONTHS)
+                archived = TransactionPartitions.archive(before)
+        
+        if created or archived:
+            logger.info(f"Partitions created: {created}, archived: {archived}")
+        else:
+            logger.info("Transaction partitions up to date")
+            
+    except Exception as e:
+        logger.error(f"Error maintaining transaction partitions: {e}", exc_info=True)
+
+
+def schedule_partition_job(scheduler):
+    """Schedule transactions partition maintenance job.
+    
+    Args:
+        scheduler: APScheduler instance
+    """
+    # Run daily at 03:30, well before a new month's first transactions
+    scheduler.add_job(
+        maintain_transaction_partitions,
+        'cron',
+        hour=3,
+        minute=30,
+        id='transaction_partitions',
+        name='Maintain Transaction Partitions',
+        replace_existing=True
+    )
+    
+    logger.info("Scheduled transaction partition job (daily at 03:30)")
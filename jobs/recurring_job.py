@@ -3,6 +3,7 @@
 from services.recurring_service import RecurringService
 from telegram import Bot
 from config.settings import Settings
+from jobs.heartbeat_job import tracked_run
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,7 +18,8 @@ async def process_recurring_transactions(bot: Bot):
     logger.info("Starting recurring transaction processing...")
     
     try:
-        count = RecurringService.process_due_recurring()
+        with tracked_run('recurring_transactions'):
+            count = RecurringService.process_due_recurring()
         
         if count > 0:
             logger.info(f"Successfully processed {count} recurring transactions")
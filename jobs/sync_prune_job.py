@@ -0,0 +1,49 @@
+"""Sync change log retention job."""
+
+from datetime import datetime, timedelta
+from config.settings import Settings
+from jobs.heartbeat_job import tracked_run
+from models.sync import SyncLog
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def prune_sync_changes():
+    """Delete transaction_changes rows older than SYNC_CHANGES_RETENTION_DAYS.
+
+    A Mini App whose cache is older than the kept log gets a full snapshot
+    on its next sync instead of a delta (see SyncService.get_changes).
+    """
+    if Settings.SYNC_CHANGES_RETENTION_DAYS <= 0:
+        return
+    
+    try:
+        with tracked_run('sync_changes_prune'):
+            before = datetime.now() - timedelta(days=Settings.SYNC_CHANGES_RETENTION_DAYS)
+            deleted = SyncLog.prune(before)
+        
+        logger.info(f"Pruned {deleted} sync changes older than {before:%Y-%m-%d %H:%M}")
+            
+    except Exception as e:
+        logger.error(f"Error pruning sync changes: {e}", exc_info=True)
+
+
+def schedule_sync_prune_job(scheduler):
+    """Schedule sync change log retention job.
+    
+    Args:
+        scheduler: APScheduler instance
+    """
+    # Run daily at 03:45, after partition maintenance
+    scheduler.add_job(
+        prune_sync_changes,
+        'cron',
+        hour=3,
+        minute=45,
+        id='sync_changes_prune',
+        name='Prune Sync Changes',
+        replace_existing=True
+    )
+    
+    logger.info("Scheduled sync change prune job (daily at 03:45)")
@@ -56,6 +56,9 @@ CREATE TABLE IF NOT EXISTS transactions (
     INDEX idx_user_date (user_id, transaction_date),
     INDEX idx_user_type (user_id, type),
     INDEX idx_user_category (user_id, category_id),
+    -- Covering indexes for report aggregates and budget spend
+    INDEX idx_user_type_date_amount (user_id, type, transaction_date, amount, category_id),
+    INDEX idx_user_category_type_date (user_id, category_id, type, transaction_date, amount),
     INDEX idx_date (transaction_date),
     INDEX idx_recurring (recurring_id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
@@ -153,6 +156,32 @@ CREATE TABLE IF NOT EXISTS transaction_history (
     INDEX idx_transaction (transaction_id)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- Background job heartbeats (written by the bot scheduler, read by API health checks)
+CREATE TABLE IF NOT EXISTS job_heartbeats (
+    job_id VARCHAR(64) PRIMARY KEY,
+    last_started_at TIMESTAMP NULL,
+    last_success_at TIMESTAMP NULL,
+    last_failure_at TIMESTAMP NULL,
+    last_error VARCHAR(255) NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- Mini App delta sync: per-user change sequence and change log (models/sync.py)
+CREATE TABLE IF NOT EXISTS sync_versions (
+    user_id INT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS transaction_changes (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL,
+    version BIGINT NOT NULL,
+    transaction_id INT NOT NULL,
+    op VARCHAR(10) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_user_version (user_id, version)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 -- Create view for quick balance calculation
 CREATE OR REPLACE VIEW user_balances AS
 SELECT 
@@ -0,0 +1,255 @@
+-- Montrixa Database Schema
+-- SQLite 3.24+ equivalent of init_db.sql (DB_BACKEND=sqlite)
+--
+-- Differences from MySQL:
+--   ENUM                        -> TEXT with CHECK constraint
+--   ON UPDATE CURRENT_TIMESTAMP -> AFTER UPDATE triggers
+--   utf8mb4_unicode_ci          -> COLLATE NOCASE on names (case-insensitive lookups)
+--   Timestamps are stored in local time to match MySQL NOW()
+
+PRAGMA foreign_keys = ON;
+
+-- Users table
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    telegram_id BIGINT UNIQUE NOT NULL,
+    username VARCHAR(255) COLLATE NOCASE,
+    first_name VARCHAR(255),
+    last_name VARCHAR(255),
+    timezone VARCHAR(50) DEFAULT 'Asia/Jakarta',
+    language_code VARCHAR(10) DEFAULT 'id',
+    is_active BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    updated_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+);
+CREATE INDEX IF NOT EXISTS idx_users_created_at ON users (created_at);
+
+-- Categories table
+CREATE TABLE IF NOT EXISTS categories (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    name VARCHAR(100) NOT NULL COLLATE NOCASE,
+    type TEXT NOT NULL CHECK (type IN ('income', 'expense')),
+    icon VARCHAR(10) DEFAULT '📦',
+    is_default BOOLEAN DEFAULT FALSE,
+    is_active BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    updated_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_categories_user_type ON categories (user_id, type);
+CREATE INDEX IF NOT EXISTS idx_categories_user_active ON categories (user_id, is_active);
+
+-- Transactions table
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    category_id INTEGER NOT NULL,
+    amount DECIMAL(15, 2) NOT NULL,
+    description TEXT,
+    transaction_date DATE NOT NULL,
+    type TEXT NOT NULL CHECK (type IN ('income', 'expense')),
+    notes TEXT,
+    is_recurring BOOLEAN DEFAULT FALSE,
+    recurring_id INTEGER NULL,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    updated_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (category_id) REFERENCES categories(id) ON DELETE RESTRICT
+);
+CREATE INDEX IF NOT EXISTS idx_transactions_user_date ON transactions (user_id, transaction_date);
+CREATE INDEX IF NOT EXISTS idx_transactions_user_type ON transactions (user_id, type);
+CREATE INDEX IF NOT EXISTS idx_transactions_user_category ON transactions (user_id, category_id);
+-- Covering indexes for report aggregates and budget spend
+CREATE INDEX IF NOT EXISTS idx_transactions_user_type_date_amount ON transactions (user_id, type, transaction_date, amount, category_id);
+CREATE INDEX IF NOT EXISTS idx_transactions_user_category_type_date ON transactions (user_id, category_id, type, transaction_date, amount);
+CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions (transaction_date);
+CREATE INDEX IF NOT EXISTS idx_transactions_recurring ON transactions (recurring_id);
+
+-- Budgets table
+CREATE TABLE IF NOT EXISTS budgets (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    category_id INTEGER NOT NULL,
+    amount DECIMAL(15, 2) NOT NULL,
+    period TEXT NOT NULL DEFAULT 'monthly' CHECK (period IN ('daily', 'weekly', 'monthly')),
+    start_date DATE NOT NULL,
+    end_date DATE NULL,
+    is_active BOOLEAN DEFAULT TRUE,
+    alert_at_75 BOOLEAN DEFAULT TRUE,
+    alert_at_90 BOOLEAN DEFAULT TRUE,
+    alert_at_100 BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    updated_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (category_id) REFERENCES categories(id) ON DELETE CASCADE,
+    UNIQUE (user_id, category_id, period, start_date)
+);
+CREATE INDEX IF NOT EXISTS idx_budgets_user_active ON budgets (user_id, is_active);
+CREATE INDEX IF NOT EXISTS idx_budgets_user_category ON budgets (user_id, category_id);
+CREATE INDEX IF NOT EXISTS idx_budgets_period ON budgets (period);
+
+-- Recurring transactions table
+CREATE TABLE IF NOT EXISTS recurring_transactions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    category_id INTEGER NOT NULL,
+    amount DECIMAL(15, 2) NOT NULL,
+    description TEXT,
+    type TEXT NOT NULL CHECK (type IN ('income', 'expense')),
+    frequency TEXT NOT NULL CHECK (frequency IN ('daily', 'weekly', 'monthly')),
+    start_date DATE NOT NULL,
+    next_run_date DATE NOT NULL,
+    last_run_date DATE NULL,
+    end_date DATE NULL,
+    is_active BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    updated_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (category_id) REFERENCES categories(id) ON DELETE RESTRICT
+);
+CREATE INDEX IF NOT EXISTS idx_recurring_user_active ON recurring_transactions (user_id, is_active);
+CREATE INDEX IF NOT EXISTS idx_recurring_next_run ON recurring_transactions (next_run_date, is_active);
+CREATE INDEX IF NOT EXISTS idx_recurring_user_type ON recurring_transactions (user_id, type);
+
+-- Budget alerts log table (to prevent spam notifications)
+CREATE TABLE IF NOT EXISTS budget_alerts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    budget_id INTEGER NOT NULL,
+    alert_type TEXT NOT NULL CHECK (alert_type IN ('warning', 'danger', 'critical')),
+    percentage DECIMAL(5, 2) NOT NULL,
+    amount_spent DECIMAL(15, 2) NOT NULL,
+    budget_amount DECIMAL(15, 2) NOT NULL,
+    alert_date DATE NOT NULL,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (budget_id) REFERENCES budgets(id) ON DELETE CASCADE,
+    UNIQUE (budget_id, alert_type, alert_date)
+);
+CREATE INDEX IF NOT EXISTS idx_budget_alerts_user_date ON budget_alerts (user_id, alert_date);
+CREATE INDEX IF NOT EXISTS idx_budget_alerts_budget_date ON budget_alerts (budget_id, alert_date);
+
+-- User settings table (for future extensibility)
+CREATE TABLE IF NOT EXISTS user_settings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER UNIQUE NOT NULL,
+    currency VARCHAR(3) DEFAULT 'IDR',
+    date_format VARCHAR(20) DEFAULT 'DD/MM/YYYY',
+    notifications_enabled BOOLEAN DEFAULT TRUE,
+    budget_alerts_enabled BOOLEAN DEFAULT TRUE,
+    weekly_report BOOLEAN DEFAULT FALSE,
+    monthly_report BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    updated_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+-- Transaction history log (for undo functionality)
+CREATE TABLE IF NOT EXISTS transaction_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    transaction_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    action TEXT NOT NULL CHECK (action IN ('created', 'updated', 'deleted')),
+    old_data TEXT NULL CHECK (old_data IS NULL OR json_valid(old_data)),
+    new_data TEXT NULL CHECK (new_data IS NULL OR json_valid(new_data)),
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_history_user_date ON transaction_history (user_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_history_transaction ON transaction_history (transaction_id);
+
+-- Background job heartbeats (written by the bot scheduler, read by API health checks)
+CREATE TABLE IF NOT EXISTS job_heartbeats (
+    job_id VARCHAR(64) PRIMARY KEY,
+    last_started_at TIMESTAMP NULL,
+    last_success_at TIMESTAMP NULL,
+    last_failure_at TIMESTAMP NULL,
+    last_error VARCHAR(255) NULL,
+    updated_at TIMESTAMP DEFAULT (datetime('now', 'localtime'))
+);
+
+-- Mini App delta sync: per-user change sequence and change log (models/sync.py)
+CREATE TABLE IF NOT EXISTS sync_versions (
+    user_id INTEGER PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS transaction_changes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    version BIGINT NOT NULL,
+    transaction_id INTEGER NOT NULL,
+    op VARCHAR(10) NOT NULL,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    UNIQUE (user_id, version)
+);
+
+-- updated_at maintenance (MySQL: ON UPDATE CURRENT_TIMESTAMP).
+-- Skipped when the statement sets updated_at itself.
+CREATE TRIGGER IF NOT EXISTS trg_users_updated_at AFTER UPDATE ON users
+FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE users SET updated_at = datetime('now', 'localtime') WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_categories_updated_at AFTER UPDATE ON categories
+FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE categories SET updated_at = datetime('now', 'localtime') WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_transactions_updated_at AFTER UPDATE ON transactions
+FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE transactions SET updated_at = datetime('now', 'localtime') WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_budgets_updated_at AFTER UPDATE ON budgets
+FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE budgets SET updated_at = datetime('now', 'localtime') WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_recurring_updated_at AFTER UPDATE ON recurring_transactions
+FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE recurring_transactions SET updated_at = datetime('now', 'localtime') WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_user_settings_updated_at AFTER UPDATE ON user_settings
+FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE user_settings SET updated_at = datetime('now', 'localtime') WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_job_heartbeats_updated_at AFTER UPDATE ON job_heartbeats
+FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE job_heartbeats SET updated_at = datetime('now', 'localtime') WHERE job_id = NEW.job_id;
+END;
+
+-- Create view for quick balance calculation
+CREATE VIEW IF NOT EXISTS user_balances AS
+SELECT
+    u.id as user_id,
+    u.telegram_id,
+    COALESCE(SUM(CASE WHEN t.type = 'income' THEN t.amount ELSE 0 END), 0) as total_income,
+    COALESCE(SUM(CASE WHEN t.type = 'expense' THEN t.amount ELSE 0 END), 0) as total_expense,
+    COALESCE(SUM(CASE WHEN t.type = 'income' THEN t.amount ELSE -t.amount END), 0) as balance
+FROM users u
+LEFT JOIN transactions t ON u.id = t.user_id
+GROUP BY u.id, u.telegram_id;
+
+-- Create view for monthly summary
+CREATE VIEW IF NOT EXISTS monthly_summaries AS
+SELECT
+    u.id as user_id,
+    strftime('%Y-%m', t.transaction_date) as month,
+    SUM(CASE WHEN t.type = 'income' THEN t.amount ELSE 0 END) as income,
+    SUM(CASE WHEN t.type = 'expense' THEN t.amount ELSE 0 END) as expense,
+    SUM(CASE WHEN t.type = 'income' THEN t.amount ELSE -t.amount END) as balance,
+    COUNT(t.id) as transaction_count
+FROM users u
+LEFT JOIN transactions t ON u.id = t.user_id
+GROUP BY u.id, strftime('%Y-%m', t.transaction_date);
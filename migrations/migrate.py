@@ -0,0 +1,56 @@
+"""Versioned schema migrations (see config/migrator.py)."""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+from config.migrator import Migrator, MigrationError
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def show_status(migrator):
+    """Print every migration and whether it has been applied."""
+    for row in migrator.status():
+        if row['applied_at'] is None:
+            state = 'pending'
+        else:
+            state = f"applied {row['applied_at']}"
+        changed = '  (file changed since applied!)' if row['changed'] else ''
+        print(f"{row['version']}_{row['name']:<40} {state}{changed}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('command', nargs='?', default='up', choices=('up', 'status'),
+                        help='up: apply pending migrations (default); status: list them')
+    parser.add_argument('--target', help='stop after this version, e.g. 0003')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='print the statements and backfill plans without running them')
+    parser.add_argument('--no-online', action='store_true',
+                        help='do not add ALGORITHM=INPLACE, LOCK=NONE to MySQL DDL')
+    args = parser.parse_args(argv)
+    
+    migrator = Migrator(dry_run=args.dry_run, online=False if args.no_online else None)
+    try:
+        if args.command == 'status':
+            show_status(migrator)
+            return
+        applied = migrator.migrate(args.target)
+    except MigrationError as e:
+        logger.error(f"❌ {e}")
+        sys.exit(1)
+    
+    if not applied:
+        logger.info("✅ Database schema is up to date")
+    elif args.dry_run:
+        logger.info(f"Dry run: {len(applied)} migration(s) pending, {len(migrator.statements)} statement(s)")
+    else:
+        logger.info(f"✅ Applied {len(applied)} migration(s)")
+
+
+if __name__ == '__main__':
+    main()
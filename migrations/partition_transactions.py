@@ -0,0 +1,78 @@
+"""Partition the transactions table by month and manage its partitions (MySQL)."""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+from datetime import datetime
+from config.settings import Settings
+from config.partitions import TransactionPartitions
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def show_status():
+    """Print the current partitions of transactions."""
+    partitions = TransactionPartitions.list_partitions()
+    if not partitions:
+        print("transactions is not partitioned")
+        return
+    for partition in partitions:
+        print(f"{partition['name']:<10} < {partition['description']:<14} ~{partition['rows']} rows")
+
+
+def show_pruning(user_id):
+    """Print the partitions each report/budget/trend query reads for a user."""
+    results = TransactionPartitions.verify_pruning(user_id)
+    for result in results:
+        status = 'OK ' if result['pruned'] else 'ALL'
+        print(f"[{status}] {len(result['partitions'])}/{result['total']} "
+              f"{','.join(result['partitions'])}\n      {result['query'][:140]}")
+    if not all(r['pruned'] for r in results):
+        sys.exit(1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    commands = parser.add_subparsers(dest='command', required=True)
+    apply = commands.add_parser('apply', help='partition transactions (rebuilds the table)')
+    apply.add_argument('--months-ahead', type=int, default=Settings.PARTITION_MONTHS_AHEAD)
+    ensure = commands.add_parser('ensure', help='pre-create upcoming monthly partitions')
+    ensure.add_argument('--months-ahead', type=int, default=Settings.PARTITION_MONTHS_AHEAD)
+    archive = commands.add_parser('archive', help='move partitions older than a month out')
+    archive.add_argument('--before', required=True, help='YYYY-MM; older months are archived')
+    archive.add_argument('--drop', action='store_true', help='delete the rows instead of keeping them')
+    verify = commands.add_parser('verify', help='EXPLAIN report queries and check partition pruning')
+    verify.add_argument('--user-id', type=int, required=True)
+    commands.add_parser('status', help='list partitions')
+    args = parser.parse_args(argv)
+    
+    if not TransactionPartitions.supported():
+        logger.error("❌ Partitioning needs DB_BACKEND=mysql")
+        sys.exit(1)
+    
+    try:
+        if args.command == 'apply':
+            if TransactionPartitions.apply(args.months_ahead):
+                logger.info("✅ transactions partitioned by month")
+        elif args.command == 'ensure':
+            created = TransactionPartitions.ensure_future(args.months_ahead)
+            logger.info(f"✅ Created partitions: {created or 'none'}")
+        elif args.command == 'archive':
+            before = datetime.strptime(args.before, '%Y-%m').date()
+            archived = TransactionPartitions.archive(before, drop=args.drop)
+            logger.info(f"✅ {'Dropped' if args.drop else 'Archived'} partitions: {archived or 'none'}")
+        elif args.command == 'verify':
+            show_pruning(args.user_id)
+        else:
+            show_status()
+    except Exception as e:
+        logger.error(f"❌ Partition command failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -7,14 +7,30 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import re
 import pymysql
 from config.settings import Settings
+from config.backends import SQLiteBackend
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def run_sqlite_migration():
+    """Create the SQLite schema from init_db_sqlite.sql."""
+    try:
+        backend = SQLiteBackend()
+        backend.apply_schema()
+        logger.info(f"✅ SQLite schema ready at {backend.path}")
+    except Exception as e:
+        logger.error(f"❌ Migration failed: {e}")
+        sys.exit(1)
+
+
 def run_migration():
     """Run the database migration from init_db.sql."""
+    if Settings.DB_BACKEND == 'sqlite':
+        run_sqlite_migration()
+        return
+    
     try:
         # Connect without selecting database first
         connection = pymysql.connect(
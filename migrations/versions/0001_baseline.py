@@ -0,0 +1,23 @@
+"""Baseline schema: the tables, views and triggers of init_db.sql / init_db_sqlite.sql.
+
+Every statement is idempotent (IF NOT EXISTS / OR REPLACE), so databases
+created earlier by run_migration.py are simply recorded as up to date.
+"""
+
+import os
+import re
+from config.backends import MIGRATIONS_DIR
+from config.database import DatabaseConnection
+from config.migrator import split_statements
+
+# The target database is selected by DB_NAME, not by the script
+_SKIP_RE = re.compile(r'^\s*(CREATE\s+DATABASE|USE)\b', re.IGNORECASE)
+
+
+def upgrade(migrator):
+    filename = 'init_db_sqlite.sql' if DatabaseConnection.backend().name == 'sqlite' else 'init_db.sql'
+    with open(os.path.join(MIGRATIONS_DIR, filename), encoding='utf-8') as f:
+        statements = split_statements(f.read())
+    for statement in statements:
+        if not _SKIP_RE.match(statement):
+            migrator.execute(statement)
@@ -0,0 +1,16 @@
+"""Covering indexes for report aggregates and budget spend (see benchmarks/plans.py).
+
+Built online (ALGORITHM=INPLACE, LOCK=NONE). Databases created from the
+current init_db.sql already have them.
+"""
+
+INDEXES = {
+    'idx_user_type_date_amount': '(user_id, type, transaction_date, amount, category_id)',
+    'idx_user_category_type_date': '(user_id, category_id, type, transaction_date, amount)',
+}
+
+
+def upgrade(migrator):
+    for name, columns in INDEXES.items():
+        if not migrator.index_exists('transactions', name):
+            migrator.execute(f"ALTER TABLE transactions ADD INDEX {name} {columns}")
@@ -0,0 +1,3 @@
+-- Covering indexes for report aggregates and budget spend (see benchmarks/plans.py)
+CREATE INDEX IF NOT EXISTS idx_transactions_user_type_date_amount ON transactions (user_id, type, transaction_date, amount, category_id);
+CREATE INDEX IF NOT EXISTS idx_transactions_user_category_type_date ON transactions (user_id, category_id, type, transaction_date, amount);
@@ -0,0 +1,17 @@
+-- Change log for Mini App delta sync (GET /api/sync). Existing transactions
+-- need no backfill: a client's first sync is a full snapshot.
+
+CREATE TABLE IF NOT EXISTS sync_versions (
+    user_id INT PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS transaction_changes (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL,
+    version BIGINT NOT NULL,
+    transaction_id INT NOT NULL,
+    op VARCHAR(10) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_user_version (user_id, version)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
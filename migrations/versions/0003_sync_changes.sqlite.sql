@@ -0,0 +1,17 @@
+-- Change log for Mini App delta sync (GET /api/sync). Existing transactions
+-- need no backfill: a client's first sync is a full snapshot.
+
+CREATE TABLE IF NOT EXISTS sync_versions (
+    user_id INTEGER PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS transaction_changes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    version BIGINT NOT NULL,
+    transaction_id INTEGER NOT NULL,
+    op VARCHAR(10) NOT NULL,
+    created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
+    UNIQUE (user_id, version)
+);
@@ -18,8 +18,11 @@ async function loadAnalytics() {
   if (chartEmpty) chartEmpty.hidden = true;
   if (categoryBreakdown) categoryBreakdown.innerHTML = `<div class="hint">Memuat…</div>`;
   if (breakdownEmpty) breakdownEmpty.hidden = true;
+  // About one bar per 6px of chart width; the server buckets and downsamples to fit
+  const width = chartCanvas && chartCanvas.clientWidth ? chartCanvas.clientWidth : 360;
+  const points = Math.max(20, Math.min(240, Math.floor(width / 6)));
   const data = await apiFetch(
-    `/api/analytics?start=${encodeURIComponent(start)}&end=${encodeURIComponent(end)}&type=${encodeURIComponent(currentType)}`
+    `/api/analytics?start=${encodeURIComponent(start)}&end=${encodeURIComponent(end)}&type=${encodeURIComponent(currentType)}&granularity=auto&points=${points}`
   );
 
   const byDay = data.by_day || [];
@@ -30,12 +33,13 @@ async function loadAnalytics() {
 
   if (chartCanvas) {
     const ctx = chartCanvas.getContext("2d");
-    const labels = byDay.map((d) => formatDate(d.date));
+    const labels = byDay.map((d) => formatPeriodLabel(d.date, data.granularity));
     const values = byDay.map((d) => (currentType === "income" ? d.income : d.expense));
 
-    if (chartEmpty) chartEmpty.hidden = values.length > 0;
+    const hasData = values.some((v) => Number(v) !== 0);
+    if (chartEmpty) chartEmpty.hidden = hasData;
 
-    if (values.length > 0) {
+    if (hasData) {
       chartInstance = new Chart(ctx, {
         type: "bar",
         data: {
@@ -53,6 +57,7 @@ async function loadAnalytics() {
         options: {
           responsive: true,
           maintainAspectRatio: false,
+          animation: values.length > 60 ? false : undefined,
           plugins: {
             legend: { display: false },
           },
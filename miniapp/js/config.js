@@ -17,7 +17,6 @@ const lastTxList = $("lastTxList");
 const txList = $("txList");
 const txListEmpty = $("txListEmpty");
 const txCount = $("txCount");
-const txPagination = $("txPagination");
 const txIncomeVal = $("txIncomeVal");
 const txExpenseVal = $("txExpenseVal");
 const linkSeeAll = $("linkSeeAll");
@@ -61,5 +60,5 @@ const fmt = new Intl.NumberFormat("id-ID");
 const tg = window.Telegram && window.Telegram.WebApp ? window.Telegram.WebApp : null;
 const initData = tg && tg.initData ? tg.initData : "";
 
-const TX_PAGE_SIZE = 10;
+const TX_PAGE_SIZE = 50;
 const PRESET_DAYS = { 7: 7, 30: 30 };
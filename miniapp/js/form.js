@@ -32,6 +32,7 @@ async function onSubmit(e) {
       });
       setStatus("Transaksi diperbarui.", "ok");
       editingTxId = null;
+      await ledgerOrNull(true);
       await Promise.all([loadBalance(), loadLast5(), loadTransactionList().catch(() => {})]);
       if (tg && tg.HapticFeedback) tg.HapticFeedback.notificationOccurred("success");
       closeTxDetail();
@@ -48,6 +49,7 @@ async function onSubmit(e) {
       setStatus("Tersimpan.", "ok");
       amountInput.value = "";
       descInput.value = "";
+      await ledgerOrNull(true);
       await Promise.all([loadBalance(), loadLast5()]);
       if (tg && tg.HapticFeedback) tg.HapticFeedback.notificationOccurred("success");
       closeAddTransaction();
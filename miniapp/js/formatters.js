@@ -12,6 +12,16 @@ function formatDate(str) {
   return `${d}/${m}/${y}`;
 }
 
+function formatPeriodLabel(str, granularity) {
+  if (granularity !== "month") return formatDate(str);
+  const months = [
+    "Jan", "Feb", "Mar", "Apr", "Mei", "Jun",
+    "Jul", "Agu", "Sep", "Okt", "Nov", "Des",
+  ];
+  const [y, m] = String(str || "").slice(0, 7).split("-");
+  return m ? `${months[Number(m) - 1]} ${y}` : "";
+}
+
 function formatDetailDateTime(tx) {
   if (!tx) return "-";
   const months = [
@@ -0,0 +1,173 @@
+/* Local transaction ledger: IndexedDB cache kept current by /api/sync deltas */
+
+const LEDGER_SYNC_INTERVAL_MS = 5000;
+const LEDGER_PAGE_SIZE = 1000;
+
+const ledger = {
+  rows: new Map(),
+  version: 0,
+  db: null,
+  opened: false,
+  loaded: false,
+  syncedAt: 0,
+  pending: null,
+};
+
+function ledgerDbName() {
+  const user = tg && tg.initDataUnsafe && tg.initDataUnsafe.user;
+  return `montrixa-ledger-${user && user.id ? user.id : "anon"}`;
+}
+
+function idbRequest(req) {
+  return new Promise((resolve, reject) => {
+    req.onsuccess = () => resolve(req.result);
+    req.onerror = () => reject(req.error);
+  });
+}
+
+function openLedgerDb() {
+  if (!window.indexedDB) return Promise.resolve(null);
+  return new Promise((resolve) => {
+    const req = indexedDB.open(ledgerDbName(), 1);
+    req.onupgradeneeded = () => {
+      req.result.createObjectStore("transactions", { keyPath: "id" });
+      req.result.createObjectStore("meta");
+    };
+    req.onsuccess = () => resolve(req.result);
+    // Private mode or storage disabled: the ledger lives in memory only
+    req.onerror = () => resolve(null);
+    req.onblocked = () => resolve(null);
+  });
+}
+
+async function openLedger() {
+  if (ledger.opened) return;
+  ledger.opened = true;
+  ledger.db = await openLedgerDb();
+  if (!ledger.db) return;
+  try {
+    const tx = ledger.db.transaction(["transactions", "meta"], "readonly");
+    const [rows, version] = await Promise.all([
+      idbRequest(tx.objectStore("transactions").getAll()),
+      idbRequest(tx.objectStore("meta").get("version")),
+    ]);
+    ledger.rows = new Map(rows.map((row) => [row.id, row]));
+    ledger.version = version || 0;
+    ledger.loaded = ledger.version > 0;
+  } catch (_) {
+    ledger.rows = new Map();
+    ledger.version = 0;
+  }
+}
+
+function writeLedger(replace, rows, deleted, version) {
+  if (!ledger.db) return Promise.resolve();
+  return new Promise((resolve) => {
+    const tx = ledger.db.transaction(["transactions", "meta"], "readwrite");
+    const store = tx.objectStore("transactions");
+    if (replace) store.clear();
+    rows.forEach((row) => store.put(row));
+    deleted.forEach((id) => store.delete(id));
+    tx.objectStore("meta").put(version, "version");
+    tx.oncomplete = () => resolve();
+    // A failed write only costs a bigger delta next time
+    tx.onerror = () => resolve();
+    tx.onabort = () => resolve();
+  });
+}
+
+async function runLedgerSync() {
+  await openLedger();
+  let snapshot = null;
+  let snapshotVersion = 0;
+  let after = 0;
+  for (;;) {
+    const since = snapshot ? 0 : ledger.version;
+    const page = await apiFetch(`/api/sync?since=${since}&after=${after}&limit=${LEDGER_PAGE_SIZE}`);
+    if (page.reset) {
+      // Snapshot pages are collected and swapped in together
+      if (!snapshot || after === 0) {
+        snapshot = new Map();
+        snapshotVersion = page.version;
+      }
+      page.transactions.forEach((row) => snapshot.set(row.id, row));
+      if (page.has_more) {
+        after = page.after;
+        continue;
+      }
+      ledger.rows = snapshot;
+      ledger.version = snapshotVersion;
+      await writeLedger(true, [...snapshot.values()], [], snapshotVersion);
+      break;
+    }
+    page.transactions.forEach((row) => ledger.rows.set(row.id, row));
+    page.deleted.forEach((id) => ledger.rows.delete(id));
+    ledger.version = page.version;
+    await writeLedger(false, page.transactions, page.deleted, page.version);
+    if (!page.has_more) break;
+  }
+  ledger.loaded = true;
+  ledger.syncedAt = Date.now();
+  return ledger;
+}
+
+function syncLedger(force = false) {
+  if (ledger.pending) {
+    // A running sync may have started before the caller's write
+    return force ? ledger.pending.then(() => syncLedger(true)) : ledger.pending;
+  }
+  if (!force && ledger.loaded && Date.now() - ledger.syncedAt < LEDGER_SYNC_INTERVAL_MS) {
+    return Promise.resolve(ledger);
+  }
+  ledger.pending = runLedgerSync().finally(() => {
+    ledger.pending = null;
+  });
+  return ledger.pending;
+}
+
+async function applyLedgerDelta(change) {
+  // Only a delta that starts at our version can be patched in place
+  if (ledger.pending || !ledger.loaded || !change.complete || change.since !== ledger.version) return false;
+  change.transactions.forEach((row) => ledger.rows.set(row.id, row));
+  change.deleted.forEach((id) => ledger.rows.delete(id));
+  ledger.version = change.version;
+  ledger.syncedAt = Date.now();
+  await writeLedger(false, change.transactions, change.deleted, change.version);
+  return true;
+}
+
+async function ledgerOrNull(force = false) {
+  try {
+    return await syncLedger(force);
+  } catch (_) {
+    return null;
+  }
+}
+
+function compareTx(a, b) {
+  if (a.transaction_date !== b.transaction_date) return a.transaction_date < b.transaction_date ? 1 : -1;
+  if (a.created_at !== b.created_at) return (a.created_at || "") < (b.created_at || "") ? 1 : -1;
+  return b.id - a.id;
+}
+
+function ledgerTransactions(start = null, end = null) {
+  const list = [];
+  ledger.rows.forEach((row) => {
+    if (start && row.transaction_date < start) return;
+    if (end && row.transaction_date > end) return;
+    list.push(row);
+  });
+  return list.sort(compareTx);
+}
+
+function ledgerTotals(list) {
+  // Sum in cents so totals match the server's exact arithmetic
+  let income = 0;
+  let expense = 0;
+  list.forEach((row) => {
+    const cents = Math.round(Number(row.amount) * 100);
+    if (row.type === "income") income += cents;
+    else expense += cents;
+  });
+  return { income: income / 100, expense: expense / 100, balance: (income - expense) / 100 };
+}
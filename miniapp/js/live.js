@@ -0,0 +1,104 @@
+/* Live updates: change events from /api/live, read as a fetch stream */
+
+const LIVE_RETRY_MS = 3000;
+
+let liveAbort = null;
+let liveRefreshing = null;
+
+function liveSleep(ms) {
+  return new Promise((resolve) => setTimeout(resolve, ms));
+}
+
+function liveWaitVisible() {
+  if (!document.hidden) return Promise.resolve();
+  return new Promise((resolve) => {
+    const onChange = () => {
+      if (document.hidden) return;
+      document.removeEventListener("visibilitychange", onChange);
+      resolve();
+    };
+    document.addEventListener("visibilitychange", onChange);
+  });
+}
+
+function refreshLiveViews() {
+  // Coalesce bursts of events into one redraw
+  if (liveRefreshing) return liveRefreshing;
+  liveRefreshing = Promise.all([
+    loadBalance(),
+    loadLast5(),
+    currentTab === "transaction" ? loadTransactionList() : null,
+  ])
+    .catch(() => {})
+    .finally(() => {
+      liveRefreshing = null;
+    });
+  return liveRefreshing;
+}
+
+async function onLiveEvent(name, data) {
+  if (name === "hello") {
+    if (ledger.loaded && data.version === ledger.version) return;
+  } else if (name === "change") {
+    // Our own writes are usually synced already
+    if (ledger.loaded && data.version <= ledger.version) return;
+    if (!(await applyLedgerDelta(data))) await ledgerOrNull(true);
+  } else {
+    return;
+  }
+  await refreshLiveViews();
+}
+
+function parseLiveBlock(block) {
+  let name = "message";
+  let data = "";
+  block.split("\n").forEach((line) => {
+    if (line.startsWith("event:")) name = line.slice(6).trim();
+    else if (line.startsWith("data:")) data += line.slice(5).trim();
+  });
+  if (!data) return null;
+  try {
+    return { name, data: JSON.parse(data) };
+  } catch (_) {
+    return null;
+  }
+}
+
+async function readLiveStream() {
+  liveAbort = new AbortController();
+  const res = await fetch("/api/live", {
+    headers: { "X-Telegram-Init-Data": initData, Accept: "text/event-stream" },
+    signal: liveAbort.signal,
+  });
+  if (!res.ok || !res.body) throw new Error(`HTTP ${res.status}`);
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) return;
+    buffer += decoder.decode(value, { stream: true });
+    let end = buffer.indexOf("\n\n");
+    while (end >= 0) {
+      const message = parseLiveBlock(buffer.slice(0, end));
+      buffer = buffer.slice(end + 2);
+      if (message) await onLiveEvent(message.name, message.data);
+      end = buffer.indexOf("\n\n");
+    }
+  }
+}
+
+async function startLiveUpdates() {
+  if (!initData || !window.fetch || !window.TextDecoder || !window.AbortController) return;
+  // Hidden Mini Apps drop the stream; it reconnects (and resyncs) when shown
+  document.addEventListener("visibilitychange", () => {
+    if (document.hidden && liveAbort) liveAbort.abort();
+  });
+  for (;;) {
+    await liveWaitVisible();
+    try {
+      await readLiveStream();
+    } catch (_) {}
+    await liveSleep(LIVE_RETRY_MS);
+  }
+}
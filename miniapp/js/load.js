@@ -8,10 +8,17 @@ async function loadBalance() {
   const monthStart = new Date(now.getFullYear(), now.getMonth(), 1);
   const start = formatLocalDateISO(monthStart);
   const end = formatLocalDateISO(now);
-  const [overall, monthly] = await Promise.all([
-    apiFetch("/api/balance"),
-    apiFetch(`/api/balance?start=${encodeURIComponent(start)}&end=${encodeURIComponent(end)}`),
-  ]);
+  let overall;
+  let monthly;
+  if (await ledgerOrNull()) {
+    overall = ledgerTotals(ledgerTransactions());
+    monthly = ledgerTotals(ledgerTransactions(start, end));
+  } else {
+    [overall, monthly] = await Promise.all([
+      apiFetch("/api/balance"),
+      apiFetch(`/api/balance?start=${encodeURIComponent(start)}&end=${encodeURIComponent(end)}`),
+    ]);
+  }
   if (incomeVal) incomeVal.textContent = formatRp(monthly.income);
   if (expenseVal) expenseVal.textContent = formatRp(monthly.expense);
   if (balanceVal) balanceVal.textContent = formatRp(overall.balance);
@@ -38,9 +45,13 @@ async function loadLast5() {
   start.setFullYear(start.getFullYear() - 1);
   const startStr = formatLocalDateISO(start);
   const endStr = formatLocalDateISO(end);
-  const cacheBust = Date.now();
-  const data = await apiFetch(`/api/transactions?start=${startStr}&end=${endStr}&limit=5&offset=0&_=${cacheBust}`);
-  lastTxData = data.transactions || [];
+  if (await ledgerOrNull()) {
+    lastTxData = ledgerTransactions(startStr, endStr).slice(0, 5);
+  } else {
+    const cacheBust = Date.now();
+    const data = await apiFetch(`/api/transactions?start=${startStr}&end=${endStr}&limit=5&offset=0&_=${cacheBust}`);
+    lastTxData = data.transactions || [];
+  }
   renderTxList(lastTxList, lastTxData, true, "Belum ada transaksi.");
 }
 
@@ -59,45 +70,75 @@ function getDateRange() {
   return { start, end };
 }
 
+function getTxVirtualList() {
+  if (!txVirtualList && txList) {
+    txVirtualList = createVirtualList(txList, document.querySelector(".main"), {
+      onNearEnd: () => loadMoreTransactions().catch(() => {}),
+    });
+  }
+  return txVirtualList;
+}
+
+async function loadMoreTransactions() {
+  // API mode only: fetch the page after txNextCursor before the user reaches it
+  if (!txNextCursor || txLoadingMore || !txVirtualList) return;
+  const token = txListToken;
+  const { start, end } = getDateRange();
+  txLoadingMore = true;
+  try {
+    const data = await apiFetch(
+      `/api/transactions?start=${encodeURIComponent(start)}&end=${encodeURIComponent(end)}&limit=${TX_PAGE_SIZE}&cursor=${encodeURIComponent(txNextCursor)}`
+    );
+    if (token !== txListToken) return;
+    txNextCursor = data.next_cursor || null;
+    txVirtualList.append(data.transactions || []);
+  } finally {
+    txLoadingMore = false;
+  }
+}
+
 async function loadTransactionList() {
   const { start, end } = getDateRange();
-  if (txList) txList.innerHTML = `<div class="hint">Memuat…</div>`;
+  const token = ++txListToken;
+  if (txList && txListData.length === 0) txList.innerHTML = `<div class="hint">Memuat…</div>`;
   if (txListEmpty) txListEmpty.hidden = true;
   if (txIncomeVal) txIncomeVal.textContent = "…";
   if (txExpenseVal) txExpenseVal.textContent = "…";
-  const offset = txPage * TX_PAGE_SIZE;
-  const [data, summary] = await Promise.all([
-    apiFetch(
-      `/api/transactions?start=${encodeURIComponent(start)}&end=${encodeURIComponent(end)}&limit=${TX_PAGE_SIZE}&offset=${offset}`
-    ),
-    apiFetch(`/api/balance?start=${encodeURIComponent(start)}&end=${encodeURIComponent(end)}`),
-  ]);
-  const list = data.transactions || [];
-  txTotal = data.total ?? 0;
-  txListData = list;
+  let list;
+  let summary;
+  if (await ledgerOrNull()) {
+    // The whole range is local; the virtual list renders only what is in view
+    list = ledgerTransactions(start, end);
+    txTotal = list.length;
+    txNextCursor = null;
+    summary = ledgerTotals(list);
+  } else {
+    let data;
+    [data, summary] = await Promise.all([
+      apiFetch(
+        `/api/transactions?start=${encodeURIComponent(start)}&end=${encodeURIComponent(end)}&limit=${TX_PAGE_SIZE}`
+      ),
+      apiFetch(`/api/balance?start=${encodeURIComponent(start)}&end=${encodeURIComponent(end)}`),
+    ]);
+    list = data.transactions || [];
+    txTotal = data.total ?? list.length;
+    txNextCursor = data.next_cursor || null;
+  }
+  if (token !== txListToken) return;
   if (txIncomeVal) txIncomeVal.textContent = formatRp(summary.income);
   if (txExpenseVal) txExpenseVal.textContent = formatRp(summary.expense);
 
-  if (txList) renderTxList(txList, list, false);
+  const vlist = getTxVirtualList();
+  if (vlist) {
+    vlist.setItems(list);
+    txListData = vlist.items();
+  }
   if (txListEmpty) {
     txListEmpty.hidden = list.length > 0;
   }
   if (txCount) {
     txCount.textContent = `Total: ${txTotal}`;
   }
-
-  const totalPages = Math.max(1, Math.ceil(txTotal / TX_PAGE_SIZE));
-  if (txPagination) {
-    txPagination.innerHTML = `
-      <button type="button" id="txPrev" ${txPage <= 0 ? "disabled" : ""}>Prev</button>
-      <span class="page-info">${txPage + 1} / ${totalPages}</span>
-      <button type="button" id="txNext" ${txPage >= totalPages - 1 ? "disabled" : ""}>Next</button>
-    `;
-    const prevBtn = $("txPrev");
-    const nextBtn = $("txNext");
-    if (prevBtn) prevBtn.addEventListener("click", () => { txPage = Math.max(0, txPage - 1); loadTransactionList().catch(() => {}); });
-    if (nextBtn) nextBtn.addEventListener("click", () => { txPage = Math.min(totalPages - 1, txPage + 1); loadTransactionList().catch(() => {}); });
-  }
 }
 
 async function setDefaultDateRange() {
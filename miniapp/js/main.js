@@ -65,6 +65,7 @@ function init() {
       try {
         await apiFetch(`/api/transaction/${selectedTxId}`, { method: "DELETE" });
         if (tg && tg.HapticFeedback) tg.HapticFeedback.notificationOccurred("success");
+        await ledgerOrNull(true);
         await Promise.all([loadBalance(), loadLast5(), loadTransactionList().catch(() => {})]);
         closeTxDetail();
       } catch (err) {
@@ -110,14 +111,13 @@ function init() {
       start.setDate(start.getDate() - days);
       if (filterStart) filterStart.value = formatLocalDateISO(start);
       if (filterEnd) filterEnd.value = formatLocalDateISO(end);
-      txPage = 0;
       loadTransactionList().catch(() => {});
     });
   });
 
   if (filterStart && filterEnd) {
-    filterStart.addEventListener("change", () => { txPage = 0; loadTransactionList().catch(() => {}); });
-    filterEnd.addEventListener("change", () => { txPage = 0; loadTransactionList().catch(() => {}); });
+    filterStart.addEventListener("change", () => loadTransactionList().catch(() => {}));
+    filterEnd.addEventListener("change", () => loadTransactionList().catch(() => {}));
   }
 
   if (amountInput) {
@@ -131,7 +131,8 @@ function init() {
   setDefaultDateRange()
     .then(() => Promise.all([loadBalance(), loadLast5()]))
     .then(() => setStatus(""))
-    .catch((e) => setStatus(e.message, "err"));
+    .catch((e) => setStatus(e.message, "err"))
+    .finally(() => startLiveUpdates());
 }
 
 init();
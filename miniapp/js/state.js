@@ -9,6 +9,9 @@ let tabBeforeDetail = "home";
 
 let currentType = "expense";
 let currentTab = "home";
-let txPage = 0;
 let txTotal = 0;
+let txNextCursor = null;
+let txLoadingMore = false;
+let txListToken = 0;
+let txVirtualList = null;
 let chartInstance = null;
@@ -0,0 +1,105 @@
+/* Virtualized list: only the rows near the viewport exist in the DOM */
+
+const VLIST_OVERSCAN = 8;
+const VLIST_ROW_GAP = 10;
+
+function createVirtualList(container, scroller, options = {}) {
+  const renderItem = options.renderItem || renderTxItem;
+  // Called with the index of the last row in view; may append more items
+  const onNearEnd = options.onNearEnd || null;
+  const prefetchRows = options.prefetchRows || 40;
+
+  let items = [];
+  let pitch = 0;
+  let rendered = new Map();
+  let frame = 0;
+
+  function measure() {
+    if (pitch || items.length === 0) return;
+    const probe = document.createElement("div");
+    probe.innerHTML = renderItem(items[0]).trim();
+    const row = probe.firstElementChild;
+    row.style.visibility = "hidden";
+    container.appendChild(row);
+    // Hidden view (display: none): measure again once it is shown
+    pitch = row.offsetHeight ? row.offsetHeight + VLIST_ROW_GAP : 0;
+    row.remove();
+  }
+
+  function visibleRange() {
+    // How far the list's top has scrolled above the scroller's top
+    const top = scroller.getBoundingClientRect().top - container.getBoundingClientRect().top;
+    const first = Math.max(0, Math.floor(top / pitch) - VLIST_OVERSCAN);
+    const last = Math.min(items.length - 1, Math.ceil((top + scroller.clientHeight) / pitch) + VLIST_OVERSCAN);
+    return [first, last];
+  }
+
+  function createRow(index) {
+    const probe = document.createElement("div");
+    probe.innerHTML = renderItem(items[index]).trim();
+    const row = probe.firstElementChild;
+    row.style.transform = `translateY(${index * pitch}px)`;
+    return row;
+  }
+
+  function render() {
+    frame = 0;
+    if (items.length === 0) return;
+    measure();
+    if (!pitch) return;
+    container.style.height = `${Math.max(0, items.length * pitch - VLIST_ROW_GAP)}px`;
+    const [first, last] = visibleRange();
+    rendered.forEach((row, index) => {
+      if (index < first || index > last) {
+        row.remove();
+        rendered.delete(index);
+      }
+    });
+    const fragment = document.createDocumentFragment();
+    for (let i = first; i <= last; i += 1) {
+      if (!rendered.has(i)) {
+        const row = createRow(i);
+        rendered.set(i, row);
+        fragment.appendChild(row);
+      }
+    }
+    container.appendChild(fragment);
+    if (onNearEnd && last >= items.length - prefetchRows) onNearEnd(last);
+  }
+
+  function schedule() {
+    if (!frame) frame = requestAnimationFrame(render);
+  }
+
+  function clear() {
+    rendered.forEach((row) => row.remove());
+    rendered = new Map();
+  }
+
+  scroller.addEventListener("scroll", schedule, { passive: true });
+  window.addEventListener("resize", () => {
+    pitch = 0;
+    clear();
+    schedule();
+  });
+
+  return {
+    setItems(next) {
+      items = next;
+      clear();
+      container.classList.add("list-virtual");
+      container.innerHTML = "";
+      if (items.length === 0) container.style.height = "";
+      render();
+    },
+    append(more) {
+      // Existing rows stay; only the height and the window are updated
+      more.forEach((item) => items.push(item));
+      schedule();
+      return items;
+    },
+    items() {
+      return items;
+    },
+  };
+}
@@ -1,8 +1,9 @@
 """Budget model and database operations."""
 
-from typing import Optional, Dict, Any, List
-from datetime import date, datetime
+from typing import Optional, Dict, Any, List, Sequence
+from datetime import date, datetime, timedelta
 from config.database import DatabaseConnection
+from utils.money import percentage, to_decimal, to_major, to_minor
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,12 +12,28 @@ logger = logging.getLogger(__name__)
 class Budget:
     """Budget model for expense tracking and alerts."""
     
+    # Order of tuple rows read by from_row(); category_name/icon come from the
+    # category join, telegram_id (optional, last) from the users join. The
+    # amount column is kept as integer minor units (see utils.money).
+    COLUMNS = (
+        'id', 'user_id', 'category_id', 'amount_minor', 'period', 'start_date', 'end_date',
+        'is_active', 'alert_at_75', 'alert_at_90', 'alert_at_100', 'created_at', 'updated_at',
+        'category_name', 'category_icon', 'telegram_id',
+    )
+    __slots__ = COLUMNS
+    
+    _SELECT = """
+        SELECT b.id, b.user_id, b.category_id, b.amount, b.period, b.start_date, b.end_date,
+               b.is_active, b.alert_at_75, b.alert_at_90, b.alert_at_100, b.created_at,
+               b.updated_at, c.name as category_name, c.icon as category_icon
+    """
+    
     def __init__(self, budget_data: Dict[str, Any]):
         """Initialize Budget from database row."""
         self.id = budget_data.get('id')
         self.user_id = budget_data.get('user_id')
         self.category_id = budget_data.get('category_id')
-        self.amount = float(budget_data.get('amount', 0))
+        self.amount_minor = to_minor(budget_data.get('amount'))
         self.period = budget_data.get('period')  # 'daily', 'weekly', 'monthly'
         self.start_date = budget_data.get('start_date')
         self.end_date = budget_data.get('end_date')
@@ -30,6 +47,28 @@ class Budget:
         # Extra fields from joins
         self.category_name = budget_data.get('category_name')
         self.category_icon = budget_data.get('category_icon')
+        self.telegram_id = budget_data.get('telegram_id')
+    
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> 'Budget':
+        """Build a budget from a tuple row in COLUMNS order (no per-row dict)."""
+        budget = cls.__new__(cls)
+        (budget.id, budget.user_id, budget.category_id, amount, budget.period,
+         budget.start_date, budget.end_date, budget.is_active, budget.alert_at_75,
+         budget.alert_at_90, budget.alert_at_100, budget.created_at, budget.updated_at,
+         budget.category_name, budget.category_icon, *telegram_id) = row
+        budget.amount_minor = to_minor(amount)
+        budget.telegram_id = telegram_id[0] if telegram_id else None
+        return budget
+    
+    @property
+    def amount(self) -> float:
+        """Budget amount in currency units (derived from amount_minor)."""
+        return to_major(self.amount_minor)
+    
+    @amount.setter
+    def amount(self, value: Any) -> None:
+        self.amount_minor = to_minor(value)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert budget to dictionary."""
@@ -69,14 +108,20 @@ class Budget:
         if start_date is None:
             start_date = date.today()
         
-        query = """
+        dialect = DatabaseConnection.dialect()
+        upsert = dialect.on_conflict_update(
+            ('user_id', 'category_id', 'period', 'start_date'),
+            (f"amount = {dialect.excluded('amount')}", "is_active = TRUE",
+             f"updated_at = {dialect.now()}"),
+        )
+        query = f"""
             INSERT INTO budgets (user_id, category_id, amount, period, start_date)
             VALUES (%s, %s, %s, %s, %s)
-            ON DUPLICATE KEY UPDATE amount = %s, is_active = TRUE, updated_at = CURRENT_TIMESTAMP
+            {upsert}
         """
         try:
             with DatabaseConnection.get_cursor() as cursor:
-                cursor.execute(query, (user_id, category_id, amount, period, start_date, amount))
+                cursor.execute(query, (user_id, category_id, to_decimal(to_minor(amount)), period, start_date))
                 budget_id = cursor.lastrowid
             
             logger.info(f"Created/Updated budget for user {user_id}, category {category_id}")
@@ -95,16 +140,17 @@ class Budget:
         Returns:
             Budget instance or None if not found
         """
-        query = """
-            SELECT b.*, c.name as category_name, c.icon as category_icon
+        query = Budget._SELECT + """
             FROM budgets b
             LEFT JOIN categories c ON b.category_id = c.id
             WHERE b.id = %s
         """
-        result = DatabaseConnection.execute_query(query, (budget_id,), fetch_one=True, commit=False)
+        result = DatabaseConnection.execute_query(
+            query, (budget_id,), fetch_one=True, commit=False, tuples=True
+        )
         
         if result:
-            return Budget(result)
+            return Budget.from_row(result)
         return None
     
     @staticmethod
@@ -118,8 +164,7 @@ class Budget:
         Returns:
             List of Budget instances
         """
-        query = """
-            SELECT b.*, c.name as category_name, c.icon as category_icon
+        query = Budget._SELECT + """
             FROM budgets b
             LEFT JOIN categories c ON b.category_id = c.id
             WHERE b.user_id = %s
@@ -131,8 +176,8 @@ class Budget:
         
         query += " ORDER BY b.period, c.name"
         
-        results = DatabaseConnection.execute_query(query, tuple(params), commit=False)
-        return [Budget(row) for row in results]
+        results = DatabaseConnection.execute_query(query, tuple(params), commit=False, tuples=True)
+        return [Budget.from_row(row) for row in results]
     
     @staticmethod
     def get_by_user_category(user_id: int, category_id: int, period: str) -> Optional['Budget']:
@@ -146,8 +191,7 @@ class Budget:
         Returns:
             Budget instance or None if not found
         """
-        query = """
-            SELECT b.*, c.name as category_name, c.icon as category_icon
+        query = Budget._SELECT + """
             FROM budgets b
             LEFT JOIN categories c ON b.category_id = c.id
             WHERE b.user_id = %s AND b.category_id = %s AND b.period = %s AND b.is_active = TRUE
@@ -155,38 +199,51 @@ class Budget:
             LIMIT 1
         """
         result = DatabaseConnection.execute_query(
-            query, (user_id, category_id, period), fetch_one=True, commit=False
+            query, (user_id, category_id, period), fetch_one=True, commit=False, tuples=True
         )
         
         if result:
-            return Budget(result)
+            return Budget.from_row(result)
         return None
     
-    def get_spent_amount(self, current_date: Optional[date] = None) -> float:
-        """Calculate total spent for this budget in current period.
+    def period_start(self, current_date: Optional[date] = None) -> date:
+        """First day of the budget period containing current_date.
         
         Args:
-            current_date: Date to calculate from (defaults to today)
+            current_date: Reference date (defaults to today)
             
         Returns:
-            Total spent amount
+            Today for daily, Monday for weekly, the 1st for monthly budgets
         """
         if current_date is None:
             current_date = date.today()
         
-        # Calculate period start date
-        from datetime import timedelta
-        
         if self.period == 'daily':
-            period_start = current_date
+            return current_date
         elif self.period == 'weekly':
             # Start of week (Monday)
-            period_start = current_date - timedelta(days=current_date.weekday())
+            return current_date - timedelta(days=current_date.weekday())
         else:  # monthly
-            period_start = current_date.replace(day=1)
+            return current_date.replace(day=1)
+    
+    def get_spent_amount(self, current_date: Optional[date] = None) -> float:
+        """Calculate total spent for this budget in current period.
+        
+        Args:
+            current_date: Date to calculate from (defaults to today)
+            
+        Returns:
+            Total spent amount
+        """
+        return to_major(self.get_spent_minor(current_date))
+    
+    def get_spent_minor(self, current_date: Optional[date] = None) -> int:
+        """Like get_spent_amount(), in integer minor units."""
+        if current_date is None:
+            current_date = date.today()
         
-        query = """
-            SELECT COALESCE(SUM(amount), 0) as total
+        query = f"""
+            SELECT {DatabaseConnection.dialect().sum_minor_units('amount')} as total
             FROM transactions
             WHERE user_id = %s 
             AND category_id = %s 
@@ -196,11 +253,65 @@ class Budget:
         """
         
         result = DatabaseConnection.execute_query(
-            query, (self.user_id, self.category_id, period_start, current_date),
+            query, (self.user_id, self.category_id, self.period_start(current_date), current_date),
             fetch_one=True, commit=False
         )
         
-        return float(result['total']) if result else 0.0
+        return int(result['total']) if result else 0
+    
+    @staticmethod
+    def get_spent_minor_amounts(budgets: List['Budget'],
+                                current_date: Optional[date] = None) -> Dict[int, int]:
+        """Calculate the current-period spending of many budgets in one query.
+        
+        Sums daily, weekly and monthly windows per (user, category) at once, so
+        listing N budgets costs one query instead of N.
+        
+        Args:
+            budgets: Budgets to evaluate (any users)
+            current_date: Date to calculate from (defaults to today)
+            
+        Returns:
+            Dictionary of budget ID to spent amount in integer minor units
+        """
+        if not budgets:
+            return {}
+        if current_date is None:
+            current_date = date.today()
+        
+        day_start = current_date
+        week_start = current_date - timedelta(days=current_date.weekday())
+        month_start = current_date.replace(day=1)
+        user_ids = sorted({b.user_id for b in budgets})
+        category_ids = sorted({b.category_id for b in budgets})
+        
+        window_sum = DatabaseConnection.dialect().sum_minor_units(
+            "CASE WHEN transaction_date >= %s THEN amount ELSE 0 END"
+        )
+        query = f"""
+            SELECT user_id, category_id,
+                   {window_sum} as daily,
+                   {window_sum} as weekly,
+                   {window_sum} as monthly
+            FROM transactions
+            WHERE user_id IN ({', '.join(['%s'] * len(user_ids))})
+            AND category_id IN ({', '.join(['%s'] * len(category_ids))})
+            AND type = 'expense'
+            AND transaction_date >= %s
+            AND transaction_date <= %s
+            GROUP BY user_id, category_id
+        """
+        params = (day_start, week_start, month_start, *user_ids, *category_ids,
+                  min(week_start, month_start), current_date)
+        results = DatabaseConnection.execute_query(query, params, commit=False)
+        
+        totals = {(row['user_id'], row['category_id']): row for row in results}
+        spent = {}
+        for budget in budgets:
+            row = totals.get((budget.user_id, budget.category_id))
+            column = budget.period if budget.period in ('daily', 'weekly') else 'monthly'
+            spent[budget.id] = int(row[column]) if row else 0
+        return spent
     
     def get_percentage_used(self, current_date: Optional[date] = None) -> float:
         """Calculate percentage of budget used.
@@ -211,10 +322,11 @@ class Budget:
         Returns:
             Percentage used (0-100+)
         """
-        spent = self.get_spent_amount(current_date)
-        if self.amount == 0:
-            return 0.0
-        return (spent / self.amount) * 100
+        return self.percentage_of(self.get_spent_minor(current_date))
+    
+    def percentage_of(self, spent_minor: int) -> float:
+        """Percentage of the budget an already computed spent amount (minor units) represents."""
+        return percentage(spent_minor, self.amount_minor)
     
     def update(self, **kwargs) -> bool:
         """Update budget information.
@@ -233,7 +345,7 @@ class Budget:
         for field, value in kwargs.items():
             if field in allowed_fields:
                 update_fields.append(f"{field} = %s")
-                values.append(value)
+                values.append(to_decimal(to_minor(value)) if field == 'amount' else value)
         
         if not update_fields:
             return False
@@ -270,12 +382,12 @@ class Budget:
         Returns:
             List of Budget instances
         """
-        query = """
-            SELECT b.*, c.name as category_name, c.icon as category_icon
+        query = Budget._SELECT + """, u.telegram_id
             FROM budgets b
             LEFT JOIN categories c ON b.category_id = c.id
+            JOIN users u ON b.user_id = u.id
             WHERE b.is_active = TRUE
             ORDER BY b.user_id, b.period
         """
-        results = DatabaseConnection.execute_query(query, commit=False)
-        return [Budget(row) for row in results]
+        results = DatabaseConnection.execute_query(query, commit=False, tuples=True)
+        return [Budget.from_row(row) for row in results]
@@ -1,7 +1,8 @@
 """Category model and database operations."""
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Sequence
 from config.database import DatabaseConnection
+from models.sync import SyncLog, RESET
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,6 +11,13 @@ logger = logging.getLogger(__name__)
 class Category:
     """Category model for income and expense categorization."""
     
+    # Order of tuple rows read by from_row()
+    COLUMNS = ('id', 'user_id', 'name', 'type', 'icon', 'is_default', 'is_active',
+               'created_at', 'updated_at')
+    __slots__ = COLUMNS
+    
+    _SELECT = f"SELECT {', '.join(COLUMNS)} FROM categories"
+    
     def __init__(self, category_data: Dict[str, Any]):
         """Initialize Category from database row."""
         self.id = category_data.get('id')
@@ -22,6 +30,14 @@ class Category:
         self.created_at = category_data.get('created_at')
         self.updated_at = category_data.get('updated_at')
     
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> 'Category':
+        """Build a category from a tuple row in COLUMNS order (no per-row dict)."""
+        category = cls.__new__(cls)
+        (category.id, category.user_id, category.name, category.type, category.icon,
+         category.is_default, category.is_active, category.created_at, category.updated_at) = row
+        return category
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert category to dictionary."""
         return {
@@ -81,11 +97,13 @@ class Category:
         Returns:
             Category instance or None if not found
         """
-        query = "SELECT * FROM categories WHERE id = %s"
-        result = DatabaseConnection.execute_query(query, (category_id,), fetch_one=True, commit=False)
+        query = Category._SELECT + " WHERE id = %s"
+        result = DatabaseConnection.execute_query(
+            query, (category_id,), fetch_one=True, commit=False, tuples=True
+        )
         
         if result:
-            return Category(result)
+            return Category.from_row(result)
         return None
     
     @staticmethod
@@ -101,7 +119,7 @@ class Category:
         Returns:
             List of Category instances
         """
-        query = "SELECT * FROM categories WHERE user_id = %s"
+        query = Category._SELECT + " WHERE user_id = %s"
         params = [user_id]
         
         if cat_type:
@@ -113,8 +131,8 @@ class Category:
         
         query += " ORDER BY is_default DESC, name ASC"
         
-        results = DatabaseConnection.execute_query(query, tuple(params), commit=False)
-        return [Category(row) for row in results]
+        results = DatabaseConnection.execute_query(query, tuple(params), commit=False, tuples=True)
+        return [Category.from_row(row) for row in results]
     
     @staticmethod
     def get_by_name(user_id: int, name: str, cat_type: str) -> Optional['Category']:
@@ -128,16 +146,13 @@ class Category:
         Returns:
             Category instance or None if not found
         """
-        query = """
-            SELECT * FROM categories 
-            WHERE user_id = %s AND name = %s AND type = %s AND is_active = TRUE
-        """
+        query = Category._SELECT + " WHERE user_id = %s AND name = %s AND type = %s AND is_active = TRUE"
         result = DatabaseConnection.execute_query(
-            query, (user_id, name, cat_type), fetch_one=True, commit=False
+            query, (user_id, name, cat_type), fetch_one=True, commit=False, tuples=True
         )
         
         if result:
-            return Category(result)
+            return Category.from_row(result)
         return None
     
     def update(self, **kwargs) -> bool:
@@ -166,7 +181,11 @@ class Category:
         query = f"UPDATE categories SET {', '.join(update_fields)} WHERE id = %s"
         
         try:
-            DatabaseConnection.execute_query(query, tuple(values))
+            with DatabaseConnection.get_cursor() as cursor:
+                cursor.execute(query, tuple(values))
+                if 'name' in kwargs or 'icon' in kwargs:
+                    # Synced transactions carry the category name and icon
+                    SyncLog.record(cursor, self.user_id, 0, RESET)
             
             # Update instance
             for field, value in kwargs.items():
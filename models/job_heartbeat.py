@@ -0,0 +1,87 @@
+"""Job heartbeat model shared by the bot scheduler and API health checks."""
+
+from typing import Dict, Any, Optional
+from config.database import DatabaseConnection
+import logging
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_JOB_ID = 'scheduler'
+
+
+class JobHeartbeat:
+    """Last start/success/failure times of a background job.
+
+    The bot and the Mini App API run as separate processes, so job liveness is
+    persisted in the database instead of being kept in memory.
+    """
+
+    __slots__ = ('job_id', 'last_started_at', 'last_success_at', 'last_failure_at',
+                 'last_error', 'updated_at', 'success_age_seconds')
+
+    def __init__(self, data: Dict[str, Any]):
+        """Initialize JobHeartbeat from database row."""
+        self.job_id = data.get('job_id')
+        self.last_started_at = data.get('last_started_at')
+        self.last_success_at = data.get('last_success_at')
+        self.last_failure_at = data.get('last_failure_at')
+        self.last_error = data.get('last_error')
+        self.updated_at = data.get('updated_at')
+        # Computed by the database so process clocks/timezones do not matter
+        self.success_age_seconds = data.get('success_age_seconds')
+
+    @staticmethod
+    def _upsert(job_id: str, column: str, error: Optional[str] = None) -> None:
+        dialect = DatabaseConnection.dialect()
+        upsert = dialect.on_conflict_update(
+            ('job_id',),
+            (f"{column} = {dialect.now()}",
+             f"last_error = COALESCE({dialect.excluded('last_error')}, last_error)"),
+        )
+        query = f"""
+            INSERT INTO job_heartbeats (job_id, {column}, last_error)
+            VALUES (%s, {dialect.now()}, %s)
+            {upsert}
+        """
+        try:
+            DatabaseConnection.execute_query(query, (job_id, error))
+        except Exception as e:
+            # Heartbeats must never break the job they describe
+            logger.warning(f"Failed to record heartbeat for {job_id}: {e}")
+
+    @staticmethod
+    def record_start(job_id: str) -> None:
+        """Mark a job run as started."""
+        JobHeartbeat._upsert(job_id, 'last_started_at')
+
+    @staticmethod
+    def record_success(job_id: str) -> None:
+        """Mark a job run as successfully finished."""
+        JobHeartbeat._upsert(job_id, 'last_success_at')
+
+    @staticmethod
+    def record_failure(job_id: str, error: str) -> None:
+        """Mark a job run as failed.
+
+        Args:
+            job_id: Scheduler job ID
+            error: Short error description (truncated to 255 characters)
+        """
+        JobHeartbeat._upsert(job_id, 'last_failure_at', (error or 'error')[:255])
+
+    @staticmethod
+    def get_all() -> Dict[str, 'JobHeartbeat']:
+        """Get heartbeats of all jobs keyed by job ID.
+
+        Returns:
+            Dictionary of job_id -> JobHeartbeat
+        """
+        dialect = DatabaseConnection.dialect()
+        query = f"""
+            SELECT job_id, last_started_at, last_success_at, last_failure_at,
+                   last_error, updated_at,
+                   {dialect.seconds_between('last_success_at', dialect.now())} AS success_age_seconds
+            FROM job_heartbeats
+        """
+        rows = DatabaseConnection.execute_query(query, commit=False)
+        return {row['job_id']: JobHeartbeat(row) for row in rows}
@@ -1,8 +1,9 @@
 """Recurring transaction model and database operations."""
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Sequence
 from datetime import date, datetime, timedelta
 from config.database import DatabaseConnection
+from utils.money import to_decimal, to_major, to_minor
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,12 +12,29 @@ logger = logging.getLogger(__name__)
 class RecurringTransaction:
     """Recurring transaction model for automated transaction creation."""
     
+    # Order of tuple rows read by from_row(); the last two come from the category join.
+    # The amount column is kept as integer minor units (see utils.money).
+    COLUMNS = (
+        'id', 'user_id', 'category_id', 'amount_minor', 'description', 'type', 'frequency',
+        'start_date', 'next_run_date', 'last_run_date', 'end_date', 'is_active',
+        'created_at', 'updated_at', 'category_name', 'category_icon',
+    )
+    __slots__ = COLUMNS
+    
+    _SELECT = """
+        SELECT r.id, r.user_id, r.category_id, r.amount, r.description, r.type, r.frequency,
+               r.start_date, r.next_run_date, r.last_run_date, r.end_date, r.is_active,
+               r.created_at, r.updated_at, c.name as category_name, c.icon as category_icon
+        FROM recurring_transactions r
+        LEFT JOIN categories c ON r.category_id = c.id
+    """
+    
     def __init__(self, recurring_data: Dict[str, Any]):
         """Initialize RecurringTransaction from database row."""
         self.id = recurring_data.get('id')
         self.user_id = recurring_data.get('user_id')
         self.category_id = recurring_data.get('category_id')
-        self.amount = float(recurring_data.get('amount', 0))
+        self.amount_minor = to_minor(recurring_data.get('amount'))
         self.description = recurring_data.get('description')
         self.type = recurring_data.get('type')  # 'income' or 'expense'
         self.frequency = recurring_data.get('frequency')  # 'daily', 'weekly', 'monthly'
@@ -32,6 +50,27 @@ class RecurringTransaction:
         self.category_name = recurring_data.get('category_name')
         self.category_icon = recurring_data.get('category_icon')
     
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> 'RecurringTransaction':
+        """Build a recurring transaction from a tuple row in COLUMNS order (no per-row dict)."""
+        recurring = cls.__new__(cls)
+        (recurring.id, recurring.user_id, recurring.category_id, amount, recurring.description,
+         recurring.type, recurring.frequency, recurring.start_date, recurring.next_run_date,
+         recurring.last_run_date, recurring.end_date, recurring.is_active,
+         recurring.created_at, recurring.updated_at,
+         recurring.category_name, recurring.category_icon) = row
+        recurring.amount_minor = to_minor(amount)
+        return recurring
+    
+    @property
+    def amount(self) -> float:
+        """Amount in currency units (derived from amount_minor)."""
+        return to_major(self.amount_minor)
+    
+    @amount.setter
+    def amount(self, value: Any) -> None:
+        self.amount_minor = to_minor(value)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert recurring transaction to dictionary."""
         return {
@@ -81,7 +120,7 @@ class RecurringTransaction:
         try:
             with DatabaseConnection.get_cursor() as cursor:
                 cursor.execute(query, (
-                    user_id, category_id, amount, description, trans_type,
+                    user_id, category_id, to_decimal(to_minor(amount)), description, trans_type,
                     frequency, start_date, start_date
                 ))
                 recurring_id = cursor.lastrowid
@@ -102,16 +141,15 @@ class RecurringTransaction:
         Returns:
             RecurringTransaction instance or None if not found
         """
-        query = """
-            SELECT r.*, c.name as category_name, c.icon as category_icon
-            FROM recurring_transactions r
-            LEFT JOIN categories c ON r.category_id = c.id
+        query = RecurringTransaction._SELECT + """
             WHERE r.id = %s
         """
-        result = DatabaseConnection.execute_query(query, (recurring_id,), fetch_one=True, commit=False)
+        result = DatabaseConnection.execute_query(
+            query, (recurring_id,), fetch_one=True, commit=False, tuples=True
+        )
         
         if result:
-            return RecurringTransaction(result)
+            return RecurringTransaction.from_row(result)
         return None
     
     @staticmethod
@@ -125,10 +163,7 @@ class RecurringTransaction:
         Returns:
             List of RecurringTransaction instances
         """
-        query = """
-            SELECT r.*, c.name as category_name, c.icon as category_icon
-            FROM recurring_transactions r
-            LEFT JOIN categories c ON r.category_id = c.id
+        query = RecurringTransaction._SELECT + """
             WHERE r.user_id = %s
         """
         params = [user_id]
@@ -138,8 +173,8 @@ class RecurringTransaction:
         
         query += " ORDER BY r.next_run_date ASC"
         
-        results = DatabaseConnection.execute_query(query, tuple(params), commit=False)
-        return [RecurringTransaction(row) for row in results]
+        results = DatabaseConnection.execute_query(query, tuple(params), commit=False, tuples=True)
+        return [RecurringTransaction.from_row(row) for row in results]
     
     @staticmethod
     def get_due_transactions(current_date: Optional[date] = None) -> List['RecurringTransaction']:
@@ -154,17 +189,16 @@ class RecurringTransaction:
         if current_date is None:
             current_date = date.today()
         
-        query = """
-            SELECT r.*, c.name as category_name, c.icon as category_icon
-            FROM recurring_transactions r
-            LEFT JOIN categories c ON r.category_id = c.id
+        query = RecurringTransaction._SELECT + """
             WHERE r.is_active = TRUE 
             AND r.next_run_date <= %s
             AND (r.end_date IS NULL OR r.end_date >= %s)
             ORDER BY r.next_run_date ASC
         """
-        results = DatabaseConnection.execute_query(query, (current_date, current_date), commit=False)
-        return [RecurringTransaction(row) for row in results]
+        results = DatabaseConnection.execute_query(
+            query, (current_date, current_date), commit=False, tuples=True
+        )
+        return [RecurringTransaction.from_row(row) for row in results]
     
     def calculate_next_run_date(self, from_date: Optional[date] = None) -> date:
         """Calculate the next run date based on frequency.
@@ -240,7 +274,7 @@ class RecurringTransaction:
         for field, value in kwargs.items():
             if field in allowed_fields:
                 update_fields.append(f"{field} = %s")
-                values.append(value)
+                values.append(to_decimal(to_minor(value)) if field == 'amount' else value)
         
         if not update_fields:
             return False
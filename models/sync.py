@@ -0,0 +1,129 @@
+"""Per-user change log of transactions for Mini App delta sync."""
+
+from datetime import datetime
+from typing import Any, Dict, List, Sequence
+from config.database import DatabaseConnection
+import logging
+
+logger = logging.getLogger(__name__)
+
+UPSERT = 'upsert'
+DELETE = 'delete'
+# Something every synced row embeds changed (a category's name or icon); clients resnapshot
+RESET = 'reset'
+
+
+class SyncLog:
+    """Change sequence of each user's transactions.
+
+    Every transaction write bumps the user's row in sync_versions and appends
+    (user_id, version, transaction_id, op) to transaction_changes in the same
+    database transaction. The sync_versions row lock is held until commit, so
+    one user's versions become visible in version order and a client that has
+    seen version N never misses a change numbered below N. Versions of a user
+    have no gaps, and prune() only removes a user's oldest changes, so the
+    kept log of each user is an unbroken run up to its current version.
+    """
+
+    @staticmethod
+    def record(cursor, user_id: int, transaction_id: int, op: str) -> None:
+        """Append one change using the writer's cursor (same transaction).
+
+        Two statements: bump the user's version, then copy it into the log
+        row with INSERT ... SELECT (no round trip to read it back).
+
+        Args:
+            cursor: Cursor of the statement that changed the transaction
+            user_id: Owner of the transaction
+            transaction_id: Changed transaction (0 for RESET)
+            op: UPSERT (created or updated), DELETE or RESET
+        """
+        dialect = DatabaseConnection.dialect()
+        cursor.execute(
+            "INSERT INTO sync_versions (user_id, version) VALUES (%s, 1) "
+            + dialect.on_conflict_update(('user_id',), ('version = version + 1',)),
+            (user_id,)
+        )
+        cursor.execute(
+            "INSERT INTO transaction_changes (user_id, version, transaction_id, op) "
+            "SELECT user_id, version, %s, %s FROM sync_versions WHERE user_id = %s",
+            (transaction_id, op, user_id)
+        )
+
+    @staticmethod
+    def current_version(user_id: int) -> int:
+        """The user's latest version (0 before the first change)."""
+        row = DatabaseConnection.execute_query(
+            "SELECT version FROM sync_versions WHERE user_id = %s",
+            (user_id,), fetch_one=True, commit=False
+        )
+        return int(row['version']) if row else 0
+
+    @staticmethod
+    def versions(user_ids: Sequence[int]) -> Dict[int, int]:
+        """Latest version of several users in one query per 500 ids.
+
+        Returns:
+            Dictionary of user ID to version (users without changes are absent)
+        """
+        result: Dict[int, int] = {}
+        user_ids = list(user_ids)
+        for start in range(0, len(user_ids), 500):
+            chunk = user_ids[start:start + 500]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            rows = DatabaseConnection.execute_query(
+                f"SELECT user_id, version FROM sync_versions WHERE user_id IN ({placeholders})",
+                tuple(chunk), commit=False
+            )
+            result.update({int(row['user_id']): int(row['version']) for row in rows})
+        return result
+
+    @staticmethod
+    def changes_since(user_id: int, since: int, limit: int) -> List[Dict[str, Any]]:
+        """Changes with a version above since, oldest first.
+
+        Returns:
+            Dicts with version, transaction_id and op
+        """
+        query = """
+            SELECT version, transaction_id, op
+            FROM transaction_changes
+            WHERE user_id = %s AND version > %s
+            ORDER BY version
+            LIMIT %s
+        """
+        return DatabaseConnection.execute_query(query, (user_id, since, limit), commit=False)
+
+    @staticmethod
+    def prune(before: datetime, batch_size: int = 1000) -> int:
+        """Delete changes logged before a cutoff, oldest first.
+
+        Walks the log in id (= write) order, batch_size rows per statement,
+        so it needs no index on created_at and never holds a long lock.
+
+        Args:
+            before: Changes created before this are deleted
+            batch_size: Rows deleted per statement
+
+        Returns:
+            Number of deleted changes
+        """
+        cutoff = before.strftime('%Y-%m-%d %H:%M:%S')
+        deleted = 0
+        while True:
+            rows = DatabaseConnection.execute_query(
+                "SELECT id, created_at < %s AS expired FROM transaction_changes ORDER BY id LIMIT %s",
+                (cutoff, batch_size), commit=False
+            )
+            last_id = None
+            for row in rows:
+                if not row['expired']:
+                    break
+                last_id = row['id']
+            if last_id is None:
+                return deleted
+            with DatabaseConnection.get_cursor() as cursor:
+                cursor.execute("DELETE FROM transaction_changes WHERE id <= %s", (last_id,))
+                deleted += max(cursor.rowcount, 0)
+            if last_id != rows[-1]['id'] or len(rows) < batch_size:
+                return deleted
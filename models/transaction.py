@@ -1,9 +1,11 @@
 """Transaction model and database operations."""
 
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterator, List, Sequence, Tuple
 from datetime import datetime, date, timedelta
 from config.database import DatabaseConnection
+from models.sync import SyncLog, UPSERT, DELETE
 from utils.datetime_utils import today_jakarta
+from utils.money import to_decimal, to_major, to_minor
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,12 +14,36 @@ logger = logging.getLogger(__name__)
 class Transaction:
     """Transaction model for income and expense tracking."""
     
+    # Order of tuple rows read by from_row(); the last two come from the category join.
+    # The amount column is kept as integer minor units (see utils.money).
+    COLUMNS = (
+        'id', 'user_id', 'category_id', 'amount_minor', 'description', 'transaction_date', 'type',
+        'notes', 'is_recurring', 'recurring_id', 'created_at', 'updated_at',
+        'category_name', 'category_icon',
+    )
+    __slots__ = COLUMNS
+    
+    # Keys of to_dict() and of API payloads (amount in currency units)
+    FIELDS = (
+        'id', 'user_id', 'category_id', 'amount', 'description', 'transaction_date', 'type',
+        'notes', 'is_recurring', 'recurring_id', 'created_at', 'updated_at',
+        'category_name', 'category_icon',
+    )
+    
+    _SELECT = """
+        SELECT t.id, t.user_id, t.category_id, t.amount, t.description, t.transaction_date,
+               t.type, t.notes, t.is_recurring, t.recurring_id, t.created_at, t.updated_at,
+               c.name as category_name, c.icon as category_icon
+        FROM transactions t
+        LEFT JOIN categories c ON t.category_id = c.id
+    """
+    
     def __init__(self, transaction_data: Dict[str, Any]):
         """Initialize Transaction from database row."""
         self.id = transaction_data.get('id')
         self.user_id = transaction_data.get('user_id')
         self.category_id = transaction_data.get('category_id')
-        self.amount = float(transaction_data.get('amount', 0))
+        self.amount_minor = to_minor(transaction_data.get('amount'))
         self.description = transaction_data.get('description')
         self.transaction_date = transaction_data.get('transaction_date')
         self.type = transaction_data.get('type')  # 'income' or 'expense'
@@ -31,6 +57,27 @@ class Transaction:
         self.category_name = transaction_data.get('category_name')
         self.category_icon = transaction_data.get('category_icon')
     
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> 'Transaction':
+        """Build a transaction from a tuple row in COLUMNS order (no per-row dict)."""
+        transaction = cls.__new__(cls)
+        (transaction.id, transaction.user_id, transaction.category_id, amount,
+         transaction.description, transaction.transaction_date, transaction.type,
+         transaction.notes, transaction.is_recurring, transaction.recurring_id,
+         transaction.created_at, transaction.updated_at,
+         transaction.category_name, transaction.category_icon) = row
+        transaction.amount_minor = to_minor(amount)
+        return transaction
+    
+    @property
+    def amount(self) -> float:
+        """Amount in currency units (derived from amount_minor)."""
+        return to_major(self.amount_minor)
+    
+    @amount.setter
+    def amount(self, value: Any) -> None:
+        self.amount_minor = to_minor(value)
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert transaction to dictionary."""
         return {
@@ -82,10 +129,11 @@ class Transaction:
         try:
             with DatabaseConnection.get_cursor() as cursor:
                 cursor.execute(query, (
-                    user_id, category_id, amount, description, transaction_date,
+                    user_id, category_id, to_decimal(to_minor(amount)), description, transaction_date,
                     trans_type, notes, is_recurring, recurring_id
                 ))
                 transaction_id = cursor.lastrowid
+                SyncLog.record(cursor, user_id, transaction_id, UPSERT)
             
             logger.info(f"Created transaction: {trans_type} {amount} for user {user_id}")
             return Transaction.get_by_id(transaction_id)
@@ -103,18 +151,33 @@ class Transaction:
         Returns:
             Transaction instance or None if not found
         """
-        query = """
-            SELECT t.*, c.name as category_name, c.icon as category_icon
-            FROM transactions t
-            LEFT JOIN categories c ON t.category_id = c.id
-            WHERE t.id = %s
-        """
-        result = DatabaseConnection.execute_query(query, (transaction_id,), fetch_one=True, commit=False)
+        query = Transaction._SELECT + " WHERE t.id = %s"
+        result = DatabaseConnection.execute_query(
+            query, (transaction_id,), fetch_one=True, commit=False, tuples=True
+        )
         
         if result:
-            return Transaction(result)
+            return Transaction.from_row(result)
         return None
     
+    @staticmethod
+    def _user_filters(user_id: int, start_date: Optional[date] = None,
+                      end_date: Optional[date] = None,
+                      trans_type: Optional[str] = None) -> Tuple[str, List[Any]]:
+        """WHERE clause (on alias t) and parameters shared by the listing queries."""
+        where = " WHERE t.user_id = %s"
+        params: List[Any] = [user_id]
+        if start_date:
+            where += " AND t.transaction_date >= %s"
+            params.append(start_date)
+        if end_date:
+            where += " AND t.transaction_date <= %s"
+            params.append(end_date)
+        if trans_type:
+            where += " AND t.type = %s"
+            params.append(trans_type)
+        return where, params
+    
     @staticmethod
     def get_by_user(user_id: int, limit: int = 10, offset: int = 0,
                    start_date: Optional[date] = None, end_date: Optional[date] = None,
@@ -132,47 +195,107 @@ class Transaction:
         Returns:
             List of Transaction instances
         """
-        query = """
-            SELECT t.*, c.name as category_name, c.icon as category_icon
-            FROM transactions t
-            LEFT JOIN categories c ON t.category_id = c.id
-            WHERE t.user_id = %s
-        """
-        params = [user_id]
+        where, params = Transaction._user_filters(user_id, start_date, end_date, trans_type)
+        query = (Transaction._SELECT + where
+                 + " ORDER BY t.transaction_date DESC, t.created_at DESC, t.id DESC LIMIT %s OFFSET %s")
+        params.extend([limit, offset])
         
-        if start_date:
-            query += " AND t.transaction_date >= %s"
-            params.append(start_date)
+        results = DatabaseConnection.execute_query(query, tuple(params), commit=False, tuples=True)
+        return [Transaction.from_row(row) for row in results]
+    
+    @staticmethod
+    def get_by_user_before(user_id: int, cursor: Optional[Tuple[date, datetime, int]],
+                           limit: int = 50, start_date: Optional[date] = None,
+                           end_date: Optional[date] = None,
+                           trans_type: Optional[str] = None) -> List['Transaction']:
+        """Keyset page in get_by_user() order: the rows that follow cursor.
         
-        if end_date:
-            query += " AND t.transaction_date <= %s"
-            params.append(end_date)
+        Unlike OFFSET, the cost does not grow with the depth of the page.
         
-        if trans_type:
-            query += " AND t.type = %s"
-            params.append(trans_type)
+        Args:
+            user_id: User ID
+            cursor: (transaction_date, created_at, id) of the last row already
+                shown (created_at may be None), or None for the first page
+            limit: Maximum number of results
+            start_date: Filter by start date
+            end_date: Filter by end date
+            trans_type: Filter by type ('income' or 'expense')
+            
+        Returns:
+            List of Transaction instances
+        """
+        where, params = Transaction._user_filters(user_id, start_date, end_date, trans_type)
+        if cursor is not None:
+            cursor_date, cursor_created, cursor_id = cursor
+            # NULL created_at sorts last under DESC in MySQL and SQLite
+            if cursor_created is None:
+                same_day = "t.created_at IS NULL AND t.id < %s"
+                same_day_params = [cursor_id]
+            else:
+                same_day = ("t.created_at < %s OR t.created_at IS NULL"
+                            " OR (t.created_at = %s AND t.id < %s)")
+                same_day_params = [cursor_created, cursor_created, cursor_id]
+            where += f" AND (t.transaction_date < %s OR (t.transaction_date = %s AND ({same_day})))"
+            params.extend([cursor_date, cursor_date, *same_day_params])
+        query = (Transaction._SELECT + where
+                 + " ORDER BY t.transaction_date DESC, t.created_at DESC, t.id DESC LIMIT %s")
+        params.append(limit)
+        
+        results = DatabaseConnection.execute_query(query, tuple(params), commit=False, tuples=True)
+        return [Transaction.from_row(row) for row in results]
+    
+    @staticmethod
+    def get_by_ids(user_id: int, transaction_ids: Sequence[int]) -> List['Transaction']:
+        """Get the user's transactions among transaction_ids (missing IDs are skipped)."""
+        if not transaction_ids:
+            return []
+        placeholders = ', '.join(['%s'] * len(transaction_ids))
+        query = Transaction._SELECT + f" WHERE t.user_id = %s AND t.id IN ({placeholders})"
+        results = DatabaseConnection.execute_query(
+            query, (user_id, *transaction_ids), commit=False, tuples=True
+        )
+        return [Transaction.from_row(row) for row in results]
+    
+    @staticmethod
+    def get_page_after(user_id: int, after_id: int = 0, limit: int = 500) -> List['Transaction']:
+        """Get the user's transactions with id above after_id, in id order (keyset paging)."""
+        query = Transaction._SELECT + " WHERE t.user_id = %s AND t.id > %s ORDER BY t.id LIMIT %s"
+        results = DatabaseConnection.execute_query(
+            query, (user_id, after_id, limit), commit=False, tuples=True
+        )
+        return [Transaction.from_row(row) for row in results]
+    
+    @staticmethod
+    def iter_by_user(user_id: int, start_date: Optional[date] = None,
+                     end_date: Optional[date] = None, trans_type: Optional[str] = None,
+                     batch_size: int = 500) -> Iterator['Transaction']:
+        """Lazily yield all matching transactions, newest first, without a limit.
         
-        query += " ORDER BY t.transaction_date DESC, t.created_at DESC LIMIT %s OFFSET %s"
-        params.extend([limit, offset])
+        Rows are fetched batch_size at a time and turned into Transaction
+        objects one by one, so exports and other full scans never hold the
+        whole result as model objects at once.
         
-        results = DatabaseConnection.execute_query(query, tuple(params), commit=False)
-        return [Transaction(row) for row in results]
+        Args:
+            user_id: User ID
+            start_date: Filter by start date
+            end_date: Filter by end date
+            trans_type: Filter by type ('income' or 'expense')
+            batch_size: Rows fetched per round trip
+            
+        Yields:
+            Transaction instances
+        """
+        where, params = Transaction._user_filters(user_id, start_date, end_date, trans_type)
+        query = Transaction._SELECT + where + " ORDER BY t.transaction_date DESC, t.created_at DESC"
+        for row in DatabaseConnection.iter_query(query, tuple(params), batch_size=batch_size):
+            yield Transaction.from_row(row)
     
     @staticmethod
     def get_count(user_id: int, start_date: Optional[date] = None,
                   end_date: Optional[date] = None, trans_type: Optional[str] = None) -> int:
         """Get total count of transactions for a user with optional filters."""
-        query = "SELECT COUNT(*) as cnt FROM transactions t WHERE t.user_id = %s"
-        params: List[Any] = [user_id]
-        if start_date:
-            query += " AND t.transaction_date >= %s"
-            params.append(start_date)
-        if end_date:
-            query += " AND t.transaction_date <= %s"
-            params.append(end_date)
-        if trans_type:
-            query += " AND t.type = %s"
-            params.append(trans_type)
+        where, params = Transaction._user_filters(user_id, start_date, end_date, trans_type)
+        query = "SELECT COUNT(*) as cnt FROM transactions t" + where
         result = DatabaseConnection.execute_query(query, tuple(params), fetch_one=True, commit=False)
         return int(result['cnt']) if result else 0
     
@@ -217,26 +340,12 @@ class Transaction:
         Returns:
             List of Transaction instances
         """
-        query = """
-            SELECT t.*, c.name as category_name, c.icon as category_icon
-            FROM transactions t
-            LEFT JOIN categories c ON t.category_id = c.id
-            WHERE t.user_id = %s AND t.category_id = %s
-        """
-        params = [user_id, category_id]
-        
-        if start_date:
-            query += " AND t.transaction_date >= %s"
-            params.append(start_date)
+        where, params = Transaction._user_filters(user_id, start_date, end_date)
+        query = Transaction._SELECT + where + " AND t.category_id = %s ORDER BY t.transaction_date DESC"
+        params.append(category_id)
         
-        if end_date:
-            query += " AND t.transaction_date <= %s"
-            params.append(end_date)
-        
-        query += " ORDER BY t.transaction_date DESC"
-        
-        results = DatabaseConnection.execute_query(query, tuple(params), commit=False)
-        return [Transaction(row) for row in results]
+        results = DatabaseConnection.execute_query(query, tuple(params), commit=False, tuples=True)
+        return [Transaction.from_row(row) for row in results]
     
     def update(self, **kwargs) -> bool:
         """Update transaction information.
@@ -255,7 +364,7 @@ class Transaction:
         for field, value in kwargs.items():
             if field in allowed_fields:
                 update_fields.append(f"{field} = %s")
-                values.append(value)
+                values.append(to_decimal(to_minor(value)) if field == 'amount' else value)
         
         if not update_fields:
             return False
@@ -264,7 +373,9 @@ class Transaction:
         query = f"UPDATE transactions SET {', '.join(update_fields)} WHERE id = %s"
         
         try:
-            DatabaseConnection.execute_query(query, tuple(values))
+            with DatabaseConnection.get_cursor() as cursor:
+                cursor.execute(query, tuple(values))
+                SyncLog.record(cursor, self.user_id, self.id, UPSERT)
             
             # Update instance
             for field, value in kwargs.items():
@@ -285,7 +396,9 @@ class Transaction:
         """
         query = "DELETE FROM transactions WHERE id = %s"
         try:
-            DatabaseConnection.execute_query(query, (self.id,))
+            with DatabaseConnection.get_cursor() as cursor:
+                cursor.execute(query, (self.id,))
+                SyncLog.record(cursor, self.user_id, self.id, DELETE)
             logger.info(f"Deleted transaction: {self.id}")
             return True
         except Exception as e:
@@ -305,10 +418,18 @@ class Transaction:
         Returns:
             Dictionary with income, expense, and balance
         """
-        query = """
+        balance = Transaction.get_balance_minor(user_id, start_date, end_date)
+        return {key: to_major(value) for key, value in balance.items()}
+    
+    @staticmethod
+    def get_balance_minor(user_id: int, start_date: Optional[date] = None,
+                          end_date: Optional[date] = None) -> Dict[str, int]:
+        """Like get_balance(), in integer minor units summed by the database."""
+        dialect = DatabaseConnection.dialect()
+        query = f"""
             SELECT 
-                SUM(CASE WHEN type = 'income' THEN amount ELSE 0 END) as total_income,
-                SUM(CASE WHEN type = 'expense' THEN amount ELSE 0 END) as total_expense
+                {dialect.sum_minor_units("CASE WHEN type = 'income' THEN amount ELSE 0 END")} as total_income,
+                {dialect.sum_minor_units("CASE WHEN type = 'expense' THEN amount ELSE 0 END")} as total_expense
             FROM transactions
             WHERE user_id = %s
         """
@@ -324,8 +445,8 @@ class Transaction:
         
         result = DatabaseConnection.execute_query(query, tuple(params), fetch_one=True, commit=False)
         
-        income = float(result['total_income'] or 0)
-        expense = float(result['total_expense'] or 0)
+        income = int(result['total_income'])
+        expense = int(result['total_expense'])
         
         return {
             'income': income,
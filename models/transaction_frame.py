@@ -0,0 +1,238 @@
+"""Columnar, read-only view of a user's transactions for analytics."""
+
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.database import DatabaseConnection
+from utils.money import to_minor
+import logging
+
+logger = logging.getLogger(__name__)
+
+_EPOCH = date(1970, 1, 1)
+# 1970-01-01 was a Thursday; shifting by 3 makes Monday day 0 of the week
+_MONDAY_OFFSET = 3
+
+PERIODS = ('day', 'week', 'month')
+
+
+def to_day_number(value: date) -> int:
+    """Days since 1970-01-01."""
+    return (value - _EPOCH).days
+
+
+def from_day_number(days: int) -> date:
+    """Inverse of to_day_number()."""
+    return _EPOCH + timedelta(days=int(days))
+
+
+def period_start(day: np.ndarray, period: str) -> np.ndarray:
+    """Day number of the start of the day, week (Monday) or month of each day number."""
+    if period == 'day':
+        return day
+    if period == 'week':
+        return day - (day + _MONDAY_OFFSET) % 7
+    if period == 'month':
+        months = day.astype('datetime64[D]').astype('datetime64[M]')
+        return months.astype('datetime64[D]').astype(np.int32)
+    raise ValueError(f"Unknown period: {period} (expected one of {PERIODS})")
+
+
+class TransactionFrame:
+    """Transactions of one user and date range as NumPy columns.
+
+    Only the columns analytics need are fetched, in one query:
+
+    - day: int32 days since 1970-01-01
+    - amount: int64 minor units (exact sums, no float drift)
+    - expense: bool (False = income)
+    - category: int32 code into category_ids
+
+    Category names and icons are looked up lazily, only when a per-category
+    breakdown is requested. Build several reports from one frame instead of
+    querying once per report.
+    """
+
+    def __init__(self, user_id: int, start_date: date, end_date: date,
+                 day: np.ndarray, amount: np.ndarray, expense: np.ndarray,
+                 category: np.ndarray, category_ids: np.ndarray):
+        self.user_id = user_id
+        self.start_date = start_date
+        self.end_date = end_date
+        self.day = day
+        self.amount = amount
+        self.expense = expense
+        self.category = category
+        self.category_ids = category_ids
+        self._categories: Optional[Dict[int, Dict[str, Any]]] = None
+        self._source: Optional['TransactionFrame'] = None
+
+    @classmethod
+    def load(cls, user_id: int, start_date: date, end_date: date) -> 'TransactionFrame':
+        """Fetch a user's transactions between two dates (inclusive).
+
+        Args:
+            user_id: User ID
+            start_date: Start date
+            end_date: End date
+
+        Returns:
+            TransactionFrame instance
+        """
+        # The database scales amounts to integer minor units: no Decimal per row
+        query = f"""
+            SELECT transaction_date, {DatabaseConnection.dialect().minor_units('amount')},
+                   type, category_id
+            FROM transactions
+            WHERE user_id = %s
+            AND transaction_date >= %s
+            AND transaction_date <= %s
+        """
+        rows = DatabaseConnection.execute_query(
+            query, (user_id, start_date, end_date), commit=False, tuples=True
+        )
+        return cls.from_tuples(user_id, start_date, end_date, rows)
+
+    @classmethod
+    def from_rows(cls, user_id: int, start_date: date, end_date: date,
+                  rows: List[Dict[str, Any]]) -> 'TransactionFrame':
+        """Build a frame from dict rows with transaction_date, amount, type and category_id."""
+        return cls.from_tuples(user_id, start_date, end_date, [
+            (row['transaction_date'], to_minor(row['amount']), row['type'], row['category_id'])
+            for row in rows
+        ])
+
+    @classmethod
+    def from_tuples(cls, user_id: int, start_date: date, end_date: date,
+                    rows: List[Tuple[date, int, str, int]]) -> 'TransactionFrame':
+        """Build a frame from (transaction_date, amount in minor units, type, category_id) rows."""
+        count = len(rows)
+        day = np.fromiter((to_day_number(row[0]) for row in rows), dtype=np.int32, count=count)
+        amount = np.fromiter((row[1] for row in rows), dtype=np.int64, count=count)
+        expense = np.fromiter((row[2] == 'expense' for row in rows), dtype=bool, count=count)
+        category, category_ids = pd.factorize(
+            np.fromiter((row[3] for row in rows), dtype=np.int64, count=count)
+        )
+        return cls(user_id, start_date, end_date, day, amount, expense,
+                   category.astype(np.int32), np.asarray(category_ids, dtype=np.int64))
+
+    def slice(self, start_date: date, end_date: date) -> 'TransactionFrame':
+        """Rows between two dates (inclusive), without another query.
+
+        The slice shares this frame's category codes, and category names are
+        looked up once for both.
+        """
+        mask = (self.day >= to_day_number(start_date)) & (self.day <= to_day_number(end_date))
+        part = TransactionFrame(self.user_id, start_date, end_date, self.day[mask], self.amount[mask],
+                                self.expense[mask], self.category[mask], self.category_ids)
+        part._source = self
+        return part
+
+    def __len__(self) -> int:
+        return len(self.amount)
+
+    def date_span(self) -> Optional[Tuple[date, date]]:
+        """First and last transaction date, or None for an empty frame."""
+        if not len(self):
+            return None
+        return from_day_number(self.day.min()), from_day_number(self.day.max())
+
+    def totals(self) -> Dict[str, int]:
+        """Income/expense sums (minor units) and counts."""
+        expense_count = int(self.expense.sum())
+        return {
+            'income': int(self.amount[~self.expense].sum()),
+            'expense': int(self.amount[self.expense].sum()),
+            'income_count': len(self) - expense_count,
+            'expense_count': expense_count,
+        }
+
+    def period_keys(self, period: str) -> np.ndarray:
+        """Day number of the start of each row's day, week (Monday) or month."""
+        return period_start(self.day, period)
+
+    def period_starts(self, period: str) -> np.ndarray:
+        """Start (day number) of every period touching start_date..end_date, ascending."""
+        days = np.arange(to_day_number(self.start_date), to_day_number(self.end_date) + 1, dtype=np.int32)
+        return np.unique(period_start(days, period))
+
+    def by_period(self, period: str = 'day', fill: bool = False) -> pd.DataFrame:
+        """Income and expense per period, in minor units.
+
+        Args:
+            period: 'day', 'week' or 'month'
+            fill: Include every period of the frame's date range, with zeros
+                where there are no transactions
+
+        Returns:
+            DataFrame indexed by period start (day number), ascending, with
+            income and expense columns; without fill, periods without
+            transactions are absent
+        """
+        keys = self.period_keys(period)
+        frame = pd.DataFrame({
+            'key': keys,
+            'income': np.where(self.expense, 0, self.amount),
+            'expense': np.where(self.expense, self.amount, 0),
+        })
+        grouped = frame.groupby('key', sort=True)[['income', 'expense']].sum()
+        if fill:
+            grouped = grouped.reindex(self.period_starts(period), fill_value=0)
+        return grouped
+
+    def by_offset(self, length: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Income and expense (minor units) per day offset from start_date.
+
+        Args:
+            length: Number of offsets (days past the range are dropped)
+
+        Returns:
+            (income, expense) int64 arrays of that length
+        """
+        offsets = self.day - to_day_number(self.start_date)
+        inside = offsets < length
+        income = np.zeros(length, dtype=np.int64)
+        expense = np.zeros(length, dtype=np.int64)
+        np.add.at(income, offsets[inside & ~self.expense], self.amount[inside & ~self.expense])
+        np.add.at(expense, offsets[inside & self.expense], self.amount[inside & self.expense])
+        return income, expense
+
+    def by_category(self, trans_type: str) -> pd.DataFrame:
+        """Total and count per category for one transaction type.
+
+        Args:
+            trans_type: 'income' or 'expense'
+
+        Returns:
+            DataFrame with category_id, total (minor units) and count, largest
+            total first
+        """
+        mask = self.expense if trans_type == 'expense' else ~self.expense
+        codes = self.category[mask]
+        size = len(self.category_ids)
+        totals = np.zeros(size, dtype=np.int64)
+        np.add.at(totals, codes, self.amount[mask])
+        counts = np.bincount(codes, minlength=size)
+        result = pd.DataFrame({'category_id': self.category_ids, 'total': totals, 'count': counts})
+        result = result[result['count'] > 0]
+        return result.sort_values('total', ascending=False, kind='stable').reset_index(drop=True)
+
+    def categories(self) -> Dict[int, Dict[str, Any]]:
+        """Name and icon of every category present in the frame (one query, cached)."""
+        if self._source is not None:
+            return self._source.categories()
+        if self._categories is None:
+            self._categories = {}
+            if len(self.category_ids):
+                ids = [int(i) for i in self.category_ids]
+                query = f"""
+                    SELECT id, name, icon
+                    FROM categories
+                    WHERE id IN ({', '.join(['%s'] * len(ids))})
+                """
+                rows = DatabaseConnection.execute_query(query, tuple(ids), commit=False)
+                self._categories = {row['id']: row for row in rows}
+        return self._categories
@@ -1,7 +1,7 @@
 """User model and database operations."""
 
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Sequence
 from config.database import DatabaseConnection
 import logging
 
@@ -11,6 +11,13 @@ logger = logging.getLogger(__name__)
 class User:
     """User model representing a Telegram user."""
     
+    # Order of tuple rows read by from_row()
+    COLUMNS = ('id', 'telegram_id', 'username', 'first_name', 'last_name', 'timezone',
+               'language_code', 'is_active', 'created_at', 'updated_at')
+    __slots__ = COLUMNS
+    
+    _SELECT = f"SELECT {', '.join(COLUMNS)} FROM users"
+    
     def __init__(self, user_data: Dict[str, Any]):
         """Initialize User from database row."""
         self.id = user_data.get('id')
@@ -24,6 +31,14 @@ class User:
         self.created_at = user_data.get('created_at')
         self.updated_at = user_data.get('updated_at')
     
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> 'User':
+        """Build a user from a tuple row in COLUMNS order (no per-row dict)."""
+        user = cls.__new__(cls)
+        (user.id, user.telegram_id, user.username, user.first_name, user.last_name,
+         user.timezone, user.language_code, user.is_active, user.created_at, user.updated_at) = row
+        return user
+    
     @property
     def full_name(self) -> str:
         """Get user's full name."""
@@ -87,11 +102,13 @@ class User:
         Returns:
             User instance or None if not found
         """
-        query = "SELECT * FROM users WHERE telegram_id = %s"
-        result = DatabaseConnection.execute_query(query, (telegram_id,), fetch_one=True, commit=False)
+        query = User._SELECT + " WHERE telegram_id = %s"
+        result = DatabaseConnection.execute_query(
+            query, (telegram_id,), fetch_one=True, commit=False, tuples=True
+        )
         
         if result:
-            return User(result)
+            return User.from_row(result)
         return None
     
     @staticmethod
@@ -104,11 +121,13 @@ class User:
         Returns:
             User instance or None if not found
         """
-        query = "SELECT * FROM users WHERE id = %s"
-        result = DatabaseConnection.execute_query(query, (user_id,), fetch_one=True, commit=False)
+        query = User._SELECT + " WHERE id = %s"
+        result = DatabaseConnection.execute_query(
+            query, (user_id,), fetch_one=True, commit=False, tuples=True
+        )
         
         if result:
-            return User(result)
+            return User.from_row(result)
         return None
     
     @staticmethod
@@ -187,10 +206,10 @@ class User:
         Returns:
             List of User instances
         """
-        query = "SELECT * FROM users WHERE is_active = TRUE ORDER BY created_at DESC"
-        results = DatabaseConnection.execute_query(query, commit=False)
+        query = User._SELECT + " WHERE is_active = TRUE ORDER BY created_at DESC"
+        results = DatabaseConnection.execute_query(query, commit=False, tuples=True)
         
-        return [User(row) for row in results]
+        return [User.from_row(row) for row in results]
     
     @staticmethod
     def count() -> int:
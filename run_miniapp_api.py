@@ -1,19 +1,50 @@
-"""Run Montrixa Mini App API server (FastAPI)."""
+"""Run Montrixa Mini App API server (FastAPI).
+
+Usage:
+    python run_miniapp_api.py                 # production: API_WORKERS processes
+    python run_miniapp_api.py --workers 4
+    python run_miniapp_api.py --reload        # development: one process, auto-reload
+"""
+
+import argparse
 
 import uvicorn
 
+from api.assets import build_if_stale
+from api.server import WorkerSupervisor, configure_logging
 from config.settings import Settings
 
+APP = "api.main:app"
+
 
-def main():
-    uvicorn.run(
-        "api.main:app",
-        host=Settings.API_HOST,
-        port=Settings.API_PORT,
-        reload=True,
-    )
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Montrixa Mini App API server")
+    parser.add_argument("--host", default=Settings.API_HOST)
+    parser.add_argument("--port", type=int, default=Settings.API_PORT)
+    parser.add_argument("--workers", type=int, default=Settings.API_WORKERS)
+    parser.add_argument("--reload", action="store_true", help="development mode: reload on code changes")
+    args = parser.parse_args(argv)
+
+    if args.reload:
+        uvicorn.run(APP, host=args.host, port=args.port, reload=True)
+        return
+
+    configure_logging(Settings.LOG_LEVEL)
+    # Workers serve miniapp/dist; (re)build it now and on every SIGHUP reload
+    build_if_stale()
+    WorkerSupervisor(
+        APP,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        backlog=Settings.API_BACKLOG,
+        keep_alive=Settings.API_KEEPALIVE_SECONDS,
+        graceful_timeout=Settings.API_GRACEFUL_TIMEOUT_SECONDS,
+        max_requests=Settings.API_MAX_REQUESTS,
+        log_level=Settings.LOG_LEVEL.lower(),
+        on_reload=build_if_stale,
+    ).run()
 
 
 if __name__ == "__main__":
     main()
-
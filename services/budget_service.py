@@ -1,11 +1,12 @@
 """Budget service for budget management and alerts."""
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set, Tuple
 from datetime import date
 from models.budget import Budget
 from models.category import Category
 from config.settings import Settings
 from config.database import DatabaseConnection
+from utils.money import to_decimal, to_major, to_minor
 import logging
 
 logger = logging.getLogger(__name__)
@@ -73,15 +74,16 @@ class BudgetService:
             user_id: User ID
             
         Returns:
-            List of budget status dictionaries
+            List of budget status dictionaries (amounts in currency units)
         """
         budgets = Budget.get_by_user(user_id)
+        spent_by_budget = Budget.get_spent_minor_amounts(budgets)
         status_list = []
         
         for budget in budgets:
-            spent = budget.get_spent_amount()
-            percentage = budget.get_percentage_used()
-            remaining = budget.amount - spent
+            spent = spent_by_budget[budget.id]
+            percentage = budget.percentage_of(spent)
+            remaining = budget.amount_minor - spent
             
             # Determine status level
             if percentage >= Settings.BUDGET_CRITICAL_THRESHOLD:
@@ -104,8 +106,8 @@ class BudgetService:
                 'category_icon': budget.category_icon,
                 'period': budget.period,
                 'budget_amount': budget.amount,
-                'spent_amount': spent,
-                'remaining_amount': remaining,
+                'spent_amount': to_major(spent),
+                'remaining_amount': to_major(remaining),
                 'percentage': percentage,
                 'status': status,
                 'status_icon': icon,
@@ -160,14 +162,12 @@ class BudgetService:
             Alert dictionary or None if no alert needed
         """
         # Get all active budgets for this category
-        budgets = Budget.get_by_user(user_id)
+        budgets = [b for b in Budget.get_by_user(user_id) if b.category_id == category_id]
+        spent_by_budget = Budget.get_spent_minor_amounts(budgets)
         
         for budget in budgets:
-            if budget.category_id != category_id:
-                continue
-            
-            percentage = budget.get_percentage_used()
-            spent = budget.get_spent_amount()
+            spent = spent_by_budget[budget.id]
+            percentage = budget.percentage_of(spent)
             
             # Check if alert should be sent
             alert_type = None
@@ -188,7 +188,7 @@ class BudgetService:
                         'category_icon': budget.category_icon,
                         'period': budget.period,
                         'budget_amount': budget.amount,
-                        'spent_amount': spent,
+                        'spent_amount': to_major(spent),
                         'percentage': percentage,
                         'alert_type': alert_type,
                     }
@@ -218,6 +218,29 @@ class BudgetService:
         
         return result['count'] > 0 if result else False
     
+    @staticmethod
+    def get_alerts_sent_today(budget_ids: List[int]) -> Set[Tuple[int, str]]:
+        """Get the alerts already sent today for many budgets in one query.
+        
+        Args:
+            budget_ids: Budget IDs to check
+            
+        Returns:
+            Set of (budget_id, alert_type) pairs
+        """
+        if not budget_ids:
+            return set()
+        
+        query = f"""
+            SELECT DISTINCT budget_id, alert_type
+            FROM budget_alerts
+            WHERE alert_date = %s AND budget_id IN ({', '.join(['%s'] * len(budget_ids))})
+        """
+        results = DatabaseConnection.execute_query(
+            query, (date.today(), *budget_ids), commit=False
+        )
+        return {(row['budget_id'], row['alert_type']) for row in results}
+    
     @staticmethod
     def log_alert(user_id: int, budget_id: int, alert_type: str,
                  percentage: float, amount_spent: float, budget_amount: float) -> bool:
@@ -241,7 +264,9 @@ class BudgetService:
         """
         try:
             DatabaseConnection.execute_query(
-                query, (user_id, budget_id, alert_type, percentage, amount_spent, budget_amount, date.today())
+                query, (user_id, budget_id, alert_type, percentage,
+                        to_decimal(to_minor(amount_spent)), to_decimal(to_minor(budget_amount)),
+                        date.today())
             )
             logger.info(f"Logged budget alert: {alert_type} for budget {budget_id}")
             return True
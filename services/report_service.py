@@ -1,17 +1,275 @@
 """Report service for generating statistics and analytics."""
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from datetime import date, datetime, timedelta
 from config.database import DatabaseConnection
-from services.transaction_service import TransactionService
+from models.transaction import Transaction
+from models.transaction_frame import PERIODS, TransactionFrame, from_day_number, to_day_number
+from utils.downsample import lttb
+from utils.money import percentage, to_major
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Reports get_reports() can build from one TransactionFrame
+REPORTS = ('summary', 'expense_by_category', 'income_by_category', 'daily_trend')
+
+# Trend bucket sizes; 'auto' picks the finest one that fits max_points
+GRANULARITIES = ('auto',) + PERIODS
+DEFAULT_TREND_POINTS = 120
+
 
 class ReportService:
     """Service for generating reports and analytics."""
 
+    @staticmethod
+    def get_reports(user_id: int, start_date: date, end_date: date,
+                    reports: Sequence[str] = REPORTS) -> Dict[str, Any]:
+        """Build several reports from a single load of the user's transactions.
+        
+        Args:
+            user_id: User ID
+            start_date: Start date
+            end_date: End date
+            reports: Names from REPORTS to compute
+            
+        Returns:
+            Dictionary of report name to the value the matching get_* method returns
+        """
+        frame = TransactionFrame.load(user_id, start_date, end_date)
+        return ReportService.reports_from_frame(frame, reports)
+    
+    @staticmethod
+    def reports_from_frame(frame: TransactionFrame,
+                           reports: Sequence[str] = REPORTS) -> Dict[str, Any]:
+        """Compute reports (see get_reports) from an already loaded frame."""
+        builders = {
+            'summary': lambda: ReportService.summary_from_frame(frame),
+            'expense_by_category': lambda: ReportService.category_breakdown(frame, 'expense'),
+            'income_by_category': lambda: ReportService.category_breakdown(frame, 'income'),
+            'daily_trend': lambda: ReportService.trend_from_frame(frame, 'day'),
+        }
+        return {name: builders[name]() for name in reports}
+    
+    @staticmethod
+    def summary_from_frame(frame: TransactionFrame) -> Dict[str, Any]:
+        """Financial summary (see get_summary) computed from a TransactionFrame."""
+        totals = frame.totals()
+        return {
+            'start_date': frame.start_date,
+            'end_date': frame.end_date,
+            'total_income': to_major(totals['income']),
+            'total_expense': to_major(totals['expense']),
+            'balance': to_major(totals['income'] - totals['expense']),
+            'transaction_count': len(frame),
+            'income_count': totals['income_count'],
+            'expense_count': totals['expense_count'],
+        }
+    
+    @staticmethod
+    def category_breakdown(frame: TransactionFrame, trans_type: str) -> List[Dict[str, Any]]:
+        """Per-category breakdown (see get_expense_by_category) from a TransactionFrame.
+        
+        Args:
+            frame: Loaded transactions
+            trans_type: 'income' or 'expense'
+            
+        Returns:
+            List of category breakdowns, largest first
+        """
+        grouped = frame.by_category(trans_type)
+        if grouped.empty:
+            return []
+        categories = frame.categories()
+        grand_total = int(grouped['total'].sum())
+        
+        breakdown = []
+        for category_id, total, count in grouped.itertuples(index=False):
+            category = categories.get(int(category_id), {})
+            breakdown.append({
+                'category_id': int(category_id),
+                'category_name': category.get('name'),
+                'category_icon': category.get('icon'),
+                'total_amount': to_major(total),
+                'transaction_count': int(count),
+                'percentage': percentage(int(total), grand_total),
+            })
+        return breakdown
+    
+    @staticmethod
+    def trend_from_frame(frame: TransactionFrame, period: str = 'day') -> List[Dict[str, Any]]:
+        """Income/expense per day, week or month (see get_daily_trend) from a TransactionFrame.
+        
+        Args:
+            frame: Loaded transactions
+            period: 'day', 'week' or 'month'; 'date' is the first day of the period
+            
+        Returns:
+            List of period data, oldest first
+        """
+        grouped = frame.by_period(period)
+        return [
+            {
+                'date': from_day_number(key),
+                'income': to_major(income),
+                'expense': to_major(expense),
+                'net': to_major(income - expense),
+            }
+            for key, income, expense in grouped.itertuples()
+        ]
+    
+    @staticmethod
+    def choose_granularity(frame: TransactionFrame, max_points: int) -> str:
+        """Finest period whose zero-filled series has at most max_points buckets ('month' otherwise)."""
+        for period in PERIODS:
+            if len(frame.period_starts(period)) <= max_points:
+                return period
+        return 'month'
+    
+    @staticmethod
+    def trend(frame: TransactionFrame, granularity: str = 'auto',
+              max_points: int = DEFAULT_TREND_POINTS, metric: str = 'net') -> Dict[str, Any]:
+        """Chart-ready trend: zero-filled buckets, at most max_points of them.
+        
+        Every period of the frame's date range is present (zeros where there
+        are no transactions). If the series is still longer than max_points,
+        it is downsampled with LTTB on metric, keeping its peaks and dips.
+        
+        Args:
+            frame: Loaded transactions
+            granularity: 'auto', 'day', 'week' or 'month'
+            max_points: Upper bound on the number of points
+            metric: Series LTTB preserves: 'income', 'expense' or 'net'
+            
+        Returns:
+            Dictionary with granularity (the period used), downsampled and
+            points (date, income, expense, net; oldest first)
+        """
+        if granularity == 'auto':
+            granularity = ReportService.choose_granularity(frame, max_points)
+        grouped = frame.by_period(granularity, fill=True)
+        keys = grouped.index.to_numpy()
+        income = grouped['income'].to_numpy()
+        expense = grouped['expense'].to_numpy()
+        series = {'income': income, 'expense': expense, 'net': income - expense}[metric]
+        keep = lttb(keys, series, max_points)
+        return {
+            'granularity': granularity,
+            'downsampled': len(keep) < len(keys),
+            'points': [
+                {
+                    'date': from_day_number(keys[i]),
+                    'income': to_major(int(income[i])),
+                    'expense': to_major(int(expense[i])),
+                    'net': to_major(int(income[i] - expense[i])),
+                }
+                for i in keep
+            ],
+        }
+    
+    @staticmethod
+    def previous_period(start_date: date, end_date: date) -> Tuple[date, date]:
+        """The range a period is compared with.
+        
+        A range that starts on the 1st and stays inside one month is compared
+        with the same days of the previous month (a whole month with the whole
+        previous month); any other range with the equally long range right
+        before it.
+        
+        Returns:
+            Tuple of (start_date, end_date), inclusive
+        """
+        if start_date.day == 1 and (start_date.year, start_date.month) == (end_date.year, end_date.month):
+            previous_end = start_date - timedelta(days=1)
+            previous_start = previous_end.replace(day=1)
+            if (end_date + timedelta(days=1)).day == 1:
+                return previous_start, previous_end
+            return previous_start, min(previous_start + (end_date - start_date), previous_end)
+        previous_end = start_date - timedelta(days=1)
+        return previous_end - (end_date - start_date), previous_end
+    
+    @staticmethod
+    def load_comparison(user_id: int, start_date: date,
+                        end_date: date) -> Tuple[TransactionFrame, TransactionFrame]:
+        """Load a period and its previous_period() with one query.
+        
+        Returns:
+            (current, previous) frames
+        """
+        previous_start, previous_end = ReportService.previous_period(start_date, end_date)
+        frame = TransactionFrame.load(user_id, min(previous_start, start_date), end_date)
+        return frame.slice(start_date, end_date), frame.slice(previous_start, previous_end)
+    
+    @staticmethod
+    def compare(user_id: int, start_date: date, end_date: date) -> Dict[str, Any]:
+        """Compare a period with the previous one (see previous_period).
+        
+        Args:
+            user_id: User ID
+            start_date: Start date
+            end_date: End date
+            
+        Returns:
+            Dictionary as returned by compare_frames
+        """
+        return ReportService.compare_frames(*ReportService.load_comparison(user_id, start_date, end_date))
+    
+    @staticmethod
+    def compare_frames(current: TransactionFrame, previous: TransactionFrame) -> Dict[str, Any]:
+        """Period-over-period comparison of two loaded frames.
+        
+        Amounts are in currency units. A change is a dict with current,
+        previous, delta and change_pct (None when previous is 0).
+        
+        Args:
+            current: Transactions of the period
+            previous: Transactions of the period it is compared with
+            
+        Returns:
+            Dictionary with current and previous (summaries), totals
+            (income, expense, balance and transaction_count changes),
+            expense_by_category and income_by_category (per-category changes
+            plus the category's percentage of the current total, largest
+            current total first) and daily (income/expense of both periods
+            aligned by day offset from each start)
+        """
+        now, before = current.totals(), previous.totals()
+        totals = {
+            'income': _change(now['income'], before['income']),
+            'expense': _change(now['expense'], before['expense']),
+            'balance': _change(now['income'] - now['expense'], before['income'] - before['expense']),
+            'transaction_count': _change(len(current), len(previous), minor=False),
+        }
+        
+        current_days = (current.end_date - current.start_date).days + 1
+        previous_days = (previous.end_date - previous.start_date).days + 1
+        length = max(current_days, previous_days)
+        income, expense = current.by_offset(length)
+        previous_income, previous_expense = previous.by_offset(length)
+        current_start = to_day_number(current.start_date)
+        previous_start = to_day_number(previous.start_date)
+        daily = [
+            {
+                'offset': offset,
+                'date': from_day_number(current_start + offset) if offset < current_days else None,
+                'previous_date': from_day_number(previous_start + offset) if offset < previous_days else None,
+                'income': to_major(int(income[offset])),
+                'previous_income': to_major(int(previous_income[offset])),
+                'expense': to_major(int(expense[offset])),
+                'previous_expense': to_major(int(previous_expense[offset])),
+            }
+            for offset in range(length)
+        ]
+        
+        return {
+            'current': ReportService.summary_from_frame(current),
+            'previous': ReportService.summary_from_frame(previous),
+            'totals': totals,
+            'expense_by_category': _category_changes(current, previous, 'expense'),
+            'income_by_category': _category_changes(current, previous, 'income'),
+            'daily': daily,
+        }
+    
     @staticmethod
     def get_summary(user_id: int, start_date: date, end_date: date) -> Dict[str, Any]:
         """Get financial summary for a date range.
@@ -24,20 +282,7 @@ class ReportService:
         Returns:
             Dictionary with summary data
         """
-        # Get balance and transactions via TransactionService
-        balance_data = TransactionService.get_balance(user_id, start_date, end_date)
-        transactions = TransactionService.get_by_date_range(user_id, start_date, end_date)
-        
-        return {
-            'start_date': start_date,
-            'end_date': end_date,
-            'total_income': balance_data['income'],
-            'total_expense': balance_data['expense'],
-            'balance': balance_data['balance'],
-            'transaction_count': len(transactions),
-            'income_count': len([t for t in transactions if t.type == 'income']),
-            'expense_count': len([t for t in transactions if t.type == 'expense']),
-        }
+        return ReportService.get_reports(user_id, start_date, end_date, ('summary',))['summary']
     
     @staticmethod
     def get_monthly_summary(user_id: int, year: int, month: int) -> Dict[str, Any]:
@@ -59,17 +304,17 @@ class ReportService:
         else:
             end_date = date(year, month + 1, 1) - timedelta(days=1)
         
-        summary = ReportService.get_summary(user_id, start_date, end_date)
+        reports = ReportService.get_reports(
+            user_id, start_date, end_date,
+            ('summary', 'expense_by_category', 'income_by_category')
+        )
+        summary = reports['summary']
         summary['month'] = month
         summary['year'] = year
         
         # Add category breakdown
-        summary['expense_by_category'] = ReportService.get_expense_by_category(
-            user_id, start_date, end_date
-        )
-        summary['income_by_category'] = ReportService.get_income_by_category(
-            user_id, start_date, end_date
-        )
+        summary['expense_by_category'] = reports['expense_by_category']
+        summary['income_by_category'] = reports['income_by_category']
         
         return summary
     
@@ -98,12 +343,12 @@ class ReportService:
         Returns:
             List of category breakdowns
         """
-        query = """
+        query = f"""
             SELECT 
                 c.id as category_id,
                 c.name as category_name,
                 c.icon as category_icon,
-                SUM(t.amount) as total_amount,
+                {DatabaseConnection.dialect().sum_minor_units('t.amount')} as total_amount,
                 COUNT(t.id) as transaction_count
             FROM transactions t
             JOIN categories c ON t.category_id = c.id
@@ -119,21 +364,19 @@ class ReportService:
             query, (user_id, start_date, end_date), commit=False
         )
         
-        # Calculate total for percentage
-        total_expense = float(sum(float(row['total_amount']) for row in results))
+        # Calculate total for percentage (exact: integer minor units)
+        total_expense = sum(row['total_amount'] for row in results)
         
         breakdown = []
         for row in results:
-            amount = float(row['total_amount'])
-            percentage = (amount / total_expense * 100) if total_expense > 0 else 0
-            
+            amount = row['total_amount']
             breakdown.append({
                 'category_id': row['category_id'],
                 'category_name': row['category_name'],
                 'category_icon': row['category_icon'],
-                'total_amount': amount,
+                'total_amount': to_major(amount),
                 'transaction_count': row['transaction_count'],
-                'percentage': percentage,
+                'percentage': percentage(amount, total_expense),
             })
         
         return breakdown
@@ -150,12 +393,12 @@ class ReportService:
         Returns:
             List of category breakdowns
         """
-        query = """
+        query = f"""
             SELECT 
                 c.id as category_id,
                 c.name as category_name,
                 c.icon as category_icon,
-                SUM(t.amount) as total_amount,
+                {DatabaseConnection.dialect().sum_minor_units('t.amount')} as total_amount,
                 COUNT(t.id) as transaction_count
             FROM transactions t
             JOIN categories c ON t.category_id = c.id
@@ -171,21 +414,19 @@ class ReportService:
             query, (user_id, start_date, end_date), commit=False
         )
         
-        # Calculate total for percentage
-        total_income = float(sum(float(row['total_amount']) for row in results))
+        # Calculate total for percentage (exact: integer minor units)
+        total_income = sum(row['total_amount'] for row in results)
         
         breakdown = []
         for row in results:
-            amount = float(row['total_amount'])
-            percentage = (amount / total_income * 100) if total_income > 0 else 0
-            
+            amount = row['total_amount']
             breakdown.append({
                 'category_id': row['category_id'],
                 'category_name': row['category_name'],
                 'category_icon': row['category_icon'],
-                'total_amount': amount,
+                'total_amount': to_major(amount),
                 'transaction_count': row['transaction_count'],
-                'percentage': percentage,
+                'percentage': percentage(amount, total_income),
             })
         
         return breakdown
@@ -202,11 +443,12 @@ class ReportService:
         Returns:
             List of daily data
         """
-        query = """
+        dialect = DatabaseConnection.dialect()
+        query = f"""
             SELECT 
                 transaction_date,
-                SUM(CASE WHEN type = 'income' THEN amount ELSE 0 END) as income,
-                SUM(CASE WHEN type = 'expense' THEN amount ELSE 0 END) as expense
+                {dialect.sum_minor_units("CASE WHEN type = 'income' THEN amount ELSE 0 END")} as income,
+                {dialect.sum_minor_units("CASE WHEN type = 'expense' THEN amount ELSE 0 END")} as expense
             FROM transactions
             WHERE user_id = %s 
             AND transaction_date >= %s 
@@ -222,9 +464,9 @@ class ReportService:
         return [
             {
                 'date': row['transaction_date'],
-                'income': float(row['income']),
-                'expense': float(row['expense']),
-                'net': float(row['income']) - float(row['expense']),
+                'income': to_major(row['income']),
+                'expense': to_major(row['expense']),
+                'net': to_major(row['income'] - row['expense']),
             }
             for row in results
         ]
@@ -241,7 +483,8 @@ class ReportService:
         Returns:
             CSV string
         """
-        transactions = TransactionService.get_by_date_range(user_id, start_date, end_date)
+        # Streamed: exports are not capped like get_by_date_range() listings
+        transactions = Transaction.iter_by_user(user_id, start_date, end_date)
         
         # Build CSV
         csv_lines = [
@@ -259,3 +502,36 @@ class ReportService:
             )
         
         return '\n'.join(csv_lines)
+
+
+def _change(current: int, previous: int, minor: bool = True) -> Dict[str, Any]:
+    """Change from previous to current (minor units in, currency units out)."""
+    scale = to_major if minor else int
+    return {
+        'current': scale(current),
+        'previous': scale(previous),
+        'delta': scale(current - previous),
+        'change_pct': round((current - previous) * 100 / abs(previous), 2) if previous else None,
+    }
+
+
+def _category_changes(current: TransactionFrame, previous: TransactionFrame,
+                      trans_type: str) -> List[Dict[str, Any]]:
+    """Per-category changes of one type over both periods' categories."""
+    now = {int(c): int(t) for c, t, _ in current.by_category(trans_type).itertuples(index=False)}
+    before = {int(c): int(t) for c, t, _ in previous.by_category(trans_type).itertuples(index=False)}
+    if not now and not before:
+        return []
+    categories = current.categories()
+    grand_total = sum(now.values())
+    ordered = sorted(set(now) | set(before), key=lambda c: (-now.get(c, 0), -before.get(c, 0), c))
+    return [
+        {
+            'category_id': category_id,
+            'category_name': categories.get(category_id, {}).get('name'),
+            'category_icon': categories.get(category_id, {}).get('icon'),
+            'percentage': percentage(now.get(category_id, 0), grand_total),
+            **_change(now.get(category_id, 0), before.get(category_id, 0)),
+        }
+        for category_id in ordered
+    ]
@@ -0,0 +1,108 @@
+"""Delta sync of a user's transactions for the Mini App's local cache."""
+
+from typing import Any, Dict, List
+from models.sync import SyncLog, DELETE, RESET
+from models.transaction import Transaction
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Rows per snapshot page and changes per delta page
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 2000
+
+
+class SyncService:
+    """Serve snapshots and change deltas of the transaction ledger."""
+
+    @staticmethod
+    def snapshot(user_id: int, after: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+        """One page of the user's full ledger, in id order.
+
+        The version is read before the rows, so changes made while a client
+        pages through a snapshot are replayed by its next delta (applying them
+        twice is harmless).
+
+        Args:
+            user_id: User ID
+            after: Last transaction id of the previous page (0 for the first)
+            limit: Page size
+
+        Returns:
+            Dictionary with version, reset (True), transactions, deleted ([]),
+            after (cursor for the next page) and has_more
+        """
+        version = SyncLog.current_version(user_id)
+        rows = Transaction.get_page_after(user_id, after, limit + 1)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return {
+            'version': version,
+            'reset': True,
+            'transactions': rows,
+            'deleted': [],
+            'after': rows[-1].id if rows else after,
+            'has_more': has_more,
+        }
+
+    @staticmethod
+    def get_changes(user_id: int, since: int = 0, after: int = 0,
+                    limit: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+        """Changes after the client's version, or a snapshot page when it has none.
+
+        A snapshot is served when since is 0, when since is ahead of the
+        server (the client's cache belongs to another database), when since
+        is older than the oldest change still in the log (see
+        SyncLog.prune) and when a RESET change falls in the requested range.
+
+        Args:
+            user_id: User ID
+            since: Version the client's cache is at (0 = empty cache)
+            after: Snapshot paging cursor (see snapshot)
+            limit: Page size
+
+        Returns:
+            Dictionary as in snapshot; for a delta reset is False,
+            transactions holds the created/updated rows, deleted the removed
+            ids and version the version the client is at after applying it
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        if since <= 0 or after > 0:
+            return SyncService.snapshot(user_id, after, limit)
+
+        changes = SyncLog.changes_since(user_id, since, limit + 1)
+        if not changes:
+            current = SyncLog.current_version(user_id)
+            if since > current:
+                logger.info(f"Sync version {since} of user {user_id} is ahead of the server; resending snapshot")
+                return SyncService.snapshot(user_id, 0, limit)
+            if since < current:
+                # Every change after since was pruned
+                logger.info(f"Sync version {since} of user {user_id} is below the pruned log; resending snapshot")
+                return SyncService.snapshot(user_id, 0, limit)
+        elif int(changes[0]['version']) > since + 1:
+            # Versions have no gaps: the oldest kept change is past since + 1
+            logger.info(f"Sync version {since} of user {user_id} is below the pruned log; resending snapshot")
+            return SyncService.snapshot(user_id, 0, limit)
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        if any(change['op'] == RESET for change in changes):
+            return SyncService.snapshot(user_id, 0, limit)
+
+        # Only the latest change of each transaction matters
+        latest: Dict[int, str] = {}
+        for change in changes:
+            latest[int(change['transaction_id'])] = change['op']
+        upserted = [tid for tid, op in latest.items() if op != DELETE]
+        rows = Transaction.get_by_ids(user_id, upserted)
+        found = {row.id for row in rows}
+        # Deleted since (or never visible to this user): the client drops them
+        deleted: List[int] = [tid for tid in latest if tid not in found]
+        return {
+            'version': int(changes[-1]['version']) if changes else since,
+            'reset': False,
+            'transactions': rows,
+            'deleted': deleted,
+            'after': 0,
+            'has_more': has_more,
+        }
@@ -1,6 +1,6 @@
 """Transaction service for transaction management."""
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import date, datetime, timedelta
 from models.transaction import Transaction
 from models.category import Category
@@ -80,6 +80,25 @@ class TransactionService:
         """
         return Transaction.get_by_user(user_id, limit, offset, start_date, end_date, trans_type)
     
+    @staticmethod
+    def get_user_transactions_before(user_id: int, cursor: Optional[Tuple[date, datetime, int]],
+                                     limit: int = 50,
+                                     start_date: Optional[date] = None,
+                                     end_date: Optional[date] = None) -> List[Transaction]:
+        """Get the page of transactions after cursor (see Transaction.get_by_user_before).
+        
+        Args:
+            user_id: User ID
+            cursor: (transaction_date, created_at, id) of the previous page's last row
+            limit: Maximum number of results
+            start_date: Filter by start date
+            end_date: Filter by end date
+            
+        Returns:
+            List of Transaction instances
+        """
+        return Transaction.get_by_user_before(user_id, cursor, limit, start_date, end_date)
+    
     @staticmethod
     def get_today_transactions(user_id: int) -> List[Transaction]:
         """Get today's transactions for a user.
@@ -93,15 +112,14 @@ class TransactionService:
         return Transaction.get_today(user_id)
     
     @staticmethod
-    def get_transactions_by_period(user_id: int, period: str) -> List[Transaction]:
-        """Get transactions for a specific period.
+    def get_period_range(period: str) -> Tuple[date, date]:
+        """Resolve a report period to its date range.
         
         Args:
-            user_id: User ID
             period: Period ('today', '7d', '30d', 'this_month', 'last_month')
             
         Returns:
-            List of Transaction instances
+            Tuple of (start_date, end_date), inclusive
         """
         today = today_jakarta()
         
@@ -127,6 +145,20 @@ class TransactionService:
             start_date = today - timedelta(days=30)
             end_date = today
         
+        return start_date, end_date
+    
+    @staticmethod
+    def get_transactions_by_period(user_id: int, period: str) -> List[Transaction]:
+        """Get transactions for a specific period.
+        
+        Args:
+            user_id: User ID
+            period: Period ('today', '7d', '30d', 'this_month', 'last_month')
+            
+        Returns:
+            List of Transaction instances
+        """
+        start_date, end_date = TransactionService.get_period_range(period)
         return Transaction.get_by_date_range(user_id, start_date, end_date)
     
     @staticmethod
@@ -243,10 +275,7 @@ class TransactionService:
         """
         from config.database import DatabaseConnection
         
-        query = """
-            SELECT t.*, c.name as category_name, c.icon as category_icon
-            FROM transactions t
-            LEFT JOIN categories c ON t.category_id = c.id
+        query = Transaction._SELECT + """
             WHERE t.user_id = %s AND (t.description LIKE %s OR t.notes LIKE %s)
             ORDER BY t.transaction_date DESC, t.created_at DESC
             LIMIT %s
@@ -254,7 +283,7 @@ class TransactionService:
         
         keyword_pattern = f"%{keyword}%"
         results = DatabaseConnection.execute_query(
-            query, (user_id, keyword_pattern, keyword_pattern, limit), commit=False
+            query, (user_id, keyword_pattern, keyword_pattern, limit), commit=False, tuples=True
         )
         
-        return [Transaction(row) for row in results]
+        return [Transaction.from_row(row) for row in results]
@@ -0,0 +1,16 @@
+"""Shared pytest fixtures."""
+
+import pytest
+from config.backends import SQLiteBackend
+from config.database import DatabaseConnection
+
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    """Point DatabaseConnection at a fresh SQLite database with the full schema."""
+    previous = DatabaseConnection._backend
+    backend = SQLiteBackend(str(tmp_path / 'montrixa.db'))
+    backend.apply_schema()
+    DatabaseConnection.configure(backend)
+    yield backend
+    DatabaseConnection.configure(previous)
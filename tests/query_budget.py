@@ -0,0 +1,141 @@
+"""Query budgets for tests: catch N+1 patterns before they reach production.
+
+Usage:
+
+    with query_budget(max_queries=3, max_repeats=1):
+        BudgetService.get_budget_status(user_id)
+
+Every statement DatabaseConnection executes inside the block is recorded
+through a QueryStats listener and grouped by SQL fingerprint. On exit the block
+fails with a report (statement, count, call sites) when more than max_queries
+statements ran in total or one fingerprint ran more than max_repeats times.
+"""
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from config.query_stats import QueryStats, _INTERNAL_DIRS
+
+_THIS_FILE = os.path.abspath(__file__)
+
+
+def _call_site() -> str:
+    """Return 'file:line in function' of the code that issued the statement."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if not filename.startswith(_INTERNAL_DIRS) and filename != _THIS_FILE:
+            return f"{os.path.relpath(filename)}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return 'unknown'
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a block runs more queries than its declared budget."""
+
+
+class _Statement:
+    """Calls recorded for one SQL fingerprint."""
+
+    __slots__ = ('fingerprint', 'count', 'call_sites')
+
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.count = 0
+        self.call_sites: Dict[str, int] = OrderedDict()
+
+
+class QueryRecorder:
+    """Collects the statements executed while it is attached to QueryStats."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.statements: Dict[str, _Statement] = OrderedDict()
+        self.total = 0
+
+    def __call__(self, fp: str, query: str, duration_ms: float, rows: int) -> None:
+        site = _call_site()
+        with self._lock:
+            statement = self.statements.get(fp)
+            if statement is None:
+                statement = self.statements[fp] = _Statement(fp)
+            statement.count += 1
+            statement.call_sites[site] = statement.call_sites.get(site, 0) + 1
+            self.total += 1
+
+    def count(self, contains: Optional[str] = None) -> int:
+        """Number of statements recorded, optionally only those whose fingerprint contains text."""
+        if contains is None:
+            return self.total
+        needle = contains.lower()
+        return sum(s.count for s in self.statements.values() if needle in s.fingerprint.lower())
+
+    def repeated(self, max_repeats: int) -> List[_Statement]:
+        """Statements executed more than max_repeats times."""
+        return [s for s in self.statements.values() if s.count > max_repeats]
+
+    def report(self, limit_sites: int = 3) -> str:
+        """Render recorded statements, most frequent first."""
+        lines = [f"{self.total} queries, {len(self.statements)} distinct:"]
+        for statement in sorted(self.statements.values(), key=lambda s: -s.count):
+            sql = statement.fingerprint
+            if len(sql) > 160:
+                sql = sql[:157] + '...'
+            lines.append(f"  {statement.count:>4}x  {sql}")
+            for site, calls in list(statement.call_sites.items())[:limit_sites]:
+                lines.append(f"         {calls}x from {site}")
+            if len(statement.call_sites) > limit_sites:
+                lines.append(f"         ... {len(statement.call_sites) - limit_sites} more call sites")
+        return '\n'.join(lines)
+
+
+@contextmanager
+def record_queries() -> Iterator[QueryRecorder]:
+    """Record every statement executed inside the block."""
+    recorder = QueryRecorder()
+    QueryStats.add_listener(recorder)
+    try:
+        yield recorder
+    finally:
+        QueryStats.remove_listener(recorder)
+
+
+@contextmanager
+def query_budget(max_queries: Optional[int] = None, max_repeats: Optional[int] = None,
+                 label: str = 'block') -> Iterator[QueryRecorder]:
+    """Fail when the block exceeds its query budget.
+
+    Args:
+        max_queries: Maximum number of statements in total (None = unlimited)
+        max_repeats: Maximum executions of any single fingerprint; a statement
+            issued once per row of an earlier result is the N+1 signature
+            (None = unlimited)
+        label: Name of the code path, used in the failure message
+
+    Yields:
+        QueryRecorder with the statements executed so far
+
+    Raises:
+        QueryBudgetExceeded: If a limit was exceeded (only when the block
+            itself did not raise)
+    """
+    with record_queries() as recorder:
+        yield recorder
+
+    problems = []
+    if max_queries is not None and recorder.total > max_queries:
+        problems.append(f"ran {recorder.total} queries, budget is {max_queries}")
+    if max_repeats is not None:
+        for statement in recorder.repeated(max_repeats):
+            problems.append(
+                f"repeated {statement.count}x (max {max_repeats}): {statement.fingerprint[:80]}"
+            )
+    if problems:
+        raise QueryBudgetExceeded(
+            f"Query budget exceeded in {label}:\n  - " + '\n  - '.join(problems)
+            + '\n\n' + recorder.report()
+        )
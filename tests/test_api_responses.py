@@ -0,0 +1,153 @@
+"""Tests for orjson API responses and record serializers."""
+
+import json
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+
+from api.auth import get_current_user
+from api.helpers import parse_cursor
+from api.main import app
+from api.responses import dumps, records
+from config.database import DatabaseConnection
+from models.category import Category
+from models.transaction import Transaction
+from models.user import User
+from services.transaction_service import TransactionService
+from services.user_service import UserService
+
+
+class TestDumps:
+    """Test dumps() matches the output of jsonable_encoder."""
+
+    def test_matches_jsonable_encoder(self):
+        """Test dates, datetimes, Decimals and None encode the same as before."""
+        content = {
+            'date': date(2024, 2, 29),
+            'created_at': datetime(2024, 2, 29, 13, 45, 1, 250000),
+            'whole': Decimal('150000'),
+            'fraction': Decimal('12.5'),
+            'notes': None,
+            'icon': '🍔',
+        }
+
+        assert json.loads(dumps(content)) == jsonable_encoder(content)
+
+
+class TestRecords:
+    """Test records()."""
+
+    def test_models_and_dict_rows(self):
+        """Test fields are picked from attributes or keys, renamed when asked."""
+        transaction = Transaction.from_row((
+            1, 2, 3, 150000, 'kopi', date(2024, 1, 5), 'expense', None, 0, None,
+            datetime(2024, 1, 5, 8, 0), datetime(2024, 1, 5, 8, 0), 'Makanan', '🍔',
+        ))
+
+        assert records([transaction], Transaction.FIELDS) == [
+            {**transaction.to_dict(), 'transaction_date': date(2024, 1, 5)}
+        ]
+        assert records([{'d': 1, 'x': 2}], ('d', 'x'), ('date', 'value')) == [{'date': 1, 'value': 2}]
+        assert records([{'d': 1}], ('d',)) == [{'d': 1}]
+        assert records([], ('d',)) == []
+
+
+class TestRoutes:
+    """Test list routes keep their JSON shape."""
+
+    def test_transactions_payload_unchanged(self, sqlite_db):
+        """Test /api/transactions returns what to_dict() + jsonable_encoder returned."""
+        user = UserService.get_or_register(telegram_id=888, username='json', first_name='Json')
+        category = Category.get_by_user(user.id, 'expense')[0]
+        for amount in (15000, 27500.5):
+            TransactionService.create_transaction(user.id, category.id, amount, 'makan', 'expense')
+        app.dependency_overrides[get_current_user] = lambda: User.get_by_id(user.id)
+        try:
+            client = TestClient(app)
+            body = client.get('/api/transactions?limit=10').json()
+            analytics = client.get('/api/analytics').json()
+        finally:
+            app.dependency_overrides.clear()
+
+        expected = jsonable_encoder([t.to_dict() for t in TransactionService.get_user_transactions(user.id, limit=10)])
+        assert body['transactions'] == expected
+        assert body['total'] == 2
+        assert analytics['summary']['total_expense'] == 42500.5
+        assert set(analytics['by_day'][0]) == {'date', 'income', 'expense'}
+
+    def test_cursor_pages_match_offset_order(self, sqlite_db):
+        """Test next_cursor pages walk the list in offset order, ties included."""
+        user = UserService.get_or_register(telegram_id=889, username='page', first_name='Page')
+        category = Category.get_by_user(user.id, 'expense')[0]
+        for amount in range(1000, 8000, 1000):
+            TransactionService.create_transaction(user.id, category.id, amount, 'makan', 'expense')
+        app.dependency_overrides[get_current_user] = lambda: User.get_by_id(user.id)
+        try:
+            client = TestClient(app)
+            expected = [t['id'] for t in client.get('/api/transactions?limit=100').json()['transactions']]
+            page = client.get('/api/transactions?limit=3').json()
+            ids = [t['id'] for t in page['transactions']]
+            while page['next_cursor']:
+                page = client.get('/api/transactions', params={'limit': 3, 'cursor': page['next_cursor']}).json()
+                assert page['total'] is None
+                ids += [t['id'] for t in page['transactions']]
+            bad = client.get('/api/transactions?cursor=nonsense')
+        finally:
+            app.dependency_overrides.clear()
+
+        assert len(expected) == 7 and ids == expected
+        assert bad.status_code == 400
+
+    def test_cursor_pages_rows_without_created_at(self, sqlite_db):
+        """Test rows with a NULL created_at are paged in order, not restarted from the top."""
+        user = UserService.get_or_register(telegram_id=891, username='nul', first_name='Null')
+        category = Category.get_by_user(user.id, 'expense')[0]
+        created = [TransactionService.create_transaction(user.id, category.id, amount, 'makan', 'expense')
+                   for amount in range(1000, 7000, 1000)]
+        DatabaseConnection.execute_query(
+            "UPDATE transactions SET created_at = NULL WHERE id IN (%s, %s, %s)",
+            tuple(t.id for t in created[1:4])
+        )
+        app.dependency_overrides[get_current_user] = lambda: User.get_by_id(user.id)
+        try:
+            client = TestClient(app)
+            expected = [t['id'] for t in client.get('/api/transactions?limit=100').json()['transactions']]
+            page = client.get('/api/transactions?limit=2').json()
+            ids = [t['id'] for t in page['transactions']]
+            while page['next_cursor']:
+                page = client.get('/api/transactions', params={'limit': 2, 'cursor': page['next_cursor']}).json()
+                ids += [t['id'] for t in page['transactions']]
+        finally:
+            app.dependency_overrides.clear()
+
+        assert parse_cursor('2024-03-01~~7') == (date(2024, 3, 1), None, 7)
+        assert len(expected) == 6 and ids == expected
+
+    def test_analytics_compare_previous(self, sqlite_db):
+        """Test compare=previous adds totals and day-aligned rows of the previous period."""
+        user = UserService.get_or_register(telegram_id=890, username='cmp', first_name='Compare')
+        category = Category.get_by_user(user.id, 'expense')[0]
+        today = date.today()
+        TransactionService.create_transaction(user.id, category.id, 20000, 'makan', 'expense', today)
+        TransactionService.create_transaction(user.id, category.id, 10000, 'makan', 'expense',
+                                              today - timedelta(days=7))
+        app.dependency_overrides[get_current_user] = lambda: User.get_by_id(user.id)
+        try:
+            client = TestClient(app)
+            params = {'start': (today - timedelta(days=6)).isoformat(), 'end': today.isoformat()}
+            plain = client.get('/api/analytics', params=params).json()
+            compared = client.get('/api/analytics', params={**params, 'compare': 'previous'}).json()
+            bad = client.get('/api/analytics', params={**params, 'compare': 'next'})
+        finally:
+            app.dependency_overrides.clear()
+
+        assert 'comparison' not in plain
+        assert compared['summary'] == plain['summary']
+        comparison = compared['comparison']
+        assert comparison['totals']['expense'] == {'current': 20000, 'previous': 10000, 'delta': 10000, 'change_pct': 100.0}
+        assert comparison['by_category'][0]['delta'] == 10000
+        assert len(comparison['daily']) == 7
+        assert (comparison['daily'][6]['expense'], comparison['daily'][6]['previous_expense']) == (20000, 10000)
+        assert bad.status_code == 422
@@ -0,0 +1,87 @@
+"""Tests for the multi-worker API server and per-process DB pools."""
+
+import asyncio
+import multiprocessing
+import os
+from unittest.mock import patch
+
+import pytest
+
+from api.main import warmup_worker
+from api.server import WorkerSupervisor, _Worker
+from config.database import DatabaseConnection
+
+
+def _report_pool(queue):
+    queue.put((os.getpid(), len(DatabaseConnection._connection_pool), DatabaseConnection.pool_stats()['created']))
+
+
+class _FakeProcess:
+    def __init__(self, alive=True, pid=1):
+        self.alive = alive
+        self.pid = pid
+        self.exitcode = None if alive else 1
+
+    def is_alive(self):
+        return self.alive
+
+
+class TestPerProcessPool:
+    """Test every process owns its own connection pool."""
+
+    def test_warmup_fills_pool(self, sqlite_db):
+        """Test warmup leaves idle connections, capped at the pool size."""
+        assert DatabaseConnection.warmup(2) == 2
+        assert DatabaseConnection.pool_stats()['in_use'] == 0
+        assert DatabaseConnection.warmup(100) == DatabaseConnection._pool_size
+        DatabaseConnection.close_all_connections()
+
+    @pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs fork')
+    def test_forked_child_starts_with_empty_pool(self, sqlite_db):
+        """Test a forked process does not reuse the parent's pooled connections."""
+        DatabaseConnection.warmup(2)
+        context = multiprocessing.get_context('fork')
+        queue = context.Queue()
+        child = context.Process(target=_report_pool, args=(queue,))
+        child.start()
+        pid, idle, created = queue.get(timeout=10)
+        child.join()
+
+        assert pid != os.getpid()
+        assert (idle, created) == (0, 0)
+        assert len(DatabaseConnection._connection_pool) == 2
+        DatabaseConnection.close_all_connections()
+
+    def test_warmup_failure_does_not_block_startup(self):
+        """Test a worker still starts when the database is down."""
+        with patch.object(DatabaseConnection, 'warmup', side_effect=OSError('down')):
+            asyncio.run(warmup_worker())
+
+
+class TestWorkerSupervisor:
+    """Test supervisor configuration and worker replacement."""
+
+    def test_uvicorn_options(self):
+        """Test backlog, keep-alive, graceful timeout and recycling reach uvicorn."""
+        supervisor = WorkerSupervisor('api.main:app', '127.0.0.1', 0, workers=0, backlog=512,
+                                      keep_alive=65, graceful_timeout=20, max_requests=0)
+
+        assert supervisor.workers == 1
+        assert supervisor.config_kwargs['backlog'] == 512
+        assert supervisor.config_kwargs['timeout_keep_alive'] == 65
+        assert supervisor.config_kwargs['timeout_graceful_shutdown'] == 20
+        assert supervisor.config_kwargs['limit_max_requests'] is None
+
+    def test_dead_workers_replaced(self):
+        """Test exited workers are respawned unless the supervisor is stopping."""
+        supervisor = WorkerSupervisor('api.main:app', '127.0.0.1', 0, workers=2)
+        supervisor._workers = [_Worker(_FakeProcess(True, 1), None), _Worker(_FakeProcess(False, 2), None)]
+        replacement = _Worker(_FakeProcess(True, 3), None)
+
+        with patch.object(supervisor, '_spawn_worker', return_value=replacement) as spawn:
+            supervisor._replace_dead_workers()
+            assert [w.pid for w in supervisor._workers] == [1, 3]
+            supervisor._workers[1].process.alive = False
+            supervisor._stopping.set()
+            supervisor._replace_dead_workers()
+        spawn.assert_called_once()
@@ -0,0 +1,152 @@
+"""Tests for the Mini App build and static file serving."""
+
+import gzip
+import os
+import shutil
+import subprocess
+from unittest import mock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.assets import (
+    IMMUTABLE, MINIAPP_DIR, MiniAppStaticFiles, build, build_version, minify_css, minify_js, needs_build,
+)
+from config.settings import Settings
+from utils.keyboards import Keyboards
+
+
+@pytest.fixture
+def source(tmp_path):
+    """Copy of the Mini App sources."""
+    target = tmp_path / 'miniapp'
+    shutil.copytree(MINIAPP_DIR, target, ignore=shutil.ignore_patterns('dist'))
+    return target
+
+
+def _client(source):
+    app = FastAPI()
+    app.mount('/', MiniAppStaticFiles(source), name='miniapp')
+    return TestClient(app)
+
+
+class TestMinify:
+    """Test the JS and CSS minifiers."""
+
+    def test_js_keeps_literals(self):
+        """Test comments go while strings, templates and regex literals stay verbatim."""
+        source = (
+            '/* global Chart */\n'
+            'const url = "https://x.test/a"; // trailing\n'
+            "const quote = /'/g;\n"
+            'const html = `<div>\n  ${items.map((i) => `<b>${i}</b>`).join("")}\n</div>`;\n'
+            'let total = a / b / 2;\n'
+            'function f() {\n    return x\n}\n'
+        )
+
+        assert minify_js(source) == (
+            'const url="https://x.test/a";'
+            "const quote=/'/g;"
+            'const html=`<div>\n  ${items.map((i) => `<b>${i}</b>`).join("")}\n</div>`;'
+            'let total=a/b/2;'
+            'function f(){return x}\n'
+        )
+
+    def test_js_keeps_statement_breaks(self):
+        """Test line breaks that may end a statement are kept and tokens are not merged."""
+        assert minify_js('a = b\n(c)\nx = y + +z\n') == 'a=b\n(c)\nx=y+ +z\n'
+
+    def test_css(self):
+        """Test comments and whitespace around punctuation are removed."""
+        source = '/* c */\n.a > .b ,\n.c {\n  color : red;\n  background: url("x y.svg");\n}\n@media (max-width: 600px) { .a { margin: 0 auto; } }\n'
+
+        assert minify_css(source) == (
+            '.a>.b,.c{color :red;background:url("x y.svg")}'
+            '@media (max-width:600px){.a{margin:0 auto}}\n'
+        )
+
+    @pytest.mark.skipif(shutil.which('node') is None, reason='node not installed')
+    def test_bundle_parses(self, source):
+        """Test the real bundle is valid JavaScript."""
+        manifest = build(source)
+
+        bundle = source / 'dist' / manifest['files']['app.js']
+        assert subprocess.run(['node', '--check', str(bundle)]).returncode == 0
+
+
+class TestBuild:
+    """Test build()."""
+
+    def test_fingerprinted_bundle(self, source):
+        """Test index.html loads one hashed bundle and stylesheet, all precompressed."""
+        manifest = build(source)
+        dist = source / 'dist'
+        html = (dist / 'index.html').read_text(encoding='utf-8')
+
+        assert html.count('<script src="./app.') == 1
+        assert './js/' not in html
+        assert f'href="./{manifest["files"]["style.css"]}"' in html
+        for name in (*manifest['assets'], 'index.html'):
+            assert gzip.decompress((dist / (name + '.gz')).read_bytes()) == (dist / name).read_bytes()
+        assert manifest['sizes']['app.js']['minified'] < manifest['sizes']['app.js']['source']
+        assert build_version(source) == manifest['version']
+
+    def test_rebuild_keeps_previous_assets(self, source):
+        """Test a change gets a new name, keeps the previous build's files and prunes older ones."""
+        first = build(source)
+        assert build(source)['version'] == first['version']
+        assert not needs_build(source)
+
+        for n in (1, 2):
+            with open(source / 'js' / 'state.js', 'a', encoding='utf-8') as f:
+                f.write(f'\nlet changed{n} = {n};\n')
+            os.utime(source / 'js' / 'state.js', (2e9 + n, 2e9 + n))
+            assert needs_build(source)
+            second = build(source)
+
+        names = os.listdir(source / 'dist')
+        assert first['files']['app.js'] not in names
+        assert second['files']['app.js'] in names
+        assert second['files']['style.css'] == first['files']['style.css']
+
+
+class TestServing:
+    """Test MiniAppStaticFiles cache and encoding headers."""
+
+    def test_built_assets(self, source):
+        """Test hashed files are immutable and precompressed; index.html revalidates."""
+        manifest = build(source)
+        client = _client(source)
+
+        asset = client.get(f"/{manifest['files']['app.js']}", headers={'Accept-Encoding': 'gzip, br'})
+        index = client.get('/', headers={'Accept-Encoding': 'gzip'})
+        again = client.get('/', headers={'Accept-Encoding': 'gzip', 'If-None-Match': index.headers['etag']})
+
+        assert asset.headers['cache-control'] == IMMUTABLE
+        assert asset.headers['content-encoding'] == 'gzip'
+        assert asset.headers['content-type'].startswith(('application/javascript', 'text/javascript'))
+        assert 'function ' in asset.text
+        assert index.headers['cache-control'] == 'no-cache'
+        assert index.headers['vary'] == 'Accept-Encoding'
+        assert again.status_code == 304
+        assert client.get('/', headers={'Accept-Encoding': 'identity'}).headers.get('content-encoding') is None
+
+    def test_unbuilt_sources_not_cached(self, source):
+        """Test without a build the sources are served with no-store."""
+        response = _client(source).get('/js/main.js')
+
+        assert response.status_code == 200
+        assert response.headers['cache-control'].startswith('no-store')
+
+
+class TestMiniAppUrl:
+    """Test the Mini App button URL."""
+
+    def test_url_uses_build_version(self, monkeypatch):
+        """Test v= is the build version and stays stable between clicks."""
+        monkeypatch.setattr(Settings, 'MINIAPP_URL', 'https://app.test/?ref=bot')
+        with mock.patch('utils.keyboards.build_version', return_value='abc123'):
+            assert Keyboards._miniapp_url_with_version() == 'https://app.test/?ref=bot&v=abc123'
+        with mock.patch('utils.keyboards.build_version', return_value=None):
+            assert Keyboards._miniapp_url_with_version() == 'https://app.test/?ref=bot'
@@ -0,0 +1,81 @@
+"""Tests for the benchmark harness helpers."""
+
+import random
+from datetime import date
+
+from benchmarks.datagen import iter_transactions
+from benchmarks.run import compare, measure
+from config.query_stats import QueryStats
+
+CATEGORIES = {
+    'income': {'Gaji': 1, 'Bonus': 2},
+    'expense': {'Makanan': 3, 'Transport': 4},
+}
+
+
+def _rows(seed):
+    return list(iter_transactions(
+        random.Random(seed), 7, CATEGORIES, date(2024, 1, 1), date(2024, 3, 31), 3.0
+    ))
+
+
+class TestDatagen:
+    """Test synthetic transaction generation."""
+
+    def test_deterministic(self):
+        """Test the same seed yields the same rows."""
+        assert _rows(1) == _rows(1)
+        assert _rows(1) != _rows(2)
+
+    def test_shape(self):
+        """Test rows cover the range with monthly salary and valid categories."""
+        rows = _rows(1)
+        salaries = [r for r in rows if r[1] == 1]
+        assert [r[4] for r in salaries] == [date(2024, 1, 25), date(2024, 2, 25), date(2024, 3, 25)]
+        assert all(r[0] == 7 and r[2] >= 500 for r in rows)
+        assert all(r[5] == 'expense' for r in rows if r[1] in (3, 4))
+        assert date(2024, 1, 1) <= min(r[4] for r in rows)
+        assert max(r[4] for r in rows) <= date(2024, 3, 31)
+
+
+class TestMeasure:
+    """Test benchmark timing."""
+
+    def test_counts_queries(self):
+        """Test query counts per call exclude warmup and setup."""
+        def setup(i):
+            QueryStats.record_query("DELETE FROM x", 1.0, 0)
+            return i
+
+        def case(i):
+            QueryStats.record_query("SELECT 1", 1.0, 1)
+            QueryStats.record_query("SELECT 2", 1.0, 1)
+
+        listeners = len(QueryStats._listeners)
+        result = measure(case, repeat=3, setup=setup)
+        assert result['count'] == 3
+        assert result['queries_avg'] == 2
+        assert len(QueryStats._listeners) == listeners
+
+
+class TestCompare:
+    """Test regression detection between runs."""
+
+    def test_regressions(self):
+        """Test slower p50 and extra queries are flagged."""
+        baseline = {'results': {
+            'a': {'p50_ms': 10.0, 'queries_avg': 2},
+            'b': {'p50_ms': 10.0, 'queries_avg': 2},
+            'c': {'p50_ms': 10.0, 'queries_avg': 2},
+        }}
+        current = {'results': {
+            'a': {'p50_ms': 11.0, 'queries_avg': 2},
+            'b': {'p50_ms': 15.0, 'queries_avg': 2},
+            'c': {'p50_ms': 9.0, 'queries_avg': 3},
+            'new': {'p50_ms': 1.0, 'queries_avg': 1},
+        }}
+        rows = {r['case']: r for r in compare(current, baseline, threshold=0.2)}
+        assert set(rows) == {'a', 'b', 'c'}
+        assert rows['a']['regression'] is False
+        assert rows['b']['regression'] is True
+        assert rows['c']['regression'] is True
@@ -0,0 +1,131 @@
+"""Tests for the async DB executor and async API routes."""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import threading
+import time
+from contextvars import ContextVar
+from urllib.parse import urlencode
+
+from fastapi.testclient import TestClient
+
+from api.main import app
+from config.database import DatabaseConnection
+from config.db_executor import DBExecutor
+from config.settings import Settings
+from models.user import User
+
+_request_id: ContextVar[str] = ContextVar('test_request_id', default='')
+
+
+def _signed_init_data(bot_token: str, telegram_id: int) -> str:
+    data = {
+        'auth_date': str(int(time.time())),
+        'user': json.dumps({'id': telegram_id, 'first_name': 'Async', 'username': 'async'}),
+    }
+    check = '\n'.join(f'{k}={v}' for k, v in sorted(data.items()))
+    secret = hmac.new(b'WebAppData', bot_token.encode(), hashlib.sha256).digest()
+    data['hash'] = hmac.new(secret, check.encode(), hashlib.sha256).hexdigest()
+    return urlencode(data)
+
+
+class TestDBExecutor:
+    """Test DBExecutor.run()."""
+
+    def test_runs_off_loop_with_caller_context(self):
+        """Test work runs on an executor thread and sees the caller's contextvars."""
+        async def scenario():
+            _request_id.set('req-1')
+            return await DBExecutor.run(lambda: (threading.current_thread().name, _request_id.get()))
+
+        thread_name, request_id = asyncio.run(scenario())
+        assert thread_name.startswith('montrixa-db')
+        assert request_id == 'req-1'
+
+    def test_bounded_concurrency_keeps_loop_free(self, monkeypatch):
+        """Test at most API_DB_THREADS calls run at once while the loop keeps ticking."""
+        monkeypatch.setattr(Settings, 'API_DB_THREADS', 2)
+        DBExecutor.shutdown()
+        running, peak, lock = [0], [0], threading.Lock()
+
+        def blocking_call():
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+
+        async def scenario():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.005)
+
+            task = asyncio.create_task(ticker())
+            await asyncio.gather(*(DBExecutor.run(blocking_call) for _ in range(6)))
+            task.cancel()
+            return ticks
+
+        try:
+            ticks = asyncio.run(scenario())
+        finally:
+            DBExecutor.shutdown()
+        assert peak[0] == 2
+        assert ticks > 10
+
+    def test_exceptions_propagate(self):
+        """Test an exception raised in the thread is re-raised to the awaiting caller."""
+        def fail():
+            raise ValueError('boom')
+
+        async def scenario():
+            try:
+                await DBExecutor.run(fail)
+            except ValueError as e:
+                return str(e)
+
+        assert asyncio.run(scenario()) == 'boom'
+
+    def test_async_session_commits(self, sqlite_db):
+        """Test 'async with session()' commits on the executor and releases the connection."""
+        async def scenario():
+            async with DatabaseConnection.session():
+                await DBExecutor.run(User.create, 777, 'u', 'U')
+
+        asyncio.run(scenario())
+        assert User.get_by_telegram_id(777) is not None
+        assert DatabaseConnection.pool_stats()['in_use'] == 0
+
+
+class TestAsyncRoutes:
+    """Test async routes with the real init_data dependency."""
+
+    def test_signed_request_uses_one_connection(self, sqlite_db, monkeypatch):
+        """Test auth and route queries share the request's unit of work."""
+        monkeypatch.setattr(Settings, 'TELEGRAM_BOT_TOKEN', '123:test')
+        stats = DatabaseConnection.pool_stats()
+        before = stats['created'] + stats['reused']
+
+        response = TestClient(app).get(
+            '/api/balance', headers={'X-Telegram-Init-Data': _signed_init_data('123:test', 4242)}
+        )
+
+        stats = DatabaseConnection.pool_stats()
+        assert response.status_code == 200
+        assert stats['created'] + stats['reused'] - before == 1
+        assert User.get_by_telegram_id(4242) is not None
+
+    def test_bad_signature_rejected(self, monkeypatch):
+        """Test a tampered init_data is refused before touching the database."""
+        monkeypatch.setattr(Settings, 'TELEGRAM_BOT_TOKEN', '123:test')
+        init_data = _signed_init_data('other:token', 4242)
+
+        response = TestClient(app).get('/api/balance', headers={'X-Telegram-Init-Data': init_data})
+
+        assert response.status_code == 401
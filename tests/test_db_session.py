@@ -0,0 +1,146 @@
+"""Tests for unit-of-work sessions."""
+
+import asyncio
+from unittest import mock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.auth import get_current_user
+from api.main import app
+from config.database import DatabaseConnection
+from handlers.budget_handler import budget_status_command
+from models.user import User
+from services.user_service import UserService
+
+
+def _checkouts() -> int:
+    stats = DatabaseConnection.pool_stats()
+    return stats['created'] + stats['reused']
+
+
+def _committed_users() -> int:
+    """Count users through a separate connection (sees committed rows only)."""
+    conn = DatabaseConnection.backend().connect()
+    try:
+        return conn.execute("SELECT COUNT(*) AS n FROM users").fetchone()['n']
+    finally:
+        conn.close()
+
+
+class TestUnitOfWork:
+    """Test DatabaseConnection.session()."""
+
+    def test_one_connection_per_session(self, sqlite_db):
+        """Test nested model calls reuse the session's connection."""
+        before = _checkouts()
+        with DatabaseConnection.session():
+            user = UserService.get_or_register(telegram_id=111, username='a', first_name='A')
+            assert User.get_by_id(user.id).telegram_id == 111
+            assert User.get_by_telegram_id(111) is not None
+
+        assert _checkouts() - before == 1
+        assert DatabaseConnection.pool_stats()['in_use'] == 0
+
+    def test_commit_once_at_end(self, sqlite_db):
+        """Test writes become visible to other connections only when the block exits."""
+        with DatabaseConnection.session():
+            User.create(111, 'a', 'A')
+            User.create(222, 'b', 'B')
+            assert User.get_by_telegram_id(222) is not None
+            assert _committed_users() == 0
+
+        assert _committed_users() == 2
+
+    def test_rollback_on_error(self, sqlite_db):
+        """Test an exception discards every write of the block."""
+        with pytest.raises(RuntimeError):
+            with DatabaseConnection.session():
+                User.create(111, 'a', 'A')
+                raise RuntimeError('boom')
+
+        assert _committed_users() == 0
+
+    def test_failed_statement_rolls_back(self, sqlite_db):
+        """Test a failed statement swallowed by a model still voids the unit of work."""
+        with DatabaseConnection.session():
+            User.create(111, 'a', 'A')
+            assert User.create(111, 'dup', 'Dup') is None
+
+        assert _committed_users() == 0
+
+    def test_non_atomic_commits_each_write(self, sqlite_db):
+        """Test atomic=False keeps one connection but commits immediately."""
+        before = _checkouts()
+        with DatabaseConnection.session(atomic=False):
+            User.create(111, 'a', 'A')
+            assert _committed_users() == 1
+            with pytest.raises(RuntimeError):
+                with DatabaseConnection.session():
+                    User.create(222, 'b', 'B')
+                    raise RuntimeError('boom')
+            User.create(333, 'c', 'C')
+
+        assert _committed_users() == 2
+        assert _checkouts() - before == 1
+
+    def test_non_atomic_read_ends_transaction(self, sqlite_db):
+        """Test a read in a non-atomic session does not leave its transaction open."""
+        with DatabaseConnection.session(atomic=False):
+            with DatabaseConnection.get_cursor(commit=False) as cursor:
+                # MySQL with autocommit off opens this implicitly on the first read
+                cursor.execute("BEGIN")
+                cursor.execute("SELECT COUNT(*) AS n FROM users")
+                conn = cursor.connection
+                assert conn.in_transaction
+            assert not conn.in_transaction
+            User.get_by_telegram_id(111)
+            assert not conn.in_transaction
+
+    def test_async_session(self, sqlite_db):
+        """Test the session works with async with and is scoped to the task."""
+        async def create(telegram_id):
+            # atomic=False: no write transaction is held across the await
+            async with DatabaseConnection.session(atomic=False):
+                User.create(telegram_id, 'u', 'U')
+                await asyncio.sleep(0)
+                return User.get_by_telegram_id(telegram_id) is not None
+
+        async def main():
+            return await asyncio.gather(create(111), create(222))
+
+        assert asyncio.run(main()) == [True, True]
+        assert _committed_users() == 2
+
+
+class TestSessionWiring:
+    """Test handlers and API requests run as one unit of work."""
+
+    def test_authenticated_handler(self, sqlite_db):
+        """Test /budgetstatus (user registration included) checks out one connection."""
+        update = mock.MagicMock()
+        update.effective_user.id = 555
+        update.effective_user.username = 'bot'
+        update.effective_user.first_name = 'Bot'
+        update.effective_user.last_name = None
+        update.effective_user.language_code = 'id'
+        update.message.reply_text = mock.AsyncMock()
+
+        before = _checkouts()
+        asyncio.run(budget_status_command.__wrapped__(update, mock.MagicMock()))
+
+        assert _checkouts() - before == 1
+        assert User.get_by_telegram_id(555) is not None
+
+    def test_api_request(self, sqlite_db):
+        """Test an API request checks out one connection for auth and queries."""
+        user = UserService.get_or_register(telegram_id=555, username='api', first_name='Api')
+        app.dependency_overrides[get_current_user] = lambda: User.get_by_id(user.id)
+        try:
+            before = _checkouts()
+            response = TestClient(app).get('/api/categories')
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+        assert _checkouts() - before == 1
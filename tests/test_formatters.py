@@ -60,3 +60,10 @@ class TestFormatter:
         """Test monthly period formatting."""
         result = Formatter.format_period("monthly")
         assert result == "Bulanan"
+    
+    def test_format_change(self):
+        """Test period-over-period change formatting."""
+        assert Formatter.format_change(12.345) == "▲ +12.3%"
+        assert Formatter.format_change(-40) == "▼ -40.0%"
+        assert Formatter.format_change(0) == "tetap"
+        assert Formatter.format_change(None) == "baru"
@@ -0,0 +1,75 @@
+"""Tests for the readiness probe."""
+
+from unittest import mock
+
+import pytest
+from fastapi.testclient import TestClient
+from api.main import app
+from config.database import DatabaseConnection
+from config.settings import Settings
+from models.job_heartbeat import JobHeartbeat
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+def _heartbeats(scheduler_age):
+    return {
+        'scheduler': JobHeartbeat({'job_id': 'scheduler', 'success_age_seconds': scheduler_age}),
+        'budget_alerts': JobHeartbeat({'job_id': 'budget_alerts', 'success_age_seconds': 60}),
+    }
+
+
+class TestReadiness:
+    """Test /api/health/ready."""
+
+    def test_ready(self, client):
+        """Test healthy DB and pool return 200 with job status."""
+        with mock.patch.object(DatabaseConnection, 'execute_query', return_value={'1': 1}), \
+                mock.patch.object(JobHeartbeat, 'get_all', return_value=_heartbeats(30)):
+            response = client.get('/api/health/ready')
+
+        body = response.json()
+        assert response.status_code == 200
+        assert body['scheduler']['alive'] is True
+        assert body['jobs']['budget_alerts']['success_age_seconds'] == 60
+        assert body['jobs']['recurring_transactions']['last_success_at'] is None
+
+    def test_stale_scheduler_stays_ready(self, client):
+        """Test a stopped bot is reported but does not fail readiness."""
+        with mock.patch.object(DatabaseConnection, 'execute_query', return_value={'1': 1}), \
+                mock.patch.object(JobHeartbeat, 'get_all', return_value=_heartbeats(3600)):
+            response = client.get('/api/health/ready')
+
+        assert response.status_code == 200
+        assert response.json()['scheduler']['alive'] is False
+
+    def test_db_unreachable(self, client):
+        """Test DB errors return 503."""
+        with mock.patch.object(DatabaseConnection, 'execute_query', side_effect=OSError):
+            response = client.get('/api/health/ready')
+
+        assert response.status_code == 503
+        assert response.json()['database']['error'] == 'OSError'
+
+    def test_db_slow(self, client, monkeypatch):
+        """Test DB latency above the threshold returns 503."""
+        monkeypatch.setattr(Settings, 'HEALTH_DB_LATENCY_MS', -1)
+        with mock.patch.object(DatabaseConnection, 'execute_query', return_value={'1': 1}), \
+                mock.patch.object(JobHeartbeat, 'get_all', return_value={}):
+            response = client.get('/api/health/ready')
+
+        assert response.status_code == 503
+        assert response.json()['database']['ok'] is False
+
+    def test_pool_saturated(self, client, monkeypatch):
+        """Test too many checked-out connections return 503."""
+        monkeypatch.setattr(DatabaseConnection, '_in_use', Settings.HEALTH_POOL_MAX_IN_USE)
+        with mock.patch.object(DatabaseConnection, 'execute_query', return_value={'1': 1}), \
+                mock.patch.object(JobHeartbeat, 'get_all', return_value={}):
+            response = client.get('/api/health/ready')
+
+        assert response.status_code == 503
+        assert response.json()['pool']['ok'] is False
@@ -0,0 +1,130 @@
+"""Tests for live change events (api.live)."""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.auth import get_current_user
+from api.live import ChangeHub, QUEUE_SIZE, event_stream, format_event
+from api.main import app
+from config.settings import Settings
+from models.category import Category
+from models.sync import SyncLog
+from models.user import User
+from services.transaction_service import TransactionService
+from services.user_service import UserService
+
+
+@pytest.fixture(autouse=True)
+def hub():
+    """Start and end every test with an empty hub."""
+    asyncio.run(ChangeHub.close())
+    yield ChangeHub
+    asyncio.run(ChangeHub.close())
+
+
+def _user(telegram_id=555):
+    user = UserService.get_or_register(telegram_id=telegram_id, username='live', first_name='Live')
+    category = Category.get_by_user(user.id, 'expense')[0]
+    return user, category
+
+
+def _add(user, category, amount=10000):
+    return TransactionService.create_transaction(user.id, category.id, amount, 'kopi', 'expense')
+
+
+class TestCollect:
+    """Test the poll that turns version changes into events."""
+
+    def test_delta_and_balance_inline(self, sqlite_db):
+        """Test a user with a known version gets the delta and new balance."""
+        user, category = _user()
+        first = _add(user, category)
+        since = SyncLog.current_version(user.id)
+        second = _add(user, category, 2500)
+        first.delete()
+
+        [(user_id, event)] = ChangeHub.collect({user.id: since})
+
+        assert user_id == user.id
+        assert event['complete'] and event['since'] == since
+        assert event['version'] == SyncLog.current_version(user.id)
+        assert [t['id'] for t in event['transactions']] == [second.id]
+        assert event['deleted'] == [first.id]
+        assert event['balance']['expense'] == 2500
+
+    def test_unchanged_and_unknown_versions(self, sqlite_db):
+        """Test unchanged users are skipped and a 0 version asks the client to sync."""
+        user, category = _user()
+        idle, _ = _user(556)
+        _add(user, category)
+
+        assert ChangeHub.collect({user.id: SyncLog.current_version(user.id), idle.id: 0}) == []
+        [(_, event)] = ChangeHub.collect({user.id: 0})
+        assert not event['complete'] and event['transactions'] == []
+
+
+class TestHub:
+    """Test subscription bookkeeping and fan-out."""
+
+    def test_stream_receives_changes(self, sqlite_db, monkeypatch):
+        """Test a stream says hello, gets a change from the poll and ends on close."""
+        monkeypatch.setattr(Settings, 'LIVE_POLL_INTERVAL_SECONDS', 60)
+        user, category = _user()
+        _add(user, category)
+
+        async def scenario():
+            stream = event_stream(user.id)
+            hello = await stream.__anext__()
+            assert ChangeHub.stream_count() == 1
+            await asyncio.to_thread(_add, user, category, 3000)
+            assert await ChangeHub.poll_once() == 1
+            change = await stream.__anext__()
+            await ChangeHub.close()
+            with pytest.raises(StopAsyncIteration):
+                await stream.__anext__()
+            return hello, change
+
+        hello, change = asyncio.run(scenario())
+        assert hello.startswith(b'retry: ') and b'event: hello\ndata: {"version":1}' in hello
+        assert change.startswith(b'event: change\ndata: {"version":2,"since":1,')
+
+    def test_slow_stream_gets_one_resync(self):
+        """Test a full queue is replaced by a single incomplete event."""
+
+        async def scenario():
+            ChangeHub._versions[1] = 0
+            queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+            ChangeHub._subscribers[1] = {queue}
+            for version in range(1, QUEUE_SIZE + 2):
+                ChangeHub.publish(1, {'version': version, 'transactions': [{}], 'deleted': [], 'complete': True})
+            return [queue.get_nowait() for _ in range(queue.qsize())]
+
+        events = asyncio.run(scenario())
+        assert len(events) == 1
+        assert events[0]['version'] == QUEUE_SIZE + 1 and not events[0]['complete']
+
+    def test_format_event(self):
+        """Test events are single-line SSE data frames."""
+        assert format_event('change', {'a': 'x\ny'}) == b'event: change\ndata: {"a":"x\\ny"}\n\n'
+
+
+class TestLiveRoute:
+    """Test GET /api/live."""
+
+    def test_stream_ends_at_max_age(self, sqlite_db, monkeypatch):
+        """Test the route streams SSE and unsubscribes when the stream expires."""
+        user, _ = _user()
+        monkeypatch.setattr(Settings, 'LIVE_STREAM_MAX_SECONDS', 0.2)
+        monkeypatch.setattr(Settings, 'LIVE_HEARTBEAT_SECONDS', 0.05)
+        app.dependency_overrides[get_current_user] = lambda: User.get_by_id(user.id)
+        try:
+            with TestClient(app).stream('GET', '/api/live') as response:
+                body = response.read()
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.headers['content-type'].startswith('text/event-stream')
+        assert b'event: hello' in body and b': ping' in body
+        assert ChangeHub.stream_count() == 0
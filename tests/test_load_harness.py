@@ -0,0 +1,29 @@
+"""Tests for the simulated-load harness."""
+
+import asyncio
+
+from benchmarks.load import run_load
+from config.database import DatabaseConnection
+
+
+class TestLoadHarness:
+    """Test driving the Application with synthetic updates."""
+
+    def test_scripted_sessions(self, sqlite_db):
+        """Test every scripted step is handled and reaches the database."""
+        report = asyncio.run(run_load(users=3, rounds=2, latency_ms=0, concurrent_updates=4))
+
+        assert report['throughput']['updates'] == 3 * 2 * 5
+        assert set(report['commands']) == {
+            '/expense', 'cb:expense_cat_*', '/report', 'cb:report_*d', '/balance'
+        }
+        assert report['commands']['/expense']['latency']['count'] == 6
+        assert report['telegram_calls']['sendMessage'] >= 12
+        assert report['telegram_calls']['answerCallbackQuery'] == 12
+
+        row = DatabaseConnection.execute_query(
+            "SELECT COUNT(*) AS n, COUNT(DISTINCT user_id) AS users FROM transactions",
+            fetch_one=True, commit=False,
+        )
+        assert row['n'] == 6
+        assert row['users'] == 3
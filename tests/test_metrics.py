@@ -0,0 +1,113 @@
+"""Tests for the metrics registry and exposition format."""
+
+import urllib.request
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.routers.metrics import router as metrics_router
+from config.settings import Settings
+from utils.metrics import Counter, Histogram, Metrics, start_metrics_server
+
+
+class TestExposition:
+    """Test Prometheus text exposition."""
+
+    def test_counter_render(self):
+        """Test counter samples with labels."""
+        counter = Counter('test_sends_total', 'Sends.', ('method',))
+        counter.inc(method='sendMessage')
+        counter.inc(2, method='sendMessage')
+        text = counter.render()
+        assert '# TYPE test_sends_total counter' in text
+        assert 'test_sends_total{method="sendMessage"} 3' in text
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test histogram buckets, sum and count."""
+        hist = Histogram('test_latency_seconds', 'Latency.', ('route',), buckets=(0.1, 1.0))
+        hist.observe(0.05, route='/a')
+        hist.observe(0.5, route='/a')
+        hist.observe(5, route='/a')
+        text = hist.render()
+        assert 'test_latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+        assert 'test_latency_seconds_bucket{route="/a",le="1"} 2' in text
+        assert 'test_latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+        assert 'test_latency_seconds_count{route="/a"} 3' in text
+        assert 'test_latency_seconds_sum{route="/a"} 5.55' in text
+
+    def test_label_mismatch(self):
+        """Test wrong label names are rejected."""
+        counter = Counter('test_total', 'Test.', ('job',))
+        with pytest.raises(ValueError):
+            counter.inc(other='x')
+
+
+class TestJobTracking:
+    """Test scheduler job instrumentation."""
+
+    def test_success_and_failure(self):
+        """Test outcomes are counted separately."""
+        before_ok = Metrics.job_runs.value(job='test_job', outcome='success')
+        before_fail = Metrics.job_runs.value(job='test_job', outcome='failure')
+
+        with Metrics.track_job('test_job'):
+            pass
+        with pytest.raises(RuntimeError):
+            with Metrics.track_job('test_job'):
+                raise RuntimeError("boom")
+
+        assert Metrics.job_runs.value(job='test_job', outcome='success') == before_ok + 1
+        assert Metrics.job_runs.value(job='test_job', outcome='failure') == before_fail + 1
+        assert Metrics.job_last_success.value(job='test_job') > 0
+
+
+class TestListener:
+    """Test the standalone bot metrics listener."""
+
+    def test_serves_metrics(self):
+        """Test /metrics is served and other paths 404."""
+        server = start_metrics_server('127.0.0.1', 0)
+        try:
+            port = server.server_address[1]
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/metrics') as resp:
+                body = resp.read().decode()
+                assert resp.headers['Content-Type'].startswith('text/plain')
+            assert 'montrixa_db_pool_connections{state="idle"}' in body
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(f'http://127.0.0.1:{port}/other')
+        finally:
+            server.shutdown()
+
+
+def _api_client(host: str) -> TestClient:
+    """TestClient for the metrics router whose requests come from host."""
+    app = FastAPI()
+    app.include_router(metrics_router)
+
+    async def from_host(scope, receive, send):
+        await app({**scope, 'client': (host, 5000)}, receive, send)
+
+    return TestClient(from_host)
+
+
+class TestApiEndpoint:
+    """Test access to the API's /metrics."""
+
+    def test_loopback_only_without_token(self):
+        """Test only direct loopback clients are answered when no token is set."""
+        assert _api_client('127.0.0.1').get('/metrics').status_code == 200
+        assert _api_client('203.0.113.7').get('/metrics').status_code == 403
+        proxied = _api_client('127.0.0.1').get('/metrics', headers={'X-Forwarded-For': '203.0.113.7'})
+        assert proxied.status_code == 403
+
+    def test_token(self):
+        """Test METRICS_TOKEN requires a matching bearer header from any client."""
+        client = _api_client('203.0.113.7')
+
+        with patch.object(Settings, 'METRICS_TOKEN', 's3cret'):
+            assert client.get('/metrics').status_code == 403
+            assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 403
+            ok = client.get('/metrics', headers={'Authorization': 'Bearer s3cret'})
+        assert ok.status_code == 200 and 'montrixa_' in ok.text
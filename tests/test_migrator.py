@@ -0,0 +1,151 @@
+"""Tests for the versioned migration runner."""
+
+import pytest
+
+from config.backends import Dialect, SQLiteDialect
+from config.database import DatabaseConnection
+from config.migrator import VERSIONS_DIR, MigrationError, Migrator, split_statements
+
+
+@pytest.fixture
+def versions(tmp_path):
+    """An empty migrations folder; write files with versions.write(name, text)."""
+    class Folder:
+        path = str(tmp_path)
+
+        def write(self, name, text):
+            (tmp_path / name).write_text(text, encoding='utf-8')
+
+    return Folder()
+
+
+def _columns(table):
+    rows = DatabaseConnection.execute_query(f"PRAGMA table_info({table})", commit=False)
+    return [row['name'] for row in rows]
+
+
+class TestSplitStatements:
+    """Test SQL script splitting."""
+
+    def test_comments_and_triggers(self):
+        """Test comment lines are dropped and trigger bodies stay whole."""
+        script = """
+            -- a comment
+            CREATE TABLE a (id INT);
+            CREATE TRIGGER t AFTER UPDATE ON a
+            BEGIN
+                UPDATE a SET id = 1;
+            END;
+            SELECT 1
+        """
+        statements = split_statements(script)
+        assert len(statements) == 3
+        assert statements[1].strip().endswith('END')
+        assert statements[2] == 'SELECT 1'
+
+
+class TestOnlineDDL:
+    """Test online DDL options per dialect."""
+
+    def test_mysql(self):
+        """Test ALTER TABLE and CREATE INDEX get INPLACE/NONE, others are untouched."""
+        dialect = Dialect()
+        assert dialect.online_ddl('ALTER TABLE t ADD INDEX i (a);') == \
+            'ALTER TABLE t ADD INDEX i (a), ALGORITHM=INPLACE, LOCK=NONE'
+        assert dialect.online_ddl('CREATE INDEX i ON t (a)') == 'CREATE INDEX i ON t (a) ALGORITHM=INPLACE LOCK=NONE'
+        assert dialect.online_ddl('ALTER TABLE t ADD COLUMN c INT, ALGORITHM=INSTANT') == \
+            'ALTER TABLE t ADD COLUMN c INT, ALGORITHM=INSTANT'
+        assert 'ALGORITHM' not in dialect.online_ddl('ALTER TABLE t REORGANIZE PARTITION pmax INTO (x)')
+        assert dialect.online_ddl('CREATE TABLE t (id INT)') == 'CREATE TABLE t (id INT)'
+
+    def test_sqlite(self):
+        """Test SQLite statements are never rewritten."""
+        assert SQLiteDialect().online_ddl('ALTER TABLE t ADD COLUMN c INT') == 'ALTER TABLE t ADD COLUMN c INT'
+
+
+class TestMigrator:
+    """Test discovery, recording and dry runs."""
+
+    def test_discovery_order_and_backend_filter(self, sqlite_db, versions):
+        """Test files are ordered by version and other backends' files skipped."""
+        versions.write('0002_second.sql', 'SELECT 1;')
+        versions.write('0001_first.sqlite.sql', 'SELECT 1;')
+        versions.write('0001_first.mysql.sql', 'SELECT 1;')
+        versions.write('README.md', '')
+
+        assert [(m.version, m.kind) for m in Migrator(versions.path).discover()] == [('0001', 'sql'), ('0002', 'sql')]
+
+        versions.write('0002_clash.py', '')
+        with pytest.raises(MigrationError):
+            Migrator(versions.path).discover()
+
+    def test_applies_once_in_order(self, sqlite_db, versions):
+        """Test pending migrations run in order and are recorded."""
+        versions.write('0001_notes.sql', 'CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT);')
+        versions.write('0002_notes_flag.py',
+                       'def upgrade(migrator):\n'
+                       '    migrator.execute("ALTER TABLE notes ADD COLUMN flagged INTEGER DEFAULT 0")\n')
+        migrator = Migrator(versions.path)
+
+        assert [m.version for m in migrator.migrate()] == ['0001', '0002']
+        assert _columns('notes') == ['id', 'body', 'flagged']
+        assert migrator.migrate() == []
+        assert [(s['version'], s['changed']) for s in migrator.status()] == [('0001', False), ('0002', False)]
+
+        versions.write('0001_notes.sql', 'CREATE TABLE notes (id INTEGER PRIMARY KEY);')
+        assert migrator.status()[0]['changed']
+
+    def test_target_and_failure(self, sqlite_db, versions):
+        """Test --target stops early and a failing migration is not recorded."""
+        versions.write('0001_a.sql', 'CREATE TABLE a (id INTEGER);')
+        versions.write('0002_b.sql', 'CREATE TABLE b (id INTEGER);')
+        versions.write('0003_broken.sql', 'CREATE TABLE a (id INTEGER);')
+        migrator = Migrator(versions.path)
+
+        assert [m.version for m in migrator.migrate('0001')] == ['0001']
+        with pytest.raises(MigrationError, match='0003_broken'):
+            migrator.migrate()
+        assert sorted(migrator.applied()) == ['0001', '0002']
+
+    def test_dry_run_changes_nothing(self, sqlite_db, versions):
+        """Test a dry run lists statements without creating tables or records."""
+        versions.write('0001_notes.sql', 'CREATE TABLE notes (id INTEGER PRIMARY KEY);')
+        migrator = Migrator(versions.path, dry_run=True)
+
+        assert [m.version for m in migrator.migrate()] == ['0001']
+        assert migrator.statements == ['CREATE TABLE notes (id INTEGER PRIMARY KEY)']
+        assert migrator.applied() == {}
+        assert _columns('notes') == []
+
+    def test_baseline_on_existing_schema(self, sqlite_db):
+        """Test the shipped baseline is a no-op on a database built by init_db."""
+        migrator = Migrator(VERSIONS_DIR)
+
+        assert [m.version for m in migrator.pending()][:1] == ['0001']
+        migrator.migrate()
+        assert migrator.pending() == []
+
+
+class TestBackfill:
+    """Test chunked backfills."""
+
+    def test_chunks_and_resume(self, sqlite_db, versions):
+        """Test every row is updated in key-range chunks and re-runs skip done rows."""
+        DatabaseConnection.execute_query("CREATE TABLE items (id INTEGER PRIMARY KEY, cents INTEGER)")
+        DatabaseConnection.execute_many("INSERT INTO items (id) VALUES (%s)", [(i,) for i in range(1, 26)])
+        migrator = Migrator(versions.path)
+
+        assert migrator.backfill('items', 'cents = id * %s', 'cents IS NULL', (100,),
+                                 batch_size=10, pause_ms=0) == 25
+        rows = DatabaseConnection.execute_query("SELECT id, cents FROM items", commit=False)
+        assert all(row['cents'] == row['id'] * 100 for row in rows)
+        assert migrator.backfill('items', 'cents = 0', 'cents IS NULL', batch_size=10, pause_ms=0) == 0
+
+    def test_dry_run(self, sqlite_db, versions):
+        """Test a dry-run backfill only plans."""
+        DatabaseConnection.execute_query("CREATE TABLE items (id INTEGER PRIMARY KEY, cents INTEGER)")
+        DatabaseConnection.execute_query("INSERT INTO items (id) VALUES (1)")
+        migrator = Migrator(versions.path, dry_run=True)
+
+        assert migrator.backfill('items', 'cents = 1', batch_size=10) == 0
+        assert DatabaseConnection.execute_query("SELECT cents FROM items", fetch_one=True)['cents'] is None
@@ -0,0 +1,103 @@
+"""Tests for slot-based models built from tuple rows."""
+
+from contextlib import closing
+from datetime import date, timedelta
+
+import pytest
+
+from benchmarks.datagen import DatasetSpec, get_benchmark_user_ids, seed_database
+from config.database import DatabaseConnection
+from models.budget import Budget
+from models.category import Category
+from models.job_heartbeat import JobHeartbeat
+from models.recurring import RecurringTransaction
+from models.transaction import Transaction
+from models.user import User
+from services.report_service import ReportService
+
+
+@pytest.fixture
+def user_id(sqlite_db):
+    """One synthetic user with a year of transactions, budgets and recurring rules."""
+    seed_database(DatasetSpec(users=1, years=1, budgets_per_user=2, recurring_per_user=2))
+    return get_benchmark_user_ids()[0]
+
+
+def _dict_row(query, params):
+    return DatabaseConnection.execute_query(query, params, fetch_one=True, commit=False)
+
+
+class TestSlotModels:
+    """Test models have no per-instance __dict__ and match dict-built ones."""
+
+    @pytest.mark.parametrize('model', [User, Category, Transaction, Budget, RecurringTransaction, JobHeartbeat])
+    def test_no_instance_dict(self, model):
+        """Test instances carry only their slots."""
+        instance = model({})
+        assert not hasattr(instance, '__dict__')
+        with pytest.raises(AttributeError):
+            instance.unknown_field = 1
+
+    def test_from_row_matches_dict_rows(self, user_id):
+        """Test tuple-built models equal the DictCursor-built ones field by field."""
+        transaction = Transaction.get_by_user(user_id, limit=1)[0]
+        budget = Budget.get_by_user(user_id)[0]
+        recurring = RecurringTransaction.get_by_user(user_id)[0]
+        category = Category.get_by_id(transaction.category_id)
+        user = User.get_by_id(user_id)
+
+        expected = {
+            transaction: Transaction(_dict_row(
+                "SELECT t.*, c.name AS category_name, c.icon AS category_icon FROM transactions t "
+                "LEFT JOIN categories c ON t.category_id = c.id WHERE t.id = %s", (transaction.id,))),
+            budget: Budget(_dict_row(
+                "SELECT b.*, c.name AS category_name, c.icon AS category_icon FROM budgets b "
+                "LEFT JOIN categories c ON b.category_id = c.id WHERE b.id = %s", (budget.id,))),
+            recurring: RecurringTransaction(_dict_row(
+                "SELECT r.*, c.name AS category_name, c.icon AS category_icon FROM recurring_transactions r "
+                "LEFT JOIN categories c ON r.category_id = c.id WHERE r.id = %s", (recurring.id,))),
+            category: Category(_dict_row("SELECT * FROM categories WHERE id = %s", (category.id,))),
+            user: User(_dict_row("SELECT * FROM users WHERE id = %s", (user_id,))),
+        }
+        for built, reference in expected.items():
+            assert built.to_dict() == reference.to_dict()
+        assert isinstance(transaction.transaction_date, date)
+        assert isinstance(transaction.amount, float)
+
+    def test_budget_telegram_id(self, user_id):
+        """Test the optional users-join column is read when present."""
+        budgets = Budget.get_all_active()
+        assert budgets and all(b.telegram_id == User.get_by_id(user_id).telegram_id for b in budgets)
+        assert Budget.get_by_user(user_id)[0].telegram_id is None
+
+
+class TestIterByUser:
+    """Test the lazy transaction iterator."""
+
+    def test_yields_everything_in_order(self, user_id):
+        """Test the iterator matches an unpaged listing and is not capped."""
+        start = date.today() - timedelta(days=365)
+        listed = Transaction.get_by_user(user_id, limit=100000, start_date=start)
+        assert len(listed) > 1000
+
+        iterated = Transaction.iter_by_user(user_id, start_date=start, batch_size=64)
+        assert [t.id for t in iterated] == [t.id for t in listed]
+        assert DatabaseConnection.pool_stats()['in_use'] == 0
+
+        expenses = list(Transaction.iter_by_user(user_id, trans_type='expense'))
+        assert expenses and all(t.type == 'expense' for t in expenses)
+
+    def test_closing_early_releases_connection(self, user_id):
+        """Test abandoning the iterator returns its connection to the pool."""
+        with closing(Transaction.iter_by_user(user_id, batch_size=10)) as transactions:
+            assert next(transactions).user_id == user_id
+            assert DatabaseConnection.pool_stats()['in_use'] == 1
+        assert DatabaseConnection.pool_stats()['in_use'] == 0
+
+    def test_export_streams_all_rows(self, user_id):
+        """Test the CSV export is no longer capped at 1000 transactions."""
+        end = date.today()
+        start = end - timedelta(days=365)
+        csv = ReportService.export_to_csv(user_id, start, end)
+
+        assert len(csv.splitlines()) - 1 == Transaction.get_count(user_id, start, end)
@@ -0,0 +1,93 @@
+"""Tests for integer minor-unit money handling."""
+
+from decimal import Decimal
+
+import pytest
+
+from config.backends import Dialect
+from models.budget import Budget
+from models.category import Category
+from models.transaction import Transaction
+from models.user import User
+from services.budget_service import BudgetService
+from services.report_service import ReportService
+from utils.formatters import Formatter
+from utils.money import percentage, to_decimal, to_major, to_minor
+
+
+@pytest.fixture
+def user_id(sqlite_db):
+    """A user with one expense category."""
+    user = User.create(111, 'money', 'Money')
+    Category.create(user.id, 'Makan', 'expense')
+    return user.id
+
+
+class TestConversions:
+    """Test conversions at the edges."""
+
+    @pytest.mark.parametrize('value, expected', [
+        (Decimal('1500.25'), 150025),
+        ('0.10', 10),
+        (0.1 + 0.2, 30),
+        (12, 1200),
+        (Decimal('1.005'), 101),
+        (None, 0),
+        (-Decimal('2.50'), -250),
+    ])
+    def test_to_minor(self, value, expected):
+        """Test Decimal, str, float, int and None become exact minor units."""
+        assert to_minor(value) == expected
+
+    def test_round_trip(self):
+        """Test to_decimal/to_major invert to_minor."""
+        assert to_decimal(150025) == Decimal('1500.25')
+        assert to_major(150025) == 1500.25
+        assert percentage(250, 1000) == 25.0
+        assert percentage(1, 0) == 0.0
+
+    def test_format_money(self):
+        """Test minor units format without going through float."""
+        assert Formatter.format_money(150000000) == "Rp 1.500.000"
+        assert Formatter.format_money(-250) == "Rp -2"
+        assert Formatter.format_money(5000050) == "Rp 50.000"
+        assert Formatter.format_money(5000150) == "Rp 50.002"
+        assert Formatter.format_money(123456, 'USD') == "USD 1,234.56"
+        assert Formatter.format_currency(Decimal('1500.00')) == "Rp 1.500"
+
+    def test_mysql_dialect(self):
+        """Test MySQL scales once after an exact DECIMAL sum."""
+        assert Dialect().sum_minor_units('amount') == 'CAST(COALESCE(SUM(amount), 0) * 100 AS SIGNED)'
+
+
+class TestExactAggregates:
+    """Test sums stay exact through the database and the models."""
+
+    def test_sums_do_not_drift(self, user_id):
+        """Test ten 0.10 expenses sum to exactly 1.00 everywhere."""
+        category_id = Category.get_by_user(user_id)[0].id
+        for _ in range(10):
+            Transaction.create(user_id, category_id, 0.1, 'permen', 'expense')
+        budget = Budget.create(user_id, category_id, 4, 'daily')
+
+        assert Transaction.get_balance_minor(user_id)['expense'] == 100
+        assert Transaction.get_balance(user_id)['balance'] == -1.0
+        assert budget.get_spent_minor() == 100
+        assert budget.get_percentage_used() == 25.0
+        assert BudgetService.get_budget_status(user_id)[0]['remaining_amount'] == 3.0
+
+        today = Transaction.get_today(user_id)[0].transaction_date
+        expense = ReportService.get_expense_by_category(user_id, today, today)[0]
+        assert expense['total_amount'] == 1.0
+        assert ReportService.get_summary(user_id, today, today)['total_expense'] == 1.0
+
+    def test_model_amounts(self, user_id):
+        """Test models keep minor units and write amounts back exactly."""
+        category_id = Category.get_by_user(user_id)[0].id
+        transaction = Transaction.create(user_id, category_id, 19999.99, 'sepatu', 'expense')
+
+        assert transaction.amount_minor == 1999999
+        assert transaction.to_dict()['amount'] == 19999.99
+        assert transaction.update(amount='25000.5')
+        assert transaction.amount_minor == 2500050
+        assert Transaction.get_by_id(transaction.id).amount_minor == 2500050
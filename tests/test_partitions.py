@@ -0,0 +1,128 @@
+"""Tests for monthly transactions partitioning."""
+
+import asyncio
+from datetime import date
+from unittest.mock import patch
+
+from config.database import DatabaseConnection
+from config.partitions import (
+    TransactionPartitions, add_months, partition_month, plan_archive, plan_future,
+)
+from config.query_stats import QueryStats
+from jobs.partition_job import maintain_transaction_partitions
+from models.category import Category
+from models.user import User
+
+
+class TestPlanning:
+    """Test the pure partition planners."""
+
+    def test_month_helpers(self):
+        """Test month arithmetic across year ends and name parsing."""
+        assert add_months(date(2024, 11, 30), 2) == date(2025, 1, 1)
+        assert add_months(date(2024, 1, 15), -1) == date(2023, 12, 1)
+        assert partition_month('p202402') == date(2024, 2, 1)
+        assert partition_month('pmax') is None
+
+    def test_plan_future(self):
+        """Test only missing months up to today + months_ahead are planned."""
+        existing = ['p202401', 'p202402', 'pmax']
+        assert plan_future(existing, date(2024, 2, 10), 2) == [date(2024, 3, 1), date(2024, 4, 1)]
+        assert plan_future(existing, date(2024, 1, 10), 1) == []
+        assert plan_future([], date(2024, 2, 10), 0) == [date(2024, 2, 1)]
+
+    def test_plan_archive(self):
+        """Test partitions wholly before the cutoff month are archived, never pmax."""
+        existing = ['p202312', 'p202401', 'p202402', 'pmax']
+        assert plan_archive(existing, date(2024, 2, 20)) == ['p202312', 'p202401']
+        assert plan_archive(existing, date(2023, 1, 1)) == []
+
+
+class TestDDL:
+    """Test generated statements."""
+
+    def test_partition_ddl(self):
+        """Test foreign keys are dropped and the PK widened before partitioning."""
+        statements = TransactionPartitions.partition_ddl(
+            date(2023, 12, 5), date(2024, 2, 1), ['transactions_ibfk_1'])
+
+        assert statements[0] == "ALTER TABLE transactions DROP FOREIGN KEY `transactions_ibfk_1`"
+        assert 'ADD PRIMARY KEY (id, transaction_date)' in statements[1]
+        assert 'RANGE COLUMNS(transaction_date)' in statements[2]
+        assert "PARTITION p202312 VALUES LESS THAN ('2024-01-01')" in statements[2]
+        assert "PARTITION p202402 VALUES LESS THAN ('2024-03-01')" in statements[2]
+        assert statements[2].rstrip(')\n').endswith('pmax VALUES LESS THAN (MAXVALUE')
+
+    def test_future_and_archive_ddl(self):
+        """Test pmax is split and old partitions are exchanged out."""
+        assert TransactionPartitions.future_ddl([]) is None
+        assert 'REORGANIZE PARTITION pmax INTO' in TransactionPartitions.future_ddl([date(2024, 3, 1)])
+
+        statements = TransactionPartitions.archive_ddl('p202401')
+        assert statements[0] == 'CREATE TABLE transactions_archive_p202401 LIKE transactions'
+        assert 'EXCHANGE PARTITION p202401 WITH TABLE transactions_archive_p202401' in statements[2]
+        assert TransactionPartitions.archive_ddl('p202401', drop=True) == \
+            ['ALTER TABLE transactions DROP PARTITION p202401']
+
+
+class TestPruningCheck:
+    """Test statement capture and EXPLAIN parsing."""
+
+    def test_capture_statements(self, sqlite_db):
+        """Test statements and their parameters are captured only inside the block."""
+        with QueryStats.capture_statements() as statements:
+            User.create(5, 'cap', 'Cap')
+        captured = len(statements)
+        User.get_by_telegram_id(5)
+
+        assert QueryStats.is_active() is QueryStats.enabled
+        assert any('INSERT INTO users' in q and 5 in a for q, a in statements)
+        assert len(statements) == captured
+
+    def test_report_statements_hit_transactions(self, sqlite_db):
+        """Test the verified reads are the transaction queries with date ranges."""
+        user = User.create(6, 'rep', 'Rep')
+        Category.create(user.id, 'Makan', 'expense')
+        statements = TransactionPartitions.capture_report_statements(user.id, date(2024, 3, 15))
+
+        assert len(statements) >= 4
+        assert all('transaction_date' in q for q, _ in statements)
+
+    def test_verify_pruning(self):
+        """Test plans are reduced to the partitions they read."""
+        plans = {
+            'EXPLAIN pruned': [{'table': 't', 'partitions': 'p202403'}, {'table': 'c', 'partitions': None}],
+            'EXPLAIN full': [{'table': 't', 'partitions': 'p202402,p202403,pmax'}],
+        }
+        with patch.object(TransactionPartitions, 'list_partitions',
+                          return_value=[{'name': n} for n in ('p202402', 'p202403', 'pmax')]), \
+                patch.object(TransactionPartitions, 'capture_report_statements',
+                             return_value=[('pruned', (1,)), ('full', (1,))]), \
+                patch.object(DatabaseConnection, 'execute_query', side_effect=lambda q, *a, **k: plans[q]):
+            results = TransactionPartitions.verify_pruning(1)
+
+        assert [r['partitions'] for r in results] == [['p202403'], ['p202402', 'p202403', 'pmax']]
+        assert [r['pruned'] for r in results] == [True, False]
+
+
+class TestPartitionJob:
+    """Test the maintenance job."""
+
+    def test_noop_without_partitioning(self, sqlite_db):
+        """Test the job does nothing on SQLite."""
+        with patch.object(TransactionPartitions, 'ensure_future') as ensure:
+            asyncio.run(maintain_transaction_partitions())
+        ensure.assert_not_called()
+
+    def test_extends_and_archives(self):
+        """Test the job pre-creates months and archives when configured."""
+        with patch.object(TransactionPartitions, 'supported', return_value=True), \
+                patch.object(TransactionPartitions, 'list_partitions', return_value=[{'name': 'pmax'}]), \
+                patch.object(TransactionPartitions, 'ensure_future', return_value=['p209901']) as ensure, \
+                patch.object(TransactionPartitions, 'archive', return_value=[]) as archive, \
+                patch('jobs.partition_job.tracked_run'), \
+                patch('jobs.partition_job.Settings.PARTITION_ARCHIVE_AFTER_MONTHS', 24):
+            asyncio.run(maintain_transaction_partitions())
+
+        ensure.assert_called_once()
+        assert archive.call_args[0][0] == add_months(date.today(), -24)
@@ -0,0 +1,139 @@
+"""Query budgets for the hot paths (N+1 detection)."""
+
+import asyncio
+from unittest import mock
+
+import pytest
+
+from benchmarks.datagen import DatasetSpec, get_benchmark_user_ids, seed_database
+from config.database import DatabaseConnection
+from handlers.budget_handler import budget_status_command
+from jobs.budget_alert_job import _send_budget_alerts
+from models.budget import Budget
+from models.category import Category
+from models.transaction import Transaction
+from models.user import User
+from services.budget_service import BudgetService
+from services.recurring_service import RecurringService
+from tests.query_budget import QueryBudgetExceeded, query_budget, record_queries
+
+
+@pytest.fixture
+def seeded(sqlite_db):
+    """Three users with transactions, monthly budgets and due recurring rules,
+    plus a tiny daily and weekly budget per user so alerts fire."""
+    seed_database(DatasetSpec(users=3, years=1, budgets_per_user=3, recurring_per_user=2))
+    user_ids = get_benchmark_user_ids()
+    for user_id in user_ids:
+        expense = [c for c in Category.get_by_user(user_id) if c.type == 'expense']
+        Budget.create(user_id, expense[0].id, 1000, 'daily')
+        Budget.create(user_id, expense[1].id, 1000, 'weekly')
+        Transaction.create(user_id, expense[0].id, 5000, 'kopi', 'expense')
+    return user_ids
+
+
+class TestQueryBudget:
+    """Test the detector itself."""
+
+    def test_groups_by_fingerprint(self, sqlite_db):
+        """Test statements differing only in literals are grouped."""
+        with record_queries() as recorder:
+            for user_id in (1, 2, 3):
+                User.get_by_id(user_id)
+
+        assert recorder.total == 3
+        assert len(recorder.statements) == 1
+        assert recorder.count('from users') == 3
+
+    def test_reports_repeats_with_call_site(self, sqlite_db):
+        """Test a repeated statement fails with count and calling line."""
+        with pytest.raises(QueryBudgetExceeded) as excinfo:
+            with query_budget(max_repeats=2, label='loop'):
+                for user_id in (1, 2, 3):
+                    User.get_by_id(user_id)
+
+        message = str(excinfo.value)
+        assert 'Query budget exceeded in loop' in message
+        assert 'repeated 3x (max 2)' in message
+        assert 'FROM users WHERE id = ?' in message
+        assert 'models/user.py' in message
+
+    def test_total_budget(self, sqlite_db):
+        """Test the total count is enforced and listeners are removed afterwards."""
+        with query_budget(max_queries=1):
+            User.get_by_id(1)
+
+        with pytest.raises(QueryBudgetExceeded, match='ran 2 queries, budget is 1'):
+            with query_budget(max_queries=1):
+                User.get_by_id(1)
+                User.get_by_id(2)
+
+    def test_block_errors_propagate(self, sqlite_db):
+        """Test an exception inside the block is not masked by the budget check."""
+        with pytest.raises(ZeroDivisionError):
+            with query_budget(max_queries=0):
+                User.get_by_id(1)
+                1 / 0
+
+
+class TestHotPathBudgets:
+    """Query budgets of the paths that run per user or per job tick."""
+
+    def test_get_budget_status(self, seeded):
+        """Test budget status costs two queries however many budgets exist."""
+        user_id = seeded[0]
+        with query_budget(max_queries=2, max_repeats=1, label='get_budget_status'):
+            status_list = BudgetService.get_budget_status(user_id)
+
+        assert len(status_list) == 5
+        for status in status_list:
+            budget = Budget.get_by_id(status['budget_id'])
+            assert status['spent_amount'] == pytest.approx(budget.get_spent_amount())
+            assert status['percentage'] == pytest.approx(budget.get_percentage_used())
+
+    def test_check_budget_alerts(self, seeded):
+        """Test the per-category alert check does not query spending twice."""
+        budget = next(b for b in Budget.get_by_user(seeded[0]) if b.period == 'daily')
+        with query_budget(max_queries=3, max_repeats=1, label='check_budget_alerts'):
+            alert = BudgetService.check_budget_alerts(seeded[0], budget.category_id)
+
+        assert alert['alert_type'] == 'critical'
+
+    def test_budget_alert_job(self, seeded):
+        """Test the alert job reads everything up front and dedups alerts."""
+        bot = mock.AsyncMock()
+        with record_queries() as recorder:
+            asyncio.run(_send_budget_alerts(bot))
+
+        sent = bot.send_message.await_count
+        assert sent >= len(seeded)
+        assert recorder.count('select') == 3, recorder.report()
+        assert recorder.count('insert into budget_alerts') == sent
+
+        # Everything was alerted today: the second run only reads
+        bot.reset_mock()
+        with query_budget(max_queries=3, max_repeats=1, label='budget alert job'):
+            asyncio.run(_send_budget_alerts(bot))
+        assert bot.send_message.await_count == 0
+
+    def test_process_due_recurring(self, seeded):
+        """Test each due rule costs a fixed 6 queries (validate, insert, log change x2, re-read, reschedule)."""
+        due = len(seeded) * 2
+        with query_budget(max_queries=1 + 6 * due, label='process_due_recurring') as recorder:
+            assert RecurringService.process_due_recurring() == due
+
+        assert recorder.count('from recurring_transactions') == 1
+
+    def test_authenticated_handler(self, seeded):
+        """Test /budgetstatus: user lookup plus the budget status queries."""
+        update = mock.MagicMock()
+        update.effective_user.id = DatabaseConnection.execute_query(
+            "SELECT telegram_id FROM users WHERE id = %s", (seeded[0],), fetch_one=True, commit=False
+        )['telegram_id']
+        update.message.reply_text = mock.AsyncMock()
+
+        # __wrapped__ skips error_handler so failures surface in the test
+        with query_budget(max_queries=3, max_repeats=1, label='/budgetstatus'):
+            asyncio.run(budget_status_command.__wrapped__(update, mock.MagicMock()))
+
+        assert 'STATUS BUDGET' in update.message.reply_text.await_args.args[0]
@@ -0,0 +1,116 @@
+"""Query-plan regression tests and index advisor checks (see benchmarks/plans.py)."""
+
+import pytest
+
+from benchmarks.datagen import DatasetSpec, get_benchmark_user_ids, seed_database
+from benchmarks.plans import (
+    HOT_CASES, TEMPORARY, StatementPlan, PlanStep, advise, analyze, regressions,
+    suggest_index, table_aliases,
+)
+from config.backends import SQLiteBackend
+from config.database import DatabaseConnection
+from config.migrator import VERSIONS_DIR, Migrator
+
+TRANSACTION_COLUMNS = ['id', 'user_id', 'category_id', 'amount', 'description', 'transaction_date',
+                       'type', 'notes', 'is_recurring', 'recurring_id', 'created_at', 'updated_at']
+
+
+@pytest.fixture(scope='module')
+def plans(tmp_path_factory):
+    """Plans of every workload statement on a seeded SQLite database."""
+    previous = DatabaseConnection._backend
+    backend = SQLiteBackend(str(tmp_path_factory.mktemp('plans') / 'montrixa.db'))
+    backend.apply_schema()
+    DatabaseConnection.configure(backend)
+    try:
+        seed_database(DatasetSpec(users=2, years=1, budgets_per_user=3, recurring_per_user=2))
+        yield analyze(get_benchmark_user_ids()[0])
+    finally:
+        DatabaseConnection.configure(previous)
+
+
+def _case(plans, case, contains):
+    return next(p for p in plans if p.case == case and contains in p.query)
+
+
+class TestHotQueryPlans:
+    """Fail when a hot query's plan gets worse."""
+
+    def test_no_regressions(self, plans):
+        """Test no hot statement on transactions scans, sorts or spills beyond its allowance."""
+        assert {p.case for p in plans} >= set(HOT_CASES)
+        assert regressions(plans) == []
+
+    @pytest.mark.parametrize('case, contains, index', [
+        ('ReportService.get_expense_by_category', 'GROUP BY', 'idx_transactions_user_type_date_amount'),
+        ('ReportService.get_income_by_category', 'GROUP BY', 'idx_transactions_user_type_date_amount'),
+        ('Budget.get_spent_minor', 'FROM transactions', 'idx_transactions_user_category_type_date'),
+        ('Budget.get_spent_minor_amounts', 'FROM transactions', 'idx_transactions_user_category_type_date'),
+    ])
+    def test_aggregates_use_covering_indexes(self, plans, case, contains, index):
+        """Test report aggregates and budget spend are answered from the index alone."""
+        step = _case(plans, case, contains).steps[0]
+        assert (step.index, step.covering) == (index, True)
+
+    def test_every_statement_explained(self, plans):
+        """Test writes are planned too and none of them scans transactions."""
+        writes = [p for p in plans if p.query.lstrip().upper().startswith(('UPDATE', 'DELETE'))]
+        assert writes and all(p.steps for p in writes)
+        assert not [p for p in plans if 'full scan: transactions' in p.issues]
+
+
+class TestAdvisor:
+    """Test issue detection and index suggestions."""
+
+    def test_regression_detected(self):
+        """Test a full scan of transactions on a hot case is reported."""
+        query = "SELECT SUM(amount) FROM transactions WHERE type = 'expense'"
+        plan = StatementPlan('ReportService.get_summary', query, None,
+                             [PlanStep('transactions', full_scan=True), PlanStep(None, temporary=True)],
+                             table_aliases(query))
+
+        assert plan.issues == ['full scan: transactions', TEMPORARY]
+        assert len(regressions([plan])) == 2
+        assert regressions([StatementPlan('Budget.get_by_user', 'SELECT 1 FROM budgets', None,
+                                          [PlanStep('budgets', filesort=True)], {})]) == []
+
+    def test_suggest_report_index(self):
+        """Test equality, range, then covered columns for the category aggregate."""
+        query = """
+            SELECT c.id, c.name, SUM(t.amount), COUNT(t.id)
+            FROM transactions t JOIN categories c ON t.category_id = c.id
+            WHERE t.user_id = %s AND t.type = 'expense'
+            AND t.transaction_date >= %s AND t.transaction_date <= %s
+            GROUP BY c.id ORDER BY 3 DESC
+        """
+        assert suggest_index(query, 'transactions', TRANSACTION_COLUMNS) == \
+            ['user_id', 'type', 'transaction_date', 'amount', 'category_id']
+
+    def test_suggest_budget_index(self):
+        """Test IN lists count as equality and unaliased single-table queries work."""
+        query = ("SELECT SUM(amount) FROM transactions WHERE user_id IN (%s, %s) AND category_id IN (%s) "
+                 "AND type = 'expense' AND transaction_date >= %s GROUP BY user_id, category_id")
+        assert suggest_index(query, 'transactions', TRANSACTION_COLUMNS) == \
+            ['user_id', 'category_id', 'type', 'transaction_date', 'amount']
+
+    def test_text_columns_are_not_covered(self):
+        """Test a statement reading TEXT columns gets a non-covering suggestion."""
+        query = "SELECT description FROM transactions WHERE user_id = %s ORDER BY created_at"
+        assert suggest_index(query, 'transactions', TRANSACTION_COLUMNS) == ['user_id', 'created_at']
+
+    def test_existing_index_not_suggested(self, plans):
+        """Test the shipped covering indexes satisfy the aggregate suggestions."""
+        suggested = [tuple(s['columns']) for s in advise(plans)]
+        assert ('user_id', 'type', 'transaction_date', 'amount', 'category_id') not in suggested
+        assert ('user_id', 'category_id', 'type', 'transaction_date', 'amount') not in suggested
+
+
+class TestCoveringIndexMigration:
+    """Test the index migration is idempotent."""
+
+    def test_applies_on_existing_schema(self, sqlite_db):
+        """Test indexes already created by the schema are skipped without error."""
+        migrator = Migrator(VERSIONS_DIR)
+        assert [m.version for m in migrator.migrate()] == ['0001', '0002', '0003']
+        assert migrator.index_exists('transactions', 'idx_transactions_user_type_date_amount')
+        assert not migrator.index_exists('transactions', 'idx_missing')
@@ -0,0 +1,86 @@
+"""Tests for query instrumentation utilities."""
+
+import pytest
+from config.query_stats import QueryStats, fingerprint, percentile
+
+
+class TestFingerprint:
+    """Test SQL fingerprint normalization."""
+
+    def test_placeholders_and_literals(self):
+        """Test literals and placeholders collapse to '?'."""
+        a = fingerprint("SELECT * FROM users WHERE telegram_id = %s AND name = 'x'")
+        b = fingerprint("SELECT *   FROM users\n WHERE telegram_id = 42 AND name = 'other'")
+        assert a == b == "SELECT * FROM users WHERE telegram_id = ? AND name = ?"
+
+    def test_in_list_collapsed(self):
+        """Test IN lists of any length share a fingerprint."""
+        a = fingerprint("SELECT id FROM t WHERE id IN (%s, %s)")
+        b = fingerprint("SELECT id FROM t WHERE id IN (1, 2, 3, 4)")
+        assert a == b
+
+    def test_comments_removed(self):
+        """Test SQL comments are ignored."""
+        result = fingerprint("SELECT 1 -- trailing\n/* block */ FROM dual")
+        assert result == "SELECT ? FROM dual"
+
+
+class TestPercentile:
+    """Test percentile helper."""
+
+    def test_empty(self):
+        """Test empty window."""
+        assert percentile([], 95) == 0.0
+
+    def test_interpolation(self):
+        """Test linear interpolation between samples."""
+        values = [1, 2, 3, 4, 5]
+        assert percentile(values, 50) == 3
+        assert percentile(values, 100) == 5
+        assert percentile(values, 25) == 2
+
+
+class TestQueryStats:
+    """Test QueryStats aggregation."""
+
+    @pytest.fixture(autouse=True)
+    def enabled_stats(self, monkeypatch):
+        monkeypatch.setattr(QueryStats, 'enabled', True)
+        monkeypatch.setattr(QueryStats, 'slow_query_ms', 1000)
+        QueryStats.reset()
+        yield
+        QueryStats.reset()
+
+    def test_snapshot_groups_by_fingerprint(self):
+        """Test statements are grouped and ordered by total time."""
+        QueryStats.record_query("SELECT * FROM users WHERE id = 1", 2.0, 1)
+        QueryStats.record_query("SELECT * FROM users WHERE id = 2", 4.0, 1)
+        QueryStats.record_query("SELECT COUNT(*) FROM transactions", 1.0, 1)
+
+        snapshot = QueryStats.snapshot()
+        top = snapshot['statements'][0]
+        assert top['fingerprint'] == "SELECT * FROM users WHERE id = ?"
+        assert top['calls'] == 2
+        assert top['total_ms'] == 6.0
+        assert top['rows_total'] == 2
+        assert len(snapshot['statements']) == 2
+
+    def test_slow_query_logged(self, caplog, monkeypatch):
+        """Test statements over the threshold are logged with call site."""
+        monkeypatch.setattr(QueryStats, 'slow_query_ms', 5)
+        QueryStats.record_query("SELECT SLEEP(1)", 10.0, 1)
+        assert "Slow query" in caplog.text
+        assert "test_query_stats.py" in caplog.text
+
+    def test_listener_receives_statements_when_disabled(self, monkeypatch):
+        """Test listeners see statements even with aggregation disabled."""
+        monkeypatch.setattr(QueryStats, 'enabled', False)
+        seen = []
+        listener = lambda fp, query, ms, rows: seen.append((fp, rows))
+        QueryStats.add_listener(listener)
+        try:
+            QueryStats.record_query("SELECT 1", 0.1, 1)
+        finally:
+            QueryStats.remove_listener(listener)
+        assert seen == [("SELECT ?", 1)]
+        assert QueryStats.snapshot()['statements'] == []
@@ -0,0 +1,127 @@
+"""Tests for read-replica routing."""
+
+from unittest import mock
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from api.middleware import ReadRoutingMiddleware
+from config.backends import SQLiteBackend
+from config.database import DatabaseConnection
+from config.read_routing import ReadRouter, _scope
+from models.user import User
+
+PRIMARY_ONLY = 1001
+REPLICA_ONLY = 2002
+
+
+@pytest.fixture
+def replica_db(sqlite_db, tmp_path):
+    """A second SQLite file acting as a replica that never receives writes."""
+    previous = (DatabaseConnection._replica_backend, DatabaseConnection._replica_configured)
+    replica = SQLiteBackend(str(tmp_path / 'replica.db'))
+    replica.apply_schema()
+    DatabaseConnection.configure_replica(replica)
+    # Rows that exist on only one side reveal where a read was served
+    User.create(PRIMARY_ONLY, 'primary', 'Primary')
+    conn = replica.connect()
+    conn.execute("INSERT INTO users (telegram_id, username) VALUES (?, 'replica')", (REPLICA_ONLY,))
+    conn.commit()
+    conn.close()
+    yield replica
+    DatabaseConnection.configure_replica(previous[0])
+    DatabaseConnection._replica_configured = previous[1]
+
+
+def _served_by_replica() -> bool:
+    replica = User.get_by_telegram_id(REPLICA_ONLY) is not None
+    primary = User.get_by_telegram_id(PRIMARY_ONLY) is not None
+    assert replica != primary
+    return replica
+
+
+class TestReadRouting:
+    """Test where DatabaseConnection sends reads."""
+
+    def test_disabled_without_replica(self, sqlite_db):
+        """Test reads use the primary when no replica is configured."""
+        with mock.patch.object(DatabaseConnection, '_replica_backend', None), \
+                mock.patch.object(DatabaseConnection, '_replica_configured', True):
+            assert User.get_by_telegram_id(REPLICA_ONLY) is None
+            assert DatabaseConnection._use_replica() is False
+
+    def test_reads_go_to_replica(self, replica_db):
+        """Test commit=False reads use the replica and writes the primary."""
+        reads_before = DatabaseConnection.pool_stats()['replica_reads']
+        assert _served_by_replica()
+        assert DatabaseConnection.pool_stats()['replica_reads'] > reads_before
+
+        User.create(3003, 'new', 'New')
+        row = DatabaseConnection.execute_query(
+            "SELECT COUNT(*) AS n FROM users WHERE telegram_id = 3003", fetch_one=True
+        )
+        assert row['n'] == 1
+
+    def test_request_pinned_after_write(self, replica_db):
+        """Test a request reads its own writes from the primary."""
+        with ReadRouter.request_scope():
+            assert _served_by_replica()
+            User.create(3003, 'new', 'New')
+            assert not _served_by_replica()
+            assert User.get_by_telegram_id(3003) is not None
+
+    def test_user_pinned_across_requests(self, replica_db):
+        """Test the writing user stays on the primary for pin_seconds, others do not."""
+        with ReadRouter.request_scope(42):
+            User.create(3003, 'new', 'New')
+
+        with ReadRouter.request_scope(42):
+            assert not _served_by_replica()
+        with ReadRouter.request_scope():
+            ReadRouter.bind_user(43)
+            assert _served_by_replica()
+
+        with mock.patch.object(ReadRouter, '_recent_writers', {42: 0.0}):
+            with ReadRouter.request_scope(42):
+                assert _served_by_replica()
+
+    def test_lagging_replica_bypassed(self, replica_db):
+        """Test reads fall back to the primary while the replica lags too far."""
+        with mock.patch.object(replica_db, 'replication_lag', return_value=ReadRouter.max_lag_seconds + 1):
+            ReadRouter.reset()
+            assert not _served_by_replica()
+            assert ReadRouter.status()['ok'] is False
+
+        ReadRouter.reset()
+        assert _served_by_replica()
+        assert ReadRouter.status() == {
+            'ok': True, 'lag_seconds': 0.0, 'max_lag_seconds': ReadRouter.max_lag_seconds
+        }
+
+    def test_unreachable_replica_bypassed(self, replica_db):
+        """Test a replica that cannot be reached does not fail reads."""
+        with mock.patch.object(replica_db, 'connect', side_effect=OSError('down')), \
+                mock.patch.object(replica_db, 'ping', side_effect=OSError('down')):
+            ReadRouter.reset()
+            assert not _served_by_replica()
+
+    def test_use_primary(self, replica_db):
+        """Test use_primary() forces reads to the primary."""
+        with ReadRouter.use_primary():
+            assert not _served_by_replica()
+        assert _served_by_replica()
+
+    def test_api_dependency_binds_user(self):
+        """Test a user bound in a sync dependency is visible to the endpoint."""
+        app = FastAPI()
+        app.add_middleware(ReadRoutingMiddleware)
+
+        def current_user():
+            ReadRouter.bind_user(7)
+
+        @app.get('/who')
+        def who(_=Depends(current_user)):
+            return {'user': _scope.get().user_key}
+
+        assert TestClient(app).get('/who').json() == {'user': 7}
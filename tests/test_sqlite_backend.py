@@ -0,0 +1,79 @@
+"""Tests for the SQLite storage backend."""
+
+from datetime import date, datetime
+
+from config.backends import translate_query
+from config.database import DatabaseConnection
+from models.budget import Budget
+from models.category import Category
+from models.job_heartbeat import JobHeartbeat
+from models.transaction import Transaction
+from services.user_service import UserService
+
+
+def _user():
+    return UserService.get_or_register(
+        telegram_id=12345, username='tester', first_name='Test', last_name=None, language_code='id'
+    )
+
+
+class TestTranslateQuery:
+    """Test placeholder translation."""
+
+    def test_positional(self):
+        """Test %s becomes ?."""
+        assert translate_query("SELECT * FROM t WHERE a = %s AND b = %s") == \
+            "SELECT * FROM t WHERE a = ? AND b = ?"
+
+    def test_named_and_escaped(self):
+        """Test %(name)s becomes :name and %% is unescaped."""
+        assert translate_query("SELECT '%%s', x FROM t WHERE a = %(id)s") == \
+            "SELECT '%s', x FROM t WHERE a = :id"
+
+
+class TestSQLiteBackend:
+    """Test models against an embedded SQLite database."""
+
+    def test_wal_mode(self, sqlite_db):
+        """Test file databases use write-ahead logging."""
+        row = DatabaseConnection.execute_query("PRAGMA journal_mode", fetch_one=True, commit=False)
+        assert row['journal_mode'] == 'wal'
+
+    def test_registration_and_types(self, sqlite_db):
+        """Test rows come back as dicts with date and datetime values."""
+        user = _user()
+        assert isinstance(user.created_at, datetime)
+
+        category = Category.get_by_name(user.id, 'makanan', 'expense')
+        assert category.name == 'Makanan'
+
+        transaction = Transaction.create(user.id, category.id, 12500.5, 'kopi', 'expense',
+                                         transaction_date=date(2024, 5, 1))
+        assert transaction.transaction_date == date(2024, 5, 1)
+        assert transaction.amount == 12500.5
+
+        bounds = Transaction.get_date_bounds(user.id)
+        assert bounds['oldest_date'] == date(2024, 5, 1)
+        assert Transaction.get_balance(user.id)['expense'] == 12500.5
+
+    def test_budget_upsert(self, sqlite_db):
+        """Test creating the same budget twice updates the amount."""
+        user = _user()
+        category = Category.get_by_name(user.id, 'Transport', 'expense')
+
+        first = Budget.create(user.id, category.id, 100000, 'monthly', date(2024, 5, 1))
+        second = Budget.create(user.id, category.id, 250000, 'monthly', date(2024, 5, 1))
+
+        assert first.id == second.id
+        assert second.amount == 250000
+        assert len(Budget.get_by_user(user.id)) == 1
+
+    def test_job_heartbeats(self, sqlite_db):
+        """Test heartbeat upserts keep the last error and compute ages."""
+        JobHeartbeat.record_failure('budget_alerts', 'boom')
+        JobHeartbeat.record_success('budget_alerts')
+
+        heartbeat = JobHeartbeat.get_all()['budget_alerts']
+        assert heartbeat.last_error == 'boom'
+        assert isinstance(heartbeat.last_success_at, datetime)
+        assert 0 <= heartbeat.success_age_seconds <= 1
@@ -0,0 +1,173 @@
+"""Tests for the transaction change log and delta sync."""
+
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+
+from api.auth import get_current_user
+from api.main import app
+from config.database import DatabaseConnection
+from models.category import Category
+from models.sync import SyncLog
+from models.transaction import Transaction
+from models.user import User
+from services.sync_service import SyncService
+from services.transaction_service import TransactionService
+from services.user_service import UserService
+
+
+def _user(telegram_id=777):
+    user = UserService.get_or_register(telegram_id=telegram_id, username='sync', first_name='Sync')
+    category = Category.get_by_user(user.id, 'expense')[0]
+    return user, category
+
+
+def _add(user, category, amount=10000, description='kopi'):
+    return TransactionService.create_transaction(user.id, category.id, amount, description, 'expense')
+
+
+class TestSyncLog:
+    """Test every transaction write is logged with a new version."""
+
+    def test_writes_bump_version(self, sqlite_db):
+        """Test create, update and delete each append one change in order."""
+        user, category = _user()
+        assert SyncLog.current_version(user.id) == 0
+
+        transaction = _add(user, category)
+        transaction.update(description='teh')
+        transaction.delete()
+
+        changes = SyncLog.changes_since(user.id, 0, 10)
+        assert [(c['version'], c['transaction_id'], c['op']) for c in changes] == [
+            (1, transaction.id, 'upsert'), (2, transaction.id, 'upsert'), (3, transaction.id, 'delete'),
+        ]
+        assert SyncLog.current_version(user.id) == 3
+
+    def test_versions_are_per_user(self, sqlite_db):
+        """Test one user's writes do not advance another user's version."""
+        alice, alice_category = _user(1)
+        bob, bob_category = _user(2)
+        _add(alice, alice_category)
+        _add(alice, alice_category)
+        _add(bob, bob_category)
+
+        assert SyncLog.current_version(alice.id) == 2
+        assert SyncLog.current_version(bob.id) == 1
+
+
+class TestSyncService:
+    """Test snapshots and deltas."""
+
+    def test_snapshot_pages_by_id(self, sqlite_db):
+        """Test an empty cache pages through the whole ledger in id order."""
+        user, category = _user()
+        created = [_add(user, category, 1000 * (i + 1)) for i in range(5)]
+
+        first = SyncService.get_changes(user.id, since=0, limit=2)
+        assert first['reset'] and first['has_more'] and first['version'] == 5
+        ids = [t.id for t in first['transactions']]
+        page = first
+        while page['has_more']:
+            page = SyncService.get_changes(user.id, since=0, after=page['after'], limit=2)
+            ids += [t.id for t in page['transactions']]
+
+        assert ids == [t.id for t in created]
+
+    def test_delta_collapses_changes(self, sqlite_db):
+        """Test a delta returns current rows for upserts and ids for deletes."""
+        user, category = _user()
+        kept = _add(user, category)
+        gone = _add(user, category)
+        since = SyncLog.current_version(user.id)
+
+        kept.update(description='teh')
+        kept.update(amount=12000)
+        gone.delete()
+        added = _add(user, category)
+        added.delete()
+
+        delta = SyncService.get_changes(user.id, since=since)
+        assert not delta['reset'] and not delta['has_more']
+        assert delta['version'] == SyncLog.current_version(user.id)
+        assert [(t.id, t.description, t.amount) for t in delta['transactions']] == [(kept.id, 'teh', 12000)]
+        assert sorted(delta['deleted']) == sorted([gone.id, added.id])
+
+        assert SyncService.get_changes(user.id, since=delta['version'])['transactions'] == []
+
+    def test_delta_pages_by_version(self, sqlite_db):
+        """Test a long delta stops at limit and continues from its version."""
+        user, category = _user()
+        for i in range(3):
+            _add(user, category, 1000 + i)
+
+        page = SyncService.get_changes(user.id, since=1, limit=1)
+        assert page['has_more'] and page['version'] == 2
+        page = SyncService.get_changes(user.id, since=page['version'], limit=1)
+        assert not page['has_more'] and page['version'] == 3
+
+    def test_category_rename_and_unknown_version_resnapshot(self, sqlite_db):
+        """Test a category rename and a version ahead of the server force a snapshot."""
+        user, category = _user()
+        _add(user, category)
+        since = SyncLog.current_version(user.id)
+
+        category.update(name='Jajan')
+        renamed = SyncService.get_changes(user.id, since=since)
+        assert renamed['reset']
+        assert [t.category_name for t in renamed['transactions']] == ['Jajan']
+
+        assert SyncService.get_changes(user.id, since=99)['reset']
+
+    def test_stale_version_after_prune_resnapshots(self, sqlite_db):
+        """Test a version older than the pruned log gets a snapshot, a newer one a delta."""
+        user, category = _user()
+        first = _add(user, category)
+        stale = SyncLog.current_version(user.id)
+        first.update(description='teh')
+        _add(user, category)
+        fresh = SyncLog.current_version(user.id)
+        kept = _add(user, category)
+
+        # Drop the two oldest changes as if they had aged out
+        expired = [c['version'] for c in SyncLog.changes_since(user.id, 0, 2)]
+        DatabaseConnection.execute_query(
+            "UPDATE transaction_changes SET created_at = '2000-01-01 00:00:00' "
+            "WHERE user_id = %s AND version IN (%s, %s)", (user.id, *expired)
+        )
+        assert SyncLog.prune(datetime.now() - timedelta(days=1), batch_size=1) == 2
+
+        resync = SyncService.get_changes(user.id, since=stale)
+        assert resync['reset'] and resync['version'] == SyncLog.current_version(user.id)
+        assert len(resync['transactions']) == 3
+        delta = SyncService.get_changes(user.id, since=fresh)
+        assert not delta['reset'] and [t.id for t in delta['transactions']] == [kept.id]
+
+        # Nothing left after since, yet the user moved on: also a snapshot
+        SyncLog.prune(datetime.now() + timedelta(days=1))
+        assert SyncService.get_changes(user.id, since=fresh)['reset']
+        assert not SyncService.get_changes(user.id, since=SyncLog.current_version(user.id))['reset']
+
+
+class TestSyncRoute:
+    """Test GET /api/sync."""
+
+    def test_snapshot_then_delta(self, sqlite_db):
+        """Test the route serializes rows like /api/transactions and returns deletes."""
+        user, category = _user()
+        first = _add(user, category)
+        app.dependency_overrides[get_current_user] = lambda: User.get_by_id(user.id)
+        try:
+            client = TestClient(app)
+            snapshot = client.get('/api/sync').json()
+            Transaction.get_by_id(first.id).delete()
+            delta = client.get(f"/api/sync?since={snapshot['version']}").json()
+        finally:
+            app.dependency_overrides.clear()
+
+        assert snapshot['reset'] is True
+        assert snapshot['transactions'][0]['id'] == first.id
+        assert set(snapshot['transactions'][0]) == set(Transaction.FIELDS)
+        assert delta == {
+            'version': 2, 'reset': False, 'transactions': [], 'deleted': [first.id], 'after': 0, 'has_more': False,
+        }
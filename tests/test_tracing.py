@@ -0,0 +1,94 @@
+"""Tests for handler tracing."""
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from config.query_stats import QueryStats
+from utils.decorators import error_handler
+from utils.tracing import Tracer, label_for_update
+
+
+def _command_update(text):
+    return SimpleNamespace(message=SimpleNamespace(text=text), callback_query=None)
+
+
+def _callback_update(data):
+    return SimpleNamespace(message=None, callback_query=SimpleNamespace(data=data))
+
+
+class TestLabelForUpdate:
+    """Test span naming."""
+
+    def test_command(self):
+        """Test commands are named after the command."""
+        assert label_for_update(_command_update("/expense 5000 makan"), "x") == "/expense"
+
+    def test_command_with_bot_mention(self):
+        """Test bot mentions are stripped."""
+        assert label_for_update(_command_update("/report@MontrixaBot"), "x") == "/report"
+
+    def test_callback_pattern(self):
+        """Test callback ids are collapsed into a pattern."""
+        assert label_for_update(_callback_update("delete_trans_42"), "x") == "cb:delete_trans_*"
+
+    def test_fallback(self):
+        """Test plain messages fall back to the handler name."""
+        assert label_for_update(_command_update("10000 makan"), "receive_amount") == "receive_amount"
+
+
+class TestTracer:
+    """Test span collection through the handler decorators."""
+
+    @pytest.fixture(autouse=True)
+    def enabled_tracer(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(Tracer, 'enabled', True)
+        monkeypatch.setattr(Tracer, 'log_file', str(tmp_path / 'spans.jsonl'))
+        Tracer.reset()
+        yield
+        Tracer.reset()
+
+    def test_handler_span_counts_queries(self, tmp_path):
+        """Test DB queries and Telegram time are attributed to the handler span."""
+        @error_handler
+        async def handler(update, context):
+            QueryStats.record_query("SELECT * FROM users WHERE id = 1", 2.0, 1)
+            QueryStats.record_query("SELECT * FROM users WHERE id = 2", 3.0, 1)
+            Tracer.add_telegram_time(7.0)
+
+        asyncio.run(handler(_command_update("/balance"), None))
+
+        span = Tracer.summary()['spans'][0]
+        assert span['name'] == "/balance"
+        assert span['kind'] == "command"
+        assert span['db_queries_avg'] == 2
+        assert span['db']['max_ms'] == 5.0
+        assert span['telegram']['max_ms'] == 7.0
+
+        logged = [json.loads(line) for line in (tmp_path / 'spans.jsonl').read_text().splitlines()]
+        assert logged[0]['name'] == "/balance"
+        assert logged[0]['db_queries'] == 2
+
+    def test_handler_error_recorded(self):
+        """Test swallowed handler errors are still marked on the span."""
+        @error_handler
+        async def handler(update, context):
+            raise RuntimeError("boom")
+
+        asyncio.run(handler(_callback_update("expense_cat_3"), None))
+
+        span = Tracer.summary()['spans'][0]
+        assert span['name'] == "cb:expense_cat_*"
+        assert span['errors'] == 1
+
+    def test_disabled_records_nothing(self, monkeypatch):
+        """Test no spans are collected when tracing is disabled."""
+        monkeypatch.setattr(Tracer, 'enabled', False)
+
+        @error_handler
+        async def handler(update, context):
+            return "ok"
+
+        assert asyncio.run(handler(_command_update("/start"), None)) == "ok"
+        assert Tracer.summary()['spans'] == []
@@ -0,0 +1,222 @@
+"""Tests for the columnar TransactionFrame and frame-based reports."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from benchmarks.datagen import DatasetSpec, get_benchmark_user_ids, seed_database
+from models.transaction_frame import TransactionFrame, from_day_number, to_day_number
+from services.report_service import ReportService
+from tests.query_budget import query_budget
+
+
+def _row(day, amount, trans_type='expense', category_id=1):
+    return {'transaction_date': day, 'amount': amount, 'type': trans_type, 'category_id': category_id}
+
+
+class TestTransactionFrame:
+    """Test column building and group-bys."""
+
+    def test_columns(self):
+        """Test dates become day numbers and amounts exact minor units."""
+        rows = [_row(date(2024, 1, 31), '0.10'), _row(date(2024, 2, 1), 0.2, 'income', 7)]
+        frame = TransactionFrame.from_rows(1, date(2024, 1, 1), date(2024, 2, 29), rows)
+
+        assert len(frame) == 2
+        assert list(frame.amount) == [10, 20]
+        assert list(frame.expense) == [True, False]
+        assert [frame.category_ids[c] for c in frame.category] == [1, 7]
+        assert from_day_number(frame.day[0]) == date(2024, 1, 31)
+        assert frame.totals() == {'income': 20, 'expense': 10, 'income_count': 1, 'expense_count': 1}
+        assert frame.date_span() == (date(2024, 1, 31), date(2024, 2, 1))
+
+    def test_period_keys(self):
+        """Test weeks start on Monday and months on the 1st."""
+        days = [date(2024, 3, 3), date(2024, 3, 4), date(2024, 3, 10), date(2024, 3, 31)]
+        frame = TransactionFrame.from_rows(1, days[0], days[-1], [_row(d, 1) for d in days])
+
+        weeks = [from_day_number(k) for k in frame.period_keys('week')]
+        assert weeks == [date(2024, 2, 26), date(2024, 3, 4), date(2024, 3, 4), date(2024, 3, 25)]
+        months = {from_day_number(k) for k in frame.period_keys('month')}
+        assert months == {date(2024, 3, 1)}
+        with pytest.raises(ValueError):
+            frame.period_keys('year')
+
+    def test_by_period_and_category(self):
+        """Test income/expense sums per period and per category."""
+        rows = [
+            _row(date(2024, 3, 1), 5, 'expense', 1),
+            _row(date(2024, 3, 1), 7, 'expense', 2),
+            _row(date(2024, 3, 2), 100, 'income', 3),
+            _row(date(2024, 3, 2), 3, 'expense', 1),
+        ]
+        frame = TransactionFrame.from_rows(1, date(2024, 3, 1), date(2024, 3, 2), rows)
+
+        daily = frame.by_period('day')
+        assert list(daily.index) == [to_day_number(date(2024, 3, 1)), to_day_number(date(2024, 3, 2))]
+        assert list(daily['expense']) == [1200, 300]
+        assert list(daily['income']) == [0, 10000]
+
+        expense = frame.by_category('expense')
+        assert expense.to_dict('records') == [
+            {'category_id': 1, 'total': 800, 'count': 2},
+            {'category_id': 2, 'total': 700, 'count': 1},
+        ]
+        assert list(frame.by_category('income')['category_id']) == [3]
+
+    def test_empty(self):
+        """Test an empty frame yields empty reports."""
+        frame = TransactionFrame.from_rows(1, date(2024, 3, 1), date(2024, 3, 2), [])
+
+        assert frame.date_span() is None
+        assert ReportService.reports_from_frame(frame)['expense_by_category'] == []
+        assert ReportService.reports_from_frame(frame)['summary']['transaction_count'] == 0
+
+
+class TestTrend:
+    """Test zero-filled, bounded trend series."""
+
+    def test_zero_fill(self):
+        """Test every period of the range is present, with zeros where empty."""
+        rows = [_row(date(2024, 3, 2), 5), _row(date(2024, 3, 5), 1, 'income')]
+        frame = TransactionFrame.from_rows(1, date(2024, 3, 1), date(2024, 3, 6), rows)
+
+        daily = frame.by_period('day', fill=True)
+        assert [from_day_number(k).day for k in daily.index] == [1, 2, 3, 4, 5, 6]
+        assert list(daily['expense']) == [0, 500, 0, 0, 0, 0]
+        weekly = frame.by_period('week', fill=True)
+        assert [from_day_number(k) for k in weekly.index] == [date(2024, 2, 26), date(2024, 3, 4)]
+        assert list(weekly['income']) == [0, 100]
+
+    def test_auto_granularity(self):
+        """Test auto picks the finest period that fits and totals are kept."""
+        rows = [_row(date(2020, 1, 1) + timedelta(days=i), 1) for i in range(0, 1500, 3)]
+        frame = TransactionFrame.from_rows(1, date(2020, 1, 1), date(2024, 2, 8), rows)
+
+        assert ReportService.trend(frame, 'auto', 2000)['granularity'] == 'day'
+        assert ReportService.trend(frame, 'auto', 300)['granularity'] == 'week'
+        trend = ReportService.trend(frame, 'auto', 60, metric='expense')
+        assert trend['granularity'] == 'month' and not trend['downsampled']
+        assert len(trend['points']) == 50
+        assert sum(p['expense'] for p in trend['points']) == len(rows)
+
+    def test_downsampled_keeps_ends_and_peak(self):
+        """Test a series over the cap is cut to max_points without losing its spike."""
+        rows = [_row(date(2024, 1, 1) + timedelta(days=i), 1) for i in range(366)]
+        rows.append(_row(date(2024, 7, 7), 500))
+        frame = TransactionFrame.from_rows(1, date(2024, 1, 1), date(2024, 12, 31), rows)
+
+        trend = ReportService.trend(frame, 'day', 40, metric='expense')
+        points = trend['points']
+        assert trend['downsampled'] and len(points) == 40
+        assert points[0]['date'] == date(2024, 1, 1) and points[-1]['date'] == date(2024, 12, 31)
+        assert date(2024, 7, 7) in [p['date'] for p in points]
+        assert [p['date'] for p in points] == sorted(p['date'] for p in points)
+
+
+class TestFrameReports:
+    """Test frame-based reports match the per-report SQL aggregates."""
+
+    @pytest.fixture
+    def user_id(self, sqlite_db):
+        """One synthetic user with a year of transactions."""
+        seed_database(DatasetSpec(users=1, years=1, budgets_per_user=0, recurring_per_user=0))
+        return get_benchmark_user_ids()[0]
+
+    def test_matches_sql(self, user_id):
+        """Test category breakdowns and daily trend equal the SQL versions."""
+        end = date.today()
+        start = end - timedelta(days=90)
+
+        with query_budget(max_queries=2, label='get_reports'):
+            reports = ReportService.get_reports(user_id, start, end)
+
+        for trans_type in ('expense', 'income'):
+            sql = getattr(ReportService, f'get_{trans_type}_by_category')(user_id, start, end)
+            frame = reports[f'{trans_type}_by_category']
+            assert {r['category_id']: r['total_amount'] for r in frame} == \
+                pytest.approx({r['category_id']: r['total_amount'] for r in sql})
+            assert [r['category_name'] for r in frame] == [r['category_name'] for r in sql]
+
+        sql_trend = ReportService.get_daily_trend(user_id, start, end)
+        assert [d['date'] for d in reports['daily_trend']] == [d['date'] for d in sql_trend]
+        assert [d['expense'] for d in reports['daily_trend']] == \
+            pytest.approx([d['expense'] for d in sql_trend])
+
+        summary = reports['summary']
+        assert summary['total_expense'] == pytest.approx(sum(d['expense'] for d in sql_trend))
+        assert summary['transaction_count'] == summary['income_count'] + summary['expense_count']
+
+    def test_monthly_trend(self, user_id):
+        """Test monthly buckets add up to the daily ones."""
+        end = date.today()
+        frame = TransactionFrame.load(user_id, end - timedelta(days=200), end)
+
+        daily = ReportService.trend_from_frame(frame, 'day')
+        monthly = ReportService.trend_from_frame(frame, 'month')
+        assert all(m['date'].day == 1 for m in monthly)
+        assert sum(m['expense'] for m in monthly) == pytest.approx(sum(d['expense'] for d in daily))
+
+
+class TestComparison:
+    """Test period-over-period comparison."""
+
+    def test_previous_period(self):
+        """Test month-to-date, whole months and other ranges pick the right previous range."""
+        previous = ReportService.previous_period
+        assert previous(date(2024, 3, 1), date(2024, 3, 15)) == (date(2024, 2, 1), date(2024, 2, 15))
+        assert previous(date(2024, 3, 1), date(2024, 3, 31)) == (date(2024, 2, 1), date(2024, 2, 29))
+        assert previous(date(2024, 3, 1), date(2024, 3, 30)) == (date(2024, 2, 1), date(2024, 2, 29))
+        assert previous(date(2024, 1, 1), date(2024, 1, 31)) == (date(2023, 12, 1), date(2023, 12, 31))
+        assert previous(date(2024, 3, 10), date(2024, 3, 16)) == (date(2024, 3, 3), date(2024, 3, 9))
+        assert previous(date(2024, 3, 5), date(2024, 3, 5)) == (date(2024, 3, 4), date(2024, 3, 4))
+
+    def test_totals_categories_and_daily(self, sqlite_db):
+        """Test total and per-category deltas and day-offset alignment."""
+        rows = [
+            _row(date(2024, 2, 1), 100, 'expense', 1),
+            _row(date(2024, 2, 3), 50, 'expense', 2),
+            _row(date(2024, 2, 3), 1000, 'income', 3),
+            _row(date(2024, 3, 1), 150, 'expense', 1),
+            _row(date(2024, 3, 2), 30, 'expense', 4),
+            _row(date(2024, 3, 2), 1000, 'income', 3),
+        ]
+        frame = TransactionFrame.from_rows(1, date(2024, 2, 1), date(2024, 3, 5), rows)
+        previous_start, previous_end = ReportService.previous_period(date(2024, 3, 1), date(2024, 3, 5))
+        comparison = ReportService.compare_frames(
+            frame.slice(date(2024, 3, 1), date(2024, 3, 5)), frame.slice(previous_start, previous_end)
+        )
+
+        totals = comparison['totals']
+        assert totals['expense'] == {'current': 180, 'previous': 150, 'delta': 30, 'change_pct': 20.0}
+        assert totals['income']['delta'] == 0 and totals['income']['change_pct'] == 0
+        assert totals['transaction_count']['current'] == 3
+        assert comparison['previous']['end_date'] == date(2024, 2, 5)
+
+        expense = {r['category_id']: r for r in comparison['expense_by_category']}
+        assert [r['category_id'] for r in comparison['expense_by_category']] == [1, 4, 2]
+        assert expense[1]['delta'] == 50 and expense[1]['change_pct'] == pytest.approx(50.0)
+        assert expense[4]['change_pct'] is None
+        assert expense[2]['current'] == 0 and expense[2]['change_pct'] == -100.0
+
+        daily = comparison['daily']
+        assert len(daily) == 5
+        assert daily[0]['date'] == date(2024, 3, 1) and daily[0]['previous_date'] == date(2024, 2, 1)
+        assert (daily[0]['expense'], daily[0]['previous_expense']) == (150, 100)
+        assert (daily[1]['income'], daily[1]['previous_income']) == (1000, 0)
+        assert daily[2]['previous_income'] == 1000
+
+    def test_one_query(self, sqlite_db):
+        """Test both periods come from a single frame load."""
+        seed_database(DatasetSpec(users=1, years=1, budgets_per_user=0, recurring_per_user=0))
+        user_id = get_benchmark_user_ids()[0]
+        end = date.today()
+
+        with query_budget(max_queries=2, label='compare'):
+            comparison = ReportService.compare(user_id, end - timedelta(days=29), end)
+
+        current = comparison['current']
+        assert current['total_expense'] == pytest.approx(sum(d['expense'] for d in comparison['daily']))
+        assert comparison['previous']['total_expense'] == \
+            pytest.approx(sum(d['previous_expense'] for d in comparison['daily']))
+        assert comparison['previous']['end_date'] == end - timedelta(days=30)
@@ -1,7 +1,11 @@
 """Decorators for bot handlers."""
 
 from functools import wraps
+from config.settings import Settings
+from config.database import DatabaseConnection
+from config.read_routing import ReadRouter
 from services.user_service import UserService
+from utils.tracing import Tracer, current_span, label_for_update
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,35 +25,62 @@ def authenticated(func):
             logger.warning("No telegram user in update")
             return
         
-        # Get or register user
-        user = UserService.get_or_register(
-            telegram_id=telegram_user.id,
-            username=telegram_user.username,
-            first_name=telegram_user.first_name,
-            last_name=telegram_user.last_name,
-            language_code=telegram_user.language_code or 'id'
-        )
-        
-        if not user:
-            await update.message.reply_text(
-                "❌ Terjadi kesalahan saat mendaftar. Silakan coba lagi."
-            )
-            return
-        
-        # Call original function with user parameter
-        return await func(update, context, user, *args, **kwargs)
+        # Reads of this update see the user's own recent writes (read replica),
+        # and every query of the handler shares one pooled connection
+        with ReadRouter.request_scope(telegram_user.id):
+            async with DatabaseConnection.session(atomic=False):
+                # Get or register user (atomically with its default categories)
+                with DatabaseConnection.session():
+                    user = UserService.get_or_register(
+                        telegram_id=telegram_user.id,
+                        username=telegram_user.username,
+                        first_name=telegram_user.first_name,
+                        last_name=telegram_user.last_name,
+                        language_code=telegram_user.language_code or 'id'
+                    )
+                
+                if not user:
+                    await update.message.reply_text(
+                        "❌ Terjadi kesalahan saat mendaftar. Silakan coba lagi."
+                    )
+                    return
+                
+                # Call original function with user parameter
+                return await func(update, context, user, *args, **kwargs)
+    
+    return wrapper
+
+
+def traced(func):
+    """Decorator to record latency, DB time and Telegram API time of a handler.
+    
+    Spans are named after the command ('/expense') or the callback pattern
+    ('cb:expense_cat_*') so percentiles are grouped the way users trigger them.
+    """
+    @wraps(func)
+    async def wrapper(update, context, *args, **kwargs):
+        name = label_for_update(update, func.__name__)
+        kind = 'command' if name.startswith('/') else 'callback' if name.startswith('cb:') else 'message'
+        with Tracer.span(name, kind):
+            return await func(update, context, *args, **kwargs)
     
     return wrapper
 
 
 def error_handler(func):
-    """Decorator to handle errors in bot handlers."""
+    """Decorator to handle errors in bot handlers.
+    
+    Also opens a trace span (see traced) since every handler is wrapped by it.
+    """
     @wraps(func)
     async def wrapper(update, context, *args, **kwargs):
         try:
             return await func(update, context, *args, **kwargs)
         except Exception as e:
             logger.error(f"Error in {func.__name__}: {e}", exc_info=True)
+            span = current_span()
+            if span is not None:
+                span.error = type(e).__name__
             
             # Try to send error message to user
             try:
@@ -64,7 +95,7 @@ def error_handler(func):
             except:
                 pass
     
-    return wrapper
+    return traced(wrapper)
 
 
 def admin_only(func):
@@ -76,9 +107,14 @@ def admin_only(func):
     async def wrapper(update, context, *args, **kwargs):
         telegram_user = update.effective_user
         
-        # Check if user is admin (you can define admin IDs in settings)
-        # For now, allow all users
-        # TODO: Implement admin check if needed
+        if not telegram_user or telegram_user.id not in Settings.ADMIN_USER_IDS:
+            logger.warning(
+                f"Rejected admin command {func.__name__} from "
+                f"{telegram_user.id if telegram_user else 'unknown user'}"
+            )
+            if update.message:
+                await update.message.reply_text("❌ Perintah ini hanya untuk admin.")
+            return
         
         return await func(update, context, *args, **kwargs)
     
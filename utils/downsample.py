@@ -0,0 +1,44 @@
+"""Downsampling of chart series to a bounded number of points."""
+
+import numpy as np
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: indices of the points that keep a series' shape.
+
+    The first and last points are always kept. The points in between are
+    split into threshold - 2 buckets, and from each bucket the point that
+    forms the largest triangle with the previously kept point and the mean
+    of the next bucket is kept, so peaks and dips survive.
+
+    Args:
+        x: Ascending x values
+        y: y values, same length as x
+        threshold: Number of points to keep
+
+    Returns:
+        Ascending int64 indices into x/y (all of them if len(x) <= threshold)
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n, dtype=np.int64)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    every = (n - 2) / (threshold - 2)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    kept = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        next_end = min(max(int((bucket + 2) * every) + 1, end + 1), n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs(
+            (x[kept] - avg_x) * (y[start:end] - y[kept])
+            - (x[kept] - x[start:end]) * (avg_y - y[kept])
+        )
+        kept = start + int(np.argmax(area))
+        indices[bucket + 1] = kept
+    return indices
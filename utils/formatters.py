@@ -4,6 +4,8 @@ from datetime import date, datetime
 from typing import Any, Optional
 import locale
 
+from utils.money import MINOR_UNITS, to_minor
+
 
 class Formatter:
     """Utility class for formatting data."""
@@ -13,19 +15,37 @@ class Formatter:
         """Format amount as currency.
         
         Args:
-            amount: Amount to format
+            amount: Amount to format (currency units: float, Decimal or int)
+            currency: Currency code (default: IDR)
+            
+        Returns:
+            Formatted currency string
+        """
+        return Formatter.format_money(to_minor(amount), currency)
+    
+    @staticmethod
+    def format_money(minor: int, currency: str = 'IDR') -> str:
+        """Format an amount in integer minor units (see utils.money) as currency.
+        
+        Args:
+            minor: Amount in minor units
             currency: Currency code (default: IDR)
             
         Returns:
             Formatted currency string
         """
+        sign = '-' if minor < 0 else ''
+        units, cents = divmod(abs(int(minor)), MINOR_UNITS)
         if currency == 'IDR':
-            # Indonesian Rupiah format: Rp 1.500.000
-            formatted = f"{amount:,.0f}".replace(',', '.')
-            return f"Rp {formatted}"
+            # Indonesian Rupiah format: Rp 1.500.000 (sen rounded half to even)
+            half = MINOR_UNITS // 2
+            if cents > half or (cents == half and units % 2):
+                units += 1
+            formatted = f"{units:,}".replace(',', '.')
+            return f"Rp {sign if units else ''}{formatted}"
         else:
             # Default format
-            return f"{currency} {amount:,.2f}"
+            return f"{currency} {sign}{units:,}.{cents:02d}"
     
     @staticmethod
     def format_date(date_obj: date, format_str: str = '%d/%m/%Y') -> str:
@@ -79,6 +99,24 @@ class Formatter:
         """
         return f"{value:.{decimals}f}%"
     
+    @staticmethod
+    def format_change(change_pct: Optional[float], decimals: int = 1) -> str:
+        """Format a period-over-period change.
+        
+        Args:
+            change_pct: Change in percent, None when the previous value was 0
+            decimals: Number of decimal places
+            
+        Returns:
+            Signed percentage with an arrow, or 'baru' without a previous value
+        """
+        if change_pct is None:
+            return "baru"
+        if change_pct == 0:
+            return "tetap"
+        arrow = "▲" if change_pct > 0 else "▼"
+        return f"{arrow} {change_pct:+.{decimals}f}%"
+    
     @staticmethod
     def format_transaction_message(transaction: Any) -> str:
         """Format transaction for display.
@@ -90,7 +128,7 @@ class Formatter:
             Formatted message string
         """
         sign = '+' if transaction.type == 'income' else '-'
-        amount_str = Formatter.format_currency(transaction.amount)
+        amount_str = Formatter.format_money(transaction.amount_minor)
         category = transaction.category_name
         date_str = Formatter.format_date_relative(transaction.transaction_date)
         
@@ -9,7 +9,7 @@ from telegram import (
 )
 from typing import List, Any
 from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
-import time
+from api.assets import build_version
 from config.settings import Settings
 
 
@@ -18,14 +18,21 @@ class Keyboards:
 
     @staticmethod
     def _miniapp_url_with_version() -> str:
-        """Append/update cache-busting version param for Mini App URL."""
+        """Mini App URL with the current build version as v= (see api.assets).
+
+        The version only changes when a new build ships, so Telegram's WebView
+        may reuse its cached index.html between builds.
+        """
         base_url = (Settings.MINIAPP_URL or "").strip()
         if not base_url:
             return ""
         parsed = urlparse(base_url)
         query = dict(parse_qsl(parsed.query, keep_blank_values=True))
-        # Telegram iOS WebView can keep stale cache; use rolling version token to force fresh fetch.
-        query["v"] = str(int(time.time()))
+        # Telegram iOS WebView can keep a stale index.html; a new build gets a new URL
+        version = build_version()
+        if not version:
+            return base_url
+        query["v"] = version
         new_query = urlencode(query)
         return urlunparse(parsed._replace(query=new_query))
     
@@ -0,0 +1,322 @@
+"""Prometheus-style metrics registry with text exposition format."""
+
+import asyncio
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _render_values(metric) -> List[str]:
+    """Render samples of a Counter or Gauge, calling its scrape-time callback if any."""
+    if metric._callback is not None:
+        try:
+            values = metric._callback()
+        except Exception as e:
+            logger.error(f"Metric callback {metric.name} failed: {e}")
+            values = {}
+    else:
+        with metric._lock:
+            values = dict(metric._values)
+    return [
+        f"{metric.name}{_format_labels(metric.labelnames, key)} {_format_value(v)}"
+        for key, v in sorted(values.items())
+    ]
+
+
+class _Metric:
+    """Base class for labelled metrics."""
+
+    type_name = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        lines.extend(self._samples())
+        return '\n'.join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter, optionally read from a callback at scrape time."""
+
+    type_name = 'counter'
+
+    def __init__(self, name, documentation, labelnames=(),
+                 callback: Optional[Callable[[], Dict[LabelValues, float]]] = None):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._callback = callback
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self):
+        return _render_values(self)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, optionally computed at scrape time."""
+
+    type_name = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=(),
+                 callback: Optional[Callable[[], Dict[LabelValues, float]]] = None):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._callback = callback
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self):
+        return _render_values(self)
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed buckets (seconds by convention)."""
+
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [bucket counts..., +Inf count], sum
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels) -> int:
+        entry = self._values.get(self._key(labels))
+        return sum(entry[0]) if entry else 0
+
+    def _samples(self):
+        with self._lock:
+            items = sorted((k, (list(c), s[0])) for k, (c, s) in self._values.items())
+        lines = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+def _db_pool_gauge() -> Dict[LabelValues, float]:
+    from config.database import DatabaseConnection
+    stats = DatabaseConnection.pool_stats()
+    return {
+        ('idle',): stats['idle'],
+        ('in_use',): stats['in_use'],
+        ('max_idle',): stats['size'],
+        ('replica_idle',): stats['replica_idle'],
+    }
+
+
+def _db_pool_cache_counter() -> Dict[LabelValues, float]:
+    from config.database import DatabaseConnection
+    stats = DatabaseConnection.pool_stats()
+    return {('db_pool', 'hit'): stats['reused'], ('db_pool', 'miss'): stats['created']}
+
+
+class Metrics:
+    """Application metrics shared by the API and bot processes."""
+
+    http_request_duration = Histogram(
+        'montrixa_http_request_duration_seconds',
+        'API request latency by route.',
+        ('method', 'route', 'status'),
+    )
+    db_pool_connections = Gauge(
+        'montrixa_db_pool_connections',
+        'Database connections by state.',
+        ('state',),
+        callback=_db_pool_gauge,
+    )
+    cache_requests = Counter(
+        'montrixa_cache_requests_total',
+        'Cache lookups by cache and result (db_pool: pooled connection reused or newly created).',
+        ('cache', 'result'),
+        callback=_db_pool_cache_counter,
+    )
+    job_duration = Histogram(
+        'montrixa_job_duration_seconds',
+        'Scheduler job run time.',
+        ('job',),
+        buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 300.0, 900.0),
+    )
+    job_runs = Counter(
+        'montrixa_job_runs_total',
+        'Scheduler job runs by outcome.',
+        ('job', 'outcome'),
+    )
+    job_last_success = Gauge(
+        'montrixa_job_last_success_timestamp_seconds',
+        'Unix time of the last successful job run.',
+        ('job',),
+    )
+    telegram_requests = Counter(
+        'montrixa_telegram_requests_total',
+        'Telegram Bot API calls by method and HTTP status.',
+        ('method', 'status'),
+    )
+    telegram_rate_limited = Counter(
+        'montrixa_telegram_rate_limited_total',
+        'Telegram Bot API calls rejected with HTTP 429.',
+        ('method',),
+    )
+    telegram_request_duration = Histogram(
+        'montrixa_telegram_request_duration_seconds',
+        'Telegram Bot API call latency.',
+        ('method',),
+    )
+    event_loop_lag = Histogram(
+        'montrixa_event_loop_lag_seconds',
+        'Delay between scheduled and actual wake-up of the lag probe.',
+        (),
+        buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+    )
+
+    @classmethod
+    def all(cls) -> List[_Metric]:
+        return [v for v in vars(cls).values() if isinstance(v, _Metric)]
+
+    @classmethod
+    def render(cls) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        return '\n'.join(m.render() for m in cls.all()) + '\n'
+
+    @classmethod
+    @contextmanager
+    def track_job(cls, job_id: str) -> Iterator[None]:
+        """Record duration and outcome of a scheduler job run.
+
+        An exception escaping the block counts as a failure and is re-raised.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            cls.job_runs.inc(job=job_id, outcome='failure')
+            raise
+        else:
+            cls.job_runs.inc(job=job_id, outcome='success')
+            cls.job_last_success.set(time.time(), job=job_id)
+        finally:
+            cls.job_duration.observe(time.perf_counter() - started, job=job_id)
+
+
+async def monitor_event_loop_lag(interval: float = 0.5) -> None:
+    """Sample event-loop lag forever; run as a background task."""
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        Metrics.event_loop_lag.observe(max(0.0, loop.time() - expected))
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = Metrics.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug("metrics listener: " + format, *args)
+
+
+def start_metrics_server(host: str, port: int) -> ThreadingHTTPServer:
+    """Serve /metrics from a daemon thread (used by the bot process).
+
+    Args:
+        host: Interface to bind
+        port: TCP port to bind
+
+    Returns:
+        The running server; call shutdown() to stop it
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, name='metrics-listener', daemon=True)
+    thread.start()
+    logger.info(f"Metrics listener on http://{host}:{server.server_address[1]}/metrics")
+    return server
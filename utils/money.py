@@ -0,0 +1,55 @@
+"""Money as integer minor units.
+
+Amounts are DECIMAL(15, 2) in the database. Inside the app they are carried
+and summed as int minor units (1 Rupiah = 100), which keeps totals and
+percentages exact. Conversion happens only at the edges: rows coming out of
+the driver (to_minor), JSON/API output (to_major) and bound query
+parameters (to_decimal).
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Any
+
+MINOR_UNITS = 100
+
+_ONE = Decimal(1)
+
+
+def to_minor(value: Any) -> int:
+    """Convert an amount to integer minor units.
+
+    Args:
+        value: Decimal (MySQL), int/float (SQLite, user input), str or None
+
+    Returns:
+        Amount in minor units; None becomes 0
+
+    Floats are rounded to the nearest minor unit, which is exact for any
+    value a DECIMAL(15, 2) column can hold.
+    """
+    if value is None:
+        return 0
+    if isinstance(value, int):
+        return value * MINOR_UNITS
+    if isinstance(value, float):
+        return round(value * MINOR_UNITS)
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value).strip())
+    return int((value * MINOR_UNITS).quantize(_ONE, rounding=ROUND_HALF_UP))
+
+
+def to_major(minor: int) -> float:
+    """Convert minor units to a float amount (JSON and other output edges)."""
+    return int(minor) / MINOR_UNITS
+
+
+def to_decimal(minor: int) -> Decimal:
+    """Convert minor units to an exact Decimal for binding to DECIMAL columns."""
+    return Decimal(int(minor)).scaleb(-2)
+
+
+def percentage(part: int, whole: int) -> float:
+    """part as a percentage of whole (both in minor units), 0 when whole is 0."""
+    if not whole:
+        return 0.0
+    return part * 100 / whole
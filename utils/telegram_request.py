@@ -0,0 +1,32 @@
+"""Instrumented HTTP transport for Telegram Bot API calls."""
+
+import time
+from typing import Tuple
+
+from telegram.request import HTTPXRequest
+
+from utils.metrics import Metrics
+from utils.tracing import Tracer
+
+
+class TracedHTTPXRequest(HTTPXRequest):
+    """HTTPXRequest that records Bot API call time, status and 429s.
+
+    Time is attributed to the current trace span and exported as metrics.
+    """
+
+    async def do_request(self, url: str, method: str, request_data=None, **kwargs) -> Tuple[int, bytes]:
+        api_method = url.rsplit('/', 1)[-1]
+        status = 'error'
+        started = time.perf_counter()
+        try:
+            code, payload = await super().do_request(url, method, request_data=request_data, **kwargs)
+            status = str(code)
+            return code, payload
+        finally:
+            elapsed = time.perf_counter() - started
+            Tracer.add_telegram_time(elapsed * 1000)
+            Metrics.telegram_requests.inc(method=api_method, status=status)
+            Metrics.telegram_request_duration.observe(elapsed, method=api_method)
+            if status == '429':
+                Metrics.telegram_rate_limited.inc(method=api_method)
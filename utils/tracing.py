@@ -0,0 +1,217 @@
+"""Per-invocation latency tracing for bot handlers and API requests."""
+
+import json
+import logging
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+from config.query_stats import QueryStats, summarize
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+_current_span: ContextVar[Optional['Span']] = ContextVar('montrixa_span', default=None)
+
+_DIGITS_RE = re.compile(r'\d+')
+
+
+class Span:
+    """Timing breakdown of a single handler invocation or API request."""
+
+    __slots__ = (
+        'name', 'kind', 'started_at', 'wall_ms', 'db_ms', 'db_queries',
+        'telegram_ms', 'telegram_calls', 'error',
+    )
+
+    def __init__(self, name: str, kind: str):
+        self.name = name
+        self.kind = kind
+        self.started_at = time.time()
+        self.wall_ms = 0.0
+        self.db_ms = 0.0
+        self.db_queries = 0
+        self.telegram_ms = 0.0
+        self.telegram_calls = 0
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert span to a JSON-serializable dictionary."""
+        return {
+            'name': self.name,
+            'kind': self.kind,
+            'started_at': round(self.started_at, 3),
+            'wall_ms': round(self.wall_ms, 3),
+            'db_ms': round(self.db_ms, 3),
+            'db_queries': self.db_queries,
+            'telegram_ms': round(self.telegram_ms, 3),
+            'telegram_calls': self.telegram_calls,
+            'error': self.error,
+        }
+
+
+class _SpanWindow:
+    """Rolling samples for one span name."""
+
+    __slots__ = ('kind', 'calls', 'errors', 'wall', 'db', 'queries', 'telegram')
+
+    def __init__(self, kind: str, window: int):
+        self.kind = kind
+        self.calls = 0
+        self.errors = 0
+        self.wall = deque(maxlen=window)
+        self.db = deque(maxlen=window)
+        self.queries = deque(maxlen=window)
+        self.telegram = deque(maxlen=window)
+
+
+def current_span() -> Optional[Span]:
+    """Return the span of the handler or request being processed, if any."""
+    return _current_span.get()
+
+
+def label_for_update(update: Any, fallback: str) -> str:
+    """Derive a stable span name from a Telegram update.
+
+    Commands map to '/command', callback data has digits replaced with '*'
+    (e.g. 'delete_trans_*'), anything else falls back to the handler name.
+    """
+    message = getattr(update, 'message', None)
+    text = getattr(message, 'text', None) if message else None
+    if text and text.startswith('/'):
+        return text.split()[0].split('@')[0]
+
+    query = getattr(update, 'callback_query', None)
+    data = getattr(query, 'data', None) if query else None
+    if data:
+        return 'cb:' + _DIGITS_RE.sub('*', data)
+
+    return fallback
+
+
+class Tracer:
+    """Collects spans and keeps rolling percentiles per span name.
+
+    Disabled by default; enable with TRACING_ENABLED=true. When TRACE_LOG_FILE is
+    set every finished span is appended to it as one JSON line.
+    """
+
+    enabled = Settings.TRACING_ENABLED
+    log_file = Settings.TRACE_LOG_FILE
+    window = Settings.TRACE_WINDOW
+
+    _lock = threading.Lock()
+    _windows: Dict[str, _SpanWindow] = {}
+    _listener_installed = False
+
+    @classmethod
+    def _on_query(cls, fingerprint: str, query: str, duration_ms: float, rows: int) -> None:
+        span = _current_span.get()
+        if span is not None:
+            span.db_ms += duration_ms
+            span.db_queries += 1
+
+    @classmethod
+    def _install_listener(cls) -> None:
+        with cls._lock:
+            if cls._listener_installed:
+                return
+            cls._listener_installed = True
+        QueryStats.add_listener(cls._on_query)
+
+    @classmethod
+    @contextmanager
+    def span(cls, name: str, kind: str = 'handler') -> Iterator[Optional[Span]]:
+        """Context manager that measures a handler or request.
+
+        Nested calls reuse the outer span so a request is only counted once.
+
+        Args:
+            name: Span name (command, callback pattern or route)
+            kind: Span kind ('command', 'callback', 'api', ...)
+        """
+        if not cls.enabled or _current_span.get() is not None:
+            yield _current_span.get()
+            return
+
+        cls._install_listener()
+        span = Span(name, kind)
+        token = _current_span.set(span)
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            span.wall_ms = (time.perf_counter() - started) * 1000
+            _current_span.reset(token)
+            cls.finish(span)
+
+    @classmethod
+    def add_telegram_time(cls, duration_ms: float) -> None:
+        """Attribute a Telegram Bot API call to the current span."""
+        span = _current_span.get()
+        if span is not None:
+            span.telegram_ms += duration_ms
+            span.telegram_calls += 1
+
+    @classmethod
+    def finish(cls, span: Span) -> None:
+        """Record a finished span and append it to the span log."""
+        with cls._lock:
+            window = cls._windows.get(span.name)
+            if window is None:
+                window = cls._windows[span.name] = _SpanWindow(span.kind, cls.window)
+            window.calls += 1
+            if span.error:
+                window.errors += 1
+            window.wall.append(span.wall_ms)
+            window.db.append(span.db_ms)
+            window.queries.append(span.db_queries)
+            window.telegram.append(span.telegram_ms)
+
+            if cls.log_file:
+                try:
+                    with open(cls.log_file, 'a', encoding='utf-8') as f:
+                        f.write(json.dumps(span.to_dict()) + '\n')
+                except OSError as e:
+                    logger.error(f"Failed to write span log: {e}")
+
+    @classmethod
+    def summary(cls) -> Dict[str, Any]:
+        """Return percentile summaries per span name ordered by p95 wall time."""
+        with cls._lock:
+            items = [
+                (name, w.kind, w.calls, w.errors, list(w.wall), list(w.db),
+                 list(w.queries), list(w.telegram))
+                for name, w in cls._windows.items()
+            ]
+
+        spans = []
+        for name, kind, calls, errors, wall, db, queries, telegram in items:
+            wall_summary = summarize(wall)
+            spans.append({
+                'name': name,
+                'kind': kind,
+                'calls': calls,
+                'errors': errors,
+                'wall': wall_summary,
+                'db': summarize(db),
+                'telegram': summarize(telegram),
+                'db_queries_avg': round(sum(queries) / len(queries), 2) if queries else 0.0,
+                'db_queries_max': max(queries) if queries else 0,
+            })
+        spans.sort(key=lambda s: s['wall']['p95_ms'], reverse=True)
+
+        return {'enabled': cls.enabled, 'spans': spans}
+
+    @classmethod
+    def reset(cls) -> None:
+        """Clear collected span windows."""
+        with cls._lock:
+            cls._windows = {}